@@ -1,20 +1,24 @@
 from fastapi import FastAPI
 import uvicorn
 from etl.databases.routes.admin import admin
+from etl.databases.routes.metrics import metrics
 from etl.databases.cassandra.routes.user import user
 from etl.databases.cassandra.routes.search import search
 from etl.databases.cassandra.routes.clicks import clicks
 from etl.databases.cassandra.routes.job import jobs
 from etl.databases.chroma.routes.job_index import job_index
+from etl.utils.tracing import LatencyMiddleware
 from src.utils.backend_log_config import backend as logger
 
 app = FastAPI()
+app.add_middleware(LatencyMiddleware)
 app.include_router(admin)
 app.include_router(user)
 app.include_router(jobs)
 app.include_router(search)
 app.include_router(clicks)
 app.include_router(job_index)
+app.include_router(metrics)
 
 if __name__ == "__main__":
     logger.info("Starting server...")
@@ -0,0 +1,168 @@
+"""
+This module benchmarks the lean browser mode in `etl.extract.lean_browser`.
+
+It serves the saved job page fixtures from a local server, each page
+extended with the kind of subresources job sites load (images, a web font, a
+stylesheet and a third-party tracker script), and loads every page in a
+standard and a lean headless Firefox. For each mode it reports the mean page
+load time and the bytes the server transferred per page. The tracker is
+served from `localhost` while pages are loaded from `127.0.0.1`, so the
+blocklist can tell them apart.
+
+Requires Firefox and geckodriver.
+
+Usage:
+    python -m benchmarks.bench_lean_browser --loads 10
+"""
+
+import argparse
+import glob
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from selenium import webdriver
+from selenium.webdriver.firefox.options import Options
+from etl.extract.lean_browser import apply_lean_mode
+
+FIXTURES = os.path.join(
+    os.path.dirname(__file__), "..", "tests", "http_fetcher", "fixtures"
+)
+
+# subresources added to every fixture page
+SUBRESOURCES = """
+<link rel="stylesheet" href="/static/site.css">
+<style>@font-face {{ font-family: Brand; src: url(/static/brand.woff2); }}
+body {{ font-family: Brand; }}</style>
+{images}
+<script src="http://localhost:{port}/tracker.js"></script>
+"""
+
+
+def build_site(port: int, images: int) -> dict:
+    """
+    Builds the pages and subresources served by the benchmark server.
+
+    Args:
+    - port (int): The port of the server.
+    - images (int): The number of images on each page.
+
+    Returns:
+    - dict: The content type and body of each path.
+    """
+    site = {
+        "/static/site.css": ("text/css", b"body { margin: 0; }" * 2000),
+        "/static/brand.woff2": ("font/woff2", os.urandom(80_000)),
+        "/tracker.js": ("text/javascript", b"var t = 1;" * 10_000),
+    }
+    tags = []
+    for n in range(images):
+        site[f"/static/img{n}.jpg"] = ("image/jpeg", os.urandom(60_000))
+        tags.append(f'<img src="/static/img{n}.jpg">')
+    extra = SUBRESOURCES.format(images="\n".join(tags), port=port)
+
+    for path in sorted(glob.glob(os.path.join(FIXTURES, "*_job.html"))):
+        with open(path, "r") as f:
+            html = f.read().replace("</body>", extra + "</body>")
+        site["/" + os.path.basename(path)] = ("text/html", html.encode())
+    return site
+
+
+def serve(images: int) -> tuple[ThreadingHTTPServer, dict, list]:
+    """
+    Starts the benchmark server in a background thread.
+
+    Args:
+    - images (int): The number of images on each page.
+
+    Returns:
+    - tuple: The server, the served site and the list the server appends
+      the size of each response to.
+    """
+    transferred = []
+    site = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            content_type, body = site.get(
+                self.path.split("?")[0], ("text/plain", b"")
+            )
+            self.send_response(200 if body else 404)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            transferred.append(len(body))
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    site.update(build_site(server.server_address[1], images))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, site, transferred
+
+
+def load_pages(lean: bool, pages: list[str], loads: int,
+               transferred: list) -> tuple[float, float]:
+    """
+    Loads every page repeatedly in a fresh headless Firefox.
+
+    Args:
+    - lean (bool): Whether to use the lean mode.
+    - pages (list[str]): The page URLs.
+    - loads (int): The number of times each page is loaded.
+    - transferred (list): The response sizes recorded by the server.
+
+    Returns:
+    - tuple[float, float]: The mean load time in ms and the mean bytes
+      transferred per page load.
+    """
+    options = Options()
+    options.add_argument("--headless")
+    # no cache, so every load transfers the page again
+    options.set_preference("browser.cache.disk.enable", False)
+    options.set_preference("browser.cache.memory.enable", False)
+    if lean:
+        apply_lean_mode(options, ["localhost"])
+    wd = webdriver.Firefox(options=options)
+    try:
+        # warm up the browser
+        wd.get(pages[0])
+        transferred.clear()
+        start = time.perf_counter()
+        for _ in range(loads):
+            for page in pages:
+                wd.get(page)
+        elapsed = time.perf_counter() - start
+    finally:
+        wd.quit()
+    # let subresources still in flight finish before counting
+    time.sleep(1)
+    count = loads * len(pages)
+    return 1000 * elapsed / count, sum(transferred) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--loads", type=int, default=10)
+    parser.add_argument("--images", type=int, default=12)
+    args = parser.parse_args()
+
+    server, site, transferred = serve(args.images)
+    host, port = server.server_address
+    pages = [f"http://{host}:{port}{path}"
+             for path in site if path.endswith(".html")]
+
+    print(f"{len(pages)} fixture pages, {args.images} images each, "
+          f"{args.loads} loads per page")
+    print(f"{'mode':<9} {'ms/page':>8} {'KB/page':>8}")
+    for lean in (False, True):
+        load_ms, size = load_pages(lean, pages, args.loads, transferred)
+        print(f"{'lean' if lean else 'standard':<9} {load_ms:>8.1f} "
+              f"{size / 1000:>8.1f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
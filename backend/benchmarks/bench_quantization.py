@@ -0,0 +1,121 @@
+"""
+This module benchmarks the compressed job embedding codecs in
+`etl.transform.quantization`.
+
+For each codec it reports the in-memory size of the index and recall@10
+against exact search, with and without re-scoring the shortlist at full
+precision. Vectors are either synthetic clustered embeddings or the
+embeddings currently stored in Chroma.
+
+Usage:
+    python -m benchmarks.bench_quantization --source synthetic --size 20000
+    python -m benchmarks.bench_quantization --source chroma
+"""
+
+import argparse
+import time
+import numpy as np
+from etl.transform.quantization import (
+    CODECS, CompressedIndex, squared_distances
+)
+
+
+def synthetic_vectors(size: int, dim: int, seed: int = 0) -> np.ndarray:
+    """
+    Generates normalized vectors grouped around random topics, which is
+    closer to real job embeddings than uniform noise.
+
+    Args:
+    - size (int): The number of vectors.
+    - dim (int): The dimension of the vectors.
+    - seed (int): Seed for the random generator. Default is 0.
+
+    Returns:
+    - np.ndarray: The vectors, shape `(size, dim)`.
+    """
+    rng = np.random.default_rng(seed)
+    topics = rng.normal(size=(max(size // 100, 1), dim))
+    vectors = topics[rng.integers(len(topics), size=size)] +\
+        0.5 * rng.normal(size=(size, dim))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32)
+
+
+def chroma_vectors() -> np.ndarray:
+    """
+    Reads the job embeddings stored in Chroma.
+
+    Returns:
+    - np.ndarray: The job embeddings.
+    """
+    from etl.load.load_chroma import ChromaIO
+    results = ChromaIO().jobs_table.get(include=["embeddings"])
+    return np.asarray(results["embeddings"], dtype=np.float32)
+
+
+def recall(index: CompressedIndex, queries: np.ndarray, truth: list,
+           rescore: int) -> tuple[float, float]:
+    """
+    Measures recall@10 and mean query latency of an index.
+
+    Args:
+    - index (CompressedIndex): The index to be measured.
+    - queries (np.ndarray): The query vectors.
+    - truth (list[set[str]]): The exact 10 nearest IDs of each query.
+    - rescore (int): The number of candidates re-scored exactly.
+
+    Returns:
+    - tuple[float, float]: The recall and the mean latency in ms.
+    """
+    hits = 0
+    start = time.perf_counter()
+    for query, expected in zip(queries, truth):
+        found = index.search(query, n_results=10, rescore=rescore)
+        hits += len(set(found) & expected)
+    elapsed = time.perf_counter() - start
+    return hits / (10 * len(queries)), 1000 * elapsed / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--source", choices=["synthetic", "chroma"],
+                        default="synthetic")
+    parser.add_argument("--size", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--rescore", type=int, default=100)
+    args = parser.parse_args()
+
+    if args.source == "chroma":
+        vectors = chroma_vectors()
+    else:
+        vectors = synthetic_vectors(args.size, args.dim)
+    ids = [str(i) for i in range(len(vectors))]
+
+    # held out queries near the indexed vectors
+    rng = np.random.default_rng(1)
+    queries = vectors[rng.integers(len(vectors), size=args.queries)] +\
+        0.1 * rng.normal(size=(args.queries, vectors.shape[1]))
+    truth = [
+        set(str(i) for i in np.argsort(squared_distances(q, vectors))[:10])
+        for q in queries
+    ]
+
+    print(f"{len(vectors)} vectors of dim {vectors.shape[1]}, "
+          f"float32 size {vectors.nbytes / 1e6:.2f} MB")
+    print(f"{'codec':<8} {'memory MB':>10} {'build s':>8} "
+          f"{'recall@10':>10} {'ms/query':>9} "
+          f"{'rescored':>9} {'ms/query':>9}")
+    for name, codec in CODECS.items():
+        start = time.perf_counter()
+        index = CompressedIndex(codec()).build(ids, vectors)
+        build_time = time.perf_counter() - start
+        plain, plain_ms = recall(index, queries, truth, rescore=0)
+        rescored, rescored_ms = recall(index, queries, truth, args.rescore)
+        print(f"{name:<8} {index.memory_bytes() / 1e6:>10.2f} "
+              f"{build_time:>8.1f} {plain:>10.3f} {plain_ms:>9.2f} "
+              f"{rescored:>9.3f} {rescored_ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
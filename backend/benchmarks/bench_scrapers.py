@@ -0,0 +1,265 @@
+"""
+This module benchmarks the throughput of the scrapers offline, by replaying
+recorded pages from a local server with `etl.extract.replay`.
+
+For each site it visits the search results pages one after another, as the
+scrapers do, parsing their job cards with the site's card parser, then
+fetches the job pages with the job page worker pool and parses them with
+the site's page parser. It reports the pages and cards per second and the
+parse time per page. The latency of the server is injected, so the results
+can be compared across runs with no network.
+
+Pages are either recorded by the scrapers (set `replay.record` in the config
+file) or a synthetic archive built from the job page test fixtures.
+
+Usage:
+    python -m benchmarks.bench_scrapers --latency 100 --workers 4
+    python -m benchmarks.bench_scrapers --archive ./models/page_archive
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import soupsieve
+from bs4 import BeautifulSoup as bs
+from etl.extract.browser_pool import BrowserPool, HostLimiter
+from etl.extract.http_fetcher import HttpFetcher
+from etl.extract.orchestrator import SITE_SCRAPERS
+from etl.extract.replay import PageArchive, ReplayServer
+
+FIXTURES = os.path.join(
+    os.path.dirname(__file__), "..", "tests", "http_fetcher", "fixtures"
+)
+
+HTTP_CONFIG = {"timeout": 30, "retries": 0, "user_agent": "bench_scrapers"}
+
+# synthetic card of each site, with the job number `n`
+SYNTHETIC_CARDS = {
+    "indeed": """
+<li><div class="cardOutline tapItem"><div><div><div><div>
+<table><tbody><tr><td>
+  <div><h2><a href="https://ng.indeed.com/rc/clk?jk={n}">
+    <span id="jobTitle-{n}">Data Analyst {n}</span></a></h2></div>
+  <div><div><span>Acme Ltd</span><div>Lagos</div></div></div>
+</td></tr></tbody></table>
+<table><tbody><tr><td></td></tr><tr><td>
+  <div><span>Posted 2 days ago</span></div>
+</td></tr></tbody></table>
+</div></div></div></div></div></li>""",
+    "linkedin": """
+<li><div><a href="https://ng.linkedin.com/jobs/view/{n}"></a>
+  <div><h3>Engineer {n}</h3><h4>Initech</h4>
+    <div><span class="job-search-card__location">Abuja</span>
+    <time datetime="2024-03-01">1 week ago</time></div></div>
+</div></li>""",
+    "jobberman": """
+<div class="mx-5"><div><div><div>
+  <div><a href="https://www.jobberman.com/listings/{n}"><p>Driver {n}</p></a>
+  </div><p>Haulage Co</p><div><span>Kano</span></div>
+</div></div></div><div><p>1 week ago</p></div></div>""",
+}
+
+# synthetic search results page of each site, around its cards
+SYNTHETIC_LISTS = {
+    "indeed": '<div id="mosaic-provider-jobcards"><ul>{cards}</ul></div>',
+    "linkedin": '<ul class="jobs-search__results-list">{cards}</ul>',
+    "jobberman": "<main><section><div></div><div><div></div>"
+                 "<div><div>{cards}</div></div></div></section></main>",
+}
+
+
+def synthetic_job_page(site: str, n: int) -> str:
+    """
+    Returns the job page of a synthetic job.
+
+    Args:
+    - site (str): The site name.
+    - n (int): The job number.
+
+    Returns:
+    - str: The HTML of the page.
+    """
+    if site == "indeed":
+        return (
+            '<html><body><div class="jobsearch-jobDescriptionText">'
+            f"Job {n}: prepare reports and dashboards.</div></body></html>"
+        )
+    with open(os.path.join(FIXTURES, f"{site}_job.html"), "r") as f:
+        return f.read()
+
+
+def page_url(search_url: str, page: int) -> str:
+    """
+    Returns the URL of a synthetic search results page.
+    """
+    return f"{search_url}{'&' if '?' in search_url else '?'}page={page}"
+
+
+def build_synthetic_archive(path: str, pages: int, cards: int,
+                            sites: dict = None) -> PageArchive:
+    """
+    Builds an archive of synthetic search results and job pages.
+
+    Args:
+    - path (str): The directory of the archive.
+    - pages (int): The number of search results pages of each site.
+    - cards (int): The number of job cards on each page.
+    - sites (dict | None): Scraper classes by site name. Default is None
+      (all sites in `SITE_SCRAPERS`).
+
+    Returns:
+    - PageArchive: The archive.
+    """
+    archive = PageArchive(path)
+    for site, SiteScraper in (sites or SITE_SCRAPERS).items():
+        for page in range(pages):
+            numbers = range(page * cards, (page + 1) * cards)
+            html = SYNTHETIC_LISTS[site].format(cards="".join(
+                SYNTHETIC_CARDS[site].format(n=n) for n in numbers
+            ))
+            archive.add(
+                site, "list", page_url(SiteScraper.search_url, page),
+                f"<html><body>{html}</body></html>"
+            )
+            for n in numbers:
+                card = SiteScraper.card_parser.parse(
+                    SYNTHETIC_CARDS[site].format(n=n)
+                )[0]
+                archive.add(
+                    site, "detail", card["job_link"],
+                    synthetic_job_page(site, n)
+                )
+    return archive
+
+
+def parse_list_page(SiteScraper, html: str) -> tuple[list, float]:
+    """
+    Parses the job cards of a search results page as the scraper does,
+    from the HTML of their container.
+
+    Args:
+    - SiteScraper: The scraper class of the site.
+    - html (str): The HTML of the page.
+
+    Returns:
+    - tuple[list, float]: The parsed cards and the seconds spent parsing
+      them.
+    """
+    container = soupsieve.select_one(
+        SiteScraper.results_selector, bs(html, "html.parser")
+    )
+    if container is None:
+        return [], 0.0
+    start = time.perf_counter()
+    cards = SiteScraper.card_parser.parse(str(container))
+    return cards, time.perf_counter() - start
+
+
+def bench_site(server: ReplayServer, site: str, SiteScraper,
+               workers: int) -> dict:
+    """
+    Scrapes the replayed pages of one site.
+
+    Args:
+    - server (ReplayServer): The running replay server.
+    - site (str): The site name.
+    - SiteScraper: The scraper class of the site.
+    - workers (int): The number of job page workers.
+
+    Returns:
+    - dict: The number of list pages, cards and job pages, and the
+      seconds spent fetching and parsing each.
+    """
+    fetcher = HttpFetcher(HTTP_CONFIG, max_connections=workers)
+    archive = server.archive
+    result = {"list_pages": 0, "cards": 0, "card_parse": 0.0,
+              "details": 0, "detail_parse": 0.0}
+
+    # search results pages are visited one after another
+    start = time.perf_counter()
+    for page in archive.pages(site, "list"):
+        cards, seconds = parse_list_page(
+            SiteScraper, fetcher.get(server.url(page["url"]))
+        )
+        result["list_pages"] += 1
+        result["cards"] += sum(card is not None for card in cards)
+        result["card_parse"] += seconds
+    result["list_time"] = time.perf_counter() - start
+
+    def fetch(session, link: str) -> float:
+        html = fetcher.get(link)
+        if SiteScraper.page_parser is None:
+            return 0.0
+        parse_start = time.perf_counter()
+        SiteScraper.page_parser(html)
+        return time.perf_counter() - parse_start
+
+    # job pages are fetched by the worker pool, without politeness delays
+    links = [server.url(page["url"])
+             for page in archive.pages(site, "detail")]
+    pool = BrowserPool(workers, HostLimiter(
+        {"default": {"max_concurrency": workers, "delay": [0, 0]}}
+    ))
+    start = time.perf_counter()
+    parse_times = [t for t in pool.map(fetch, links) if t is not None]
+    result["detail_time"] = time.perf_counter() - start
+    result["details"] = len(parse_times)
+    result["detail_parse"] = sum(parse_times)
+    return result
+
+
+def rate(count: float, seconds: float) -> float:
+    return count / seconds if seconds > 0 else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--archive", default=None,
+                        help="recorded archive (default: synthetic)")
+    parser.add_argument("--latency", type=float, default=100,
+                        help="server latency in ms")
+    parser.add_argument("--jitter", type=float, default=0,
+                        help="maximum random latency added, in ms")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--pages", type=int, default=4,
+                        help="synthetic search results pages per site")
+    parser.add_argument("--cards", type=int, default=15,
+                        help="synthetic job cards per page")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp:
+        if args.archive is None:
+            archive = build_synthetic_archive(temp, args.pages, args.cards)
+        else:
+            archive = PageArchive(args.archive)
+        server = ReplayServer(
+            archive, args.latency / 1000, args.jitter / 1000
+        )
+        with server:
+            print(f"latency {args.latency:.0f}ms (+{args.jitter:.0f}ms), "
+                  f"{args.workers} job page workers")
+            print(f"{'site':<10} {'lists/s':>8} {'cards/s':>8} "
+                  f"{'card ms':>8} {'jobs/s':>8} {'job ms':>8}")
+            for site in archive.sites():
+                if site not in SITE_SCRAPERS:
+                    continue
+                SiteScraper = SITE_SCRAPERS[site]
+                r = bench_site(server, site, SiteScraper, args.workers)
+                # job pages of sites without a page parser are only
+                # parsed in the browser
+                job_ms = "n/a"
+                if SiteScraper.page_parser is not None:
+                    job_ms = f"{1000 * rate(r['detail_parse'], r['details']):.2f}"  # noqa
+                print(
+                    f"{site:<10} "
+                    f"{rate(r['list_pages'], r['list_time']):>8.1f} "
+                    f"{rate(r['cards'], r['list_time']):>8.1f} "
+                    f"{1000 * rate(r['card_parse'], r['list_pages']):>8.2f} "
+                    f"{rate(r['details'], r['detail_time']):>8.1f} "
+                    f"{job_ms:>8}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -9,10 +9,13 @@ import yaml
 from cassandra.cluster import Cluster, Session
 from cassandra.auth import PlainTextAuthProvider
 from cassandra.metadata import Metadata
-from cassandra.cqlengine import connection
+from cassandra.cqlengine import connection, management
 from cassandra.query import dict_factory
 from src.utils.pipeline_log_config import pipeline as logger
 
+# tables synced by this process
+synced_tables = set()
+
 
 class CassandraConn:
     """
@@ -37,6 +40,9 @@ class CassandraConn:
     - jobs_table (str): Name of the jobs table in the keyspace.
     - search_table (str): Name of the search table in the keyspace.
     - clicks_table (str): Name of the clicks table in the keyspace.
+    - recommendations_table (str): Name of the user recommendations table
+      in the keyspace.
+    - vectors_table (str): Name of the user vectors table in the keyspace.
 
     Methods:
     - __init__(): Initializes the CassandraConn object and sets up connections
@@ -96,6 +102,10 @@ class CassandraConn:
             self.config["database"]["cassandra"]["tables"]["search"]
         self.clicks_table =\
             self.config["database"]["cassandra"]["tables"]["clicks"]
+        self.recommendations_table =\
+            self.config["database"]["cassandra"]["tables"]["recommendations"]
+        self.vectors_table =\
+            self.config["database"]["cassandra"]["tables"]["vectors"]
 
         # set session
         self.session = self.get_session()
@@ -141,3 +151,17 @@ class CassandraConn:
             return session
         except Exception as e:
             logger.error("Error connecting to Cassandra: %s", e)
+
+
+def sync_table(model):
+    """
+    Creates the table of a model, or adds the columns it is missing, on
+    keyspaces created before the table or columns were added. The table is
+    only synced once per process.
+
+    Args:
+    - model (Model): The cqlengine model of the table.
+    """
+    if model.__name__ not in synced_tables:
+        management.sync_table(model=model)
+        synced_tables.add(model.__name__)
@@ -58,6 +58,8 @@ class Job(BaseModel):
     - emp_type (str): Type of employment associated with the job.
     - job_func (str): Function or role related to the job.
     - ind (str): Industry associated with the job.
+    - alt_links (Set[str]): Links to near-duplicates of the job posted on
+      other sites (default: empty set).
     """
     uuid: UUID
     skipped: bool
@@ -74,6 +76,7 @@ class Job(BaseModel):
     emp_type: str
     job_func: str
     ind: str
+    alt_links: Set[str] = Field(default_factory=set[str])
 
 
 class Search(BaseModel):
@@ -1,9 +1,10 @@
 """
 This module contains CRUD routes for the `clicks_metadata` table in Cassandra.
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, BackgroundTasks
 from etl.databases.cassandra.data_models import Click
 from etl.databases.cassandra.table_models import ClicksMetadata
+from etl.utils.user_vectors import refresh_user_vector
 from src.utils.backend_log_config import backend as logger
 
 # create router for clicks
@@ -52,12 +53,14 @@ async def read_clicks(user_id: str):
 
 
 @clicks.post("/clicks/new", tags=["Clicks"])
-async def write_click(click: Click):
+async def write_click(click: Click, background_tasks: BackgroundTasks):
     """
     Write a new click entry into the `clicks_metadata` table.
 
     Args:
     - click (Click): The Click object representing the new click entry.
+    - background_tasks (BackgroundTasks): Used to refresh the user's
+      cached clicks vector after the response is sent.
 
     Returns:
     - Click: The created Click object representing the newly added click entry.
@@ -68,6 +71,7 @@ async def write_click(click: Click):
         job_id=str(click.job_id)
     )
     logger.info(f"Write click for user {click.user_id} and job {click.job_id}")
+    background_tasks.add_task(refresh_user_vector, click.user_id, ["clicks"])
     return user_click
 
 
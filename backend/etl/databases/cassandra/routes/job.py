@@ -1,13 +1,23 @@
 """
 This module contains CRUD routes for the `job_listings` table in Cassandra.
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from etl.databases.cassandra.cassandra_conn import sync_table
 from etl.databases.cassandra.data_models import Job
 from etl.databases.cassandra.table_models import JobListings
 from src.utils.backend_log_config import backend as logger
 
+
+def sync_job_listings():
+    """
+    Adds the columns of `job_listings` missing on older keyspaces before
+    the first request reads or writes it.
+    """
+    sync_table(JobListings)
+
+
 # create router
-jobs = APIRouter()
+jobs = APIRouter(dependencies=[Depends(sync_job_listings)])
 
 
 @jobs.get("/jobs/read_all", tags=["Jobs"])
@@ -73,7 +83,8 @@ async def write_job(job: Job):
         seniority=job.seniority,
         emp_type=job.emp_type,
         job_func=job.job_func,
-        ind=job.ind
+        ind=job.ind,
+        alt_links=job.alt_links
     )
     logger.info(f"Write job {job.job_id} to `job_listings` table")
     return job
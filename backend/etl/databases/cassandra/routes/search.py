@@ -2,9 +2,10 @@
 This module contains CRUD routes for the `search_metadata` table in Cassandra.
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, BackgroundTasks
 from etl.databases.cassandra.data_models import Search
 from etl.databases.cassandra.table_models import SearchMetadata
+from etl.utils.user_vectors import refresh_user_vector
 from src.utils.backend_log_config import backend as logger
 
 # create router
@@ -50,22 +51,26 @@ async def read_search(user_id: str):
 
 
 @search.post("/search/new", tags=["Search"])
-async def write_search(search: Search):
+async def write_search(search: Search, background_tasks: BackgroundTasks):
     """
     Creates new search metadata for a user in the `search_metadata` table.
 
     Args:
     - search (Search): The search metadata to be added.
+    - background_tasks (BackgroundTasks): Used to refresh the user's
+      cached searches vector after the response is sent.
 
     Returns:
     - Search: The newly created search metadata.
     """
+    user_id = search.user_id
     search = SearchMetadata.objects.create(
         user_id=str(search.user_id),
         search_query=search.search_query,
         search_results=search.search_results
     )
     logger.info(f"Write search for user {search.user_id}")
+    background_tasks.add_task(refresh_user_vector, user_id, ["searches"])
     return search
 
 
@@ -2,11 +2,13 @@
 This module contains the CRUD routes for the `users` table in Cassandra.
 """
 
-from fastapi import APIRouter
+from uuid import UUID
+from fastapi import APIRouter, BackgroundTasks
 from fastapi.responses import JSONResponse
 from etl.databases.cassandra.data_models import User
 from etl.databases.cassandra.table_models import Users
 from etl.utils.utilities import scrub_metadata
+from etl.utils.user_vectors import refresh_user_vector
 from src.utils.backend_log_config import backend as logger
 
 # create router
@@ -138,13 +140,16 @@ async def create_user(user: User):
 
 
 @user.put("/users/update/{user_id}", response_model=User, tags=["User"])
-async def update_user(user_id: str, user: User):
+async def update_user(user_id: str, user: User,
+                      background_tasks: BackgroundTasks):
     """
     Updates the details of an existing user in the database.
 
     Args:
     - user_id (str): The unique identifier for the user to be updated.
     - user (User): The updated user object containing the new details.
+    - background_tasks (BackgroundTasks): Used to refresh the user's
+      cached profile vector after the response is sent.
 
     Returns:
     - User: The updated user object fetched from the `users`
@@ -162,6 +167,7 @@ async def update_user(user_id: str, user: User):
     logger.info(
         f"Updated user {user.username} in `users` table with ID {user_id}"
     )
+    background_tasks.add_task(refresh_user_vector, UUID(user_id), ["profile"])
     return Users.get(Users.user_id == user_id)
 
 
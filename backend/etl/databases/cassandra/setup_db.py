@@ -7,7 +7,8 @@ from etl.databases.cassandra.cassandra_conn import CassandraConn
 from cassandra.cqlengine import management
 # Table models
 from etl.databases.cassandra.table_models import (
-    Users, JobListings, ClicksMetadata, SearchMetadata
+    Users, JobListings, ClicksMetadata, SearchMetadata, UserRecommendations,
+    UserVectors
 )
 
 
@@ -28,7 +29,8 @@ class SetupDB(CassandraConn):
 
         Creates keyspace with replication factor 1 and durable writes.
         Then creates `users`, `job_listings`, `search_metadata`,
-        and `clicks_metadata` tables.
+        `clicks_metadata`, `user_recommendations` and `user_vectors`
+        tables.
         """
         # create keyspace
         try:
@@ -63,6 +65,16 @@ class SetupDB(CassandraConn):
                 model=ClicksMetadata
             )
 
+            # create `user_recommendations` table
+            management.sync_table(
+                model=UserRecommendations
+            )
+
+            # create `user_vectors` table
+            management.sync_table(
+                model=UserVectors
+            )
+
             self.close_conn()
             logger.info("Created tables")
         except Exception as e:
@@ -72,8 +84,9 @@ class SetupDB(CassandraConn):
         """
         Drops existing tables from the keyspace if they exist.
 
-        Drops `users`, `job_listings`, `search_metadata`, and
-        `clicks_metadata` tables.
+        Drops `users`, `job_listings`, `search_metadata`,
+        `clicks_metadata`, `user_recommendations` and `user_vectors`
+        tables.
         """
         # drop tables from keyspace if they exist
         try:
@@ -81,6 +94,8 @@ class SetupDB(CassandraConn):
             management.drop_table(JobListings)
             management.drop_table(SearchMetadata)
             management.drop_table(ClicksMetadata)
+            management.drop_table(UserRecommendations)
+            management.drop_table(UserVectors)
             logger.info("Dropped tables")
         except Exception as e:
             logger.error(f"Error dropping tables: {e}")
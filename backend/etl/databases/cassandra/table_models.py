@@ -4,7 +4,7 @@ This module defines the table models for the Cassandra database.
 from etl.databases.cassandra.cassandra_conn import CassandraConn
 from cassandra.cqlengine.models import Model
 from cassandra.cqlengine.columns import (
-    UUID, Text, DateTime, Boolean, List, Set, Map
+    UUID, Text, DateTime, Boolean, List, Set, Map, Float
 )
 from uuid import uuid4
 from datetime import datetime
@@ -67,6 +67,8 @@ class JobListings(Model):
     - emp_type (Text, optional): Type of employment for the job.
     - job_func (Text, optional): Function or role of the job.
     - ind (Text, optional): Industry associated with the job.
+    - alt_links (Set[Text], optional): Links to near-duplicates of the job
+      posted on other sites.
     """
     __connection__ = conn.session_name
     __keyspace__ = conn.keyspace_name
@@ -86,6 +88,7 @@ class JobListings(Model):
     emp_type = Text()
     job_func = Text()
     ind = Text()
+    alt_links = Set(Text)
 
 
 class SearchMetadata(Model):
@@ -138,3 +141,49 @@ class ClicksMetadata(Model):
         clustering_order="desc"
     )
     job_id = Text(required=True)
+
+
+class UserRecommendations(Model):
+    """
+    Represents the `user_recommendations` table in Cassandra.
+
+    Attributes:
+    - user_id (UUID, primary key): Identifier for the user the
+      recommendations were computed for.
+    - job_ids (List[Text]): IDs of the recommended jobs, best first.
+    - updated_at (DateTime): Timestamp of when the recommendations were
+      last refreshed.
+    """
+    __connection__ = conn.session_name
+    __keyspace__ = conn.keyspace_name
+    __table_name__ = conn.recommendations_table
+    user_id = UUID(primary_key=True)
+    job_ids = List(Text)
+    updated_at = DateTime(default=datetime.now)
+
+
+class UserVectors(Model):
+    """
+    Represents the `user_vectors` table in Cassandra.
+
+    Attributes:
+    - user_id (UUID, primary key): Identifier for the user the vectors
+      belong to.
+    - profile (List[Float]): Embedding of the user's skills, work history
+      and preferences.
+    - searches (List[Float]): Embedding of the user's recent searches.
+    - clicks (List[Float]): Mean of the stored embeddings of the jobs the
+      user recently clicked.
+    - vector (List[Float]): Blend of the component vectors used at
+      query time, empty if the user had no data.
+    - updated_at (DateTime): Timestamp of the last update.
+    """
+    __connection__ = conn.session_name
+    __keyspace__ = conn.keyspace_name
+    __table_name__ = conn.vectors_table
+    user_id = UUID(primary_key=True)
+    profile = List(Float)
+    searches = List(Float)
+    clicks = List(Float)
+    vector = List(Float)
+    updated_at = DateTime(default=datetime.now)
@@ -2,10 +2,17 @@
 This module contains routes for the job embeddings index.
 """
 
+import os
 from fastapi import APIRouter
 from etl.databases.chroma.chroma_conn import ChromaConn
+from etl.databases.cassandra.table_models import UserRecommendations
 from etl.transform.vectorizer import vectorize
-from etl.utils.utilities import get_user_metadata
+from etl.transform.lexical_index import (
+    InvertedIndex, reciprocal_rank_fusion
+)
+from etl.transform.quantization import CompressedIndex
+from etl.utils.tracing import set_attributes, span, traced
+from etl.utils.user_vectors import get_search_vector
 from uuid import UUID
 from src.utils.backend_log_config import backend as logger
 
@@ -24,37 +31,90 @@ except Exception as e:
     jobs_table = None
     logger.error("Error loading job embeddings table: %s", e)
 
+# Indexes saved to disk by the scraping pipeline
+lexical_index_config = conn.config["database"]["lexical_index"]
+compressed_index_config = conn.config["database"]["compressed_index"]
+saved_indexes = {
+    "lexical": {
+        "path": lexical_index_config["path"],
+        "loader": InvertedIndex.load,
+        "index": InvertedIndex(),
+        "mtime": None
+    },
+    "compressed": {
+        "path": compressed_index_config["path"],
+        "loader": CompressedIndex.load,
+        "index": None,
+        "mtime": None
+    },
+}
 
-@job_index.get("/index/search/{user_id}&&{query}",
-               response_model=list[str], tags=["Index"])
-async def search_index(query: str, user_id: UUID):
+
+def get_saved_index(name: str):
     """
-    Searches the vector index for job queries using user metadata and
-    a given query.
+    Returns an index saved to disk by the scraping pipeline, reloading it if
+    a newer version has been saved since it was last loaded.
 
     Args:
-    - query (str): The search query.
-    - user_id (UUID): The unique identifier for the user.
+    - name (str): The name of the index in `saved_indexes`.
 
     Returns:
-    - list[str]: A list of job IDs that match the search query.
+    - InvertedIndex | CompressedIndex | None: The current index, or its
+      initial value if it has not been built yet.
+    """
+    saved = saved_indexes[name]
+    try:
+        mtime = os.path.getmtime(saved["path"])
+    except OSError:
+        # index has not been built yet
+        return saved["index"]
+    if mtime != saved["mtime"]:
+        saved["index"] = saved["loader"](saved["path"])
+        saved["mtime"] = mtime
+        logger.info(f"Loaded {name} index of {len(saved['index'])} jobs")
+    return saved["index"]
+
+
+def get_lexical_index() -> InvertedIndex:
+    """
+    Returns the current lexical index of job listings.
+
+    Returns:
+    - InvertedIndex: The current lexical index.
+    """
+    return get_saved_index("lexical")
+
 
-    The function fetches user metadata using the provided user_id and creates
-    a composite query by combining the user metadata with the search query.
-    It then searches the vector index using the composite query and returns
-    the top 10 matching job IDs.
+@traced()
+def query_jobs_table(query_vector: list, n_results: int) -> list[str]:
+    """
+    Queries the job embeddings table with a query vector.
+
+    Args:
+    - query_vector (list): The embedded query.
+    - n_results (int): The number of job IDs to return.
+
+    Returns:
+    - list[str]: IDs of the nearest jobs, best first.
+
+    When a compressed index is enabled and has been built, it is searched
+    in process instead of Chroma, with the shortlist re-scored at full
+    precision if configured.
 
     If the Chroma index is not loaded during server startup, this function
     will attempt to load it before executing the search query.
     """
-    # fetch user metadata
-    user_metadata = get_user_metadata(user_id)
-    # create compisite query using user metadata and query
-    composite_query = f"{query}, {user_metadata}"
-    # search vector index with vectorised query
-    # and return top 10 results
-    query_vector = vectorize(composite_query)
+    if compressed_index_config["method"] != "none":
+        compressed_index = get_saved_index("compressed")
+        if compressed_index is not None and len(compressed_index) > 0:
+            set_attributes({"backend": "compressed", "n_results": n_results})
+            return compressed_index.search(
+                query_vector[0],
+                n_results=n_results,
+                rescore=compressed_index_config["rescore"]
+            )
 
+    set_attributes({"backend": "chroma", "n_results": n_results})
     # this try-except block solves for when chroma index is not loaded
     # as at server startup (ex. when the app is first deployed)
     # It will hardly ever use the except block, so does not
@@ -62,12 +122,8 @@ async def search_index(query: str, user_id: UUID):
     try:
         results = jobs_table.query(  # type: ignore
             query_embeddings=query_vector,
-            n_results=10
+            n_results=n_results
         )
-        logger.info(f"Retrieved vector search results from Chroma."
-                    f"User ID: {user_id}")
-        # parse and return results
-        return results["ids"][0]
     except Exception as e:
         logger.warning(f"Chroma index not loaded: {e}")
         logger.info("Reloading Chroma index")
@@ -77,9 +133,114 @@ async def search_index(query: str, user_id: UUID):
         )
         results = table.query(
             query_embeddings=query_vector,
-            n_results=10
+            n_results=n_results
+        )
+    # parse and return results
+    return results["ids"][0]
+
+
+@traced()
+def get_cached_recommendations(user_id: UUID) -> list[str]:
+    """
+    Reads the recommendations precomputed for a user by the
+    scraping pipeline.
+
+    Args:
+    - user_id (UUID): The unique identifier for the user.
+
+    Returns:
+    - list[str]: The cached job IDs, or an empty list if none are cached.
+    """
+    try:
+        cached = UserRecommendations.objects(user_id=user_id).first()
+    except Exception as e:
+        logger.warning(f"Error reading cached recommendations: {e}")
+        return []
+    if cached is None:
+        return []
+    return list(cached.job_ids)
+
+
+@job_index.get("/index/search/{user_id}&&{query}",
+               response_model=list[str], tags=["Index"])
+async def search_index(query: str, user_id: UUID):
+    """
+    Searches the vector index for job queries using user metadata and
+    a given query.
+
+    Args:
+    - query (str): The search query.
+    - user_id (UUID): The unique identifier for the user.
+
+    Returns:
+    - list[str]: A list of job IDs that match the search query.
+
+    The function embeds the search query and blends it (weighted mean) with
+    the user's cached profile vector, which is computed from the user's
+    metadata on first use and kept up to date as the user's profile,
+    searches and clicks change. It then searches the vector index using the
+    blended query. When the query contains keywords, the search query alone
+    is also ranked against the lexical index with BM25 and both rankings are
+    merged with reciprocal rank fusion before the top 10 job IDs are
+    returned.
+
+    If the query cannot be embedded (e.g. the embedding model is
+    overloaded), the lexical results are returned on their own.
+
+    An empty query is served from the recommendations cached for the user
+    by the scraping pipeline when they exist.
+
+    Each step is traced as a span of the request, see
+    `etl.utils.tracing`.
+    """
+    # serve empty queries from the recommendations cache
+    if query.strip() == "":
+        cached = get_cached_recommendations(user_id)
+        if len(cached) > 0:
+            logger.info(f"Served cached recommendations. User ID: {user_id}")
+            return cached[:10]
+
+    # rank jobs by keyword match on the search query
+    keyword_results = []
+    if query.strip() != "":
+        # includes tokenizing the query
+        with span("lexical_search"):
+            keyword_results = get_lexical_index().search(
+                query,
+                n_results=lexical_index_config["candidates"]
+            )
+
+    try:
+        # blend the embedded query with the cached user vector
+        blended_vector = get_search_vector(query, user_id)
+        if blended_vector is None:
+            # new user without profile data searching with an empty query
+            query_vector = vectorize(query)
+        else:
+            query_vector = [blended_vector]
+    except Exception as e:
+        if len(keyword_results) == 0:
+            raise e
+        logger.warning(
+            f"Falling back to lexical search for user {user_id}: {e}"
         )
+        return keyword_results[:10]
+
+    # search vector index with vectorised query
+    if len(keyword_results) == 0:
+        vector_results = query_jobs_table(query_vector, n_results=10)
         logger.info(f"Retrieved vector search results from Chroma."
                     f"User ID: {user_id}")
-        # parse and return results
-        return results["ids"][0]
+        return vector_results
+
+    vector_results = query_jobs_table(
+        query_vector,
+        n_results=lexical_index_config["candidates"]
+    )
+    logger.info(f"Retrieved hybrid search results. User ID: {user_id}")
+    # fuse vector and keyword rankings and return top 10 results
+    with span("reciprocal_rank_fusion"):
+        return reciprocal_rank_fusion(
+            [vector_results, keyword_results],
+            n_results=10
+        )
@@ -12,11 +12,9 @@ from etl.databases.chroma.chroma_conn import ChromaConn
 from etl.databases.cassandra.setup_db import SetupDB as CassandraSetupDB
 from etl.databases.chroma.setup_db import SetupDB as ChromaSetupDB
 from src.utils.backend_log_config import backend as logger
-from etl.extract.site_scraper import (
-    IndeedScraper, LinkedinScraper, JobbermanScraper, scrape_with_retry
+from etl.load.scraping_pipeline import (
+    open_stage_store, run_scraping_pipeline
 )
-from etl.load.load_chroma import ChromaIO
-from etl.load.load_cassandra import CassandraIO
 
 # load config file
 with open("./config/config.yaml", "r") as stream:
@@ -123,38 +121,38 @@ async def initialize_chroma():
             )
 
 
-def scraping_pipeline():
+def scraping_pipeline(resume: bool = False):
     """
     Runs the data scraping and cleanup pipeline.
 
-    This function executes the following steps:
-    1. Initiates scraping job data from different sources (Indeed, Jobberman,
-       LinkedIn), saving the scraped jobs to Cassandra.
-    2. Load jobs from Cassandra database, embed them and push them into Chroma.
+    This function runs the stages of the scraping pipeline, see
+    `etl.load.scraping_pipeline`:
+    1. Scrapes job data from different sources (Indeed, Jobberman,
+       LinkedIn) concurrently, saving each source's jobs to Cassandra as
+       soon as it finishes.
+    2. Once every source has finished, whether it succeeded or not, embeds
+       the new jobs and pushes them into Chroma.
     3. Scrubs older jobs and their corresponding embeddings from both
-       Cassandra and Chroma.
-    """
-
-    # Scrape Job and save to Cassandra
-    scrape_with_retry(IndeedScraper)
-    scrape_with_retry(JobbermanScraper)
-    scrape_with_retry(LinkedinScraper)
-
-    # Update Job embeddings in Chroma
-    chroma_io = ChromaIO()
-    chroma_io.load_from_cassandra()
+       Chroma and Cassandra.
+    4. Rebuilds the compressed vector index and refreshes the cached
+       recommendations of active users, at the same time.
 
-    # Scrub older jobs and embeddings
-    cassandra_io = CassandraIO()
-    cassandra_io.scrub_jobs()
-    chroma_io.scrub_jobs()
+    Args:
+    - resume (bool): Whether to resume the latest run, running again only
+      its failed stages and the stages after them. Default is False.
+    """
+    run_scraping_pipeline(resume=resume)
 
 
 @admin.get("/scrape_jobs", tags=["Database Admin"])
-async def scrape_jobs():
+async def scrape_jobs(resume: bool = False):
     """
     Starts the data scraping pipeline in a new process.
 
+    Args:
+    - resume (bool): Whether to resume the latest run, running again only
+      its failed stages and the stages after them. Default is False.
+
     Initiates the scraping process for job data from multiple sources.
     If successful, it starts the scraping pipeline in a separate process,
     logging the start of the pipeline and returning a success message.
@@ -163,9 +161,9 @@ async def scrape_jobs():
     """
     try:
         # call scraping pipeline in a new process
-        scraping = Process(target=scraping_pipeline)
+        scraping = Process(target=scraping_pipeline, args=(resume,))
         scraping.start()
-        logger.info("Scraping pipeline started")
+        logger.info("Scraping pipeline started (resume: %s)", resume)
         # let the admin know that the pipeline is running
         return JSONResponse(
             status_code=200,
@@ -180,6 +178,33 @@ async def scrape_jobs():
         )
 
 
+@admin.get("/scrape_status", tags=["Database Admin"])
+async def scrape_status():
+    """
+    Retrieves the status and timings of the stages of the latest scraping
+    pipeline run.
+
+    If successful, returns the run and the status, start and finish times,
+    duration in seconds, error and result of each of its stages.
+    If an error occurs, logs the error and returns an error message.
+    """
+    try:
+        store, _ = open_stage_store()
+        run_id = store.latest_run()
+        stages = store.stages(run_id) if run_id is not None else {}
+        return JSONResponse(
+            status_code=200,
+            content={"run_id": run_id, "stages": stages}
+        )
+    except Exception as e:
+        # if error, let the admin know
+        logger.error("Error getting scraping pipeline status: %s", e)
+        return JSONResponse(
+            status_code=500,
+            content={"message": "Error getting scraping pipeline status"}
+        )
+
+
 @admin.get("/user_count", tags=["Database Admin"])
 async def get_users_count():
     """
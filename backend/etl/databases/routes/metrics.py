@@ -0,0 +1,60 @@
+"""
+This module provides the route serving the metrics of the ETL pipeline and
+the latency of the backend routes in the Prometheus text format, to be
+scraped by a Prometheus server, and the route serving the traces of slow
+requests.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse, PlainTextResponse
+from etl.utils.metrics import get_metrics_store
+from etl.utils.tracing import LatencyMiddleware
+from src.utils.backend_log_config import backend as logger
+
+# create router
+metrics = APIRouter()
+
+
+@metrics.get("/metrics", tags=["Monitoring"],
+             response_class=PlainTextResponse)
+def get_metrics():
+    """
+    Serves the durations, item counts and error counts of the pipeline
+    stages of each site, see `etl.utils.metrics`, and the latency histogram
+    of each backend route, see `etl.utils.tracing`.
+
+    The route is synchronous, so FastAPI runs it in its thread pool and the
+    metrics database is read off the event loop.
+
+    Returns:
+    - PlainTextResponse: The metrics in the Prometheus text format, without
+      the pipeline metrics if they are disabled.
+    """
+    try:
+        store = get_metrics_store()
+        body = store.exposition() if store is not None else ""
+        if LatencyMiddleware.instance is not None:
+            body += LatencyMiddleware.instance.histogram.exposition()
+        return PlainTextResponse(
+            body, media_type="text/plain; version=0.0.4"
+        )
+    except Exception as e:
+        logger.error("Error reading metrics: %s", e)
+        return PlainTextResponse("Error reading metrics", status_code=500)
+
+
+@metrics.get("/traces/slow", tags=["Monitoring"])
+async def get_slow_requests():
+    """
+    Serves the latest requests slower than `tracing.slow_request_ms`, with
+    the spans of each request, slowest first.
+
+    Returns:
+    - JSONResponse: The route, path, status, duration in milliseconds and
+      spans of each slow request.
+    """
+    middleware = LatencyMiddleware.instance
+    samples = list(middleware.slow_requests) if middleware is not None\
+        else []
+    samples.sort(key=lambda sample: sample["duration_ms"], reverse=True)
+    return JSONResponse(status_code=200, content=samples)
@@ -0,0 +1,363 @@
+"""
+This module contains a manager of long-lived browser sessions.
+
+Starting a headless Firefox and creating a Selenium profile for it are the
+slowest steps of a scrape, so instead of starting a browser per scraper and
+per job page worker, the `BrowserManager` keeps warm sessions and hands them
+out on demand. Released sessions are reused by the next scraper or worker,
+including the scraper of a retry, and are recycled (quit and replaced on
+the next request) after serving a number of pages or once their browser's
+memory has grown too much.
+
+New sessions get their profile from a `ProfileStock`, which keeps a few
+fresh profiles created ahead of time in a background thread, so sessions
+rotate through profiles without waiting for them to be created. A profile
+is deleted once the last browser using it is quit, and the profiles left
+in stock are deleted when the manager is closed.
+"""
+
+import threading
+from queue import Queue, Empty
+from src.utils.pipeline_log_config import pipeline as logger
+
+
+def browser_memory_mb(driver) -> float | None:
+    """
+    Measures the resident memory of a Firefox webdriver's browser process.
+
+    Args:
+    - driver (webdriver.Firefox): The webdriver.
+
+    Returns:
+    - float | None: The resident memory in MB, or None if it cannot be
+      measured.
+    """
+    try:
+        pid = driver.capabilities["moz:processID"]
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (AttributeError, KeyError, OSError, ValueError):
+        pass
+    return None
+
+
+class ProfileStock:
+    """
+    Keeps a stock of fresh browser profiles, created ahead of time in a
+    background thread, and deletes the profiles it created once they are
+    no longer used.
+
+    Attributes:
+    - create_profile (Callable[[], str]): Creates a profile and returns its
+      name.
+    - delete_profile (Callable[[str], None] | None): Deletes a profile
+      given its name, or None to keep profiles.
+    - profiles (Queue): The profiles ready to be used.
+    - created (set[str]): The profiles created by the stock and not deleted
+      yet.
+    """
+    def __init__(self, create_profile, size: int, delete_profile=None):
+        """
+        Initializes a ProfileStock and starts filling it in the background.
+
+        Args:
+        - create_profile (Callable[[], str]): Creates a profile and returns
+          its name, e.g. `generate_profile`.
+        - size (int): The number of profiles kept in stock. With 0, profiles
+          are only created on demand.
+        - delete_profile (Callable[[str], None] | None): Deletes a profile
+          given its name. Default is None (profiles are kept).
+
+        Example:
+            stock = ProfileStock(generate_profile, 2, delete_profile)
+            profile_name = stock.take()
+            ...
+            stock.discard(profile_name)
+        """
+        self.create_profile = create_profile
+        self.delete_profile = delete_profile
+        self.profiles = Queue()
+        # free places in the stock, so no profile is created ahead of room
+        self.slots = threading.Semaphore(max(size, 0))
+        self.created = set()
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.filler = None
+        if size > 0:
+            self.filler = threading.Thread(target=self.fill, daemon=True)
+            self.filler.start()
+
+    def new_profile(self) -> str:
+        """
+        Creates a profile, recording it to be deleted once it is discarded.
+
+        Returns:
+        - str: The name of the profile.
+        """
+        profile = self.create_profile()
+        with self.lock:
+            self.created.add(profile)
+        return profile
+
+    def fill(self):
+        """
+        Creates profiles until the stock is stopped, waiting while it is
+        full.
+        """
+        while not self.stopped.is_set():
+            if not self.slots.acquire(timeout=1) or self.stopped.is_set():
+                continue
+            try:
+                self.profiles.put(self.new_profile())
+            except Exception as e:
+                self.slots.release()
+                logger.error(f"Error creating browser profile: {e}")
+                self.stopped.wait(10)
+
+    def take(self) -> str:
+        """
+        Takes a profile from the stock, or creates one if the stock is
+        empty.
+
+        Returns:
+        - str: The name of the profile.
+        """
+        try:
+            profile = self.profiles.get_nowait()
+        except Empty:
+            return self.new_profile()
+        self.slots.release()
+        return profile
+
+    def discard(self, profile_name: str):
+        """
+        Deletes a profile created by the stock, once the browsers using it
+        were quit. Other profiles, e.g. the default profile, are kept.
+
+        Args:
+        - profile_name (str): The name of the profile.
+        """
+        with self.lock:
+            if profile_name not in self.created:
+                return
+            self.created.discard(profile_name)
+        if self.delete_profile is None:
+            return
+        try:
+            self.delete_profile(profile_name)
+        except Exception as e:
+            logger.error(f"Error deleting browser profile: {e}")
+
+    def stop(self):
+        """
+        Stops creating profiles, and deletes the profiles left in stock.
+        """
+        self.stopped.set()
+        if self.filler is not None:
+            # wake the filler if it is waiting for room
+            self.slots.release()
+            self.filler.join()
+        while True:
+            try:
+                self.discard(self.profiles.get_nowait())
+            except Empty:
+                break
+
+
+class ManagedSession:
+    """
+    A browser session handed out by a `BrowserManager`, which forwards
+    attribute access to its webdriver and counts the pages it loads.
+
+    Attributes:
+    - driver (webdriver.Firefox): The webdriver.
+    - profile_name (str): The name of the session's profile.
+    - pages (int): The number of pages loaded by the session.
+    - base_memory (float | None): The browser's memory in MB when the
+      session was opened.
+    """
+    def __init__(self, driver, profile_name: str,
+                 base_memory: float | None):
+        self.driver = driver
+        self.profile_name = profile_name
+        self.pages = 0
+        self.base_memory = base_memory
+
+    def get(self, url: str):
+        self.pages += 1
+        return self.driver.get(url)
+
+    def __getattr__(self, name: str):
+        # only called for attributes not set on the ManagedSession itself
+        return getattr(self.driver, name)
+
+
+class BrowserManager:
+    """
+    Keeps warm browser sessions and hands them out on demand.
+
+    Attributes:
+    - open_browser (Callable[[str], Any] | None): Opens a webdriver given
+      the name of its profile, unless `acquire` is given another way.
+    - profiles (ProfileStock): The stock of profiles for new sessions.
+    - max_pages (int): The number of pages after which a session is
+      recycled.
+    - max_memory_growth_mb (float | None): The memory growth in MB after
+      which a session is recycled, or None for no limit.
+    - measure_memory (Callable[[Any], float | None]): Measures the memory
+      of a webdriver's browser in MB.
+    - idle (list[ManagedSession]): The sessions ready to be handed out.
+    - open_sessions (dict[str, int]): The number of open sessions of each
+      profile.
+    """
+    def __init__(self, open_browser, profiles: ProfileStock, max_pages: int,
+                 max_memory_growth_mb: float | None = None,
+                 measure_memory=browser_memory_mb):
+        """
+        Initializes a BrowserManager.
+
+        Args:
+        - open_browser (Callable[[str], Any] | None): Opens a webdriver
+          given the name of its profile, or None if every `acquire` is
+          given its own.
+        - profiles (ProfileStock): The stock of profiles for new sessions.
+        - max_pages (int): The number of pages after which a session is
+          recycled.
+        - max_memory_growth_mb (float | None): The memory growth in MB
+          after which a session is recycled. Default is None (no limit).
+        - measure_memory (Callable[[Any], float | None]): Measures the
+          memory of a webdriver's browser in MB. Default is
+          `browser_memory_mb`.
+
+        Example:
+            browsers = BrowserManager(open_driver, stock, max_pages=200)
+            wd = browsers.acquire()
+            wd.get(link)
+            browsers.release(wd)
+        """
+        self.open_browser = open_browser
+        self.profiles = profiles
+        self.max_pages = max_pages
+        self.max_memory_growth_mb = max_memory_growth_mb
+        self.measure_memory = measure_memory
+        self.lock = threading.Lock()
+        self.idle: list[ManagedSession] = []
+        self.open_sessions: dict[str, int] = {}
+
+    def acquire(self, profile_name: str = None,
+                open_browser=None) -> ManagedSession:
+        """
+        Hands out a warm session, or opens a new one if none is idle.
+
+        Args:
+        - profile_name (str | None): The profile the session must use.
+          Default is None (any profile, new sessions take one from the
+          stock).
+        - open_browser (Callable[[str], Any] | None): Opens the webdriver
+          of a new session. Default is None (`self.open_browser`).
+
+        Returns:
+        - ManagedSession: The session, to be given back with `release`.
+        """
+        with self.lock:
+            for session in self.idle:
+                if profile_name in (None, session.profile_name):
+                    self.idle.remove(session)
+                    return session
+
+        profile_name = profile_name or self.profiles.take()
+        driver = (open_browser or self.open_browser)(profile_name)
+        logger.info(f"Opened browser with profile {profile_name}")
+        with self.lock:
+            self.open_sessions[profile_name] =\
+                self.open_sessions.get(profile_name, 0) + 1
+        return ManagedSession(
+            driver, profile_name, self.measure_memory(driver)
+        )
+
+    def release(self, session: ManagedSession):
+        """
+        Gives a session back, keeping it warm unless it is due to be
+        recycled.
+
+        Args:
+        - session (ManagedSession): A session from `acquire`.
+        """
+        if self.needs_recycling(session):
+            self.quit(session)
+            return
+        with self.lock:
+            self.idle.append(session)
+
+    def needs_recycling(self, session: ManagedSession) -> bool:
+        """
+        Checks whether a session served too many pages or its browser's
+        memory grew too much.
+
+        Args:
+        - session (ManagedSession): The session.
+
+        Returns:
+        - bool: True if the session should be quit.
+        """
+        if session.pages >= self.max_pages:
+            return True
+        if self.max_memory_growth_mb is None or session.base_memory is None:
+            return False
+        memory = self.measure_memory(session.driver)
+        return memory is not None and \
+            memory - session.base_memory > self.max_memory_growth_mb
+
+    def recycle_idle(self, profile_name: str = None):
+        """
+        Quits idle sessions, e.g. the session of a profile which ran into
+        an auth wall.
+
+        Args:
+        - profile_name (str | None): The profile of the sessions to quit.
+          Default is None (every idle session).
+        """
+        with self.lock:
+            sessions = [
+                session for session in self.idle
+                if profile_name in (None, session.profile_name)
+            ]
+            self.idle = [
+                session for session in self.idle if session not in sessions
+            ]
+        for session in sessions:
+            self.quit(session)
+
+    def quit(self, session: ManagedSession):
+        """
+        Quits a session's browser, logging any error, and discards its
+        profile if no other session uses it.
+
+        Args:
+        - session (ManagedSession): The session.
+        """
+        logger.info(
+            f"Recycling browser with profile {session.profile_name} after "
+            f"{session.pages} pages"
+        )
+        try:
+            session.driver.quit()
+        except Exception as e:
+            logger.error(f"Error quitting browser: {e}")
+        with self.lock:
+            remaining = self.open_sessions.get(session.profile_name, 1) - 1
+            self.open_sessions[session.profile_name] = remaining
+            if remaining <= 0:
+                del self.open_sessions[session.profile_name]
+        if remaining <= 0:
+            self.profiles.discard(session.profile_name)
+
+    def close(self):
+        """
+        Quits every idle session, stops creating profiles and deletes the
+        unused ones.
+        """
+        self.recycle_idle()
+        self.profiles.stop()
@@ -0,0 +1,286 @@
+"""
+This module contains a worker pool for fetching job pages in parallel.
+
+Each worker owns an independent session, such as a headless Firefox
+webdriver with its own Selenium profile, and pulls job links from a shared
+queue, so the links are sharded across the sessions as they free up.
+Requests to each host go through a `HostLimiter`, which caps the number of
+concurrent requests per host and spaces them out with a random politeness
+delay. Results are merged back in the order of the links.
+
+Sessions can be opened lazily, so workers which never need a browser (e.g.
+because pages are fetched over HTTP first) never start one.
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from queue import Queue, Empty
+from urllib.parse import urlparse
+from src.utils.pipeline_log_config import pipeline as logger
+
+
+class HostLimiter:
+    """
+    Limits the number of concurrent requests to each host and the time
+    between the start of consecutive requests to it.
+
+    Attributes:
+    - limits (dict): Settings per host name, each with `max_concurrency`
+      and `delay` (the [min, max] seconds between request starts). The
+      `default` entry applies to hosts which are not listed.
+    """
+    def __init__(self, limits: dict):
+        self.limits = limits
+        self.lock = threading.Lock()
+        self.semaphores = {}
+        self.next_start = {}
+
+    def get_limit(self, host: str) -> dict:
+        """
+        Returns the settings of a host.
+
+        Args:
+        - host (str): The host name.
+
+        Returns:
+        - dict: The host's `max_concurrency` and `delay` settings.
+        """
+        return self.limits.get(host, self.limits["default"])
+
+    @contextmanager
+    def slot(self, url: str):
+        """
+        Waits until a request to the URL's host is allowed, and holds one of
+        the host's concurrency slots while the request runs.
+
+        Args:
+        - url (str): The URL about to be requested.
+
+        Example:
+            with limiter.slot(link):
+                wd.get(link)
+        """
+        host = urlparse(url).netloc
+        limit = self.get_limit(host)
+        with self.lock:
+            if host not in self.semaphores:
+                self.semaphores[host] = threading.Semaphore(
+                    limit["max_concurrency"]
+                )
+        with self.semaphores[host]:
+            # reserve the next start time for the host
+            with self.lock:
+                now = time.monotonic()
+                start = max(now, self.next_start.get(host, now))
+                self.next_start[host] = start + random.uniform(
+                    *limit["delay"]
+                )
+            time.sleep(start - now)
+            yield
+
+
+class LazySession:
+    """
+    Opens a session on first use and forwards attribute access to it.
+
+    Attributes:
+    - open_session (Callable[[], Any]): Creates the session.
+    - session: The session, or None if it has not been used yet.
+
+    Example:
+        wd = LazySession(create_driver)
+        wd.get(link)  # the webdriver is created here
+    """
+    def __init__(self, open_session):
+        self.open_session = open_session
+        self.session = None
+
+    def __getattr__(self, name: str):
+        # only called for attributes not set on the LazySession itself
+        if self.session is None:
+            self.session = self.open_session()
+        return getattr(self.session, name)
+
+
+class BrowserPool:
+    """
+    A pool of workers which fetch pages in parallel, one session each.
+
+    Attributes:
+    - num_workers (int): The number of workers (and sessions).
+    - limiter (HostLimiter): The per-host limits applied to every request.
+    - open_session (Callable[[], Any] | None): Creates the session of a
+      worker which was not given one, e.g. a new webdriver. Default is None
+      (such workers run without a session).
+    - close_session (Callable[[Any], None] | None): Closes a session
+      created by `open_session`. Default is None.
+    - lazy (bool): Whether sessions are only opened once a worker first
+      uses its session. Default is False.
+    """
+    def __init__(self, num_workers: int, limiter: HostLimiter,
+                 open_session=None, close_session=None, lazy: bool = False):
+        self.num_workers = max(num_workers, 1)
+        self.limiter = limiter
+        self.open_session = open_session
+        self.close_session = close_session
+        self.lazy = lazy
+
+    def map(self, fetch_page, links: list, sessions: list = None) -> list:
+        """
+        Fetches every link with `fetch_page` and returns the results in the
+        order of the links.
+
+        Args:
+        - fetch_page (Callable[[Any, str], Any]): Fetches and parses a page
+          given a worker's session and the page link.
+        - links (list[str]): The page links.
+        - sessions (list | None): Existing sessions to reuse for the first
+          workers. They are left open. Default is None.
+
+        Returns:
+        - list: The result of each link, or None if fetching it failed.
+
+        Example:
+            pool = BrowserPool(4, HostLimiter(limits), open_driver, quit)
+            details = pool.map(get_job_page, job_links, [driver])
+        """
+        return list(self.imap(fetch_page, links, sessions))
+
+    def imap(self, fetch_page, links: list, sessions: list = None):
+        """
+        Fetches every link with `fetch_page`, yielding the results in the
+        order of the links as soon as they are ready.
+
+        Args:
+        - fetch_page (Callable[[Any, str], Any]): See `map`.
+        - links (list[str]): The page links.
+        - sessions (list | None): See `map`.
+
+        Yields:
+        - Any: The result of each link, or None if fetching it failed.
+
+        Closing the generator early stops the workers after the pages they
+        are fetching, and waits for them, so their sessions are no longer
+        in use once it returns.
+        """
+        results = {}
+        ready = threading.Condition()
+        stopped = threading.Event()
+        queue = Queue()
+        for index, link in enumerate(links):
+            queue.put((index, link))
+
+        def store(index: int, result):
+            with ready:
+                results[index] = result
+                ready.notify_all()
+
+        sessions = list(sessions or [])
+        workers = [
+            threading.Thread(
+                target=self.work,
+                args=(
+                    fetch_page,
+                    queue,
+                    stopped,
+                    store,
+                    sessions[n] if n < len(sessions) else None,
+                    n >= len(sessions)
+                ),
+                daemon=True
+            )
+            for n in range(min(self.num_workers, len(links)))
+        ]
+        for worker in workers:
+            worker.start()
+
+        def finished(index: int) -> bool:
+            # links left over by workers which exited are never fetched
+            return index in results or \
+                not any(worker.is_alive() for worker in workers)
+
+        try:
+            for index in range(len(links)):
+                with ready:
+                    while not finished(index):
+                        # wake up regularly in case every worker has exited
+                        ready.wait(timeout=1)
+                    result = results.pop(index, None)
+                yield result
+        finally:
+            stopped.set()
+            for worker in workers:
+                worker.join()
+
+    def work(self, fetch_page, queue: Queue, stopped: threading.Event,
+             store, session, owns_session: bool):
+        """
+        Runs one worker until the queue of links is empty.
+
+        Args:
+        - fetch_page (Callable[[Any, str], Any]): See `map`.
+        - queue (Queue): The shared queue of (index, link) pairs.
+        - stopped (threading.Event): Set once the results are no longer
+          wanted, after which no more links are fetched.
+        - store (Callable[[int, Any], None]): Stores the result of a link
+          by its index.
+        - session: The worker's session, if it was given one.
+        - owns_session (bool): Whether the worker opens and closes its
+          own session.
+        """
+        try:
+            if owns_session:
+                session = self.open_worker_session()
+        except Exception as e:
+            # leave the links to the other workers
+            logger.error(f"Error opening worker session: {e}")
+            return
+
+        try:
+            while not stopped.is_set():
+                try:
+                    index, link = queue.get_nowait()
+                except Empty:
+                    break
+                result = None
+                try:
+                    with self.limiter.slot(link):
+                        result = fetch_page(session, link)
+                except Exception as e:
+                    logger.error(f"Error scraping Page {index + 1}: {e}")
+                store(index, result)
+        finally:
+            if owns_session:
+                self.close_worker_session(session)
+
+    def open_worker_session(self):
+        """
+        Opens the session of a worker which was not given one.
+
+        Returns:
+        - Any: The new session, a `LazySession` if sessions are lazy, or
+          None if the pool has no `open_session`.
+        """
+        if self.open_session is None:
+            return None
+        if self.lazy:
+            return LazySession(self.open_session)
+        return self.open_session()
+
+    def close_worker_session(self, session):
+        """
+        Closes a session opened by `open_worker_session`, logging any error.
+
+        Args:
+        - session: The session to close.
+        """
+        if isinstance(session, LazySession):
+            session = session.session
+        if session is None or self.close_session is None:
+            return
+        try:
+            self.close_session(session)
+        except Exception as e:
+            logger.error(f"Error closing worker session: {e}")
@@ -0,0 +1,188 @@
+"""
+This module contains the parser which extracts job cards from the HTML of a
+search results container in a single pass.
+
+Instead of querying every field of every card through the webdriver, the
+scraper reads the container's `outerHTML` once per page and parses all of
+its cards in-process with precompiled CSS selectors. Each site describes its
+cards with a selector of the card elements and a set of card fields, each
+with alternative selectors tried in order (none for the card element
+itself), the attribute to read (or None for the element's text) and
+optionally a default for a missing value.
+
+A card whose fields cannot all be found is returned as None, so the caller
+can fall back to reading that card through the webdriver.
+"""
+
+import soupsieve
+from bs4 import BeautifulSoup as bs
+
+# Indeed card fields, relative to each `li` of the job cards container
+INDEED_CARD_TABLE = (
+    ":scope > div.cardOutline > div:nth-of-type(1) > div > "
+    "div:nth-of-type(1) > div > table:nth-of-type(1) tr > td"
+)
+INDEED_CARD_FIELDS = {
+    "job_link": (
+        [INDEED_CARD_TABLE + " > div:nth-of-type(1) > h2 > a"], "href"
+    ),
+    "job_id": (
+        [INDEED_CARD_TABLE + " > div:nth-of-type(1) > h2 > a > span"], "id"
+    ),
+    "job_title": ([INDEED_CARD_TABLE + " > div:nth-of-type(1) > h2"], None),
+    "company_name": (
+        [INDEED_CARD_TABLE + " > div:nth-of-type(2) > div > span"], None
+    ),
+    "location": ([INDEED_CARD_TABLE + " > div:nth-of-type(2) > div"], None),
+    "date": (
+        [
+            ":scope > div.cardOutline > div:nth-of-type(1) > div > "
+            "div:nth-of-type(1) > div > table:nth-of-type(2) "
+            "tr:nth-of-type(2) > td > div:nth-of-type(1) > "
+            "span:nth-of-type(1)"
+        ],
+        None
+    ),
+}
+
+# LinkedIn card fields, relative to each `li` of the results list
+LINKEDIN_CARD_FIELDS = {
+    "job_link": (["a"], "href"),
+    # cards without a data-id get "None", as when read with the webdriver
+    "job_id": ([], "data-id", "None"),
+    "job_title": (["h3"], None),
+    "company_name": (["h4"], None),
+    "location": (['[class="job-search-card__location"]'], None),
+    "date": (["div > div > time"], "datetime"),
+}
+
+# Jobberman card fields, relative to each `.mx-5` card, for the two
+# alternating card structures
+JOBBERMAN_CARD_INFO = [
+    ":scope > div:nth-of-type(1) > div:nth-of-type(2) > div",
+    ":scope > div:nth-of-type(1) > div > div",
+]
+JOBBERMAN_CARD_FIELDS = {
+    "job_link": (
+        [info + " > div:nth-of-type(1) > a" for info in JOBBERMAN_CARD_INFO],
+        "href"
+    ),
+    "job_title": (
+        [
+            info + " > div:nth-of-type(1) > a > p"
+            for info in JOBBERMAN_CARD_INFO
+        ],
+        None
+    ),
+    "company_name": (
+        [info + " > p:nth-of-type(1)" for info in JOBBERMAN_CARD_INFO],
+        None
+    ),
+    "location": (
+        [
+            info + " > div:nth-of-type(2) > span:nth-of-type(1)"
+            for info in JOBBERMAN_CARD_INFO
+        ],
+        None
+    ),
+    "date": ([":scope > div:nth-of-type(2) > p", ":scope > div > p"], None),
+}
+
+
+class CardParser:
+    """
+    Parses the job cards of a search results container with precompiled
+    selectors.
+
+    Attributes:
+    - card_selector (soupsieve.SoupSieve): Selects the card elements in
+      the container.
+    - fields (dict): The compiled alternative selectors, the attribute and
+      the default of each card field.
+    """
+    def __init__(self, card_selector: str, fields: dict):
+        """
+        Initializes a CardParser, compiling its selectors once.
+
+        Args:
+        - card_selector (str): The CSS selector of the card elements in the
+          container, matching the elements the webdriver lists.
+        - fields (dict): The alternative CSS selectors, the attribute (None
+          for the text) and optionally the default of each card field.
+
+        Example:
+            parser = CardParser("li", INDEED_CARD_FIELDS)
+            cards = parser.parse(container.get_attribute("outerHTML"))
+        """
+        self.card_selector = soupsieve.compile(card_selector)
+        self.fields = {
+            field: (
+                [soupsieve.compile(selector) for selector in spec[0]],
+                spec[1],
+                spec[2] if len(spec) > 2 else None
+            )
+            for field, spec in fields.items()
+        }
+
+    def parse(self, html: str) -> list[dict | None]:
+        """
+        Parses every card of a search results container.
+
+        Args:
+        - html (str): The `outerHTML` of the container.
+
+        Returns:
+        - list[dict | None]: The fields of each card, in document order,
+          or None for a card with a missing field.
+        """
+        container = bs(html, "html.parser")
+        return [
+            self.parse_card(card)
+            for card in self.card_selector.select(container)
+        ]
+
+    def parse_card(self, card) -> dict | None:
+        """
+        Parses the fields of one card.
+
+        Args:
+        - card (bs4.Tag): The card element.
+
+        Returns:
+        - dict | None: The card's fields, or None if a field is missing.
+        """
+        parsed = {}
+        for field, (selectors, attribute, default) in self.fields.items():
+            value = self.read_field(card, selectors, attribute)
+            if value is None:
+                value = default
+            if value is None:
+                return None
+            parsed[field] = value
+        return parsed
+
+    @staticmethod
+    def read_field(card, selectors: list, attribute: str | None):
+        """
+        Reads a field from the first element matched by its selectors.
+
+        Args:
+        - card (bs4.Tag): The card element.
+        - selectors (list[soupsieve.SoupSieve]): The alternative selectors,
+          or an empty list for the card element itself.
+        - attribute (str | None): The attribute to read, or None for the
+          element's text.
+
+        Returns:
+        - str | None: The field, or None if no element matches.
+        """
+        element = card if len(selectors) == 0 else None
+        for selector in selectors:
+            element = selector.select_one(card)
+            if element is not None:
+                break
+        if element is None:
+            return None
+        if attribute is None:
+            return element.get_text("\n", strip=True)
+        return element.get(attribute)
@@ -0,0 +1,153 @@
+"""
+This module contains the checkpoint of a site's scrape run.
+
+The checkpoint records how many search result pages of each search were
+visited, the job
+cards collected from them and the job links whose jobs were written to the
+database. It is saved to disk after every page and every write, so a scrape
+which dies halfway is resumed by the next run, whether it is a retry or the
+next day's run, instead of starting over from the first page. The
+checkpoint is cleared once a run completes. A checkpoint without a path is
+only kept in memory.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+
+
+class ScrapeCheckpoint:
+    """
+    The progress of a site's scrape run, persisted as a JSON file.
+
+    Attributes:
+    - path (str | None): The file path of the checkpoint, or None if it is
+      only kept in memory.
+    - started_at (datetime): When the checkpointed run started.
+    - pages_visited (dict[str, int]): The number of search result pages
+      visited, by search URL.
+    - cards (list[dict]): The job cards collected so far.
+    - written (set[str]): The job links whose jobs were written.
+    - resumed (bool): Whether the checkpoint was loaded from disk.
+    """
+    def __init__(self, path: str, max_age_hours: float):
+        """
+        Initializes a ScrapeCheckpoint, resuming the saved one if it exists
+        and is recent enough.
+
+        Args:
+        - path (str | None): The file path of the checkpoint, or None to
+          keep it in memory only.
+        - max_age_hours (float): The age after which a saved checkpoint is
+          discarded and the run starts over.
+
+        Example:
+            checkpoint = ScrapeCheckpoint("./models/checkpoints/indeed.json",
+                                          max_age_hours=48)
+            for page in range(checkpoint.pages_visited.get(url, 0),
+                              num_pages):
+                ...
+        """
+        self.path = path
+        self.started_at = datetime.now()
+        self.pages_visited: dict[str, int] = {}
+        self.cards: list[dict] = []
+        self.written: set[str] = set()
+        self.resumed = False
+
+        state = self.read()
+        if state is not None and datetime.now() - state["started_at"] <\
+                timedelta(hours=max_age_hours):
+            self.started_at = state["started_at"]
+            self.pages_visited = state["pages_visited"]
+            self.cards = state["cards"]
+            self.written = set(state["written"])
+            self.resumed = True
+
+    def read(self) -> dict | None:
+        """
+        Reads the saved checkpoint.
+
+        Returns:
+        - dict | None: The saved state, or None if there is no readable
+          checkpoint.
+        """
+        if self.path is None:
+            return None
+        try:
+            with open(self.path, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        state["started_at"] = datetime.fromisoformat(state["started_at"])
+        return state
+
+    def save(self):
+        """
+        Saves the checkpoint, replacing the saved one atomically.
+        """
+        if self.path is None:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(f"{self.path}.tmp", "w") as f:
+            json.dump(
+                {
+                    "started_at": self.started_at.isoformat(),
+                    "pages_visited": self.pages_visited,
+                    "cards": self.cards,
+                    "written": sorted(self.written)
+                },
+                f,
+                default=str
+            )
+        os.replace(f"{self.path}.tmp", self.path)
+
+    def add_page(self, cards: list[dict], url: str, pages: int = 1):
+        """
+        Records the visit of search result pages and the cards collected
+        from them.
+
+        Args:
+        - cards (list[dict]): The new job cards.
+        - url (str): The search URL of the pages.
+        - pages (int): The number of pages visited. Default is 1.
+        """
+        self.pages_visited[url] = self.pages_visited.get(url, 0) + pages
+        self.cards.extend(cards)
+        self.save()
+
+    def mark_written(self, jobs: list):
+        """
+        Records jobs which were written to the database.
+
+        Args:
+        - jobs (list[Job]): The written jobs.
+        """
+        self.written.update(job.job_link for job in jobs)
+        self.save()
+
+    def known_uuids(self) -> set[str]:
+        """
+        Returns the UUIDs of the cards collected so far.
+        """
+        return {str(card["uuid"]) for card in self.cards}
+
+    def pending_cards(self) -> list[dict]:
+        """
+        Returns the collected cards whose jobs were not written yet.
+        """
+        return [
+            card for card in self.cards
+            if card["job_link"] not in self.written
+        ]
+
+    def clear(self):
+        """
+        Deletes the saved checkpoint once a run is complete.
+        """
+        if self.path is None:
+            return
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,133 @@
+"""
+This module contains a pooled HTTP client for fetching job pages without a
+browser.
+
+Connections are kept alive and reused across requests to the same host, and
+responses which are login, sign-up or bot check pages are reported as
+`AuthWallError` so the caller can fall back to a browser session. Pages
+fetched before can be re-fetched with a conditional request, which the
+server answers without the page if it has not changed.
+"""
+
+import urllib3
+from etl.extract.page_parsers import AuthWallError, is_auth_wall
+
+
+class HttpFetcher:
+    """
+    Fetches pages over keep-alive HTTP connections.
+
+    Attributes:
+    - http (urllib3.PoolManager): The connection pools, one per host. It is
+      safe to share between threads.
+    """
+    def __init__(self, config: dict, max_connections: int = 4):
+        """
+        Initializes an HttpFetcher instance.
+
+        Args:
+        - config (dict): The `http` section of the config file, with the
+          `timeout` in seconds, the number of `retries` and the
+          `user_agent`.
+        - max_connections (int): The number of connections kept alive per
+          host. Default is 4.
+
+        Example:
+            fetcher = HttpFetcher(config["http"], max_connections=4)
+            html = fetcher.get("https://www.jobberman.com/listings/...")
+        """
+        self.http = urllib3.PoolManager(
+            maxsize=max_connections,
+            block=True,
+            headers={"User-Agent": config["user_agent"]},
+            timeout=urllib3.Timeout(total=config["timeout"]),
+            retries=urllib3.Retry(
+                total=None,
+                connect=config["retries"],
+                read=config["retries"],
+                status=config["retries"],
+                redirect=5,
+                backoff_factor=0.5,
+                status_forcelist=[500, 502, 503, 504],
+                raise_on_status=False
+            )
+        )
+
+    def get(self, url: str) -> str:
+        """
+        Fetches a page, following redirects.
+
+        Args:
+        - url (str): The URL of the page.
+
+        Returns:
+        - str: The HTML of the page.
+
+        Raises:
+        - AuthWallError: If the response is an auth wall.
+        - urllib3.exceptions.HTTPError: If the page could not be fetched
+          or the response is an HTTP error.
+        """
+        return self.request(url)[0]
+
+    def get_conditional(self, url: str, etag: str = None,
+                        last_modified: str = None) -> tuple[str | None, dict]:
+        """
+        Fetches a page unless it is unchanged since an earlier fetch, with
+        an HTTP conditional request.
+
+        Args:
+        - url (str): The URL of the page.
+        - etag (str | None): The `ETag` header of the earlier response.
+          Default is None.
+        - last_modified (str | None): The `Last-Modified` header of the
+          earlier response. Default is None.
+
+        Returns:
+        - tuple[str | None, dict]: The HTML of the page, or None if the
+          server answered that it is unchanged, and the `etag` and
+          `last_modified` validators to send with the next request.
+
+        Raises:
+        - AuthWallError: If the response is an auth wall.
+        - urllib3.exceptions.HTTPError: If the page could not be fetched
+          or the response is an HTTP error.
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        html, response = self.request(url, headers)
+        if response.status == 304:
+            return None, {"etag": etag, "last_modified": last_modified}
+        return html, {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified")
+        }
+
+    def request(self, url: str, headers: dict = None) -> tuple[str, object]:
+        """
+        Sends a GET request, following redirects, and checks its response.
+
+        Args:
+        - url (str): The URL of the page.
+        - headers (dict | None): Headers added to the request. Default is
+          None.
+
+        Returns:
+        - tuple[str, urllib3.BaseHTTPResponse]: The HTML of the page and
+          the response.
+        """
+        response = self.http.request("GET", url, headers={
+            **self.http.headers, **(headers or {})
+        })
+        html = response.data.decode("utf-8", errors="replace")
+        final_url = response.geturl() or url
+        if is_auth_wall(final_url, response.status, html):
+            raise AuthWallError(f"Auth wall at {final_url}")
+        if response.status >= 400:
+            raise urllib3.exceptions.HTTPError(
+                f"HTTP {response.status} fetching {url}"
+            )
+        return html, response
@@ -0,0 +1,96 @@
+"""
+This module contains the lean browsing mode of the scrapers' Firefox
+webdrivers.
+
+Scrapers only read the HTML of search results and job pages, so a lean
+browser skips everything else a page loads:
+- images, media and web fonts are blocked,
+- requests to the hosts of a third-party blocklist (ads, trackers and
+  analytics) are sent to an unreachable proxy by a proxy auto-config script,
+  so they fail at once,
+- browser features which make background requests (telemetry, safe
+  browsing, prefetching, notifications, WebRTC) are disabled,
+- pages are considered loaded once their DOM is ready (the `eager` page
+  load strategy), without waiting for the remaining subresources.
+
+Scrapers opt in with their `lean_browser` class attribute.
+"""
+
+import json
+from urllib.parse import quote
+from selenium.webdriver.firefox.options import Options
+
+# Firefox preferences of the lean mode
+LEAN_PREFERENCES = {
+    # block images, autoplaying media and web fonts
+    "permissions.default.image": 2,
+    "media.autoplay.default": 5,
+    "media.autoplay.blocking_policy": 2,
+    "gfx.downloadable_fonts.enabled": False,
+    "browser.display.use_document_fonts": 0,
+    # no prefetching of links and DNS
+    "network.prefetch-next": False,
+    "network.dns.disablePrefetch": True,
+    "network.predictor.enabled": False,
+    # no background requests
+    "browser.safebrowsing.malware.enabled": False,
+    "browser.safebrowsing.phishing.enabled": False,
+    "datareporting.healthreport.uploadEnabled": False,
+    "toolkit.telemetry.enabled": False,
+    "app.update.auto": False,
+    "dom.webnotifications.enabled": False,
+    "dom.push.enabled": False,
+    "geo.enabled": False,
+    "media.peerconnection.enabled": False,
+}
+
+# unreachable proxy which blocked requests are sent to
+BLOCKING_PROXY = "PROXY 127.0.0.1:9"
+
+
+def blocklist_pac(blocklist: list[str]) -> str:
+    """
+    Creates a proxy auto-config script which blocks requests to the hosts
+    of a blocklist and their subdomains.
+
+    Args:
+    - blocklist (list[str]): The blocked domains.
+
+    Returns:
+    - str: The script, as a `data:` URL.
+    """
+    script = (
+        "function FindProxyForURL(url, host) {"
+        f" var blocked = {json.dumps(blocklist)};"
+        " for (var i = 0; i < blocked.length; i++) {"
+        " if (host == blocked[i] || dnsDomainIs(host, '.' + blocked[i]))"
+        f" return '{BLOCKING_PROXY}'; }}"
+        " return 'DIRECT'; }"
+    )
+    return "data:application/x-javascript-config," + quote(script)
+
+
+def apply_lean_mode(options: Options, blocklist: list[str]) -> Options:
+    """
+    Applies the lean mode to the options of a Firefox webdriver.
+
+    Args:
+    - options (Options): The webdriver options.
+    - blocklist (list[str]): The blocked third-party domains.
+
+    Returns:
+    - Options: The same options, for chaining.
+
+    Example:
+        options = apply_lean_mode(Options(), config["lean_browser"])
+        wd = webdriver.Firefox(options=options)
+    """
+    for name, value in LEAN_PREFERENCES.items():
+        options.set_preference(name, value)
+    if len(blocklist) > 0:
+        options.set_preference("network.proxy.type", 2)
+        options.set_preference(
+            "network.proxy.autoconfig_url", blocklist_pac(blocklist)
+        )
+    options.page_load_strategy = "eager"
+    return options
@@ -0,0 +1,228 @@
+"""
+This module runs the site scrapers concurrently, each in its own process.
+
+Every site is scraped with `scrape_with_retry` in a separate process, so its
+jobs are written to Cassandra as soon as that site finishes, regardless of
+the other sites. Each process runs in its own process group with resource
+limits, and a site which runs past its timeout is killed together with its
+browsers, so one slow or auth-walled site cannot delay the others.
+
+The timeouts and resource limits are set in the `scraping` section of the
+config file.
+"""
+
+import os
+import resource
+import signal
+import time
+import multiprocessing
+from multiprocessing.connection import wait
+import yaml
+from etl.extract.site_scraper import (
+    IndeedScraper, LinkedinScraper, JobbermanScraper, scrape_with_retry
+)
+from src.utils.pipeline_log_config import pipeline as logger
+
+# site scrapers run by the scraping pipeline
+SITE_SCRAPERS = {
+    "indeed": IndeedScraper,
+    "jobberman": JobbermanScraper,
+    "linkedin": LinkedinScraper,
+}
+
+# resource limits applied to each site process, with the unit of each
+RESOURCE_LIMITS = {
+    "cpu_seconds": (resource.RLIMIT_CPU, 1),
+    "memory_mb": (resource.RLIMIT_AS, 1024 * 1024),
+    "open_files": (resource.RLIMIT_NOFILE, 1),
+}
+
+
+def load_settings() -> dict:
+    """
+    Loads the `scraping` section of the config file.
+
+    Returns:
+    - dict: The per-site timeouts and process resource limits.
+    """
+    with open("./config/config.yaml", "r") as stream:
+        return yaml.safe_load(stream)["scraping"]
+
+
+def set_resource_limits(limits: dict):
+    """
+    Sets soft resource limits on the current process and the processes it
+    starts.
+
+    Args:
+    - limits (dict): Values for the keys of `RESOURCE_LIMITS`. Missing or
+      null values are left unlimited.
+    """
+    for name, (limit, unit) in RESOURCE_LIMITS.items():
+        if limits.get(name) is None:
+            continue
+        _, hard = resource.getrlimit(limit)
+        soft = limits[name] * unit
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+        resource.setrlimit(limit, (soft, hard))
+
+
+def run_site(scrape, SiteScraper, limits: dict, conn):
+    """
+    Scrapes one site in a child process and sends back the outcome.
+
+    Args:
+    - scrape (Callable): Scrapes the site given the scraper class, and
+      returns the number of new jobs.
+    - SiteScraper: The scraper class of the site.
+    - limits (dict): The resource limits of the process.
+    - conn (Connection): The pipe to send the outcome to the parent.
+    """
+    # own process group, so the site can be killed along with its browsers
+    os.setpgrp()
+    set_resource_limits(limits)
+    try:
+        conn.send({"status": "ok", "jobs": scrape(SiteScraper)})
+    except Exception as e:
+        conn.send({"status": "failed", "error": str(e)})
+    finally:
+        conn.close()
+
+
+def start_site(context, site: str, SiteScraper, scrape,
+               settings: dict) -> dict:
+    """
+    Starts the process scraping one site.
+
+    Args:
+    - context (BaseContext): The multiprocessing context.
+    - site (str): The name of the site.
+    - SiteScraper: The scraper class of the site.
+    - scrape (Callable): See `run_site`.
+    - settings (dict): The `timeouts` and `limits` settings.
+
+    Returns:
+    - dict: The state of the running site.
+    """
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(
+        target=run_site,
+        args=(scrape, SiteScraper, settings["limits"], sender),
+        name=f"scrape-{site}"
+    )
+    process.start()
+    # the child owns the sending end now
+    sender.close()
+
+    start = time.monotonic()
+    timeout = settings["timeouts"].get(site, settings["timeouts"]["default"])
+    logger.info(f"Started scraping {site} (timeout {timeout}s)")
+    return {
+        "site": site,
+        "process": process,
+        "receiver": receiver,
+        "start": start,
+        "deadline": start + timeout
+    }
+
+
+def finish_site(state: dict, timed_out: bool = False) -> dict:
+    """
+    Collects the outcome of a site's process, killing it if it timed out.
+
+    Args:
+    - state (dict): The state of the site returned by `start_site`.
+    - timed_out (bool): Whether the site ran past its timeout.
+
+    Returns:
+    - dict: The site's summary with its `status` (ok, failed, timeout or
+      crashed), number of new `jobs`, `duration` in seconds and `error`.
+    """
+    process = state["process"]
+    if timed_out:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            # the process has not moved to its own group yet
+            pass
+        process.kill()
+    process.join()
+
+    outcome = {"status": "timeout", "error": "Timed out"}
+    if not timed_out:
+        outcome = {
+            "status": "crashed",
+            "error": f"Exited with code {process.exitcode}"
+        }
+        try:
+            if state["receiver"].poll():
+                outcome = state["receiver"].recv()
+        except EOFError:
+            # the process exited without sending its outcome
+            pass
+    state["receiver"].close()
+
+    summary = {
+        "site": state["site"],
+        "status": outcome["status"],
+        "jobs": outcome.get("jobs", 0),
+        "duration": round(time.monotonic() - state["start"], 1),
+        "error": outcome.get("error")
+    }
+    logger.info(
+        f"Finished scraping {summary['site']}: {summary['status']}, "
+        f"{summary['jobs']} new jobs in {summary['duration']}s"
+    )
+    return summary
+
+
+def scrape_sites(sites: dict = None, scrape=scrape_with_retry,
+                 settings: dict = None) -> list[dict]:
+    """
+    Scrapes several sites concurrently, one process per site.
+
+    Args:
+    - sites (dict | None): Scraper classes by site name. Default is None
+      (all sites in `SITE_SCRAPERS`).
+    - scrape (Callable): Scrapes a site given its scraper class and returns
+      the number of new jobs. Default is `scrape_with_retry`.
+    - settings (dict | None): The `timeouts` and `limits` settings.
+      Default is None (read from the config file).
+
+    Returns:
+    - list[dict]: The summary of each site, in the order the sites
+      finished.
+
+    Example:
+        summary = scrape_sites()
+        Scrapes Indeed, Jobberman and LinkedIn at the same time and returns
+        the status, number of new jobs and duration of each site.
+    """
+    sites = sites or SITE_SCRAPERS
+    settings = settings or load_settings()
+    # spawn, so children do not inherit database sessions or threads
+    context = multiprocessing.get_context("spawn")
+
+    running = {}
+    for site, SiteScraper in sites.items():
+        state = start_site(context, site, SiteScraper, scrape, settings)
+        running[state["process"].sentinel] = state
+
+    summary = []
+    while running:
+        next_deadline = min(state["deadline"] for state in running.values())
+        finished = wait(
+            list(running),
+            timeout=max(next_deadline - time.monotonic(), 0)
+        )
+        for sentinel in finished:
+            summary.append(finish_site(running.pop(sentinel)))
+
+        # kill the sites which ran past their timeout
+        now = time.monotonic()
+        for sentinel in [s for s, state in running.items()
+                         if state["deadline"] <= now]:
+            summary.append(finish_site(running.pop(sentinel), True))
+
+    return summary
@@ -0,0 +1,237 @@
+"""
+This module contains parsers which extract job details from the static HTML
+of job pages, so pages can be scraped without loading them in a browser.
+
+Each parser takes the HTML of a job page and returns the job details keyed
+by the scraper's detail fields. A parser raises `PageParseError` when the
+page does not have the expected structure, so the caller can fall back to
+loading the page in a browser.
+
+Parsers are also re-applied to the job pages kept in the page store (see
+`etl.extract.page_store`), so each parser has a version in `PAGE_PARSERS`,
+to be bumped whenever a fix changes the details it extracts.
+"""
+
+from bs4 import BeautifulSoup as bs
+
+
+class PageParseError(ValueError):
+    """
+    Raised when job details cannot be parsed from a page's static HTML.
+    """
+
+
+class AuthWallError(Exception):
+    """
+    Raised when a site answers with a login, sign-up or bot check page
+    instead of the job page.
+    """
+
+
+# HTTP status codes used for blocked requests (999 is LinkedIn's)
+AUTH_WALL_STATUSES = {401, 403, 429, 999}
+
+# URL paths of login and sign-up pages
+AUTH_WALL_PATHS = ["authwall", "/login", "/signup", "/checkpoint"]
+
+# titles of login walls and bot check pages, lowercased
+AUTH_WALL_TITLES = {
+    "just a moment...",
+    "attention required! | cloudflare",
+    "hcaptcha solve page",
+    "security check - indeed.com",
+    "sign up | linkedin",
+    "linkedin login, sign in | linkedin",
+    "security verification | linkedin",
+}
+
+# elements which only bot check pages have, as opposed to the scripts and
+# widgets of bot checks which normal pages may also embed
+AUTH_WALL_SELECTORS = [
+    "form#challenge-form",
+    "#challenge-stage",
+    "#cf-challenge-running",
+    "form#captcha-form",
+]
+
+# Jobberman job page selectors, shared with the browser scraper
+JOBBERMAN_ARTICLE = (
+    r"#tab1 > div.flex.flex-col.rounded-lg.border-gray-300.md\:border."
+    r"hover\:border-gray-400.md\:mx-0 > article"
+)
+JOBBERMAN_DETAILS = (
+    JOBBERMAN_ARTICLE +
+    r" > div.flex.flex-wrap.justify-start.pt-5.pb-2.px-4.w-full.border-b."
+    r"border-gray-300.md\:flex-nowrap.md\:px-5 > div.w-full.text-gray-500"
+)
+JOBBERMAN_SELECTORS = {
+    "job_summary": JOBBERMAN_ARTICLE + " > div:nth-child(4)",
+    "job_req": JOBBERMAN_ARTICLE + " > div:nth-child(5)",
+    "seniority": (
+        JOBBERMAN_ARTICLE +
+        " > div:nth-child(4) > ul > li:nth-child(2) > span.pb-1.text-gray-500"
+    ),
+    "emp_type": JOBBERMAN_DETAILS + " > div.mt-3 > span > a",
+    "job_func": JOBBERMAN_DETAILS + " > h2:nth-child(3) > a",
+    "ind": JOBBERMAN_DETAILS + " > div:nth-child(5) > a",
+}
+
+
+# Indeed job page selectors, tried in order for the employment type
+INDEED_EMP_TYPE_SELECTORS = [
+    ".css-1p3gyjy > div:nth-child(1) > div:nth-child(1)",
+    "div.css-1p3gyjy:nth-child(1) > div:nth-child(1) > div:nth-child(1)",
+    ".css-tvvxwd"
+]
+
+
+def is_auth_wall(url: str, status: int, html: str) -> bool:
+    """
+    Checks whether a response is an auth wall rather than a job page.
+
+    Pages are matched on their final URL, title and challenge elements
+    rather than on substrings of their HTML, since job pages also load bot
+    check scripts (e.g. Cloudflare's `/cdn-cgi/challenge-platform/`).
+
+    Args:
+    - url (str): The final URL of the response, after redirects.
+    - status (int): The HTTP status code of the response.
+    - html (str): The body of the response.
+
+    Returns:
+    - bool: True if the response is a login, sign-up or bot check page.
+    """
+    if status in AUTH_WALL_STATUSES:
+        return True
+    if any(path in url.lower() for path in AUTH_WALL_PATHS):
+        return True
+    soup = bs(html, "html.parser")
+    if soup.title and soup.title.get_text(strip=True).lower() in \
+            AUTH_WALL_TITLES:
+        return True
+    return any(soup.select_one(selector) for selector in AUTH_WALL_SELECTORS)
+
+
+def select_text(page, selector: str) -> str | None:
+    """
+    Returns the text of the first element matching a CSS selector.
+
+    Args:
+    - page (BeautifulSoup): The parsed page.
+    - selector (str): The CSS selector.
+
+    Returns:
+    - str | None: The element's text, or None if no element matches.
+    """
+    element = page.select_one(selector)
+    if element is None:
+        return None
+    return element.get_text("\n", strip=True)
+
+
+def parse_indeed_page(html: str) -> dict:
+    """
+    Parses an Indeed job page, as loaded in a browser.
+
+    Args:
+    - html (str): The HTML of the job page.
+
+    Returns:
+    - dict: The job description, employment type (`NA` if missing), and
+      placeholders for the details Indeed does not show.
+
+    Raises:
+    - PageParseError: If the job description is missing.
+    """
+    page = bs(html, "html.parser")
+    job_description = select_text(page, ".jobsearch-jobDescriptionText")
+    if job_description is None:
+        raise PageParseError("Indeed job description missing")
+
+    employment_type = "NA"
+    for selector in INDEED_EMP_TYPE_SELECTORS:
+        text = select_text(page, selector)
+        if text is not None:
+            employment_type = text
+            break
+
+    return {
+        "job_desc": job_description,
+        "seniority": "Unavailable on Indeed",
+        "emp_type": employment_type,
+        "job_func": "Unavailable on Indeed",
+        "ind": "Unavailable on Indeed"
+    }
+
+
+def parse_linkedin_page(html: str) -> dict:
+    """
+    Parses a LinkedIn guest job page.
+
+    Args:
+    - html (str): The HTML of the job page.
+
+    Returns:
+    - dict: The job description, seniority level, employment type,
+      job function and job industry.
+
+    Raises:
+    - PageParseError: If the description or job criteria are missing.
+    """
+    page = bs(html, "html.parser")
+    job_description = select_text(page, "div.show-more-less-html__markup")
+    job_criteria = [
+        criterion.get_text(strip=True)
+        for criterion in page.select(
+            "span.description__job-criteria-text--criteria"
+        )
+    ]
+    if job_description is None or len(job_criteria) < 4:
+        raise PageParseError("LinkedIn job description or criteria missing")
+
+    return {
+        "job_desc": job_description,
+        "seniority": job_criteria[0],
+        "emp_type": job_criteria[1],
+        "job_func": job_criteria[2],
+        "ind": job_criteria[3]
+    }
+
+
+def parse_jobberman_page(html: str) -> dict:
+    """
+    Parses a Jobberman job page.
+
+    Args:
+    - html (str): The HTML of the job page.
+
+    Returns:
+    - dict: The job description, seniority level, employment type,
+      job function and job industry, with `NA` for missing details.
+
+    Raises:
+    - PageParseError: If the job description is missing.
+    """
+    page = bs(html, "html.parser")
+    details = {
+        field: select_text(page, selector)
+        for field, selector in JOBBERMAN_SELECTORS.items()
+    }
+    if details["job_summary"] is None or details["job_req"] is None:
+        raise PageParseError("Jobberman job description missing")
+
+    return {
+        "job_desc": details["job_summary"] + "\n\n" + details["job_req"],
+        "seniority": details["seniority"] or "NA",
+        "emp_type": details["emp_type"] or "NA",
+        "job_func": details["job_func"] or "NA",
+        "ind": details["ind"] or "NA"
+    }
+
+
+# parser of the stored job pages of each site, with its version
+PAGE_PARSERS = {
+    "indeed": (1, parse_indeed_page),
+    "linkedin": (1, parse_linkedin_page),
+    "jobberman": (1, parse_jobberman_page),
+}
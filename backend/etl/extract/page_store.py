@@ -0,0 +1,272 @@
+"""
+This module keeps the raw HTML of scraped job pages, so the job details can
+be extracted again from the stored pages after a parser fix, without
+visiting the sites again.
+
+Pages are kept compressed in a SQLite database, keyed by job UUID, with zstd
+when the `zstandard` package is installed and zlib otherwise. The codec of
+each page is stored with it, so a store written with one codec can be read
+after switching to the other. The store keeps a running total of the
+compressed bytes, and once it exceeds the store's size limit, the pages
+stored longest ago are evicted, as their jobs are the first to be scrubbed
+from the database.
+
+Each page also records the version of the parser which extracted its
+details and a hash of those details, see `PAGE_PARSERS` in
+`etl.extract.page_parsers`. `PageStore.reextract` re-parses the pages
+extracted by an older parser version and yields the jobs whose details
+changed, to be rewritten and re-embedded.
+
+The store is set in the `page_store` section of the `scraping` section of
+the config file.
+"""
+
+import hashlib
+import json
+import time
+import zlib
+from typing import Iterator
+from etl.utils.sqlite_conn import connect
+from src.utils.pipeline_log_config import pipeline as logger
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def compress(html: str, level: int) -> tuple[str, bytes]:
+    """
+    Compresses a page with zstd, or zlib if zstd is not available.
+
+    Args:
+    - html (str): The HTML of the page.
+    - level (int): The zstd compression level, capped at 9 for zlib.
+
+    Returns:
+    - tuple[str, bytes]: The codec name and the compressed page.
+    """
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=level).compress(
+            html.encode()
+        )
+    return "zlib", zlib.compress(html.encode(), min(level, 9))
+
+
+def decompress(codec: str, data: bytes) -> str:
+    """
+    Decompresses a page.
+
+    Args:
+    - codec (str): The codec name, `zstd` or `zlib`.
+    - data (bytes): The compressed page.
+
+    Returns:
+    - str: The HTML of the page.
+    """
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is needed to read zstd pages")
+        return zstandard.ZstdDecompressor().decompress(data).decode()
+    return zlib.decompress(data).decode()
+
+
+def details_hash(details: dict) -> str:
+    """
+    Returns the hash of a job's page details.
+
+    Args:
+    - details (dict): The job page details.
+
+    Returns:
+    - str: The hex digest of the details.
+    """
+    return hashlib.sha1(
+        json.dumps(details, sort_keys=True).encode()
+    ).hexdigest()
+
+
+class PageStore:
+    """
+    Compressed job pages, keyed by job UUID, in a size-bounded SQLite
+    database.
+
+    Attributes:
+    - path (str): The file path of the SQLite database.
+    - max_bytes (int): The compressed bytes kept before the pages stored
+      longest ago are evicted.
+    - level (int): The compression level.
+    """
+    def __init__(self, path: str, max_bytes: int, level: int = 10):
+        """
+        Initializes a PageStore, creating its database if needed.
+
+        Args:
+        - path (str): The file path of the SQLite database.
+        - max_bytes (int): The compressed bytes kept before the pages
+          stored longest ago are evicted.
+        - level (int): The compression level. Default is 10.
+
+        Example:
+            store = PageStore("./models/page_store.db", 512 * 2 ** 20)
+            store.add(uuid, "indeed", link, html)
+            store.mark_parsed(uuid, 1, details)
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.level = level
+        with connect(self.path) as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "uuid TEXT PRIMARY KEY, site TEXT NOT NULL, "
+                "url TEXT NOT NULL, codec TEXT NOT NULL, html BLOB NOT NULL, "
+                "size INTEGER NOT NULL, stored_at REAL NOT NULL, "
+                "parser_version INTEGER, details_hash TEXT)"
+            )
+            db.execute(
+                "CREATE INDEX IF NOT EXISTS pages_stored_at "
+                "ON pages (stored_at)"
+            )
+            # running total of the compressed bytes, in a single row
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS meta ("
+                "id INTEGER PRIMARY KEY CHECK (id = 0), "
+                "bytes INTEGER NOT NULL)"
+            )
+            db.execute(
+                "INSERT OR IGNORE INTO meta (id, bytes) "
+                "SELECT 0, COALESCE(SUM(size), 0) FROM pages"
+            )
+
+    def add(self, uuid: str, site: str, url: str, html: str):
+        """
+        Stores a page, replacing an earlier page of the job, and evicts the
+        pages stored longest ago if the store is over its size limit.
+
+        Args:
+        - uuid (str): The UUID of the job.
+        - site (str): The site name.
+        - url (str): The URL of the page.
+        - html (str): The HTML of the page.
+        """
+        codec, data = compress(html, self.level)
+        with connect(self.path) as db:
+            db.execute("BEGIN IMMEDIATE")
+            row = db.execute(
+                "SELECT size FROM pages WHERE uuid = ?", (uuid,)
+            ).fetchone()
+            db.execute(
+                "INSERT OR REPLACE INTO pages (uuid, site, url, codec, html, "
+                "size, stored_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (uuid, site, url, codec, data, len(data), time.time())
+            )
+            replaced = 0 if row is None else row[0]
+            db.execute(
+                "UPDATE meta SET bytes = bytes + ?", (len(data) - replaced,)
+            )
+            (total,) = db.execute("SELECT bytes FROM meta").fetchone()
+            if total > self.max_bytes:
+                self.evict(db, total)
+
+    def evict(self, db, total: int):
+        """
+        Deletes the pages stored longest ago until the store is within its
+        size limit.
+
+        Args:
+        - db (sqlite3.Connection): The connection, in a transaction.
+        - total (int): The compressed bytes of the stored pages.
+        """
+        evicted = []
+        for uuid, size in db.execute(
+            "SELECT uuid, size FROM pages ORDER BY stored_at"
+        ):
+            if total <= self.max_bytes:
+                break
+            evicted.append((uuid,))
+            total -= size
+        db.executemany("DELETE FROM pages WHERE uuid = ?", evicted)
+        db.execute("UPDATE meta SET bytes = ?", (total,))
+
+    def mark_parsed(self, uuid: str, version: int, details: dict):
+        """
+        Records the parser version which extracted the details of a stored
+        page, and a hash of the details.
+
+        Args:
+        - uuid (str): The UUID of the job.
+        - version (int): The parser version.
+        - details (dict): The extracted details.
+        """
+        with connect(self.path) as db:
+            db.execute(
+                "UPDATE pages SET parser_version = ?, details_hash = ? "
+                "WHERE uuid = ?",
+                (version, details_hash(details), uuid)
+            )
+
+    def get(self, uuid: str) -> str | None:
+        """
+        Returns the stored page of a job.
+
+        Args:
+        - uuid (str): The UUID of the job.
+
+        Returns:
+        - str | None: The HTML of the page, or None if it is not stored.
+        """
+        with connect(self.path) as db:
+            row = db.execute(
+                "SELECT codec, html FROM pages WHERE uuid = ?", (uuid,)
+            ).fetchone()
+        return None if row is None else decompress(*row)
+
+    def stats(self) -> dict:
+        """
+        Returns the number of stored pages and their compressed size.
+        """
+        with connect(self.path) as db:
+            (pages,) = db.execute("SELECT COUNT(*) FROM pages").fetchone()
+            (size,) = db.execute("SELECT bytes FROM meta").fetchone()
+        return {"pages": pages, "bytes": size}
+
+    def reextract(self, site: str, version: int, parser,
+                  batch_size: int = 100) -> Iterator[tuple[str, dict]]:
+        """
+        Re-parses the stored pages of a site extracted by an older parser
+        version, marking them with the new version.
+
+        Args:
+        - site (str): The site name.
+        - version (int): The version of the parser.
+        - parser (Callable): The parser, taking the HTML of a page and
+          returning its details.
+        - batch_size (int): The pages read from the database at once.
+          Default is 100.
+
+        Yields:
+        - tuple[str, dict]: The UUID and new details of each job whose
+          details changed.
+        """
+        last = ""
+        while True:
+            with connect(self.path) as db:
+                rows = db.execute(
+                    "SELECT uuid, codec, html, details_hash FROM pages "
+                    "WHERE site = ? AND uuid > ? AND "
+                    "COALESCE(parser_version, 0) < ? "
+                    "ORDER BY uuid LIMIT ?",
+                    (site, last, version, batch_size)
+                ).fetchall()
+            if len(rows) == 0:
+                return
+            for uuid, codec, data, old_hash in rows:
+                last = uuid
+                try:
+                    details = parser(decompress(codec, data))
+                except Exception as e:
+                    logger.info(f"Error re-parsing job {uuid}: {e}")
+                    continue
+                self.mark_parsed(uuid, version, details)
+                if details_hash(details) != old_hash:
+                    yield uuid, details
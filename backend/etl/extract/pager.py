@@ -0,0 +1,133 @@
+"""
+This module contains the freshness-aware pager which decides when a scraper
+can stop paginating a site's search results.
+
+Search results are listed newest first, so once a page holds no new jobs the
+remaining pages only hold older, already scraped jobs. The pager stops
+paginating:
+- after `patience` consecutive pages without new jobs, or
+- as soon as a page without new jobs reaches the watermark, i.e. one of the
+  newest postings seen by the last completed run of the same site and query.
+
+Watermarks are kept per site and query in a JSON file, so a daily run costs
+roughly as many pages as there are new postings.
+"""
+
+import json
+import os
+from datetime import datetime
+
+
+class FreshnessPager:
+    """
+    Tracks the known jobs on each search results page of a run.
+
+    Attributes:
+    - path (str): The file path of the watermarks.
+    - key (str): The site and query of the run.
+    - patience (int): The number of consecutive pages without new jobs
+      after which pagination stops.
+    - watermark (list[str]): The UUIDs of the newest postings seen by the
+      last completed run.
+    - newest (list[str]): The UUIDs of the newest postings seen by this run.
+    - idle_pages (int): The number of consecutive pages without new jobs.
+    - stopped (bool): Whether the pager stopped pagination.
+    """
+    def __init__(self, path: str, key: str, patience: int):
+        """
+        Initializes a FreshnessPager, loading the watermark of the site and
+        query.
+
+        Args:
+        - path (str): The file path of the watermarks.
+        - key (str): The site and query of the run, e.g. the scraper name
+          and search URL.
+        - patience (int): The number of consecutive pages without new jobs
+          after which pagination stops.
+
+        Example:
+            pager = FreshnessPager(path, f"Indeed:{url}", patience=1)
+            for page in pages:
+                ...
+                if not pager.add_page(seen):
+                    break
+            pager.save()
+        """
+        self.path = path
+        self.key = key
+        self.patience = patience
+        self.watermark = self.read().get(key, {}).get("uuids", [])
+        self.newest: list[str] = []
+        self.idle_pages = 0
+        self.stopped = False
+
+    def read(self) -> dict:
+        """
+        Reads the saved watermarks.
+
+        Returns:
+        - dict: The watermark of each site and query.
+        """
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def add_page(self, seen: list[tuple[str, bool]]) -> bool:
+        """
+        Records the jobs of a search results page and decides whether to
+        visit the next page.
+
+        Args:
+        - seen (list[tuple[str, bool]]): The UUID of each job on the page,
+          in page order, and whether the job was already known.
+
+        Returns:
+        - bool: True to keep paginating, False to stop.
+        """
+        if len(self.newest) == 0:
+            self.newest = [uuid for uuid, _ in seen]
+
+        new_jobs = sum(1 for _, known in seen if not known)
+        self.idle_pages = self.idle_pages + 1 if new_jobs == 0 else 0
+        self.stopped = self.reached_watermark(seen) or \
+            self.idle_pages >= self.patience
+        return not self.stopped
+
+    def reached_watermark(self, seen: list[tuple[str, bool]]) -> bool:
+        """
+        Checks whether a page lists the watermark followed only by known
+        jobs, so every later page holds older jobs.
+
+        A watermark job followed by new jobs does not count, so a posting
+        pinned to the top of the results cannot stop pagination.
+
+        Args:
+        - seen (list[tuple[str, bool]]): See `add_page`.
+
+        Returns:
+        - bool: True if the page reached the watermark.
+        """
+        watermark = set(self.watermark)
+        for position, (uuid, _) in enumerate(seen):
+            if uuid in watermark:
+                return all(known for _, known in seen[position:])
+        return False
+
+    def save(self):
+        """
+        Saves the newest postings of this run as the watermark of its site
+        and query. To be called once the run completes.
+        """
+        if len(self.newest) == 0:
+            return
+        watermarks = self.read()
+        watermarks[self.key] = {
+            "uuids": self.newest,
+            "updated_at": datetime.now().isoformat()
+        }
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(f"{self.path}.tmp", "w") as f:
+            json.dump(watermarks, f)
+        os.replace(f"{self.path}.tmp", self.path)
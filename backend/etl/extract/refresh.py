@@ -0,0 +1,295 @@
+"""
+This module re-checks the job pages of jobs already in the database, so
+edits to a posting are picked up without scraping the sites again.
+
+Jobs are skipped by the scrapers once their link is known, so a refresh run
+instead re-fetches the job pages of a sample of live jobs, the ones checked
+longest ago first. Each page is fetched with an HTTP conditional request
+(`If-None-Match` / `If-Modified-Since`) when its last response had an `ETag`
+or `Last-Modified` header, so unchanged pages cost a `304` response without
+a body. Pages which are downloaded are parsed, and their description is
+compared by a hash of its normalized text with the description last seen,
+so only jobs whose description changed are rewritten, and re-embedded by
+`ChromaIO.reembed_jobs`.
+
+The validators and description hash of each job are kept in a SQLite
+database. Only sites with a `page_parser` are refreshed, since the other
+sites' job pages can only be loaded in a browser.
+
+The sample size and database path are set in the `refresh` section of the
+`scraping` section of the config file.
+"""
+
+import hashlib
+import time
+from etl.extract.http_fetcher import HttpFetcher
+from etl.extract.page_parsers import AuthWallError
+from etl.extract.site_limits import (
+    CircuitBreaker, RateLimiter, SiteBlockedError
+)
+from etl.load.load_cassandra import CassandraIO
+from etl.transform.near_duplicates import normalize_text
+from etl.utils.sqlite_conn import connect
+from src.utils.pipeline_log_config import pipeline as logger
+
+
+def description_hash(text: str) -> str:
+    """
+    Returns the hash of a job description, ignoring changes to its case,
+    punctuation and whitespace.
+
+    Args:
+    - text (str): The job description.
+
+    Returns:
+    - str: The hex digest of the normalized description.
+    """
+    return hashlib.sha1(normalize_text(text).encode()).hexdigest()
+
+
+class FreshnessStore:
+    """
+    The HTTP validators and description hash of each job page, and when it
+    was last checked, kept in a SQLite database.
+
+    Attributes:
+    - path (str): The file path of the SQLite database.
+    """
+    def __init__(self, path: str):
+        """
+        Initializes a FreshnessStore, creating its database if needed.
+
+        Args:
+        - path (str): The file path of the SQLite database.
+
+        Example:
+            store = FreshnessStore("./models/refresh.db")
+            for uuid in store.sample(uuids, 100):
+                ...
+        """
+        self.path = path
+        with connect(self.path) as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "uuid TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, "
+                "content_hash TEXT, checked_at REAL NOT NULL)"
+            )
+
+    def get(self, uuid: str) -> dict | None:
+        """
+        Returns what was recorded when a job page was last checked.
+
+        Args:
+        - uuid (str): The UUID of the job.
+
+        Returns:
+        - dict | None: The `etag`, `last_modified`, `content_hash` and
+          `checked_at` of the page, or None if it was never checked.
+        """
+        with connect(self.path) as db:
+            row = db.execute(
+                "SELECT etag, last_modified, content_hash, checked_at "
+                "FROM pages WHERE uuid = ?",
+                (uuid,)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(
+            ["etag", "last_modified", "content_hash", "checked_at"], row
+        ))
+
+    def update(self, uuid: str, validators: dict, content_hash: str):
+        """
+        Records a check of a job page.
+
+        Args:
+        - uuid (str): The UUID of the job.
+        - validators (dict): The `etag` and `last_modified` of the page.
+        - content_hash (str): The hash of the page's description.
+        """
+        with connect(self.path) as db:
+            db.execute(
+                "INSERT OR REPLACE INTO pages (uuid, etag, last_modified, "
+                "content_hash, checked_at) VALUES (?, ?, ?, ?, ?)",
+                (uuid, validators.get("etag"),
+                 validators.get("last_modified"), content_hash, time.time())
+            )
+
+    def sample(self, uuids: list[str], size: int,
+               min_age: float = 0) -> list[str]:
+        """
+        Picks the jobs to check, never checked first, then the ones checked
+        longest ago.
+
+        Args:
+        - uuids (list[str]): The UUIDs of the live jobs.
+        - size (int): The number of jobs to pick.
+        - min_age (float): Jobs checked less than this many seconds ago
+          are not picked. Default is 0.
+
+        Returns:
+        - list[str]: The UUIDs of the picked jobs.
+        """
+        with connect(self.path) as db:
+            checked = dict(db.execute("SELECT uuid, checked_at FROM pages"))
+        cutoff = time.time() - min_age
+        due = [uuid for uuid in uuids if checked.get(uuid, 0) <= cutoff]
+        return sorted(due, key=lambda uuid: checked.get(uuid, 0))[:size]
+
+    def prune(self, uuids: list[str]):
+        """
+        Forgets the jobs which are no longer live.
+
+        Args:
+        - uuids (list[str]): The UUIDs of the live jobs.
+        """
+        with connect(self.path) as db:
+            db.execute("BEGIN IMMEDIATE")
+            stored = {row[0] for row in db.execute("SELECT uuid FROM pages")}
+            db.executemany(
+                "DELETE FROM pages WHERE uuid = ?",
+                [(uuid,) for uuid in stored.difference(uuids)]
+            )
+
+
+class JobRefresher(CassandraIO):
+    """
+    Re-checks the job pages of live jobs and rewrites the details of the
+    jobs whose description changed.
+
+    Attributes:
+    - sites (dict): The scraper classes with a `page_parser`, by source
+      name as in the `source` column.
+    - store (FreshnessStore): The validators and hashes of the job pages.
+    - http (HttpFetcher): The HTTP client.
+    - rate_limiter (RateLimiter): The request rates shared with the
+      scrapers.
+    - breaker (CircuitBreaker): The circuit breakers shared with the
+      scrapers.
+    """
+    def __init__(self, sites: dict, config: dict):
+        """
+        Initializes a JobRefresher.
+
+        Args:
+        - sites (dict): The scraper classes, by site name.
+        - config (dict): The config file, with the `scraping.refresh`,
+          `site_limits` and `http` sections.
+
+        Example:
+            refresher = JobRefresher(SITE_SCRAPERS, config)
+            changed = refresher.refresh(sample_size=200)
+            ChromaIO().reembed_jobs(changed)
+        """
+        CassandraIO.__init__(self)
+        self.sites = {
+            SiteScraper.__name__[:-7]: SiteScraper
+            for SiteScraper in sites.values()
+            if SiteScraper.page_parser is not None
+        }
+        self.settings = config["scraping"]["refresh"]
+        self.store = FreshnessStore(self.settings["path"])
+        self.http = HttpFetcher(config["http"])
+        site_limits = config["site_limits"]
+        self.rate_limiter = RateLimiter(
+            site_limits["path"], site_limits["rates"]
+        )
+        self.breaker = CircuitBreaker(
+            site_limits["path"],
+            site_limits["breaker_threshold"],
+            site_limits["breaker_cooldown"]
+        )
+
+    def check_page(self, job: dict) -> dict | None:
+        """
+        Re-fetches the job page of a job and returns its details if its
+        description changed.
+
+        Args:
+        - job (dict): The job's `uuid`, `source`, `job_link` and
+          `job_desc`.
+
+        Returns:
+        - dict | None: The job page details, or None if the page or its
+          description is unchanged.
+
+        Raises:
+        - SiteBlockedError: If the site's breaker is open.
+        - AuthWallError: If the page is an auth wall or captcha.
+        - urllib3.exceptions.HTTPError: If the page could not be fetched.
+        """
+        SiteScraper = self.sites[job["source"]]
+        site = SiteScraper.__name__[:-7].lower()
+        # pages never checked are compared with the description scraped
+        last = self.store.get(job["uuid"]) or {
+            "content_hash": description_hash(job["job_desc"] or "")
+        }
+
+        self.breaker.check(site)
+        self.rate_limiter.acquire(job["job_link"])
+        try:
+            html, validators = self.http.get_conditional(
+                job["job_link"], last.get("etag"), last.get("last_modified")
+            )
+        except AuthWallError:
+            self.breaker.record_block(site, job["job_link"])
+            raise
+        self.breaker.record_success(site)
+
+        if html is None:
+            self.store.update(job["uuid"], validators, last["content_hash"])
+            return None
+        details = SiteScraper.page_parser(html)
+        content_hash = description_hash(details["job_desc"])
+        self.store.update(job["uuid"], validators, content_hash)
+        if content_hash == last["content_hash"]:
+            return None
+        return details
+
+    def refresh(self, sample_size: int = None) -> list[str]:
+        """
+        Re-checks a sample of live jobs and rewrites the details of the
+        jobs whose description changed.
+
+        Args:
+        - sample_size (int | None): The number of jobs to check. Default
+          is None (the `sample_size` in the config file).
+
+        Returns:
+        - list[str]: The UUIDs of the changed jobs, to be re-embedded.
+        """
+        if sample_size is None:
+            sample_size = self.settings["sample_size"]
+        jobs = {
+            job["uuid"]: job for job in self.get_job_pages(list(self.sites))
+        }
+        self.store.prune(list(jobs))
+        sample = self.store.sample(
+            list(jobs), sample_size, self.settings["min_age_hours"] * 3600
+        )
+        logger.info(f"Checking {len(sample)} of {len(jobs)} live jobs")
+
+        changed = {}
+        counts = {"unchanged": 0, "failed": 0}
+        for uuid in sample:
+            try:
+                details = self.check_page(jobs[uuid])
+            except SiteBlockedError as e:
+                logger.warning(f"Skipping job {uuid}: {e}")
+                counts["failed"] += 1
+                continue
+            except Exception as e:
+                logger.info(f"Error checking job {uuid}: {e}")
+                counts["failed"] += 1
+                continue
+            if details is None:
+                counts["unchanged"] += 1
+            else:
+                changed[uuid] = details
+
+        self.update_job_details(changed)
+        logger.info(
+            f"{len(changed)} jobs changed, {counts['unchanged']} unchanged, "
+            f"{counts['failed']} could not be checked"
+        )
+        return list(changed)
@@ -0,0 +1,255 @@
+"""
+This module records the pages loaded by the scrapers and replays them
+offline, so scraper performance can be measured without the live sites.
+
+A `PageArchive` is a directory of recorded pages, one JSON file per page
+with its URL, site, kind (`list` for search results pages, `detail` for job
+pages) and HTML. Scrapers record every page they load into the archive set
+in the `replay` section of the config file.
+
+A `ReplayServer` serves the pages of an archive from a local HTTP server,
+after an injectable latency. A page recorded from `https://host/path?query`
+is served at `/host/path?query`, and the links between recorded pages are
+rewritten to point to the server.
+"""
+
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+from urllib.parse import urlparse
+
+
+class PageArchive:
+    """
+    A directory of recorded pages.
+
+    Attributes:
+    - path (str): The directory of the archive.
+    """
+    def __init__(self, path: str):
+        """
+        Initializes a PageArchive, creating its directory if needed.
+
+        Args:
+        - path (str): The directory of the archive.
+
+        Example:
+            archive = PageArchive("./models/page_archive")
+            archive.add("indeed", "list", url, wd.page_source)
+            for page in archive.pages("indeed", "list"):
+                ...
+        """
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def add(self, site: str, kind: str, url: str, html: str):
+        """
+        Records a page, replacing an earlier recording of its URL.
+
+        Args:
+        - site (str): The site name.
+        - kind (str): The kind of page, `list` or `detail`.
+        - url (str): The URL of the page.
+        - html (str): The HTML of the page.
+        """
+        digest = hashlib.sha1(url.encode()).hexdigest()[:16]
+        directory = os.path.join(self.path, site)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{kind}-{digest}.json")
+        # pages are recorded by the worker threads and processes of every
+        # site, so each page is written atomically
+        temp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp, "w") as f:
+            json.dump(
+                {
+                    "url": url,
+                    "site": site,
+                    "kind": kind,
+                    "recorded_at": datetime.now().isoformat(),
+                    "html": html
+                },
+                f
+            )
+        os.replace(temp, path)
+
+    def sites(self) -> list[str]:
+        """
+        Returns the names of the sites with recorded pages.
+        """
+        return sorted(
+            name for name in os.listdir(self.path)
+            if os.path.isdir(os.path.join(self.path, name))
+        )
+
+    def pages(self, site: str = None, kind: str = None) -> Iterator[dict]:
+        """
+        Reads the recorded pages, in a stable order.
+
+        Args:
+        - site (str | None): Only the pages of this site. Default is None
+          (every site).
+        - kind (str | None): Only the pages of this kind. Default is None
+          (every kind).
+
+        Yields:
+        - dict: Each page, with its `url`, `site`, `kind`, `recorded_at`
+          and `html`.
+        """
+        for name in [site] if site is not None else self.sites():
+            directory = os.path.join(self.path, name)
+            if not os.path.isdir(directory):
+                continue
+            for file in sorted(os.listdir(directory)):
+                if not file.endswith(".json") or \
+                        kind is not None and not file.startswith(f"{kind}-"):
+                    continue
+                with open(os.path.join(directory, file), "r") as f:
+                    yield json.load(f)
+
+
+class ReplayServer:
+    """
+    A local HTTP server replaying the pages of an archive.
+
+    Attributes:
+    - archive (PageArchive): The archive.
+    - latency (float): The seconds each response is delayed by.
+    - jitter (float): The maximum random seconds added to the latency.
+    - base_url (str | None): The URL of the server once started.
+    - requests (int): The number of requests served.
+    """
+    def __init__(self, archive: PageArchive, latency: float = 0.0,
+                 jitter: float = 0.0):
+        """
+        Initializes a ReplayServer.
+
+        Args:
+        - archive (PageArchive): The archive.
+        - latency (float): The seconds each response is delayed by.
+          Default is 0.
+        - jitter (float): The maximum random seconds added to the latency.
+          Default is 0.
+
+        Example:
+            with ReplayServer(PageArchive(path), latency=0.2) as server:
+                html = fetcher.get(server.url(recorded_url))
+        """
+        self.archive = archive
+        self.latency = latency
+        self.jitter = jitter
+        self.base_url = None
+        self.requests = 0
+        self.server = None
+        self.bodies = {}
+        self.paths = {}
+        self.lock = threading.Lock()
+
+    def url(self, original: str) -> str:
+        """
+        Returns the URL at which the server replays a recorded URL.
+
+        Args:
+        - original (str): The recorded URL.
+
+        Returns:
+        - str: The replay URL.
+        """
+        parsed = urlparse(original)
+        return f"{self.base_url}/{parsed.netloc}{self.request_path(parsed)}"
+
+    @staticmethod
+    def request_path(parsed) -> str:
+        """
+        Returns the path and query of a parsed URL.
+        """
+        return parsed.path + (f"?{parsed.query}" if parsed.query else "")
+
+    def load(self):
+        """
+        Loads the pages of the archive, with the links between recorded
+        hosts rewritten to the server.
+        """
+        pages = list(self.archive.pages())
+        hosts = {urlparse(page["url"]).netloc for page in pages}
+        for page in pages:
+            html = page["html"]
+            for host in hosts:
+                for scheme in ("https", "http"):
+                    html = html.replace(
+                        f"{scheme}://{host}", f"{self.base_url}/{host}"
+                    )
+            parsed = urlparse(page["url"])
+            path = self.request_path(parsed)
+            self.bodies[f"/{parsed.netloc}{path}"] = html.encode()
+            # relative links resolve against the server root, without the
+            # host of the page
+            self.paths.setdefault(path, f"/{parsed.netloc}{path}")
+
+    def lookup(self, path: str) -> bytes | None:
+        """
+        Returns the body served at a request path.
+
+        Args:
+        - path (str): The request path, with its query.
+
+        Returns:
+        - bytes | None: The page, or None if it was not recorded.
+        """
+        if path in self.bodies:
+            return self.bodies[path]
+        if path in self.paths:
+            return self.bodies[self.paths[path]]
+        return None
+
+    def start(self) -> str:
+        """
+        Starts the server in a background thread.
+
+        Returns:
+        - str: The URL of the server.
+        """
+        replay = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                time.sleep(replay.latency + random.uniform(0, replay.jitter))
+                body = replay.lookup(self.path)
+                with replay.lock:
+                    replay.requests += 1
+                self.send_response(200 if body is not None else 404)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body or b"")))
+                self.end_headers()
+                self.wfile.write(body or b"")
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.load()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.base_url
+
+    def stop(self):
+        """
+        Stops the server.
+        """
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self) -> "ReplayServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
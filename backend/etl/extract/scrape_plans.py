@@ -0,0 +1,67 @@
+"""
+This module contains the scrape plans, the searches scraped on each site.
+
+The `scrape_plans` section of the config file lists the searches of each
+site, each with:
+- a `query` and a `location`, filled into the site's `search_url_template`,
+  or a full search `url`,
+- a `quota`, the number of jobs to list,
+- a `priority`, higher searches being scraped first.
+
+A site without plans scrapes its default `search_url` with the global
+`num_jobs` quota. The job cards of all the searches of a site are
+deduplicated before any job page is fetched.
+"""
+
+from urllib.parse import quote_plus
+
+
+def plan_url(SiteScraper, plan: dict) -> str:
+    """
+    Returns the search URL of a plan.
+
+    Args:
+    - SiteScraper: The scraper class of the site.
+    - plan (dict): The plan's settings.
+
+    Returns:
+    - str: The search URL.
+    """
+    if plan.get("url"):
+        return plan["url"]
+    if not plan.get("query") and not plan.get("location"):
+        return SiteScraper.search_url
+    return SiteScraper.search_url_template.format(
+        query=quote_plus(plan.get("query") or ""),
+        location=quote_plus(plan.get("location") or "")
+    )
+
+
+def load_plans(SiteScraper, config: dict) -> list[dict]:
+    """
+    Loads the scrape plans of a site, highest priority first.
+
+    Args:
+    - SiteScraper: The scraper class of the site.
+    - config (dict): The config.
+
+    Returns:
+    - list[dict]: The plans, each with its `name`, search `url`, `quota`
+      of jobs and `priority`.
+    """
+    site = str(SiteScraper.__name__)[:-7].lower()
+    num_jobs = config["selenium"]["num_jobs"]
+    entries = (config.get("scrape_plans") or {}).get(site) or [{}]
+
+    plans = []
+    for entry in entries:
+        name = entry.get("name") or entry.get("url") or\
+            f"{entry.get('query') or 'all'} in " \
+            f"{entry.get('location') or 'default location'}"
+        plans.append({
+            "name": name,
+            "url": plan_url(SiteScraper, entry),
+            "quota": entry.get("quota", num_jobs),
+            "priority": entry.get("priority", 0)
+        })
+    return sorted(plans, key=lambda plan: -plan["priority"])
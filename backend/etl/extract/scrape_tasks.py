@@ -0,0 +1,320 @@
+"""
+This module distributes scraping over a `TaskQueue`, so any number of
+stateless workers, on any node, share the work of a scrape run.
+
+A run is scheduled as units of work:
+- `list_pages` tasks, one per site, search of the site's scrape plans (see
+  `etl.extract.scrape_plans`) and range of search results pages, which
+  collect the new job cards of the pages and queue them as
+- `job_details` tasks, batches of job cards whose job pages are scraped
+  and whose jobs are written to Cassandra.
+
+Job details tasks are leased before list pages tasks, so jobs reach the
+database while the search results are still being listed. List pages tasks
+are leased by the priority of their plan, and the first pages of every
+search of a priority before the later ones, so the searches are spread
+over the workers. A job card listed by several searches is claimed by the
+first task collecting it, so its job page is only fetched once. Once a list
+pages task finds no more new jobs, the remaining list pages tasks of its
+search are cancelled. Every worker process keeps its browsers warm between
+tasks with the process's browser managers. Workers skip the tasks of sites
+whose circuit breaker tripped (see `etl.extract.site_limits`) until the
+breaker closes.
+
+The queue settings are in the `task_queue` section of the config file.
+"""
+
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date
+import yaml
+from etl.extract.orchestrator import SITE_SCRAPERS
+from etl.extract.scrape_plans import load_plans
+from etl.extract.site_limits import CircuitBreaker, SiteBlockedError
+from etl.extract.site_scraper import close_browser_manager
+from etl.extract.task_queue import TaskQueue
+from src.utils.pipeline_log_config import pipeline as logger
+
+# priority of each kind of task, higher first; list pages tasks add the
+# priority of their scrape plan, which stays below the job details priority
+TASK_PRIORITIES = {
+    "list_pages": 0,
+    "job_details": 1000,
+}
+
+
+def load_config() -> dict:
+    """
+    Loads the config file.
+
+    Returns:
+    - dict: The config.
+    """
+    with open("./config/config.yaml", "r") as stream:
+        return yaml.safe_load(stream)
+
+
+def open_queue(config: dict = None) -> TaskQueue:
+    """
+    Opens the scrape task queue.
+
+    Args:
+    - config (dict | None): The config. Default is None (read from the
+      config file).
+
+    Returns:
+    - TaskQueue: The queue.
+    """
+    settings = (config or load_config())["task_queue"]
+    return TaskQueue(
+        settings["path"], settings["lease_seconds"], settings["max_attempts"]
+    )
+
+
+def schedule_scrape(queue: TaskQueue, sites: dict = None,
+                    config: dict = None, run_id: str = None) -> int:
+    """
+    Queues the list pages tasks of the scrape plans of a scrape run.
+
+    Args:
+    - queue (TaskQueue): The task queue.
+    - sites (dict | None): Scraper classes by site name. Default is None
+      (all sites in `SITE_SCRAPERS`).
+    - config (dict | None): The config. Default is None (read from the
+      config file).
+    - run_id (str | None): The ID of the run. Scheduling a run with the
+      same ID again does not queue its tasks twice. Default is None
+      (today's date).
+
+    Returns:
+    - int: The number of tasks queued.
+
+    Example:
+        schedule_scrape(open_queue())
+        Queues today's search results pages of every site, to be scraped
+        by the workers started with `run_worker`.
+    """
+    sites = sites or SITE_SCRAPERS
+    config = config or load_config()
+    run_id = run_id or date.today().isoformat()
+    pages_per_task = config["task_queue"]["pages_per_task"]
+
+    tasks = []
+    for site, SiteScraper in sites.items():
+        for plan in load_plans(SiteScraper, config):
+            url = plan["url"]
+            num_pages = SiteScraper.count_pages(plan["quota"])
+            step = num_pages if SiteScraper.scrolling_results else\
+                pages_per_task
+            for start in range(0, num_pages, step):
+                payload = {
+                    "site": site,
+                    "url": url,
+                    "start_page": start,
+                    "end_page": min(start + step, num_pages),
+                    "run_id": run_id
+                }
+                tasks.append((plan["priority"], start, payload))
+
+    # queue the first pages of every search before the later ones, as
+    # tasks of the same priority are leased in order
+    queued = 0
+    for priority, start, payload in sorted(
+            tasks, key=lambda task: (-task[0], task[1])):
+        group = f"{run_id}:{payload['site']}:{payload['url']}"
+        queued += queue.enqueue(
+            "list_pages",
+            payload,
+            key=f"{group}:{start}",
+            group=group,
+            priority=TASK_PRIORITIES["list_pages"] + priority
+        )
+    logger.info(f"Scheduled {queued} list pages tasks for run {run_id}")
+    return queued
+
+
+def list_pages(queue: TaskQueue, task: dict, sites: dict, config: dict):
+    """
+    Collects the new job cards of a range of search results pages and
+    queues the cards no other task claimed in job details tasks.
+
+    Args:
+    - queue (TaskQueue): The task queue.
+    - task (dict): The list pages task.
+    - sites (dict): Scraper classes by site name.
+    - config (dict): The config.
+    """
+    payload = task["payload"]
+    scraper = sites[payload["site"]](
+        profile_name=None, url=payload["url"], checkpointing=False
+    )
+    try:
+        scraper.visit_pages(
+            range(payload["start_page"], payload["end_page"])
+        )
+    finally:
+        scraper.close()
+
+    # the later pages of the search only list known jobs
+    if scraper.pager.stopped:
+        cancelled = queue.cancel_group(task["group"])
+        logger.info(f"No more new jobs, cancelled {cancelled} tasks")
+
+    # skip the cards already collected by the tasks of other searches
+    run = f"{payload['run_id']}:{payload['site']}"
+    claimed = queue.claim(
+        [f"{run}:{card['uuid']}" for card in scraper.cards],
+        owner=f"{run}:{payload['url']}:{payload['start_page']}"
+    )
+    new_cards = [
+        card for card in scraper.cards
+        if f"{run}:{card['uuid']}" in claimed
+    ]
+
+    batch_size = config["scraping"]["batch_size"]
+    for start in range(0, len(new_cards), batch_size):
+        cards = new_cards[start:start + batch_size]
+        queue.enqueue(
+            "job_details",
+            {"site": payload["site"], "cards": cards},
+            key=f"{run}:{cards[0]['uuid']}",
+            priority=TASK_PRIORITIES["job_details"]
+        )
+
+
+def job_details(queue: TaskQueue, task: dict, sites: dict, config: dict):
+    """
+    Scrapes the job pages of a batch of job cards and writes the jobs to
+    Cassandra.
+
+    Args:
+    - queue (TaskQueue): The task queue.
+    - task (dict): The job details task.
+    - sites (dict): Scraper classes by site name.
+    - config (dict): The config.
+    """
+    payload = task["payload"]
+    scraper = sites[payload["site"]](profile_name=None, checkpointing=False)
+    try:
+        scraper.update_database(scraper.get_job_details(payload["cards"]))
+    finally:
+        scraper.close()
+
+
+# handler of each kind of task
+TASK_HANDLERS = {
+    "list_pages": list_pages,
+    "job_details": job_details,
+}
+
+
+@contextmanager
+def keep_leased(queue: TaskQueue, task: dict, worker: str):
+    """
+    Renews the lease of a task in the background while it is worked on.
+
+    Args:
+    - queue (TaskQueue): The task queue.
+    - task (dict): The leased task.
+    - worker (str): The ID of the worker holding the task.
+    """
+    done = threading.Event()
+
+    def renew():
+        while not done.wait(queue.lease_seconds / 3):
+            if not queue.renew(task, worker):
+                logger.error(f"Lost the lease of task {task['id']}")
+                return
+
+    renewer = threading.Thread(target=renew, daemon=True)
+    renewer.start()
+    try:
+        yield
+    finally:
+        done.set()
+        renewer.join()
+
+
+def run_worker(queue: TaskQueue, sites: dict = None, config: dict = None,
+               worker: str = None, idle_timeout: float = None,
+               handlers: dict = None) -> dict:
+    """
+    Runs a worker which leases tasks from the queue and handles them until
+    the queue stays empty for `idle_timeout` seconds.
+
+    Args:
+    - queue (TaskQueue): The task queue.
+    - sites (dict | None): Scraper classes by site name. Default is None
+      (all sites in `SITE_SCRAPERS`).
+    - config (dict | None): The config. Default is None (read from the
+      config file).
+    - worker (str | None): The ID of the worker. Default is None (the host
+      name and process ID).
+    - idle_timeout (float | None): The seconds without tasks after which
+      the worker stops. Default is None (the `idle_timeout` setting, or
+      run forever if it is null).
+    - handlers (dict | None): Handler of each kind of task. Default is None
+      (`TASK_HANDLERS`).
+
+    Returns:
+    - dict: The number of tasks `done` and `failed` by the worker.
+
+    Example:
+        run_worker(open_queue())
+        Handles scrape tasks until the queue has been empty for a minute.
+    """
+    sites = sites or SITE_SCRAPERS
+    config = config or load_config()
+    settings = config["task_queue"]
+    worker = worker or f"{socket.gethostname()}-{os.getpid()}"
+    if idle_timeout is None:
+        idle_timeout = settings["idle_timeout"]
+    handlers = handlers or TASK_HANDLERS
+    site_limits = config["site_limits"]
+    breaker = CircuitBreaker(
+        site_limits["path"],
+        site_limits["breaker_threshold"],
+        site_limits["breaker_cooldown"]
+    )
+
+    processed = {"done": 0, "failed": 0}
+    idle_since = time.monotonic()
+    logger.info(f"Scrape worker {worker} started")
+    try:
+        while True:
+            blocked = list(breaker.open_sites())
+            task = queue.lease(
+                worker, list(handlers), exclude={"site": blocked}
+            )
+            if task is None:
+                if idle_timeout is not None and \
+                        time.monotonic() - idle_since >= idle_timeout:
+                    break
+                time.sleep(settings["poll_interval"])
+                continue
+
+            logger.info(
+                f"Running {task['kind']} task {task['id']} "
+                f"(attempt {task['attempts']})"
+            )
+            try:
+                with keep_leased(queue, task, worker):
+                    handlers[task["kind"]](queue, task, sites, config)
+                queue.complete(task, worker)
+                processed["done"] += 1
+            except SiteBlockedError as e:
+                # retried once the site's breaker closes
+                logger.error(f"Releasing task {task['id']}: {e}")
+                queue.release(task, worker)
+            except Exception as e:
+                logger.error(f"Error running task {task['id']}: {e}")
+                queue.fail(task, worker, str(e))
+                processed["failed"] += 1
+            idle_since = time.monotonic()
+    finally:
+        close_browser_manager()
+    logger.info(f"Scrape worker {worker} stopped: {processed}")
+    return processed
@@ -0,0 +1,258 @@
+"""
+This module contains the request limits shared by every scraper process and
+worker of a site, kept in a SQLite database:
+- a token bucket per host, which caps the rate of requests to the host
+  across processes, while `HostLimiter` only spaces out the requests of one
+  process,
+- a circuit breaker per site, which trips once the site answers with auth
+  walls or captchas several times in a row. A tripped site's workers stop
+  at once instead of burning browser time on blocked sessions, and no new
+  work is started on the site until the breaker's cooldown is over.
+
+As with the task queue, SQLite serializes the processes with its database
+lock, so the database file can be shared by the processes of one host or
+mounted on every node.
+
+The limits are set in the `site_limits` section of the config file.
+"""
+
+import os
+import time
+from urllib.parse import urlparse
+from etl.utils.sqlite_conn import connect
+from src.utils.pipeline_log_config import pipeline as logger
+
+
+class SiteBlockedError(Exception):
+    """
+    Raised when the circuit breaker of a site is open.
+    """
+
+
+class RateLimiter:
+    """
+    Token buckets limiting the rate of requests to each host, shared by
+    processes through a SQLite database.
+
+    Each request takes a token from its host's bucket, which refills at
+    `rate` tokens per second up to `burst` tokens. A request finding the
+    bucket empty reserves the next token and waits for it, so waiting
+    requests are served in order.
+
+    Attributes:
+    - path (str): The file path of the SQLite database.
+    - rates (dict): Settings per host name, each with its `rate` and
+      `burst`. The `default` entry applies to hosts which are not listed.
+    """
+    def __init__(self, path: str, rates: dict):
+        """
+        Initializes a RateLimiter, creating its database if needed.
+
+        Args:
+        - path (str): The file path of the SQLite database.
+        - rates (dict): The `rate` and `burst` of each host.
+
+        Example:
+            limiter = RateLimiter("./models/site_limits.db", rates)
+            limiter.acquire(link)
+            wd.get(link)
+        """
+        self.path = path
+        self.rates = rates
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with connect(path) as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                " host TEXT PRIMARY KEY,"
+                " tokens REAL NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+
+    def get_rate(self, host: str) -> dict:
+        """
+        Returns the settings of a host.
+
+        Args:
+        - host (str): The host name.
+
+        Returns:
+        - dict: The host's `rate` and `burst` settings.
+        """
+        return self.rates.get(host, self.rates["default"])
+
+    def reserve(self, host: str) -> float:
+        """
+        Takes a token from a host's bucket, reserving the next token if the
+        bucket is empty.
+
+        Args:
+        - host (str): The host name.
+
+        Returns:
+        - float: The seconds to wait before the request may start.
+        """
+        rate = self.get_rate(host)
+        now = time.time()
+        with connect(self.path) as db:
+            db.execute("BEGIN IMMEDIATE")
+            row = db.execute(
+                "SELECT tokens, updated_at FROM buckets WHERE host = ?",
+                (host,)
+            ).fetchone()
+            tokens = rate["burst"]
+            if row is not None:
+                tokens = min(
+                    rate["burst"], row[0] + (now - row[1]) * rate["rate"]
+                )
+            # tokens below zero are reserved by waiting requests
+            tokens -= 1
+            db.execute(
+                "INSERT OR REPLACE INTO buckets (host, tokens, updated_at)"
+                " VALUES (?, ?, ?)",
+                (host, tokens, now)
+            )
+        return max(-tokens / rate["rate"], 0)
+
+    def acquire(self, url: str) -> float:
+        """
+        Waits until a request to the URL's host is allowed.
+
+        Args:
+        - url (str): The URL about to be requested.
+
+        Returns:
+        - float: The seconds waited.
+        """
+        wait = self.reserve(urlparse(url).netloc)
+        time.sleep(wait)
+        return wait
+
+
+class CircuitBreaker:
+    """
+    Circuit breakers stopping the scraping of sites which block the
+    scrapers, shared by processes through a SQLite database.
+
+    A site's breaker trips once `threshold` blocked pages are recorded in a
+    row, and stays open for `cooldown` seconds. A page which is not blocked
+    resets the count.
+
+    Attributes:
+    - path (str): The file path of the SQLite database.
+    - threshold (int): The number of blocked pages in a row which trips a
+      breaker.
+    - cooldown (float): The seconds a tripped breaker stays open.
+    """
+    def __init__(self, path: str, threshold: int = 3,
+                 cooldown: float = 1800):
+        """
+        Initializes a CircuitBreaker, creating its database if needed.
+
+        Args:
+        - path (str): The file path of the SQLite database.
+        - threshold (int): The blocked pages in a row which trip a
+          breaker. Default is 3.
+        - cooldown (float): The seconds a tripped breaker stays open.
+          Default is 1800.
+
+        Example:
+            breaker = CircuitBreaker("./models/site_limits.db")
+            breaker.check("linkedin")
+            wd.get(link)
+            if is_auth_wall(wd.current_url, 200, wd.page_source):
+                breaker.record_block("linkedin", "auth wall")
+        """
+        self.path = path
+        self.threshold = max(threshold, 1)
+        self.cooldown = cooldown
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with connect(path) as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS breakers ("
+                " site TEXT PRIMARY KEY,"
+                " blocked INTEGER NOT NULL DEFAULT 0,"
+                " open_until REAL NOT NULL DEFAULT 0,"
+                " reason TEXT)"
+            )
+
+    def record_block(self, site: str, reason: str) -> bool:
+        """
+        Records a blocked page, tripping the site's breaker at the
+        `threshold`.
+
+        Args:
+        - site (str): The site name.
+        - reason (str): What blocked the page, e.g. the auth wall URL.
+
+        Returns:
+        - bool: True if the breaker tripped.
+        """
+        now = time.time()
+        with connect(self.path) as db:
+            db.execute("BEGIN IMMEDIATE")
+            db.execute(
+                "INSERT OR IGNORE INTO breakers (site) VALUES (?)", (site,)
+            )
+            db.execute(
+                "UPDATE breakers SET blocked = blocked + 1, reason = ?"
+                " WHERE site = ?",
+                (reason, site)
+            )
+            (blocked,) = db.execute(
+                "SELECT blocked FROM breakers WHERE site = ?", (site,)
+            ).fetchone()
+            if blocked < self.threshold:
+                return False
+            db.execute(
+                "UPDATE breakers SET blocked = 0, open_until = ?"
+                " WHERE site = ?",
+                (now + self.cooldown, site)
+            )
+        logger.error(
+            f"Stopping {site} for {self.cooldown:.0f}s after {blocked} "
+            f"blocked pages in a row: {reason}"
+        )
+        return True
+
+    def record_success(self, site: str):
+        """
+        Records a page which was not blocked, resetting the count of
+        blocked pages.
+
+        Args:
+        - site (str): The site name.
+        """
+        with connect(self.path) as db:
+            db.execute(
+                "UPDATE breakers SET blocked = 0"
+                " WHERE site = ? AND blocked > 0",
+                (site,)
+            )
+
+    def open_sites(self) -> dict[str, str]:
+        """
+        Returns the sites whose breakers are open.
+
+        Returns:
+        - dict[str, str]: The reason each open breaker tripped, by site.
+        """
+        with connect(self.path) as db:
+            rows = db.execute(
+                "SELECT site, reason FROM breakers WHERE open_until > ?",
+                (time.time(),)
+            ).fetchall()
+        return dict(rows)
+
+    def check(self, site: str):
+        """
+        Checks that a site's breaker is closed.
+
+        Args:
+        - site (str): The site name.
+
+        Raises:
+        - SiteBlockedError: If the breaker is open.
+        """
+        reason = self.open_sites().get(site)
+        if reason is not None:
+            raise SiteBlockedError(f"{site} is blocked: {reason}")
@@ -12,6 +12,8 @@ interface.
 
 import os
 import glob
+import functools
+import shutil
 from abc import ABC, abstractmethod
 import hashlib
 import random
@@ -20,17 +22,46 @@ from math import ceil
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.firefox.options import Options
-from selenium.common.exceptions import NoSuchElementException
-import pandas as pd
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import (
+    NoSuchElementException, TimeoutException
+)
+from datetime import datetime
+from typing import Iterator
 import yaml
-from bs4 import BeautifulSoup as bs
-from urllib.request import urlopen as uReq
+from pydantic import ValidationError
 import time
-import random as rand
 from uuid import UUID
-from etl.load.load_cassandra import CassandraIO, Job
+from etl.extract.browser_manager import BrowserManager, ProfileStock
+from etl.extract.browser_pool import BrowserPool, HostLimiter
+from etl.extract.card_parsers import (
+    CardParser, INDEED_CARD_FIELDS, LINKEDIN_CARD_FIELDS, JOBBERMAN_CARD_FIELDS
+)
+from etl.extract.checkpoint import ScrapeCheckpoint
+from etl.extract.http_fetcher import HttpFetcher
+from etl.extract.lean_browser import apply_lean_mode
+from etl.extract.page_store import PageStore
+from etl.extract.pager import FreshnessPager
+from etl.extract.replay import PageArchive
+from etl.extract.scrape_plans import load_plans
+from etl.extract.site_limits import (
+    CircuitBreaker, RateLimiter, SiteBlockedError
+)
+from etl.extract.page_parsers import (
+    AuthWallError, JOBBERMAN_SELECTORS, PAGE_PARSERS, is_auth_wall,
+    parse_indeed_page, parse_linkedin_page, parse_jobberman_page
+)
+from etl.load.load_cassandra import CassandraIO, Job, JobWriter
+from etl.transform.near_duplicates import open_index
+from etl.utils.metrics import instrumented
 from src.utils.pipeline_log_config import pipeline as logger
 
+# job details fetched from each job page
+DETAIL_FIELDS = ["job_desc", "seniority", "emp_type", "job_func", "ind"]
+
+# browsers shared by the scrapers of each site in this process
+browser_managers = {}
+
 
 def generate_profile() -> str:
     """
@@ -64,7 +95,85 @@ def generate_profile() -> str:
     return profile[23:]
 
 
-def scrape_with_retry(SiteScraper):
+def delete_profile(profile_path: str, profile_name: str):
+    """
+    Deletes the directory of a Firefox browser profile created by
+    `generate_profile`.
+
+    Args:
+    - profile_path (str): The directory of the Firefox profiles.
+    - profile_name (str): The name of the profile.
+    """
+    for directory in glob.glob(os.path.expanduser(
+            f"{profile_path}*.{profile_name}")):
+        shutil.rmtree(directory, ignore_errors=True)
+    logger.info(f"Deleted browser profile {profile_name}")
+
+
+def get_browser_manager(site: str, settings: dict,
+                        profile_path: str) -> BrowserManager:
+    """
+    Returns the browser manager shared by the scrapers of a site in this
+    process, creating it on first use.
+
+    A queue worker runs the tasks of every site in one process, and the
+    sites open their browsers differently (e.g. in lean mode or not), so
+    each site keeps its own warm sessions. Scrapers pass their own
+    `create_driver` to `acquire`, so the manager does not keep the first
+    scraper alive.
+
+    Args:
+    - site (str): The site, e.g. `indeed`.
+    - settings (dict): The `browsers` settings of the config file.
+    - profile_path (str): The directory of the Firefox profiles, where the
+      profiles of quit browsers are deleted.
+
+    Returns:
+    BrowserManager: The browser manager of the site.
+    """
+    if site not in browser_managers:
+        browser_managers[site] = BrowserManager(
+            None,
+            ProfileStock(
+                generate_profile,
+                settings["profile_stock"],
+                functools.partial(delete_profile, profile_path)
+            ),
+            settings["max_pages"],
+            settings["max_memory_growth_mb"]
+        )
+    return browser_managers[site]
+
+
+def close_browser_manager():
+    """
+    Quits the browsers of this process, stops creating profiles and deletes
+    the unused ones.
+    """
+    for site in list(browser_managers):
+        browser_managers.pop(site).close()
+
+
+def retry_delay(attempt: int, settings: dict) -> float:
+    """
+    Returns the delay before a retry, growing exponentially with the
+    attempt, with full jitter so retries of concurrent scrapers spread out.
+
+    Args:
+    - attempt (int): The number of the failed attempt, from 0.
+    - settings (dict): The `retry` settings of the config file, with the
+      `base_delay` and `max_delay` in seconds.
+
+    Returns:
+    float: The delay in seconds.
+    """
+    return random.uniform(
+        0,
+        min(settings["max_delay"], settings["base_delay"] * 2 ** attempt)
+    )
+
+
+def scrape_with_retry(SiteScraper) -> int:
     """
     Attempts to scrape a website using the provided `SiteScraper` class,
     handling exceptions with retries.
@@ -72,44 +181,65 @@ def scrape_with_retry(SiteScraper):
     Args:
     SiteScraper: A class that implements scraping functionality.
 
-    This function initializes a scraper with the default profile, attempts to
-    scrape data, creates a dataframe from the scraped data, and updates the
-    database. If an exception occurs (e.g., encountering an AuthWall),
-    it logs the error, generates a new browser profile, waits for 10 seconds,
-    and retries the scraping process with the new profile.
-
-    If the jobs dataframe is empty, indicating an AuthWall,
-    it raises an exception.
-
-    Note: 'SiteScraper' should implement necessary methods like 'scrape()',
-    'create_dataframe()', 'update_database()', and accept 'profile_name'
+    Returns:
+    int: The number of new jobs scraped.
+
+    This function initializes a scraper with the default profile and streams
+    the jobs it scrapes into the database. If an exception occurs (e.g.,
+    encountering an AuthWall), it logs the error, quits the browser with
+    the failed profile, takes a new browser profile from the stock, waits
+    for an exponentially growing, jittered delay (see `retry_delay`), and
+    retries the scraping process with the new profile, up to the number of
+    `attempts` in the `scraping.retry` settings. The job page browsers are
+    kept warm for the retries, and every browser is quit at the end.
+
+    If no new jobs are scraped, indicating an AuthWall,
+    it raises an exception, unless it is the last attempt. If the site's
+    circuit breaker tripped, the site is not retried.
+
+    Note: 'SiteScraper' should implement necessary methods like 'scrape()'
+    and 'update_database()', and accept 'profile_name'
     as an optional argument for profile usage.
     """
+    with open("./config/config.yaml", "r") as stream:
+        retry = yaml.safe_load(stream)["scraping"]["retry"]
+    attempts = max(retry["attempts"], 1)
+
+    # Start with the default profile
+    profile_name = "Selenium"
     try:
-        # Initialize scraper with default profile
-        scraper = SiteScraper()
-        _ = scraper.scrape()
-        jobs_df = scraper.create_dataframe()
-
-        # raise exception if the jobs dataframe is
-        # empty, signifying authwall
-        if len(jobs_df) == 0:
-            raise Exception("Ran into AuthWall")
-        scraper.update_database()
-
-    except Exception as e:
-        # log the error and create new profile
-        logger.error(f"Error scraping {SiteScraper.__class__.__name__}: {e}")
-        new_profile = generate_profile()
-        logger.info(f"New profile: {new_profile}")
-        logger.info("Sleeping for 10 seconds...")
-        # sleep for 10 seconds and try again
-        time.sleep(10)
-        logger.info("Retrying...")
-        scraper = SiteScraper(profile_name=new_profile)
-        _ = scraper.scrape()
-        _ = scraper.create_dataframe()
-        scraper.update_database()
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            try:
+                scraper = SiteScraper(profile_name=profile_name)
+                num_jobs = scraper.update_database(scraper.scrape())
+
+                # raise exception if no jobs were scraped, signifying authwall
+                if num_jobs == 0 and not last_attempt:
+                    raise Exception("Ran into AuthWall")
+                return num_jobs
+
+            except Exception as e:
+                # a blocked site is not retried until its breaker closes
+                if last_attempt or isinstance(e, SiteBlockedError):
+                    raise e
+                # log the error and take a new profile
+                logger.error(f"Error scraping {SiteScraper.__name__}: {e}")
+                browsers = browser_managers.get(
+                    SiteScraper.__name__[:-7].lower()
+                )
+                if browsers is None:
+                    new_profile = generate_profile()
+                else:
+                    browsers.recycle_idle(profile_name)
+                    new_profile = browsers.profiles.take()
+                profile_name = new_profile
+                logger.info(f"New profile: {new_profile}")
+                delay = retry_delay(attempt, retry)
+                logger.info(f"Retrying in {delay:.1f} seconds...")
+                time.sleep(delay)
+    finally:
+        close_browser_manager()
 
 
 class SiteScraper(ABC):
@@ -133,7 +263,7 @@ class SiteScraper(ABC):
         pass
 
     @abstractmethod
-    def create_dataframe(self):
+    def create_job(self):
         pass
 
     @abstractmethod
@@ -161,10 +291,32 @@ class IndeedScraper(SiteScraper, CassandraIO):
     parameters for the search URL, driver path, profile name, and the number
     of jobs to retrieve.
     """
+    # parser of the static HTML of job pages, or None if job pages
+    # can only be scraped in a browser
+    page_parser = None
+    # parser of the job cards of a search results page, and the CSS
+    # selector of the container of the cards
+    card_parser = CardParser("li", INDEED_CARD_FIELDS)
+    results_selector = "#mosaic-provider-jobcards"
+    # whether the scraper's browsers block images, fonts and third-party
+    # trackers, see `etl.extract.lean_browser`
+    lean_browser = False
+    # default search URL, with parameters for location and keywords
+    search_url = "https://ng.indeed.com/jobs?q=&l=Nigeria&from=searchOnHP&vjk=701c24acfea16b1d" # noqa
+    # search URL of a scrape plan's query and location, see
+    # `etl.extract.scrape_plans`
+    search_url_template = "https://ng.indeed.com/jobs?q={query}&l={location}"
+    # number of jobs on each search results page
+    jobs_per_page = 15
+    # whether all search results are listed on one scrolling page, so the
+    # pages cannot be visited separately
+    scrolling_results = False
+
     def __init__(self,
                  driver_path: str = "/usr/local/bin/geckodriver",
                  profile_name: str = "Selenium",
-                 url: str = "https://ng.indeed.com/jobs?q=&l=Nigeria&from=searchOnHP&vjk=701c24acfea16b1d", # noqa
+                 url: str = None,
+                 checkpointing: bool = True,
                  ):
         """
         Initializes an instance of a job website scraper.
@@ -172,14 +324,19 @@ class IndeedScraper(SiteScraper, CassandraIO):
         Args:
         - driver_path (str): The path to the geckodriver executable.
         - profile_name (str): The name of the Selenium profile to use.
-        - url (str): The URL of the website to scrape job listings from.
+        - url (str | None): The URL of the website to scrape job listings
+          from. Default is None (the searches of the site's scrape plans,
+          see `etl.extract.scrape_plans`).
+        - checkpointing (bool): Whether the run is checkpointed to disk and
+          resumed. Default is True. Task queue workers, which are
+          checkpointed by the queue, turn it off.
 
         This method initializes an instance of the class `SiteScraper`.
         It sets up the Selenium webdriver using provided options and
         configurations. It also loads configuration settings from a YAML file,
         configures the Selenium profile based on deployment settings,
-        and sets up attributes for URL, and various lists for job details
-        to construct the final dataframe.
+        and sets up attributes for URL, and the list of job cards from
+        which the jobs are built.
         """
         logger.info(f"Initializing {self.__class__.__name__}")
         CassandraIO.__init__(self)
@@ -201,70 +358,262 @@ class IndeedScraper(SiteScraper, CassandraIO):
             self.profile_path =\
                 self.config["selenium"]["profile_path"]["local"]
 
+        scraping = self.config["scraping"]
+        self.batch_size = scraping["batch_size"]
+
+        # Set up the checkpoint of the run, resuming an unfinished run
+        checkpoint_path = None
+        if checkpointing:
+            checkpoint_path = os.path.join(
+                scraping["checkpoints"]["path"],
+                f"{str(self.__class__.__name__)[:-7].lower()}.json"
+            )
+        self.checkpoint = ScrapeCheckpoint(
+            checkpoint_path,
+            scraping["checkpoints"]["max_age_hours"]
+        )
+        if self.checkpoint.resumed:
+            logger.info(
+                "Resuming scrape after "
+                f"{sum(self.checkpoint.pages_visited.values())} pages"
+                f" with {len(self.checkpoint.pending_cards())} pending jobs"
+            )
+
+        # Set up the state shared with the scrapers of other processes
+        self.set_up_shared_state()
+
+        # Set up the known job UUIDs, loaded on first use, and the job UUIDs
+        # seen on the current search results page
+        self.known_uuids = None
+        self.page_seen = []
+
         logger.info("Setting up webdriver")
         try:
-            # Configure Selenium
-            options = Options()
-            # set headless mode
-            options.add_argument("--headless")
-            # set profile
-            options.add_argument("-profile")
-            options.add_argument(glob.glob(os.path.expanduser(
-                f"{self.profile_path}*.{profile_name}"
-                ))[0])
             self.driver_path = driver_path
-            # set driver
-            self.driver = webdriver.Firefox(options=options)
+            # set driver, reusing a warm browser of this process if one
+            # with the profile is idle
+            self.browsers = get_browser_manager(
+                self.site,
+                self.config["selenium"]["browsers"],
+                self.profile_path
+            )
+            self.driver = self.acquire_browser(profile_name)
             logger.info("webdriver setup successful")
         except Exception as e:
             logger.error(f"webdriver setup failed: {e}")
             raise e
 
-        # Set url and number of jobs
-        self.url = url
-        self.num_jobs = self.config["selenium"]["num_jobs"]
-
-        # Set up dataframe lists
-        self.uuid = []
-        self.job_id = []
-        self.job_title = []
-        self.company_name = []
-        self.location = []
-        self.date = []
-        self.job_link = []
-        self.job_desc = []
-        self.seniority = []
-        self.emp_type = []
-        self.job_func = []
-        self.ind = []
+        # Set the searches to scrape, the url of the first one and the
+        # total number of jobs
+        if url is None:
+            self.plans = load_plans(self.__class__, self.config)
+        else:
+            self.plans = [{
+                "name": url,
+                "url": url,
+                "quota": self.config["selenium"]["num_jobs"],
+                "priority": 0
+            }]
+        self.url = self.plans[0]["url"]
+        self.num_jobs = sum(plan["quota"] for plan in self.plans)
+        self.card_parsing = self.config["selenium"]["card_parsing"]
+        self.load_timeout = self.config["selenium"]["load_timeout"]
+
+        # Set up early stopping once pages hold no new jobs, with one pager
+        # per search
+        self.pagers = []
+        self.pager = self.create_pager()
+
+        # Set job page worker pool settings
+        self.detail_workers = self.config["selenium"]["detail_workers"]
+        self.host_limits = self.config["selenium"]["host_limits"]
+        self.http = HttpFetcher(
+            self.config["http"],
+            max_connections=self.detail_workers
+        )
+
+        # Set up list of job cards, each holding the details of a job
+        # collected from the search results pages
+        self.cards = []
+
+    def set_up_shared_state(self):
+        """
+        Sets up the state the scraper shares with the scrapers of other
+        processes: the index merging the near-duplicates of jobs posted on
+        several sites, the site's request rates and circuit breaker, the
+        store of job pages, and the archive recording the loaded pages, if
+        recording is on.
+        """
+        scraping = self.config["scraping"]
+        self.site = str(self.__class__.__name__)[:-7].lower()
+
+        self.deduplicator = open_index(scraping["near_duplicates"])
+
+        site_limits = self.config["site_limits"]
+        self.rate_limiter = RateLimiter(
+            site_limits["path"], site_limits["rates"]
+        )
+        self.breaker = CircuitBreaker(
+            site_limits["path"],
+            site_limits["breaker_threshold"],
+            site_limits["breaker_cooldown"]
+        )
+
+        self.page_store = None
+        page_store = scraping["page_store"]
+        if page_store["enabled"]:
+            self.page_store = PageStore(
+                page_store["path"],
+                page_store["max_mb"] * 2 ** 20,
+                page_store["level"]
+            )
 
-    def scrape(self):
+        self.archive = None
+        if self.config["replay"]["record"] is not None:
+            self.archive = PageArchive(self.config["replay"]["record"])
+
+    def acquire_browser(self, profile_name: str = None):
+        """
+        Acquires a warm browser of the site from the browser manager, or
+        opens one with `create_driver`.
+
+        Args:
+        - profile_name (str | None): The profile the browser must use.
+          Default is None (any profile).
+
+        Returns:
+        - ManagedSession: The browser, to be given back to the manager.
+        """
+        return self.browsers.acquire(profile_name, self.create_driver)
+
+    def create_driver(self, profile_name: str):
+        """
+        Creates a headless Firefox webdriver using a Selenium profile, in
+        lean mode if the scraper opts in with `lean_browser`.
+
+        Args:
+        - profile_name (str): The name of the Selenium profile to use.
+
+        Returns:
+        - webdriver.Firefox: The new webdriver.
+        """
+        # Configure Selenium
+        options = Options()
+        # set headless mode
+        options.add_argument("--headless")
+        # set profile
+        options.add_argument("-profile")
+        options.add_argument(glob.glob(os.path.expanduser(
+            f"{self.profile_path}*.{profile_name}"
+            ))[0])
+        # skip the resources the scraper does not read
+        if self.lean_browser:
+            apply_lean_mode(options, self.config["selenium"]["lean_blocklist"])
+        return webdriver.Firefox(options=options)
+
+    def create_pager(self) -> FreshnessPager:
+        """
+        Creates the pager of the current search, `self.url`.
+
+        Returns:
+        FreshnessPager: The pager, also added to `self.pagers`.
+        """
+        scraping = self.config["scraping"]
+        pager = FreshnessPager(
+            scraping["pager"]["watermarks"],
+            f"{str(self.__class__.__name__)[:-7]}:{self.url}",
+            scraping["pager"]["patience"]
+        )
+        self.pagers.append(pager)
+        return pager
+
+    def visit_plans(self):
+        """
+        Visits the search results pages of every scrape plan, highest
+        priority first, resuming each search after its checkpointed pages.
+
+        The new job cards of all the searches are collected into
+        `self.cards`. A job listed by several searches is known once its
+        first search collected it, so its job page is only fetched once.
+        """
+        for plan in self.plans:
+            self.url = plan["url"]
+            if plan is not self.plans[0]:
+                self.pager = self.create_pager()
+            pages = range(
+                self.checkpoint.pages_visited.get(self.url, 0),
+                self.count_pages(plan["quota"])
+            )
+            if len(pages) == 0:
+                continue
+            logger.info(
+                f"Searching {plan['name']} for {plan['quota']} jobs"
+            )
+            self.visit_pages(pages)
+
+    def save_pagers(self):
+        """
+        Saves the watermarks of every search once a run is complete.
+        """
+        for pager in self.pagers:
+            pager.save()
+
+    @instrumented("scrape")
+    def scrape(self) -> Iterator[Job]:
         """
         Scrapes job listings from Indeed based on the initialized parameters.
 
+        Yields:
+        Job: Each new job, as soon as its job page has been scraped.
+
         This method initiates the scraping process for job listings
         from Indeed. It calculates the number of pages required to retrieve
         the desired number of jobs based on the assumption of 15 jobs per page.
-        Then, it iterates through each page, fetching job cards, closing the
-        email pop-up if present, and retrieving job details.
-        Finally, it closes the webdriver after scraping all necessary data.
+        Then, it iterates through each page of each search of the scrape
+        plans, fetching job cards, closing the email pop-up if present, and
+        retrieving job details.
+        Finally, it gives the webdriver back to the browser manager after
+        scraping all necessary data.
 
         Note: The `get_jobs` and `get_job_details` methods should be
         implemented to process job cards and extract detailed information.
         """
         logger.info(f"Scraping {self.num_jobs} jobs from Indeed")
-        # set number of pages based on the number
-        # of jobs per page on the website
-        num_of_pages = ceil(self.num_jobs / 15)
+        try:
+            # scrape the pages of every search in a loop
+            self.visit_plans()
+            # get the rest of the details by loading each job page
+            yield from self.get_job_details(self.checkpoint.pending_cards())
+        finally:
+            self.close()
+        self.checkpoint.clear()
+        self.save_pagers()
+        logger.info(f"Scraped {len(self.checkpoint.cards)} jobs")
+
+    @classmethod
+    def count_pages(cls, num_jobs: int) -> int:
+        """
+        Returns the number of search results pages listing a number of jobs.
 
-        if num_of_pages == 0:
-            num_of_pages = 1
-        else:
-            pass
+        Args:
+        - num_jobs (int): The number of jobs.
 
-        # scrape pages in a loop
+        Returns:
+        int: The number of pages, at least 1.
+        """
+        return max(ceil(num_jobs / cls.jobs_per_page), 1)
+
+    def visit_pages(self, pages: range):
+        """
+        Visits Indeed search results pages and collects their job cards
+        into `self.cards`, stopping early once the `pager` finds no more
+        new jobs.
+
+        Args:
+        - pages (range): The numbers of the pages, from 0.
+        """
         wd = self.driver
-        for i in range(0, num_of_pages):
+        for i in pages:
             # dynamically construct the page url
             extension = ""
             if i != 0:
@@ -272,10 +621,10 @@ class IndeedScraper(SiteScraper, CassandraIO):
 
             url = self.url + extension
             # fetch the page and get the job cards
-            wd.get(url)
+            self.open_page(wd, url, "list")
             jobs_lists = wd.find_element(
                 By.CSS_SELECTOR,
-                "#mosaic-provider-jobcards"
+                self.results_selector
             )
             jobs = jobs_lists.find_elements(By.TAG_NAME, "li")  # return a list
 
@@ -288,191 +637,407 @@ class IndeedScraper(SiteScraper, CassandraIO):
                 logger.error(f"Email pop-up not found: {e}")
 
             # fetch the details from each job card
-            self.get_jobs(jobs)
+            num_cards = len(self.cards)
+            self.get_jobs(jobs, jobs_lists)
+            if self.record_page(self.cards[num_cards:]):
+                break
 
-        # get the rest of the details by loading each job page
-        self.get_job_details(self.job_link)
-        wd.close()
-        logger.info(f"Scraped {len(self.job_link)} jobs")
+    def open_page(self, wd, url: str, kind: str = "detail"):
+        """
+        Loads a page in a browser at the site's shared request rate, and
+        records whether the site blocked it in the site's circuit breaker.
 
-    def get_jobs(self, jobs: list):
+        Args:
+        - wd (webdriver.Firefox): The webdriver used to load the page.
+        - url (str): The URL of the page.
+        - kind (str): The kind of page, `list` for search results pages
+          or `detail` for job pages, under which the page is recorded if
+          recording is on. Job pages are kept in the page store. Default
+          is `detail`.
+
+        Raises:
+        - SiteBlockedError: If the site's breaker is open, in which case
+          the page is not loaded.
+        - AuthWallError: If the page is an auth wall or captcha.
         """
-        Extracts job details from the provided list of job cards.
+        self.breaker.check(self.site)
+        self.rate_limiter.acquire(url)
+        wd.get(url)
+        html = wd.page_source
+        if is_auth_wall(wd.current_url, 200, html):
+            self.breaker.record_block(self.site, wd.current_url)
+            raise AuthWallError(f"Auth wall at {wd.current_url}")
+        self.breaker.record_success(self.site)
+        self.archive_page(kind, url, html)
+        if kind == "detail":
+            self.store_page(url, html)
+
+    def archive_page(self, kind: str, url: str, html: str):
+        """
+        Records a loaded page into the page archive, if recording is on.
 
         Args:
-        - jobs (list): A list of job card elements containing job details.
+        - kind (str): The kind of page, `list` or `detail`.
+        - url (str): The URL of the page.
+        - html (str): The HTML of the page.
+        """
+        if self.archive is None:
+            return
+        try:
+            self.archive.add(self.site, kind, url, html)
+        except Exception as e:
+            logger.error(f"Error recording {url}: {e}")
 
-        This method processes each job card element passed as an argument.
-        It extracts various job details such as job link, job ID, job title,
-        company name, location, and creation date.
-        It generates UUIDs for the jobs based on their links, checks if the
-        job already exists in the database, and appends the details to
-        respective lists for further processing.
+    def store_page(self, url: str, html: str):
+        """
+        Keeps a job page in the page store, if the store is enabled.
 
-        Note: This method assumes a specific structure of HTML elements
-        representing job details within each job card. Thus, it may need
-        to be updated if the structure changes.
+        Args:
+        - url (str): The URL of the job page.
+        - html (str): The HTML of the page.
+        """
+        if self.page_store is None:
+            return
+        try:
+            self.page_store.add(
+                str(self.generate_uuid(url)), self.site, url, html
+            )
+        except Exception as e:
+            logger.error(f"Error storing {url}: {e}")
+
+    def mark_parsed(self, url: str, details: dict):
+        """
+        Records in the page store the parser version which extracted the
+        details of a stored job page, if the store is enabled.
+
+        Args:
+        - url (str): The URL of the job page.
+        - details (dict): The extracted details.
+        """
+        if self.page_store is None:
+            return
+        try:
+            self.page_store.mark_parsed(
+                str(self.generate_uuid(url)), PAGE_PARSERS[self.site][0],
+                details
+            )
+        except Exception as e:
+            logger.error(f"Error storing details of {url}: {e}")
+
+    def close(self):
+        """
+        Gives the scraper's webdriver back to the browser manager.
+        """
+        self.browsers.release(self.driver)
+
+    def load_known_uuids(self) -> set[str]:
+        """
+        Returns the UUIDs of the jobs in the database, merged into another
+        job as near-duplicates or already collected by this run, loading
+        them on first use.
+
+        Returns:
+        set[str]: The known job UUIDs.
+        """
+        if self.known_uuids is None:
+            # get existing job UUIDs from cassandra database
+            self.get_uuids()
+            self.known_uuids = set(self.uuids) | self.checkpoint.known_uuids()
+            if self.deduplicator is not None:
+                self.known_uuids |= self.deduplicator.duplicate_uuids()
+        return self.known_uuids
+
+    def is_known(self, uuid: UUID) -> bool:
+        """
+        Checks whether a job is already in the database or was already
+        collected by this run, and records it as seen on the current page.
+
+        Args:
+        - uuid (UUID): The UUID of the job.
+
+        Returns:
+        bool: True if the job is known.
         """
-        # get existing job UUIDs from cassandra database
-        self.get_uuids()
+        known = str(uuid) in self.load_known_uuids()
+        self.page_seen.append((str(uuid), known))
+        self.known_uuids.add(str(uuid))
+        return known
 
-        # loop through each job card and store details
-        # in growing lists for each property
+    def record_page(self, cards: list[dict]) -> bool:
+        """
+        Checkpoints a visited search results page and its new job cards.
+
+        Args:
+        - cards (list[dict]): The new job cards of the page.
+
+        Returns:
+        bool: True if the `pager` stops pagination because the page held
+        no new jobs, so the remaining pages, which list older jobs, can be
+        skipped.
+        """
+        self.checkpoint.add_page(cards, self.url)
+        seen, self.page_seen = self.page_seen, []
+        if not self.pager.add_page(seen):
+            logger.info("No more new jobs listed, stopping pagination")
+            return True
+        return False
+
+    def get_jobs(self, jobs: list, container=None):
+        """
+        Extracts job details from the provided list of job cards.
+
+        Args:
+        - jobs (list): A list of job card elements containing job details.
+        - container (WebElement | None): The element holding the job cards.
+          Default is None.
+
+        This method collects the job link, job ID, job title, company name,
+        location and creation date of each job card. If `card_parsing` is
+        enabled and the container is given, the container's HTML is read
+        once and every card is parsed in-process by `card_parser`; cards
+        which cannot be parsed are read through the webdriver with
+        `read_card`. Known jobs are skipped, and each complete card is
+        appended to `self.cards` for further processing, so a card with a
+        missing detail is skipped as a whole.
+        """
+        # loop through each job card and store its details
         logger.info(f"Parsing {len(jobs)} job cards")
-        n = 0
-        for job in jobs:
-            n += 1
+        parsed = self.parse_cards(container, len(jobs))
+        for n, (job, fields) in enumerate(zip(jobs, parsed), start=1):
             try:
-                # get the job link
-                job_link0 = job.find_element(
-                    By.XPATH,
-                    f'//*[@id="mosaic-provider-jobcards"]/ul/li[{n}]/div[contains(@class,' # noqa
-                    f'"cardOutline")]/div[1]/div/div[1]/div/table[1]/tbody/tr/td/div[' # noqa
-                    f'1]/h2/a').get_attribute('href')
-
-                # check if job already exists by comparing its hashed link
-                # with those on the database and skip its scraping if
-                # there's a match by raising an assertion error
-                temp_uuid = self.generate_uuid(job_link0)
-                assert str(temp_uuid) not in self.uuids, f"Job {temp_uuid} already exists" # noqa
-                # continue if no assertion error
-                self.job_link.append(job_link0)
-                self.uuid.append(temp_uuid)
-
-                # get job ID
-                job_id0 = job.find_element(
-                    By.XPATH,
-                    f'//*[@id="mosaic-provider-jobcards"]/ul/li[{n}]/div[contains(@class,' # noqa
-                    f'"cardOutline")]/div[1]/div/div[1]/div/table[1]/tbody/tr/td/div[' # noqa
-                    f'1]/h2/a/span').get_attribute('id')
-                self.job_id.append(job_id0)
-
-                # get job title
-                job_title0 = job.find_element(
-                    By.XPATH,
-                    f'//*[@id="mosaic-provider-jobcards"]/ul/li[{n}]/div[contains(@class,' # noqa
-                    f'"cardOutline")]/div[1]/div/div[1]/div/table[1]/tbody/tr/td/div[' # noqa
-                    f'1]/h2').get_attribute('innerText')
-                self.job_title.append(job_title0)
-
-                # get company name
-                company_name0 = job.find_element(
-                    By.XPATH,
-                    f'//*[@id="mosaic-provider-jobcards"]/ul/li[{n}]/div[contains(@class,' # noqa
-                    f'"cardOutline")]/div[1]/div/div[1]/div/table[1]/tbody/tr/td/div[' # noqa
-                    f'2]/div/span').get_attribute('innerText')
-                self.company_name.append(company_name0)
-
-                # get location
-                location0 = job.find_element(
-                    By.XPATH,
-                    f'//*[@id="mosaic-provider-jobcards"]/ul/li[{n}]/div[contains(@class,' # noqa
-                    f'"cardOutline")]/div[1]/div/div[1]/div/table[1]/tbody/tr/td/div[' # noqa
-                    f'2]/div').get_attribute('innerText')
-                self.location.append(location0)
-
-                # get job creation date
-                date0 = job.find_element(
-                    By.XPATH,
-                    f'//*[@id="mosaic-provider-jobcards"]/ul/li[{n}]/div[contains(@class,' # noqa
-                    f'"cardOutline")]/div[1]/div/div[1]/div/table[2]/tbody/tr[2]/td/div[1]/span[' # noqa
-                    f'1]').text
-                self.date.append(date0)
+                if fields is None:
+                    card = self.read_card(job, n)
+                else:
+                    fields = dict(fields)
+                    card = self.new_card(fields.pop("job_link"))
+                    card.update(fields)
+
+                # add the card once all its details are collected
+                self.cards.append(card)
 
             except Exception as e:
                 logger.error(f"Error getting job {n} details: {e}")
 
-    def get_job_details(self, job_link: list):
+    def parse_cards(self, container, num_jobs: int) -> list[dict | None]:
+        """
+        Parses the job cards of a search results page from the HTML of
+        their container in a single pass.
+
+        Args:
+        - container (WebElement | None): The element holding the job cards.
+        - num_jobs (int): The number of job cards listed by the webdriver.
+
+        Returns:
+        list[dict | None]: The fields of each job card, or None for the
+        cards which have to be read through the webdriver (all of them if
+        card parsing is disabled or the cards do not match).
+        """
+        unparsed = [None] * num_jobs
+        if container is None or not self.card_parsing:
+            return unparsed
+        try:
+            parsed = self.card_parser.parse(
+                container.get_attribute("outerHTML")
+            )
+        except Exception as e:
+            logger.error(f"Error parsing job cards: {e}")
+            return unparsed
+        if len(parsed) != num_jobs:
+            logger.error(
+                f"Parsed {len(parsed)} of {num_jobs} job cards, "
+                "reading them with the webdriver"
+            )
+            return unparsed
+        return parsed
+
+    def new_card(self, job_link: str) -> dict:
         """
-        Retrieves additional job details from the provided
-        list of job page links.
+        Starts the card of a job from its link.
 
         Args:
-        - job_link (list): A list containing URLs of job pages.
+        - job_link (str): The link of the job.
 
-        This method iterates through each job page URL provided in the list.
-        For each URL, it loads the job page, fetches specific details such as
-        job description, seniority level, employment type, job function,
-        and job industry. It populates respective lists with fetched details
-        for further processing.
+        Returns:
+        dict: The card, with the job's UUID and link.
 
-        Note: This method assumes certain HTML structures for
-        job details on the job pages.
+        Raises:
+        AssertionError: If the job is already known, so its scraping is
+        skipped.
         """
-        logger.info(f"Getting job page details for {len(job_link)} jobs")
+        # check if job already exists by comparing its hashed link
+        # with those on the database
+        temp_uuid = self.generate_uuid(job_link)
+        assert not self.is_known(temp_uuid), f"Job {temp_uuid} already exists" # noqa
+        return {"uuid": temp_uuid, "job_link": job_link}
 
-        # loop throught he list of job pages, load each job page
-        # and fetch more details
+    def read_card(self, job, n: int) -> dict:
+        """
+        Reads the details of an Indeed job card through the webdriver.
 
-        # initialize page counter
-        page = 0
+        Args:
+        - job (WebElement): The job card element.
+        - n (int): The position of the job card on the page, from 1.
 
-        # set driver as `wd` for easy referencing
-        wd = self.driver
-        for link in job_link:
-            page += 1
+        Returns:
+        dict: The job card.
 
-            try:
-                # Load job page
-                wd.get(link)
-
-                try:
-                    # Get job description
-                    job_description = wd.find_element(
-                        By.CLASS_NAME,
-                        "jobsearch-jobDescriptionText"
-                    ).get_attribute(
-                        'innerText'
-                    )
-                    self.job_desc.append(job_description)
-                except Exception as e:
-                    logger.error(f"Error getting job description: {e}")
-                    self.job_desc.append('NA')
-
-                # Seniority level
-                seniority_level = 'Unavailable on Indeed'
-                self.seniority.append(seniority_level)
-
-                # Employment type
-                selectors = [
-                    ".css-1p3gyjy > div:nth-child(1) > div:nth-child(1)",
-                    "div.css-1p3gyjy:nth-child(1) > div:nth-child(1) > div:nth-child(1)", # noqa
-                    ".css-tvvxwd"
-                ]
-                employment_type = 'NA'
-                # Loop through the selectors and
-                # try to find the employment type
-                for selector in selectors:
-                    try:
-                        employment_type = wd.find_element(
-                            By.CSS_SELECTOR,
-                            selector
-                        ).get_attribute('innerText')
-                        break  # If found, exit the loop
-                    except NoSuchElementException:
-                        continue  # If not found, try the next selector
-
-                # Append the employment type to list
-                self.emp_type.append(employment_type)
-
-                # Job function
-                job_function = 'Unavailable on Indeed'
-                self.job_func.append(job_function)
-
-                # Job industry
-                industries = 'Unavailable on Indeed'
-                self.ind.append(industries)
+        Note: This method assumes a specific structure of HTML elements
+        representing job details within each job card. Thus, it may need
+        to be updated if the structure changes.
+        """
+        # get the job link, skipping known jobs
+        job_link0 = job.find_element(
+            By.XPATH,
+            f'//*[@id="mosaic-provider-jobcards"]/ul/li[{n}]/div[contains(@class,' # noqa
+            f'"cardOutline")]/div[1]/div/div[1]/div/table[1]/tbody/tr/td/div[' # noqa
+            f'1]/h2/a').get_attribute('href')
+        card = self.new_card(job_link0)
+
+        # get job ID
+        job_id0 = job.find_element(
+            By.XPATH,
+            f'//*[@id="mosaic-provider-jobcards"]/ul/li[{n}]/div[contains(@class,' # noqa
+            f'"cardOutline")]/div[1]/div/div[1]/div/table[1]/tbody/tr/td/div[' # noqa
+            f'1]/h2/a/span').get_attribute('id')
+        card["job_id"] = job_id0
+
+        # get job title
+        job_title0 = job.find_element(
+            By.XPATH,
+            f'//*[@id="mosaic-provider-jobcards"]/ul/li[{n}]/div[contains(@class,' # noqa
+            f'"cardOutline")]/div[1]/div/div[1]/div/table[1]/tbody/tr/td/div[' # noqa
+            f'1]/h2').get_attribute('innerText')
+        card["job_title"] = job_title0
+
+        # get company name
+        company_name0 = job.find_element(
+            By.XPATH,
+            f'//*[@id="mosaic-provider-jobcards"]/ul/li[{n}]/div[contains(@class,' # noqa
+            f'"cardOutline")]/div[1]/div/div[1]/div/table[1]/tbody/tr/td/div[' # noqa
+            f'2]/div/span').get_attribute('innerText')
+        card["company_name"] = company_name0
+
+        # get location
+        location0 = job.find_element(
+            By.XPATH,
+            f'//*[@id="mosaic-provider-jobcards"]/ul/li[{n}]/div[contains(@class,' # noqa
+            f'"cardOutline")]/div[1]/div/div[1]/div/table[1]/tbody/tr/td/div[' # noqa
+            f'2]/div').get_attribute('innerText')
+        card["location"] = location0
+
+        # get job creation date
+        date0 = job.find_element(
+            By.XPATH,
+            f'//*[@id="mosaic-provider-jobcards"]/ul/li[{n}]/div[contains(@class,' # noqa
+            f'"cardOutline")]/div[1]/div/div[1]/div/table[2]/tbody/tr[2]/td/div[1]/span[' # noqa
+            f'1]').text
+        card["date"] = date0
+        return card
+
+    @instrumented("job_details")
+    def get_job_details(self, cards: list[dict]) -> Iterator[Job]:
+        """
+        Retrieves additional job details from the job page of each job card.
+
+        Args:
+        - cards (list[dict]): The job cards, each with the job's link.
+
+        Yields:
+        Job: The job of each card, in card order, as soon as its job page
+        has been scraped.
+
+        This method fetches every job page with `fetch_job_page`.
+        Pages are fetched by a pool of `detail_workers` workers, each with
+        its own headless browser session from the browser manager (the
+        scraper's own webdriver is reused by the first worker), subject to
+        the per-host concurrency caps and politeness delays in
+        `host_limits`. For scrapers with a `page_parser`, worker browsers
+        are only started once a page has to be loaded in a browser.
+        If a page cannot be fetched, its details are set to `NA`, unless
+        the site's circuit breaker tripped, which stops the scrape.
+        """
+        logger.info(f"Getting job page details for {len(cards)} jobs")
+
+        pool = BrowserPool(
+            self.detail_workers,
+            HostLimiter(self.host_limits),
+            open_session=self.acquire_browser,
+            close_session=self.browsers.release,
+            lazy=self.page_parser is not None
+        )
+        details = pool.imap(
+            self.fetch_job_page,
+            [card["job_link"] for card in cards],
+            [self.driver]
+        )
+
+        # combine each card with the details of its page
+        for card, page_details in zip(cards, details):
+            if page_details is None:
+                # stop once the site blocks the scraper, leaving the
+                # remaining cards to the next run
+                self.breaker.check(self.site)
+                page_details = dict.fromkeys(DETAIL_FIELDS, "NA")
+            job = self.create_job(card, page_details)
+            if job is not None:
+                yield job
+
+    def fetch_job_page(self, wd, link: str) -> dict:
+        """
+        Fetches the details of a job page, over HTTP first if the scraper
+        has a `page_parser`.
+
+        Args:
+        - wd (webdriver.Firefox): The webdriver used if the page has to be
+          loaded in a browser.
+        - link (str): The URL of the job page.
+
+        Returns:
+        - dict: The job details, keyed by `DETAIL_FIELDS`.
 
+        The page is loaded in the browser with `get_job_page` when the
+        static HTML cannot be fetched or parsed, e.g. when the site answers
+        with an auth wall. Either way, the page is kept in the page store.
+        """
+        details = None
+        if self.page_parser is not None:
+            try:
+                self.breaker.check(self.site)
+                self.rate_limiter.acquire(link)
+                html = self.http.get(link)
+                self.archive_page("detail", link, html)
+                self.store_page(link, html)
+                details = self.page_parser(html)
+            except SiteBlockedError:
+                raise
             except Exception as e:
-                # in case of error, log the error and append
-                # `NA` to all missing fields to ensure consistency
-                # of list indices
-                logger.error(f'Error scraping Page {page}: {e}')
-                self.job_desc.append("NA")
-                self.seniority.append("NA")
-                self.emp_type.append("NA")
-                self.job_func.append("NA")
-                self.ind.append("NA")
+                logger.info(f"Loading {link} in browser: {e}")
+        if details is None:
+            details = self.get_job_page(wd, link)
+        self.mark_parsed(link, details)
+        return details
+
+    def get_job_page(self, wd, link: str) -> dict:
+        """
+        Loads an Indeed job page and fetches its details.
+
+        Args:
+        - wd (webdriver.Firefox): The webdriver used to load the page.
+        - link (str): The URL of the job page.
+
+        Returns:
+        - dict: The job description, seniority level, employment type,
+          job function and job industry, keyed by `DETAIL_FIELDS`.
+
+        The details are parsed from the page source with
+        `parse_indeed_page`, the parser re-applied to the stored pages,
+        rather than with a round trip to the browser per element.
+
+        Note: This method assumes certain HTML structures for
+        job details on the job pages.
+        """
+        self.open_page(wd, link)
+        return parse_indeed_page(wd.page_source)
 
     @staticmethod
     def generate_uuid(job_link: str) -> UUID:
@@ -491,83 +1056,63 @@ class IndeedScraper(SiteScraper, CassandraIO):
         # convert hex string to UUID and return
         return UUID(hex=hex_string)
 
-    def create_dataframe(self):
+    def create_job(self, card: dict, details: dict) -> Job | None:
         """
-        Creates a pandas DataFrame from the scraped job details.
+        Creates a job from its job card and job page details.
+
+        Args:
+        - card (dict): The details collected from the job card.
+        - details (dict): The details fetched from the job page.
 
         Returns:
-        pandas.DataFrame: A DataFrame containing job details
-        extracted during scraping.
-
-        This method constructs a pandas DataFrame using the job details stored
-        in various lists such as UUIDs, job IDs, job titles, company names,
-        locations, dates, job links, descriptions, seniority, employment types,
-        job functions, and industries.
-        The DataFrame includes additional metadata like the scraping
-        timestamp and source class name.
-        """
-        logger.info("Creating jobs dataframe")
-
-        # create jobs dataframe using the populated lists
-        # as well as the scraped_at timestamp and source of
-        # the job as the class name from which it was generated
-        jobs_dataframe = pd.DataFrame({
-            'uuid': self.uuid,
-            'skipped': False,
-            'scraped_at': pd.to_datetime('today'),
-            'source': str(self.__class__.__name__)[:-7],
-            'job_id': self.job_id,
-            'job_title': self.job_title,
-            'company_name': self.company_name,
-            'location': self.location,
-            'date': self.date,
-            'job_link': self.job_link,
-            'job_desc': self.job_desc,
-            'seniority': self.seniority,
-            'emp_type': self.emp_type,
-            'job_func': self.job_func,
-            'ind': self.ind
-        })
-        return jobs_dataframe
+        Job | None: The job, with the scraping timestamp and the source
+        class name, or None if the job is invalid.
+        """
+        try:
+            return Job(
+                skipped=False,
+                scraped_at=datetime.now(),
+                source=str(self.__class__.__name__)[:-7],
+                **card,
+                **details
+            )
+        except ValidationError as e:
+            logger.error(f"Invalid job {card['job_link']}: {e}")
+            return None
 
-    def update_database(self):
+    def update_database(self, jobs: Iterator[Job]) -> int:
         """
-        Updates the database with new job listings.
+        Writes new job listings to the database as they are scraped.
 
-        This method creates a DataFrame from the scraped data and
-        checks if it contains new job listings.
-        If new listings are found, it formats each job as a `Job` object and
-        adds them to the database's `job_listings` table using the `write_jobs`
-        method from the `CassandraIO` class. If the DataFrame is
-        empty, it skips the update.
+        Args:
+        - jobs (Iterator[Job]): The scraped jobs, e.g. from `scrape`.
 
-        Note: This method assumes the existence of a `Job` class and a
-        `write_jobs` method in the `CassandraIO` class.
+        Returns:
+        int: The number of new jobs, including the near-duplicates merged
+        into other jobs.
+
+        This method streams the jobs into a `JobWriter`, which adds them to
+        the database's `job_listings` table using the `write_jobs` method
+        from the `CassandraIO` class every `batch_size` jobs, so jobs land
+        in the database while scraping is still running. Near-duplicates of
+        jobs posted on other sites are merged into their canonical jobs as
+        alternate links instead, see `etl.transform.near_duplicates`.
         """
         logger.info("Updating database")
-        # create the dataframe from the scraped data
-        new_jobs_df = self.create_dataframe()
+        with JobWriter(self, self.batch_size,
+                       on_flush=self.checkpoint.mark_written,
+                       deduplicator=self.deduplicator) as writer:
+            for job in jobs:
+                writer.add(job)
 
-        if new_jobs_df.empty:
-            # skip the update if the dataframe is empty
+        if writer.written + writer.duplicates == 0:
             logger.info("No new jobs found")
         else:
-            logger.info(f"Found {len(new_jobs_df)} new jobs")
-            # initialize list to hold formatted jobs
-            jobs = []
-            # iterate though each row of the jobs dataframe
-            # and format each job as a `Job` object according to
-            # the jobs table schema
-            for _, row in new_jobs_df.iterrows():
-                jobs.append(Job(**row.to_dict()))
-            # write the jobs to the database
-            logger.info(f"Adding {len(jobs)} new jobs to job_listings table")
-            try:
-                # use the `write_jobs` method from the `CassandraIO` class
-                self.write_jobs(jobs)
-                logger.info(f"{len(jobs)} new jobs added successfully")
-            except Exception as e:
-                logger.error(f"Error writing jobs to database: {e}")
+            logger.info(
+                f"{writer.written} new jobs added, {writer.duplicates} "
+                "near-duplicates merged"
+            )
+        return writer.written + writer.duplicates
 
 
 class LinkedinScraper(IndeedScraper):
@@ -588,215 +1133,265 @@ class LinkedinScraper(IndeedScraper):
     It inherits functionality from the IndeedScraper
     class and customizes LinkedIn-specific parameters.
     """
+    page_parser = staticmethod(parse_linkedin_page)
+    card_parser = CardParser("li", LINKEDIN_CARD_FIELDS)
+    results_selector = ".jobs-search__results-list"
+    lean_browser = True
+    search_url = str("https://www.linkedin.com/jobs/search?" +
+                     "keywords=&location=Nigeria&geoId=" +
+                     "105365761&trk=public_jobs_jobs-search-bar_search-submit" + # noqa
+                     "&position=1&pageNum=0")
+    search_url_template = str("https://www.linkedin.com/jobs/search?" +
+                              "keywords={query}&location={location}" +
+                              "&position=1&pageNum=0")
+    jobs_per_page = 25
+    scrolling_results = True
+
     def __init__(self, driver_path: str = "/usr/local/bin/geckodriver",
                  profile_name: str = "Selenium",
-                 url: str = str("https://www.linkedin.com/jobs/search?" + # noqa
-                                "keywords=&location=Nigeria&geoId=" +
-                                "105365761&trk=public_jobs_jobs-search-bar_search-submit" + # noqa
-                                "&position=1&pageNum=0"),
+                 url: str = None,
+                 checkpointing: bool = True,
                  ):
-        super().__init__(driver_path, profile_name, url)
+        super().__init__(driver_path, profile_name, url, checkpointing)
 
-    def scrape(self):
+    @instrumented("scrape")
+    def scrape(self) -> Iterator[Job]:
         """
         Scrapes job listings from LinkedIn.
 
+        Yields:
+        Job: Each new job, as soon as its job page has been scraped.
+
         This method performs the scraping process for job listings on LinkedIn.
-        It loads the LinkedIn job search page, sets the number of pages to be
-        scrolled based on the desired number of jobs, iterates through the
-        pages, retrieves job cards, and extracts job details.
-        It closes the webdriver after scraping.
+        For each search of the scrape plans, it loads the LinkedIn job search
+        page, sets the number of pages to be scrolled based on the desired
+        number of jobs, iterates through the pages and retrieves job cards.
+        It then extracts the job details of the cards of every search.
+        It gives the webdriver back to the browser manager after scraping.
+        Errors are raised to the caller, which retries the site with
+        backoff, see `scrape_with_retry`.
+        """
+        logger.info(f"Scraping {self.num_jobs} jobs from LinkedIn")
+        try:
+            # Scroll the results of every search
+            self.visit_plans()
+            # get more job details from full job page
+            yield from self.get_job_details(self.checkpoint.pending_cards())
+        finally:
+            self.close()
+        self.checkpoint.clear()
+        self.save_pagers()
+        logger.info(f"Scraped {len(self.checkpoint.cards)} jobs")
+
+    def visit_pages(self, pages: range):
+        """
+        Loads LinkedIn search results, scrolling once per page to load more
+        of them, and collects their job cards into `self.cards`, stopping
+        early once the `pager` finds no more new jobs.
+
+        Args:
+        - pages (range): The numbers of the pages. LinkedIn lists every
+          job on one scrolling page, so only the number of pages matters.
         """
         # set driver as `wd` to make code more readable
         wd = self.driver
-        try:
-            # Load page
-            wd.get(self.url)
-
-            # Set number of pages based on number of jobs per page
-            num_pages = ceil(self.num_jobs / 25)
-            if num_pages == 0:
-                num_pages = 1
-
-            # Loop to retrieve jobs on pages
-            i = 0
-            while i < num_pages:
-                wd.execute_script(
-                    "window.scrollTo(0, document.body.scrollHeight);"
-                )
-                i += 1
-                try:
-                    # click button to load more jobs and wait
-                    # for page to load
-                    wd.find_element(
-                        "xpath",
-                        '/html/body/main/div/section/button'
-                    ).click()
-                    time.sleep(5)
-                except NoSuchElementException:
-                    pass
-                    time.sleep(5)
-
-            # Extract job cards list
-            jobs_lists = wd.find_element(
-                By.CLASS_NAME,
-                "jobs-search__results-list"
+        # Load page
+        self.open_page(wd, self.url, "list")
+
+        # Loop to retrieve jobs on pages, stopping once the loaded jobs
+        # are no longer new
+        i = 0
+        num_cards = len(self.cards)
+        seen_links = set()
+        num_loaded = self.count_jobs()
+        while i < len(pages) and self.load_more(seen_links):
+            wd.execute_script(
+                "window.scrollTo(0, document.body.scrollHeight);"
             )
-            jobs = jobs_lists.find_elements(By.TAG_NAME, "li")  # return a list
+            i += 1
+            try:
+                # click button to load more jobs
+                wd.find_element(
+                    "xpath",
+                    '/html/body/main/div/section/button'
+                ).click()
+            except NoSuchElementException:
+                pass
+            # wait for the jobs to load, stopping at the end of the
+            # results
+            loaded = self.wait_for_jobs(num_loaded)
+            if loaded <= num_loaded:
+                logger.info("No more jobs loaded, stopping scrolling")
+                break
+            num_loaded = loaded
+
+        # record the results with every loaded job
+        self.archive_page("list", self.url, wd.page_source)
+
+        # Extract job cards list
+        jobs_lists = wd.find_element(
+            By.CSS_SELECTOR,
+            self.results_selector
+        )
+        jobs = jobs_lists.find_elements(By.TAG_NAME, "li")  # return a list
+
+        # get job card details
+        self.get_jobs(jobs, jobs_lists)
+        self.checkpoint.add_page(self.cards[num_cards:], self.url, len(pages))
+
+    def count_jobs(self) -> int:
+        """
+        Counts the job cards listed on the search results page.
 
-            # get job card details
-            self.get_jobs(jobs)
-            # get more job details from full job page
-            self.get_job_details(self.job_link)
-            wd.close()
-        except Exception as e:
-            logger.error(f"Error scraping LinkedIn: {e}")
-            wd.close()
+        Returns:
+        int: The number of job cards.
+        """
+        return self.driver.execute_script(
+            "return document.querySelectorAll("
+            "'.jobs-search__results-list li').length;"
+        ) or 0
 
-    def get_jobs(self, jobs: list):
+    def wait_for_jobs(self, num_loaded: int) -> int:
         """
-        Retrieves job details from LinkedIn job cards.
+        Waits until more job cards are listed, for at most `load_timeout`
+        seconds.
 
         Args:
-        - jobs (list): A list of job card elements containing job details.
-
-        This method iterates through each job card element passed
-        as an argument. It extracts various job details such as
-        job link, job ID, job title, company name, location, and posting date.
-        It checks for existing jobs by comparing hashed links to
-        the list of hashed links from the database to avoid duplicate entries.
+        - num_loaded (int): The number of job cards listed before loading
+          more.
 
-        Note: This method assumes certain HTML structures for job cards.
-        As such, it may need to be updated if the structure changes.
+        Returns:
+        int: The number of job cards listed after waiting.
         """
-        # get existing job UUIDs from cassandra database
-        self.get_uuids()
-
-        logger.info(f"Scraping {self.num_jobs} jobs from LinkedIn")
-        # loop through job cards and collect details
-        n = 0
-        for job in jobs:
-            n += 1
-            try:
-                # get job link
-                job_link0 = job.find_element(
-                    By.CSS_SELECTOR,
-                    'a'
-                ).get_attribute('href').split(sep="?refId=")[0]
-
-                # check if job already exists by comparing hashed link
-                # to list of hashed links from the database and raise
-                # an assertion error if it already exists
-                temp_uuid = self.generate_uuid(job_link0)
-                assert str(temp_uuid) not in self.uuids, f"Job {temp_uuid} already exists" # noqa
-                # continue if no assertion error
-                self.job_link.append(job_link0)
-                self.uuid.append(temp_uuid)
-
-                # get job id
-                job_id0 = str(job.get_attribute('data-id'))
-                self.job_id.append(job_id0)
-
-                # get job title
-                job_title0 = job.find_element(
-                    By.CSS_SELECTOR,
-                    'h3'
-                ).get_attribute('innerText')
-                self.job_title.append(job_title0)
+        try:
+            WebDriverWait(
+                self.driver, self.load_timeout, poll_frequency=0.25
+            ).until(lambda wd: self.count_jobs() > num_loaded)
+        except TimeoutException:
+            pass
+        return self.count_jobs()
 
-                # get company name
-                company_name0 = job.find_element(
-                    By.CSS_SELECTOR,
-                    'h4'
-                ).get_attribute('innerText')
-                self.company_name.append(company_name0)
+    def load_more(self, seen_links: set[str]) -> bool:
+        """
+        Checks the job cards loaded since the last check with the `pager`,
+        to decide whether to load more job cards.
 
-                # get location
-                location0 = job.find_element(
-                    By.CSS_SELECTOR,
-                    '[class="job-search-card__location"]'
-                ).get_attribute('innerText')
-                self.location.append(location0)
+        Args:
+        - seen_links (set[str]): The job links already checked. Updated
+          with the newly loaded links.
 
-                # get job posting date
-                date0 = job.find_element(
-                    By.CSS_SELECTOR,
-                    "div>div>time"
-                ).get_attribute('datetime')
-                self.date.append(date0)
-            except Exception as e:
-                logger.error(f"Error getting job {n} details: {e}")
+        Returns:
+        bool: True to load more job cards, False to stop.
 
-    def get_job_details(self, job_link: list):
+        The job links are read with a single script call, as LinkedIn
+        lists every job card on one scrolling page.
+        """
+        links = self.driver.execute_script(
+            "return Array.from(document.querySelectorAll("
+            "'.jobs-search__results-list li a')).map(a => a.href);"
+        ) or []
+        known_uuids = self.load_known_uuids()
+        seen = []
+        for link in links:
+            link = link.split(sep="?refId=")[0]
+            if link in seen_links:
+                continue
+            seen_links.add(link)
+            uuid = str(self.generate_uuid(link))
+            seen.append((uuid, uuid in known_uuids))
+
+        if not self.pager.add_page(seen):
+            logger.info("No new jobs loaded, stopping scrolling")
+            return False
+        return True
+
+    def new_card(self, job_link: str) -> dict:
         """
-        Retrieves additional job details from individual LinkedIn job pages.
+        Starts the card of a LinkedIn job from its link, without the
+        tracking parameters of the link.
 
         Args:
-        - job_link (list): A list of job page URLs containing job details
-          to be scraped.
+        - job_link (str): The link of the job.
 
-        This method iterates through each job page URL passed as an argument.
-        It extracts job details such as job description, seniority level,
-        employment type, job function, and job industry from the HTML content
-        of the job pages. It handles errors during scraping and appends 'NA'
-        to maintain consistency in scraped data list indices.
+        Returns:
+        dict: The card, with the job's UUID and link.
+        """
+        return super().new_card(job_link.split(sep="?refId=")[0])
 
-        Note: This method assumes certain HTML structures for job details.
-        As such, it may need to be updated if the structure changes.
+    def read_card(self, job, n: int) -> dict:
         """
-        # loop through each job link to get additional details
-        page = 0
-        for link in job_link:
-            page += 1
-            try:
-                # Parse job page
-                response = uReq(link)
-                job_page = response.read()
-                job_page_html = bs(job_page, "html.parser")
-
-                # Get job description
-                job_description = job_page_html.findAll(
-                    "div",
-                    {"class": "show-more-less-html__markup"}
-                )
-                job_description = bs(job_description[0].text).text
-                self.job_desc.append(job_description)
+        Reads the details of a LinkedIn job card through the webdriver.
 
-                # Get job details
-                job_details = job_page_html.findAll(
-                    "span",
-                    {"class": "description__job-criteria-text description__job-criteria-text--criteria"} # noqa
-                )
+        Args:
+        - job (WebElement): The job card element.
+        - n (int): The position of the job card on the page, from 1.
 
-                # Seniority level
-                seniority_level = bs(job_details[0].text).text
-                self.seniority.append(seniority_level)
+        Returns:
+        dict: The job card.
 
-                # Employment type
-                employment_type = bs(job_details[1].text).text
-                self.emp_type.append(employment_type)
+        Note: This method assumes certain HTML structures for job cards.
+        As such, it may need to be updated if the structure changes.
+        """
+        # get job link, skipping known jobs
+        job_link0 = job.find_element(
+            By.CSS_SELECTOR,
+            'a'
+        ).get_attribute('href')
+        card = self.new_card(job_link0)
+
+        # get job id
+        job_id0 = str(job.get_attribute('data-id'))
+        card["job_id"] = job_id0
+
+        # get job title
+        job_title0 = job.find_element(
+            By.CSS_SELECTOR,
+            'h3'
+        ).get_attribute('innerText')
+        card["job_title"] = job_title0
+
+        # get company name
+        company_name0 = job.find_element(
+            By.CSS_SELECTOR,
+            'h4'
+        ).get_attribute('innerText')
+        card["company_name"] = company_name0
+
+        # get location
+        location0 = job.find_element(
+            By.CSS_SELECTOR,
+            '[class="job-search-card__location"]'
+        ).get_attribute('innerText')
+        card["location"] = location0
+
+        # get job posting date
+        date0 = job.find_element(
+            By.CSS_SELECTOR,
+            "div>div>time"
+        ).get_attribute('datetime')
+        card["date"] = date0
+        return card
+
+    def get_job_page(self, wd, link: str) -> dict:
+        """
+        Loads a LinkedIn job page in the browser and fetches its details.
 
-                # Job function
-                job_function = bs(job_details[2].text).text
-                self.job_func.append(job_function)
+        Args:
+        - wd (webdriver.Firefox): The webdriver used to load the page.
+        - link (str): The URL of the job page.
 
-                # Job industry
-                industries = bs(job_details[3].text).text
-                self.ind.append(industries)
+        Returns:
+        - dict: The job description, seniority level, employment type,
+          job function and job industry, keyed by `DETAIL_FIELDS`.
 
-                # Sleep for random duration to bypass bot detection
-                time.sleep(rand.uniform(0.5, 1))
-                logger.info(f"Job {page} page scraped successfully")
+        The politeness delay between requests to LinkedIn, which helps to
+        bypass bot detection, is set in `host_limits` in the config file.
 
-            except Exception as e:
-                # log error and append `NA` for job details to ensure
-                # consistency of scraped data list indices
-                print('There was an error scraping Page ', page, ': ', e)
-                self.job_desc.append("NA")
-                self.seniority.append("NA")
-                self.emp_type.append("NA")
-                self.job_func.append("NA")
-                self.ind.append("NA")
+        Note: This method assumes certain HTML structures for job details.
+        As such, it may need to be updated if the structure changes.
+        """
+        self.open_page(wd, link)
+        return parse_linkedin_page(wd.page_source)
 
 
 class JobbermanScraper(IndeedScraper):
@@ -816,43 +1411,73 @@ class JobbermanScraper(IndeedScraper):
     It inherits functionality from the IndeedScraper
     class and customizes Jobberman-specific parameters.
     """
+    page_parser = staticmethod(parse_jobberman_page)
+    card_parser = CardParser(".mx-5", JOBBERMAN_CARD_FIELDS)
+    results_selector = str("body > main > section > div:nth-of-type(2) > " +
+                           "div:nth-of-type(2) > div:nth-of-type(1)")
+    lean_browser = True
+    search_url = "https://www.jobberman.com/jobs"
+    search_url_template = "https://www.jobberman.com/jobs?q={query}&l={location}"  # noqa
+    jobs_per_page = 14
+
     def __init__(self,
                  driver_path: str = "/usr/local/bin/geckodriver",
                  profile_name: str = "Selenium",
-                 url: str = "https://www.jobberman.com/jobs",
+                 url: str = None,
+                 checkpointing: bool = True,
                  ):
-        super().__init__(driver_path, profile_name, url)
+        super().__init__(driver_path, profile_name, url, checkpointing)
 
-    def scrape(self):
+    @instrumented("scrape")
+    def scrape(self) -> Iterator[Job]:
         """
         Scrapes job listings from Jobberman.
 
+        Yields:
+        Job: Each new job, as soon as its job page has been scraped.
+
         This method initiates the scraping process by retrieving job listings
         from multiple pages on the Jobberman website.
-        It calculates the number of pages based on the number of jobs per page
-        and then iterates through each page to collect job cards.
+        For each search of the scrape plans, it calculates the number of pages
+        based on the number of jobs per page and then iterates through each
+        page to collect job cards.
         After gathering job cards from multiple pages, it proceeds to retrieve
         additional job details from the full job page for each job listing.
-        Finally, it closes the webdriver after the scraping process.
+        Finally, it gives the webdriver back to the browser manager after the
+        scraping process.
         """
         logger.info(f"Scraping {self.num_jobs} jobs from Jobberman")
-        # Set number of pages based on number of jobs per page
-        num_of_pages = ceil(self.num_jobs / 14)
-        if num_of_pages == 0:
-            num_of_pages = 1
+        try:
+            # Loop through the pages of each search and get job cards
+            self.visit_plans()
+            # get more details from full job page
+            yield from self.get_job_details(self.checkpoint.pending_cards())
+        finally:
+            self.close()
+        self.checkpoint.clear()
+        self.save_pagers()
+
+    def visit_pages(self, pages: range):
+        """
+        Visits Jobberman search results pages and collects their job cards
+        into `self.cards`, stopping early once the `pager` finds no more
+        new jobs.
+
+        Args:
+        - pages (range): The numbers of the pages, from 0.
+        """
         # Set driver as `wd` for easy referencing
         wd = self.driver
-        # Loop through each page and get job cards
-        for i in range(num_of_pages):
+        for i in pages:
             i = i + 1
-            page = "?page=" + str(i)
+            # searches with a query already have URL parameters
+            page = ("&" if "?" in self.url else "?") + "page=" + str(i)
             url = self.url + page
 
-            wd = self.driver
-            wd.get(url)
+            self.open_page(wd, url, "list")
             jobs_lists = wd.find_element(
-                By.XPATH,
-                "/html/body/main/section/div[2]/div[2]/div[1]"
+                By.CSS_SELECTOR,
+                self.results_selector
             )
             jobs = jobs_lists.find_elements(
                 By.CLASS_NAME,
@@ -860,301 +1485,146 @@ class JobbermanScraper(IndeedScraper):
             )  # return a list
 
             # get job card details
-            self.get_jobs(jobs)
-        # get more details from full job page
-        self.get_job_details(self.job_link)
-        wd.close()
+            num_cards = len(self.cards)
+            self.get_jobs(jobs, jobs_lists)
+            if self.record_page(self.cards[num_cards:]):
+                break
+
+    def new_card(self, job_link: str) -> dict:
+        """
+        Starts the card of a Jobberman job from its link. Jobberman does not
+        show job IDs.
+
+        Args:
+        - job_link (str): The link of the job.
+
+        Returns:
+        dict: The card, with the job's UUID, link and ID.
+        """
+        card = super().new_card(job_link)
+        card["job_id"] = "Not available on Jobberman"
+        return card
 
-    def get_jobs(self, jobs: list):
+    def read_card(self, job, n: int) -> dict:
         """
-        Collects job details from Jobberman job cards.
+        Reads the details of a Jobberman job card through the webdriver.
 
-        This method iterates through the list of job cards retrieved from the
-        Jobberman website and extracts various job details such as job link,
-        title, company name, location, posting date, and job ID.
         It utilizes two different approaches to handle the alternating
         structure of job cards on the webpage.
-        It checks for existing job UUIDs in the Cassandra database and appends
-        the collected details to respective lists for further processing.
 
         Args:
-        - jobs (list): A list of job card elements containing job information.
+        - job (WebElement): The job card element.
+        - n (int): The position of the job card on the page, from 1.
 
-        This method parses through the job cards, extracts job details, and
-        handles potential exceptions while collecting data from the Jobberman
-        website, ensuring the retrieval of pertinent job information for
-        further processing.
+        Returns:
+        dict: The job card.
 
         Note: This method assumes a specific structure of HTML elements.
         Thus, it may need to be updated if the structure changes.
         """
-        # get existing job UUIDs from cassandra database
-        self.get_uuids()
-
-        # Loop through job cards and collect details
-        logger.info(f"Parsing {len(jobs)} job cards")
-        n = 0
-        for job in jobs:
-            n += 1
-
-            # try two approaches for each job card due alternating
-            # structure of job cards
-            try:
-                if n < 5:
-                    # get job link
-                    job_link0 = job.find_element(
-                        By.XPATH,
-                        f'/html/body/main/section/div[2]/div[2]/div[1]'
-                        f'/div[{n}]/div[1]/div[2]/div/div[1]/a'
-                    ).get_attribute(
-                        'href'
-                    )
-
-                    # check if job already exists by comparing its hashed link
-                    # with those on the database and skip its scraping if
-                    # there's a match by raising an assertion error
-                    temp_uuid = self.generate_uuid(job_link0)
-                    assert str(temp_uuid) not in self.uuids, f"Job {temp_uuid} already exists" # noqa
-                    # continue if no assertion error
-                    self.job_link.append(job_link0)
-                    self.uuid.append(temp_uuid)
-
-                    # get job title
-                    job_title0 = job.find_element(
-                        By.XPATH,
-                        f'/html/body/main/section/div[2]/div[2]/div[1]/'
-                        f'div[{n}]/div[1]/div[2]/div/div[1]/a/p'
-                    ).get_attribute(
-                        'innerText'
-                    )
-                    self.job_title.append(job_title0)
-
-                    # get company name
-                    company_name0 = job.find_element(
-                        By.XPATH,
-                        f'/html/body/main/section/div[2]/div[2]/div[1]/'
-                        f'div[{n}]/div[1]/div[2]/div/p[1]'
-                    ).get_attribute(
-                        'innerText'
-                    )
-                    self.company_name.append(company_name0)
-
-                    # get location
-                    location0 = job.find_element(
-                        By.XPATH,
-                        f'/html/body/main/section/div[2]/div[2]/div[1]/'
-                        f'div[{n}]/div[1]/div[2]/div/div[2]/span[1]'
-                    ).get_attribute(
-                        'innerText'
-                    )
-                    self.location.append(location0)
-
-                    # get job posting date
-                    date0 = job.find_element(
-                        By.XPATH,
-                        f'/html/body/main/section/div[2]/div[2]/div[1]/'
-                        f'div[{n}]/div[2]/p'
-                    ).get_attribute(
-                        'innerText'
-                    )
-                    self.date.append(date0)
-
-                    # get job id
-                    job_id0 = "Not available on Jobberman"
-                    self.job_id.append(job_id0)
-
-                else:
-                    # get job link
-                    job_link0 = job.find_element(
-                        By.XPATH,
-                        f'/html/body/main/section/div[2]/div[2]/div[1]/'
-                        f'div[{n}]/div[1]/div/div/div[1]/a'
-                    ).get_attribute(
-                        'href'
-                    )
-
-                    # check if job already exists by comparing its hashed link
-                    # with those on the database and skip its scraping if
-                    # there's a match by raising an assertion error
-                    temp_uuid = self.generate_uuid(job_link0)
-                    assert str(temp_uuid) not in self.uuids, f"Job {temp_uuid} already exists" # noqa
-                    # continue if no assertion error
-                    self.job_link.append(job_link0)
-                    self.uuid.append(temp_uuid)
-
-                    # get job title
-                    job_title0 = job.find_element(
-                        By.XPATH,
-                        f'/html/body/main/section/div[2]/div[2]/div[1]/'
-                        f'div[{n}]/div[1]/div/div/div[1]/a/p'
-                    ).get_attribute(
-                        'innerText'
-                    )
-                    self.job_title.append(job_title0)
-
-                    # get company name
-                    company_name0 = job.find_element(
-                        By.XPATH,
-                        f'/html/body/main/section/div[2]/div[2]/div[1]/'
-                        f'div[{n}]/div[1]/div/div/p[1]'
-                    ).get_attribute(
-                        'innerText'
-                    )
-                    self.company_name.append(company_name0)
-
-                    # get location
-                    location0 = job.find_element(
-                        By.XPATH,
-                        f'/html/body/main/section/div[2]/div[2]/div[1]/'
-                        f'div[{n}]/div[1]/div/div/div[2]/span[1]'
-                    ).get_attribute(
-                        'innerText'
-                    )
-                    self.location.append(location0)
-
-                    # get job posting date
-                    date0 = job.find_element(
-                        By.XPATH,
-                        f'/html/body/main/section/div[2]/div[2]/div[1]/'
-                        f'div[{n}]/div/p'
-                    ).get_attribute(
-                        'innerText'
-                    )
-                    self.date.append(date0)
-
-                    # get job id
-                    job_id0 = "Not available on Jobberman"
-                    self.job_id.append(job_id0)
-            except Exception as e:
-                logger.error(f"Error getting job {n} details: {e}")
-
-    def get_job_details(self, job_link: list): # noqa
+        # try two approaches for each job card due alternating
+        # structure of job cards
+        if n < 5:
+            info = f'/html/body/main/section/div[2]/div[2]/div[1]/div[{n}]' \
+                '/div[1]/div[2]/div'
+            date = f'/html/body/main/section/div[2]/div[2]/div[1]/div[{n}]' \
+                '/div[2]/p'
+        else:
+            info = f'/html/body/main/section/div[2]/div[2]/div[1]/div[{n}]' \
+                '/div[1]/div/div'
+            date = f'/html/body/main/section/div[2]/div[2]/div[1]/div[{n}]' \
+                '/div/p'
+
+        # get job link, skipping known jobs
+        job_link0 = job.find_element(
+            By.XPATH,
+            f'{info}/div[1]/a'
+        ).get_attribute(
+            'href'
+        )
+        card = self.new_card(job_link0)
+
+        # get job title
+        job_title0 = job.find_element(
+            By.XPATH,
+            f'{info}/div[1]/a/p'
+        ).get_attribute(
+            'innerText'
+        )
+        card["job_title"] = job_title0
+
+        # get company name
+        company_name0 = job.find_element(
+            By.XPATH,
+            f'{info}/p[1]'
+        ).get_attribute(
+            'innerText'
+        )
+        card["company_name"] = company_name0
+
+        # get location
+        location0 = job.find_element(
+            By.XPATH,
+            f'{info}/div[2]/span[1]'
+        ).get_attribute(
+            'innerText'
+        )
+        card["location"] = location0
+
+        # get job posting date
+        date0 = job.find_element(
+            By.XPATH,
+            date
+        ).get_attribute(
+            'innerText'
+        )
+        card["date"] = date0
+        return card
+
+    def get_job_page(self, wd, link: str) -> dict:
         """
-        Collects additional job details from individual job pages on Jobberman.
+        Loads a Jobberman job page in the browser and fetches its details.
 
-        This method navigates to each job page using the provided list of job
-        links, extracts detailed information for each job, including
-        job description, seniority level, employment type, job function, and
-        job industry.
-        It utilizes CSS selectors to locate specific elements on the job page,
-        extracts the necessary information, and appends it to their respective
-        lists for further processing.
+        It utilizes the CSS selectors shared with `parse_jobberman_page` to
+        locate specific elements on the job page and sets each missing
+        detail to `NA`.
 
         Args:
-        - job_link (list): A list of URLs leading to job pages on Jobberman.
+        - wd (webdriver.Firefox): The webdriver used to load the page.
+        - link (str): The URL of the job page.
 
-        This method iterates through each job page, extracts job-specific
-        details, handles potential exceptions while collecting data from the
-        Jobberman website, and ensures the retrieval of pertinent job
-        information for further processing.
+        Returns:
+        - dict: The job description, seniority level, employment type,
+          job function and job industry, keyed by `DETAIL_FIELDS`.
 
         Note: This method assumes a specific structure of HTML elements.
         It may need to be updated if the structure changes.
         """
-        # loop through each page to get more details
-        page = 0
-        wd = self.driver
-        for link in job_link:
-            page += 1
-            try:
-                # Load job page
-                wd.get(link)
-
-                try:
-                    # Get job description
-                    job_summary = wd.find_element(
-                        By.CSS_SELECTOR,
-                        f"#tab1 > div.flex.flex-col.rounded-lg.border-gray-"  # noqa 
-                        f"300.md\:border.hover\:border-gray-400.md\:mx-0 > "  # noqa # type: ignore
-                        f"article > div:nth-child(4)"
-                    ).get_attribute(
-                        'innerText'
-                    )
-                    job_req = wd.find_element(
-                        By.CSS_SELECTOR,
-                        f"#tab1 > div.flex.flex-col.rounded-lg.border-gray-"  # noqa
-                        f"300.md\:border.hover\:border-gray-400.md\:mx-0 > "  # noqa # type: ignore
-                        f"article > div:nth-child(5)"
-                    ).get_attribute(
-                        'innerText'
-                    )
-                    job_description = str(job_summary) + "\n\n" + str(job_req)
-                    self.job_desc.append(job_description)
-                except NoSuchElementException:
-                    self.job_desc.append('NA')
-
-                try:
-                    # Seniority level
-                    seniority_level = wd.find_element(
-                        By.CSS_SELECTOR,
-                        f'#tab1 > div.flex.flex-col.rounded-lg.border-gray-'  # noqa
-                        f'300.md\:border.hover\:border-gray-400.md\:mx-0 > '  # noqa # type: ignore
-                        f'article > div:nth-child(4) > ul > li:nth-child(2) '
-                        f'> span.pb-1.text-gray-500'
-                    ).get_attribute(
-                        'innerText'
-                    )
-                    self.seniority.append(seniority_level)
-                except NoSuchElementException:
-                    self.seniority.append('NA')
-
-                try:
-                    # Employment type
-                    employment_type = wd.find_element(
-                        By.CSS_SELECTOR,
-                        f"#tab1 > div.flex.flex-col.rounded-lg.border-gray-"  # noqa
-                        f"300.md\:border.hover\:border-gray-400.md\:mx-0 > "  # noqa # type: ignore
-                        f"article > div.flex.flex-wrap.justify-start.pt-5."
-                        f"pb-2.px-4.w-full.border-b.border-gray-300.md\:flex"  # noqa # type: ignore
-                        f"-nowrap.md\:px-5 > div.w-full.text-gray-500 > div."  # noqa # type: ignore
-                        f"mt-3 > span > a"
-                    ).get_attribute(
-                        'innerText'
-                    )
-                    self.emp_type.append(employment_type)
-                except NoSuchElementException:
-                    self.emp_type.append('NA')
-
-                try:
-                    # Job function
-                    job_function = wd.find_element(
-                        By.CSS_SELECTOR,
-                        f"#tab1 > div.flex.flex-col.rounded-lg.border-gray-"  # noqa
-                        f"300.md\:border.hover\:border-gray-400.md\:mx-0 > "  # noqa # type: ignore
-                        f"article > div.flex.flex-wrap.justify-start.pt-5."
-                        f"pb-2.px-4.w-full.border-b.border-gray-300.md\:flex"  # noqa # type: ignore
-                        f"-nowrap.md\:px-5 > div.w-full.text-gray-500 > h2:"  # noqa # type: ignore
-                        f"nth-child(3) > a"
-                    ).get_attribute(
-                        'innerText'
-                    )
-                    self.job_func.append(job_function)
-                except NoSuchElementException:
-                    self.job_func.append('NA')
-
-                try:
-                    # Job industry
-                    industries = wd.find_element(
-                        By.CSS_SELECTOR,
-                        f"#tab1 > div.flex.flex-col.rounded-lg.border-gray-"  # noqa
-                        f"300.md\:border.hover\:border-gray-400.md\:mx-0 > "  # noqa # type: ignore
-                        f"article > div.flex.flex-wrap.justify-start.pt-5."
-                        f"pb-2.px-4.w-full.border-b.border-gray-300.md\:flex"  # noqa # type: ignore
-                        f"-nowrap.md\:px-5 > div.w-full.text-gray-500 > div:"  # noqa # type: ignore
-                        f"nth-child(5) > a"
-                    ).get_attribute(
-                        'innerText'
-                    )
-                    self.ind.append(industries)
-                except NoSuchElementException:
-                    self.ind.append('NA')
+        # Load job page
+        self.open_page(wd, link)
 
-            except Exception as e:
-                # log error and append 'NA' to each list to
-                # enusre consistency of list indices
-                logger.error(f"There was an error scraping Page {page}: {e}")
-                self.job_desc.append("NA")
-                self.seniority.append("NA")
-                self.emp_type.append("NA")
-                self.job_func.append("NA")
-                self.ind.append("NA")
+        found = {}
+        for field, selector in JOBBERMAN_SELECTORS.items():
+            try:
+                found[field] = wd.find_element(
+                    By.CSS_SELECTOR,
+                    selector
+                ).get_attribute(
+                    'innerText'
+                )
+            except NoSuchElementException:
+                found[field] = 'NA'
+
+        # Job description is made up of the summary and requirements
+        job_description = 'NA'
+        if 'NA' not in (found["job_summary"], found["job_req"]):
+            job_description = str(found["job_summary"]) + "\n\n" +\
+                str(found["job_req"])
+
+        return {
+            "job_desc": job_description,
+            "seniority": found["seniority"],
+            "emp_type": found["emp_type"],
+            "job_func": found["job_func"],
+            "ind": found["ind"]
+        }
@@ -0,0 +1,353 @@
+"""
+This module contains a task queue backed by a SQLite database, through
+which scrape work is shared between worker processes on any number of
+nodes.
+
+Tasks are leased rather than popped: a worker which takes a task holds it
+for `lease_seconds`, and a task whose lease runs out, because its worker
+crashed or was killed, becomes available again. Failed tasks are retried
+until they reach `max_attempts`. Tasks may carry a unique key, so
+scheduling the same unit of work twice only queues it once, and a group,
+so the remaining tasks of e.g. one search can be cancelled together.
+Workers also claim keys of their own, e.g. the job cards they collected,
+so work found by several tasks is only queued by the first of them.
+
+SQLite serializes the leases with its database lock, so the queue file can
+be shared by the workers of one host or, as a stand-in for a networked
+queue, mounted on every node.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from etl.utils.sqlite_conn import connect
+
+# task statuses
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class TaskQueue:
+    """
+    A persistent queue of leased tasks.
+
+    Attributes:
+    - path (str): The file path of the SQLite database.
+    - lease_seconds (float): How long a leased task is held by its worker.
+    - max_attempts (int): The number of times a task is tried before it is
+      marked as failed.
+    """
+    def __init__(self, path: str, lease_seconds: float = 600,
+                 max_attempts: int = 3):
+        """
+        Initializes a TaskQueue, creating its database if needed.
+
+        Args:
+        - path (str): The file path of the SQLite database.
+        - lease_seconds (float): How long a leased task is held by its
+          worker. Default is 600.
+        - max_attempts (int): The number of times a task is tried. Default
+          is 3.
+
+        Example:
+            queue = TaskQueue("./models/scrape_queue.db")
+            queue.enqueue("list_pages", {"site": "indeed", ...})
+            task = queue.lease("worker-1")
+            ...
+            queue.complete(task, "worker-1")
+        """
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self.connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " kind TEXT NOT NULL,"
+                " payload TEXT NOT NULL,"
+                " key TEXT UNIQUE,"
+                " task_group TEXT,"
+                " priority INTEGER NOT NULL DEFAULT 0,"
+                " status TEXT NOT NULL,"
+                " attempts INTEGER NOT NULL DEFAULT 0,"
+                " worker TEXT,"
+                " lease_until REAL,"
+                " error TEXT,"
+                " created_at REAL NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+            db.execute(
+                "CREATE INDEX IF NOT EXISTS tasks_status"
+                " ON tasks (status, priority, id)"
+            )
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS claims ("
+                " key TEXT PRIMARY KEY,"
+                " owner TEXT NOT NULL,"
+                " created_at REAL NOT NULL)"
+            )
+
+    def connect(self):
+        """
+        Opens a connection to the queue database, see
+        `etl.utils.sqlite_conn.connect`.
+        """
+        return connect(self.path, sqlite3.Row)
+
+    def enqueue(self, kind: str, payload: dict, key: str = None,
+                group: str = None, priority: int = 0) -> bool:
+        """
+        Adds a task to the queue.
+
+        Args:
+        - kind (str): The kind of task, which selects its handler.
+        - payload (dict): The JSON-serializable arguments of the task.
+        - key (str | None): A unique key of the task. A task whose key is
+          already queued is not added again. Default is None.
+        - group (str | None): The group of the task, see `cancel_group`.
+          Default is None.
+        - priority (int): Tasks with a higher priority are leased first.
+          Default is 0.
+
+        Returns:
+        - bool: True if the task was added.
+        """
+        now = time.time()
+        with self.connect() as db:
+            cursor = db.execute(
+                "INSERT OR IGNORE INTO tasks (kind, payload, key, task_group,"
+                " priority, status, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (kind, json.dumps(payload, default=str), key, group,
+                 priority, PENDING, now, now)
+            )
+            return cursor.rowcount == 1
+
+    def lease(self, worker: str, kinds: list[str] = None,
+              exclude: dict = None) -> dict | None:
+        """
+        Leases the next available task: a pending task, or a leased task
+        whose lease ran out.
+
+        Args:
+        - worker (str): The ID of the worker taking the task.
+        - kinds (list[str] | None): The kinds of task the worker handles.
+          Default is None (any kind).
+        - exclude (dict | None): Payload values of tasks which are skipped,
+          as lists by payload field, e.g. `{"site": ["linkedin"]}`.
+          Default is None.
+
+        Returns:
+        - dict | None: The task, with its `id`, `kind`, `payload`, `group`
+          and `attempts` (including this one), or None if no task is
+          available.
+        """
+        now = time.time()
+        query = (
+            "SELECT * FROM tasks WHERE (status = ? OR"
+            " (status = ? AND lease_until < ?))"
+        )
+        params = [PENDING, LEASED, now]
+        if kinds is not None:
+            query += f" AND kind IN ({', '.join('?' * len(kinds))})"
+            params.extend(kinds)
+        for field, values in (exclude or {}).items():
+            query += (
+                " AND COALESCE(json_extract(payload, ?), '') NOT IN"
+                f" ({', '.join('?' * len(values))})"
+            )
+            params.extend([f"$.{field}", *values])
+        query += " ORDER BY priority DESC, id LIMIT 1"
+
+        with self.connect() as db:
+            # take the write lock first, so no other worker leases the task
+            db.execute("BEGIN IMMEDIATE")
+            row = db.execute(query, params).fetchone()
+            while row is not None and row["attempts"] >= self.max_attempts:
+                # the last attempt's worker died holding the lease
+                db.execute(
+                    "UPDATE tasks SET status = ?, error = ?, updated_at = ?"
+                    " WHERE id = ?",
+                    (FAILED, "Lease expired", now, row["id"])
+                )
+                row = db.execute(query, params).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE tasks SET status = ?, worker = ?, lease_until = ?,"
+                " attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (LEASED, worker, now + self.lease_seconds, now, row["id"])
+            )
+        return {
+            "id": row["id"],
+            "kind": row["kind"],
+            "payload": json.loads(row["payload"]),
+            "group": row["task_group"],
+            "attempts": row["attempts"] + 1
+        }
+
+    def renew(self, task: dict, worker: str) -> bool:
+        """
+        Extends the lease of a task still being worked on.
+
+        Args:
+        - task (dict): The leased task.
+        - worker (str): The ID of the worker holding the task.
+
+        Returns:
+        - bool: False if the worker no longer holds the task.
+        """
+        return self.update(
+            task, worker, LEASED, lease_until=time.time() + self.lease_seconds
+        )
+
+    def complete(self, task: dict, worker: str) -> bool:
+        """
+        Marks a leased task as done.
+
+        Args:
+        - task (dict): The leased task.
+        - worker (str): The ID of the worker holding the task.
+
+        Returns:
+        - bool: False if the worker no longer held the task.
+        """
+        return self.update(task, worker, DONE)
+
+    def fail(self, task: dict, worker: str, error: str) -> bool:
+        """
+        Gives a failed task back to the queue to be retried, or marks it
+        as failed once it reached `max_attempts`.
+
+        Args:
+        - task (dict): The leased task.
+        - worker (str): The ID of the worker holding the task.
+        - error (str): The error message.
+
+        Returns:
+        - bool: False if the worker no longer held the task.
+        """
+        status = FAILED if task["attempts"] >= self.max_attempts else PENDING
+        return self.update(task, worker, status, error=error)
+
+    def release(self, task: dict, worker: str) -> bool:
+        """
+        Gives a leased task back to the queue untried, e.g. when its work
+        cannot be started yet, without counting the attempt.
+
+        Args:
+        - task (dict): The leased task.
+        - worker (str): The ID of the worker holding the task.
+
+        Returns:
+        - bool: False if the worker no longer held the task.
+        """
+        with self.connect() as db:
+            cursor = db.execute(
+                "UPDATE tasks SET status = ?, lease_until = NULL,"
+                " attempts = attempts - 1, updated_at = ?"
+                " WHERE id = ? AND worker = ? AND status = ?",
+                (PENDING, time.time(), task["id"], worker, LEASED)
+            )
+            return cursor.rowcount == 1
+
+    def update(self, task: dict, worker: str, status: str,
+               lease_until: float = None, error: str = None) -> bool:
+        """
+        Updates a task held by a worker.
+
+        Args:
+        - task (dict): The leased task.
+        - worker (str): The ID of the worker holding the task.
+        - status (str): The new status.
+        - lease_until (float | None): The new end of the lease. Default
+          is None.
+        - error (str | None): The error message. Default is None.
+
+        Returns:
+        - bool: False if the worker no longer held the task.
+        """
+        with self.connect() as db:
+            cursor = db.execute(
+                "UPDATE tasks SET status = ?, lease_until = ?, error = ?,"
+                " updated_at = ? WHERE id = ? AND worker = ? AND status = ?",
+                (status, lease_until, error, time.time(), task["id"],
+                 worker, LEASED)
+            )
+            return cursor.rowcount == 1
+
+    def cancel_group(self, group: str) -> int:
+        """
+        Cancels the pending tasks of a group.
+
+        Args:
+        - group (str): The group.
+
+        Returns:
+        - int: The number of cancelled tasks.
+        """
+        with self.connect() as db:
+            cursor = db.execute(
+                "UPDATE tasks SET status = ?, updated_at = ?"
+                " WHERE task_group = ? AND status = ?",
+                (CANCELLED, time.time(), group, PENDING)
+            )
+            return cursor.rowcount
+
+    def claim(self, keys: list[str], owner: str) -> set[str]:
+        """
+        Claims keys for an owner, unless another owner claimed them first.
+
+        Args:
+        - keys (list[str]): The keys.
+        - owner (str): The owner, e.g. the key of the claiming task. A
+          retried task claims its keys again under the same owner.
+
+        Returns:
+        - set[str]: The keys held by the owner.
+        """
+        now = time.time()
+        with self.connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            db.executemany(
+                "INSERT OR IGNORE INTO claims (key, owner, created_at)"
+                " VALUES (?, ?, ?)",
+                [(key, owner, now) for key in keys]
+            )
+            held = set()
+            for key in keys:
+                row = db.execute(
+                    "SELECT owner FROM claims WHERE key = ?", (key,)
+                ).fetchone()
+                if row["owner"] == owner:
+                    held.add(key)
+        return held
+
+    def counts(self) -> dict:
+        """
+        Counts the tasks of each status.
+
+        Returns:
+        - dict: The number of tasks by status.
+        """
+        with self.connect() as db:
+            rows = db.execute(
+                "SELECT status, COUNT(*) AS n FROM tasks GROUP BY status"
+            ).fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def is_drained(self) -> bool:
+        """
+        Checks whether every task is finished, i.e. none is pending or
+        leased.
+
+        Returns:
+        - bool: True if the queue is drained.
+        """
+        counts = self.counts()
+        return counts.get(PENDING, 0) + counts.get(LEASED, 0) == 0
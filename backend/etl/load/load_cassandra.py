@@ -4,7 +4,10 @@ Cassandra in the ETL pipeline.
 """
 from etl.databases.cassandra.data_models import Job
 from etl.databases.cassandra.table_models import JobListings
-from etl.databases.cassandra.cassandra_conn import CassandraConn
+from etl.databases.cassandra.cassandra_conn import CassandraConn, sync_table
+from etl.transform.near_duplicates import open_index
+from cassandra.cqlengine.query import LWTException
+from etl.utils.metrics import instrumented, timed
 from src.utils.pipeline_log_config import pipeline as logger
 from datetime import datetime
 
@@ -13,6 +16,8 @@ class CassandraIO:
     def __init__(self):
         self.conn = CassandraConn()
         self.session = self.conn.session
+        # add the columns of `job_listings` missing on older keyspaces
+        sync_table(JobListings)
 
     def get_uuids(self):
         """
@@ -97,33 +102,118 @@ class CassandraIO:
             self.scrape_dates.append(i['scraped_at'])
 
     def write_jobs(self, jobs: list[Job]):
-        # write new jobs
+        # write new jobs, recording the time taken and jobs written
         logger.info(f"Writing {len(jobs)} new jobs")
         n = 0
-        for job in jobs:
-            n += 1
+        with timed("write_jobs", getattr(self, "site", "all")) as record:
+            for job in jobs:
+                n += 1
+                try:
+                    JobListings.objects.if_not_exists().create(
+                        uuid=str(job.uuid),
+                        skipped=job.skipped,
+                        scraped_at=job.scraped_at,
+                        source=job.source,
+                        job_id=job.job_id,
+                        job_title=job.job_title,
+                        company_name=job.company_name,
+                        location=job.location,
+                        date=job.date,
+                        job_link=job.job_link,
+                        job_desc=job.job_desc,
+                        seniority=job.seniority,
+                        emp_type=job.emp_type,
+                        job_func=job.job_func,
+                        ind=job.ind,
+                        alt_links=job.alt_links
+                    )
+                    record["items"] += 1
+                except Exception as e:
+                    record["errors"] += 1
+                    logger.error(
+                        f"Error writing job {n} -- {job.job_id}: {e}"
+                    )
+
+    def add_alt_links(self, alt_links: dict[str, set[str]]) -> set[str]:
+        """
+        Adds the links of near-duplicates to the alternate links of jobs
+        already in the `job_listings` table.
+
+        Args:
+        - alt_links (dict[str, set[str]]): The new links, by job UUID.
+
+        Returns:
+        - set[str]: The UUIDs of the jobs which are no longer in the table,
+          e.g. because they were scrubbed, whose near-duplicates must be
+          written instead.
+        """
+        missing = set()
+        for uuid, links in alt_links.items():
             try:
-                JobListings.objects.if_not_exists().create(
-                    uuid=str(job.uuid),
-                    skipped=job.skipped,
-                    scraped_at=job.scraped_at,
-                    source=job.source,
-                    job_id=job.job_id,
-                    job_title=job.job_title,
-                    company_name=job.company_name,
-                    location=job.location,
-                    date=job.date,
-                    job_link=job.job_link,
-                    job_desc=job.job_desc,
-                    seniority=job.seniority,
-                    emp_type=job.emp_type,
-                    job_func=job.job_func,
-                    ind=job.ind
+                JobListings.objects(uuid=uuid).if_exists().update(
+                    alt_links__add=links
                 )
+            except LWTException:
+                missing.add(uuid)
             except Exception as e:
-                logger.error(f"Error writing job {n} -- {job.job_id}: {e}")
+                logger.error(f"Error adding alternate links to {uuid}: {e}")
+        return missing
+
+    def remove_duplicates(self, uuids: list[str]):
+        """
+        Removes scrubbed jobs and their near-duplicates from the
+        near-duplicate index, so later copies of their postings are written
+        as new jobs, logging instead of raising if it fails.
+
+        Args:
+        - uuids (list[str]): The UUIDs of the scrubbed jobs.
+        """
+        try:
+            index = open_index(self.conn.config["scraping"]["near_duplicates"])
+            if index is not None:
+                removed = index.remove(uuids)
+                logger.info(f"Removed {removed} jobs from near-duplicates")
+        except Exception as e:
+            logger.error(f"Error removing jobs from near-duplicates: {e}")
+
+    def get_job_pages(self, sources: list[str]) -> list[dict]:
+        """
+        Retrieves the link and description of the jobs of some sources
+        from the `job_listings` table.
+
+        Args:
+        - sources (list[str]): The sources of the jobs, as in the `source`
+          column, e.g. `Linkedin`.
+
+        Returns:
+        - list[dict]: The `uuid`, `source`, `job_link` and `job_desc` of
+          each job.
+        """
+        rows = self.session.execute(
+            "SELECT uuid, source, job_link, job_desc FROM job_listings"
+        )
+        return [
+            {**row, "uuid": str(row["uuid"])} for row in rows
+            if row["source"] in sources
+        ]
 
-    def scrub_jobs(self):
+    def update_job_details(self, details: dict[str, dict]):
+        """
+        Replaces the job page details of jobs in the `job_listings` table,
+        e.g. after their postings were edited.
+
+        Args:
+        - details (dict[str, dict]): The new details keyed by field name,
+          by job UUID.
+        """
+        for uuid, fields in details.items():
+            try:
+                JobListings.objects(uuid=uuid).if_exists().update(**fields)
+            except Exception as e:
+                logger.error(f"Error updating job details of {uuid}: {e}")
+
+    @instrumented("scrub_jobs")
+    def scrub_jobs(self) -> int:
         """
         Scrubs and potentially deletes jobs older than 30 days
         from the `job_listings` table.
@@ -148,7 +238,7 @@ class CassandraIO:
         - None
 
         Returns:
-        - None
+        - int: The number of old jobs found.
 
         Example:
             cassandra_io = CassandraIO()
@@ -184,5 +274,118 @@ class CassandraIO:
                     logger.error(
                         f"Error deleting jobs from `job_listings`: {e}"
                     )
+            self.remove_duplicates(old_jobs)
         else:
             logger.info("No old jobs found")
+        return len(old_jobs)
+
+
+class JobWriter:
+    """
+    Buffers scraped jobs and writes them to the `job_listings` table in
+    batches, so jobs land in the database while scraping is still running
+    and memory use does not grow with the number of jobs.
+
+    Attributes:
+    - cassandra_io (CassandraIO): The Cassandra interface used to write.
+    - batch_size (int): The number of buffered jobs that triggers a write.
+    - buffer (list[Job]): The jobs waiting to be written.
+    - written (int): The number of jobs passed to the database so far.
+    - on_flush (Callable[[list[Job]], None] | None): Called with each
+      batch after it is written, e.g. to checkpoint progress.
+    - deduplicator (NearDuplicateIndex | None): Merges the near-duplicates
+      of each batch into their canonical jobs before they are written.
+    - duplicates (int): The number of near-duplicates merged so far.
+
+    Example:
+        with JobWriter(cassandra_io, batch_size=25) as writer:
+            for job in scraper.scrape():
+                writer.add(job)
+    """
+    def __init__(self, cassandra_io: CassandraIO, batch_size: int,
+                 on_flush=None, deduplicator=None):
+        self.cassandra_io = cassandra_io
+        self.batch_size = batch_size
+        self.on_flush = on_flush
+        self.deduplicator = deduplicator
+        self.buffer: list[Job] = []
+        self.written = 0
+        self.duplicates = 0
+
+    def add(self, job: Job):
+        """
+        Buffers a job, writing the buffer once it holds `batch_size` jobs.
+
+        Args:
+        - job (Job): The job to be written.
+        """
+        self.buffer.append(job)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the buffered jobs to the database, merging near-duplicates
+        into their canonical jobs first if there is a `deduplicator`.
+        """
+        if len(self.buffer) == 0:
+            return
+        jobs = self.buffer
+        if self.deduplicator is not None:
+            jobs = self.dedup(self.buffer)
+            self.duplicates += len(self.buffer) - len(jobs)
+        self.cassandra_io.write_jobs(jobs)
+        self.written += len(jobs)
+        if self.deduplicator is not None:
+            # link the copies other scrapers found while the jobs were
+            # being written
+            self.cassandra_io.add_alt_links(
+                self.deduplicator.mark_written([job.uuid for job in jobs])
+            )
+        if self.on_flush is not None:
+            self.on_flush(self.buffer)
+        self.buffer = []
+
+    def dedup(self, jobs: list[Job]) -> list[Job]:
+        """
+        Merges near-duplicates into their canonical jobs, adding the links
+        of copies of jobs already written to those jobs.
+
+        The links of copies of canonical jobs another scraper is still
+        writing are held until they are written. Copies of canonical jobs
+        which are no longer in the database after they were written, i.e.
+        which were scrubbed, are clustered again, with the first copy made
+        canonical, so reposted jobs are not lost.
+
+        Args:
+        - jobs (list[Job]): The jobs.
+
+        Returns:
+        - list[Job]: The canonical jobs to be written.
+        """
+        canonical, alt_links = self.deduplicator.dedup(jobs)
+        missing = self.cassandra_io.add_alt_links(alt_links)
+        if len(missing) == 0:
+            return canonical
+        written = self.deduplicator.hold_links(
+            {uuid: alt_links[uuid] for uuid in missing}
+        )
+        # jobs may have been written since the links were first added
+        missing = self.cassandra_io.add_alt_links(
+            {uuid: alt_links[uuid] for uuid in written}
+        )
+        if len(missing) == 0:
+            return canonical
+        self.deduplicator.remove(list(missing))
+        orphan_links = set().union(*(alt_links[uuid] for uuid in missing))
+        orphans = [job for job in jobs if job.job_link in orphan_links]
+        canonical_orphans, alt_links = self.deduplicator.dedup(orphans)
+        self.cassandra_io.add_alt_links(alt_links)
+        return canonical + canonical_orphans
+
+    def __enter__(self) -> "JobWriter":
+        return self
+
+    def __exit__(self, *exc):
+        # write the remaining jobs, even if scraping stopped early
+        self.flush()
@@ -2,6 +2,9 @@ from etl.databases.chroma.chroma_conn import ChromaConn
 from etl.databases.chroma.data_models import JobEmbedding
 from etl.load.load_cassandra import CassandraIO, JobListings
 from etl.transform.vectorizer import vectorize
+from etl.transform.lexical_index import InvertedIndex
+from etl.transform.quantization import CompressedIndex, CODECS
+from etl.utils.metrics import instrumented
 from src.utils.pipeline_log_config import pipeline as logger
 from datetime import datetime
 
@@ -15,7 +18,8 @@ class ChromaIO(CassandraIO):
         CassandraIO. It sets up the connection to the Chroma database and
         initializes the jobs_table attribute by obtaining the collection
         from the Chroma database with the specified collection name
-        and embedding function.
+        and embedding function. It also loads the lexical index of job
+        listings which is kept in step with the vector table.
 
         Args:
         - None
@@ -36,6 +40,13 @@ class ChromaIO(CassandraIO):
             embedding_function=self.chroma_conn.embedding_function
         )
 
+        self.lexical_index_path =\
+            self.chroma_conn.config["database"]["lexical_index"]["path"]
+        self.lexical_index = InvertedIndex.load(self.lexical_index_path)
+
+        self.compressed_index_config =\
+            self.chroma_conn.config["database"]["compressed_index"]
+
     def get_vector_uuids(self):
         """
         Fetches UUIDs of jobs already present in the vector table.
@@ -60,7 +71,8 @@ class ChromaIO(CassandraIO):
         """
         try:
             # get uuids for jobs already in the vector table
-            self.vector_uuids = self.jobs_table.get()["ids"]
+            # without transferring their documents or metadata
+            self.vector_uuids = self.jobs_table.get(include=[])["ids"]
             logger.info(f"Found {len(self.vector_uuids)} jobs in vector table")
         except Exception as e:
             logger.error(
@@ -69,7 +81,8 @@ class ChromaIO(CassandraIO):
             logger.warning("Setting vector uuids to empty list")
             self.vector_uuids = []
 
-    def load_from_cassandra(self):
+    @instrumented("load_from_cassandra")
+    def load_from_cassandra(self) -> int:
         """
         Loads jobs from Cassandra to Chroma's vector table.
 
@@ -79,11 +92,14 @@ class ChromaIO(CassandraIO):
         respective data fetched from Cassandra. It pushes the newly embedded
         jobs to the vector table in Chroma.
 
+        Jobs missing from the lexical index (including jobs embedded before
+        the index existed) are added to it from the same Cassandra reads.
+
         Args:
         - None
 
         Returns:
-        - None
+        - int: The number of jobs embedded.
 
         Example:
             chroma_io = ChromaIO()
@@ -99,6 +115,10 @@ class ChromaIO(CassandraIO):
 
         # get list of jobs which have not been embedded yet
         to_push = [x for x in self.uuids if x not in self.vector_uuids]
+        # get list of jobs which are not in the lexical index yet
+        to_index = {x for x in self.uuids if x not in self.lexical_index}
+
+        indexed_jobs = []
         if len(to_push) > 0:
             logger.info(f"Pushing {len(to_push)} jobs to vector table")
             # embed jobs in `to_push`
@@ -107,6 +127,8 @@ class ChromaIO(CassandraIO):
             for id in to_push:
                 # pull full job data from cassandra
                 job = dict(JobListings.objects(uuid=id).get())
+                if id in to_index:
+                    indexed_jobs.append(job)
                 # vectorize job data
                 job_vector = JobEmbedding(
                     uuid=str(id),
@@ -128,20 +150,131 @@ class ChromaIO(CassandraIO):
         else:
             logger.info("Vector table is up to date")
 
-    def scrub_jobs(self):
+        # index jobs which were embedded before the lexical index existed
+        for id in to_index.difference(to_push):
+            indexed_jobs.append(dict(JobListings.objects(uuid=id).get()))
+        self.update_lexical_index(add=indexed_jobs)
+        return len(to_push)
+
+    def reembed_jobs(self, uuids: list[str]):
+        """
+        Re-embeds jobs whose details changed in Cassandra, replacing their
+        vectors in the vector table and their entries in the lexical index.
+
+        Args:
+        - uuids (list[str]): The UUIDs of the changed jobs, e.g. from
+          `JobRefresher.refresh`.
+
+        Returns:
+        - None
+
+        Example:
+            chroma_io = ChromaIO()
+
+            chroma_io.reembed_jobs(refresher.refresh())
+
+            Re-embeds the jobs whose descriptions were edited.
+        """
+        if len(uuids) == 0:
+            logger.info("No changed jobs to re-embed")
+            return
+        jobs = [dict(JobListings.objects(uuid=id).get()) for id in uuids]
+        try:
+            self.jobs_table.upsert(
+                ids=[str(job["uuid"]) for job in jobs],
+                embeddings=[vectorize(job)[0] for job in jobs]
+            )
+            logger.info(f"Re-embedded {len(jobs)} changed jobs")
+        except Exception as e:
+            logger.error(f"Failed to re-embed changed jobs: {e}")
+        self.update_lexical_index(add=jobs, remove=uuids)
+
+    def update_lexical_index(self, add: list[dict] | None = None,
+                             remove: list[str] | None = None):
+        """
+        Applies incremental changes to the lexical index and saves it.
+
+        Args:
+        - add (list[dict] | None): Full job listings to add to the index.
+        - remove (list[str] | None): UUIDs of jobs to remove from the index.
+
+        Returns:
+        - None
+        """
+        add = add or []
+        remove = remove or []
+        if len(add) == 0 and len(remove) == 0:
+            logger.info("Lexical index is up to date")
+            return
+        try:
+            self.lexical_index.remove_jobs(remove)
+            self.lexical_index.add_jobs(add)
+            self.lexical_index.save(self.lexical_index_path)
+            logger.info(
+                f"Lexical index updated: {len(add)} added, "
+                f"{len(remove)} removed, {len(self.lexical_index)} total"
+            )
+        except Exception as e:
+            logger.error(f"Failed to update lexical index: {e}")
+
+    def build_compressed_index(self):
+        """
+        Builds the compressed copy of the vector table used for search.
+
+        This method reads every embedding from the vector table, compresses
+        them with the codec set in the `compressed_index` config section and
+        saves the index to disk, where the search route picks it up. The
+        full precision vectors are saved alongside for exact re-scoring
+        when re-scoring is enabled. Nothing is built if the method is `none`.
+
+        Args:
+        - None
+
+        Returns:
+        - None
+
+        Example:
+            chroma_io = ChromaIO()
+
+            chroma_io.build_compressed_index()
+
+            Compresses the job embeddings and saves the index to disk.
+        """
+        method = self.compressed_index_config["method"]
+        if method == "none":
+            logger.info("Compressed index disabled")
+            return
+        try:
+            results = self.jobs_table.get(include=["embeddings"])
+            index = CompressedIndex(CODECS[method]()).build(
+                ids=results["ids"],
+                vectors=results["embeddings"],
+                keep_vectors=self.compressed_index_config["rescore"] > 0
+            )
+            index.save(self.compressed_index_config["path"])
+            logger.info(
+                f"Built {method} index of {len(index)} jobs "
+                f"({index.memory_bytes()} bytes in memory)"
+            )
+        except Exception as e:
+            logger.error(f"Failed to build compressed index: {e}")
+
+    @instrumented("scrub_embeddings")
+    def scrub_jobs(self) -> int:
         """
         Deletes embeddings for jobs older than 30 days from
         the vector table in Chroma.
 
         This method fetches job UUIDs and their scrape dates from Cassandra.
         It identifies jobs older than 30 days based on their scrape dates and
-        proceeds to delete their embeddings from the vector table in Chroma.
+        proceeds to delete their embeddings from the vector table in Chroma,
+        and removes them from the lexical index.
 
         Args:
         - None
 
         Returns:
-        - None
+        - int: The number of old job embeddings found.
 
         Example:
             chroma_io = ChromaIO()
@@ -176,5 +309,8 @@ class ChromaIO(CassandraIO):
                 )
             except Exception as e:
                 logger.error(f"Error deleting jobs from vector table: {e}")
+            self.update_lexical_index(remove=old_jobs)
+            self.remove_duplicates(old_jobs)
         else:
             logger.info("No old job embeddings found")
+        return len(old_jobs)
@@ -0,0 +1,156 @@
+"""
+This module contains the batch job which precomputes job recommendations
+for active users and caches them in Cassandra, so the recommendations panel
+can be served with a single key lookup.
+"""
+from datetime import datetime, timedelta
+from uuid import UUID
+from cassandra.cqlengine import management
+from etl.databases.cassandra.table_models import UserRecommendations
+from etl.load.load_chroma import ChromaIO
+from etl.utils.user_vectors import get_user_vector
+from src.utils.pipeline_log_config import pipeline as logger
+
+
+class RecommendationIO(ChromaIO):
+    def __init__(self):
+        """
+        Initializes a RecommendationIO instance.
+
+        This method initializes a RecommendationIO instance, inheriting from
+        ChromaIO for access to Cassandra and the job embeddings table, and
+        loads the recommendation settings from the config file.
+
+        Args:
+        - None
+
+        Returns:
+        - None
+
+        Example:
+            recommendation_io = RecommendationIO()
+            Initializes a RecommendationIO instance, setting up the database
+            connections and recommendation settings.
+        """
+        ChromaIO.__init__(self)
+
+        recommendations = self.chroma_conn.config["recommendations"]
+        self.top_k = recommendations["top_k"]
+        self.batch_size = recommendations["batch_size"]
+        self.active_days = recommendations["active_days"]
+
+    def get_active_users(self) -> list[UUID]:
+        """
+        Fetches the IDs of users who were active recently.
+
+        A user is active if they signed up, searched or clicked a job within
+        the last `active_days` days.
+
+        Args:
+        - None
+
+        Returns:
+        - list[UUID]: IDs of the active users.
+        """
+        cutoff = datetime.today() - timedelta(days=self.active_days)
+
+        active_users = set()
+        for column, table in [
+            ("created_at", "users"),
+            ("search_timestamp", "search_metadata"),
+            ("click_timestamp", "clicks_metadata")
+        ]:
+            rows = self.session.execute(
+                f"SELECT user_id, {column} FROM {table}"
+            )
+            for row in rows:
+                if row[column] is not None and row[column] >= cutoff:
+                    active_users.add(str(row['user_id']))
+
+        logger.info(f"Found {len(active_users)} active users")
+        return [UUID(user_id) for user_id in active_users]
+
+    def recommend_batch(self, user_ids: list[UUID]) -> dict[UUID, list[str]]:  # noqa E501
+        """
+        Computes the top jobs for a batch of users.
+
+        Args:
+        - user_ids (list[UUID]): IDs of the users in the batch.
+
+        Returns:
+        - dict[UUID, list[str]]: The top `top_k` job IDs for each user who
+          has a profile vector, best first.
+        """
+        # read the cached profile vectors of the batch
+        profiled_users = []
+        vectors = []
+        for user_id in user_ids:
+            try:
+                vector = get_user_vector(user_id)
+            except Exception as e:
+                logger.error(f"Error reading vector of {user_id}: {e}")
+                continue
+            if vector is not None:
+                profiled_users.append(user_id)
+                vectors.append(vector)
+        if len(profiled_users) == 0:
+            return {}
+
+        # query the whole batch at once
+        results = self.jobs_table.query(
+            query_embeddings=vectors,
+            n_results=self.top_k
+        )
+        return dict(zip(profiled_users, results["ids"]))
+
+    def refresh_recommendations(self):
+        """
+        Recomputes and caches the top jobs for every active user.
+
+        This method reads the cached profile vector of each active user,
+        queries the job embeddings table in batches of `batch_size` users,
+        then writes each user's top `top_k` job IDs to the
+        `user_recommendations` table.
+
+        Args:
+        - None
+
+        Returns:
+        - None
+
+        Example:
+            recommendation_io = RecommendationIO()
+
+            recommendation_io.refresh_recommendations()
+
+            Refreshes the cached recommendations of all active users.
+        """
+        # make sure the table exists on keyspaces created before it was added
+        management.sync_table(model=UserRecommendations)
+
+        users = self.get_active_users()
+        refreshed = 0
+        for start in range(0, len(users), self.batch_size):
+            try:
+                recommendations = self.recommend_batch(
+                    users[start:start + self.batch_size]
+                )
+            except Exception as e:
+                logger.error(f"Error computing recommendations batch: {e}")
+                continue
+
+            # cache the results
+            for user_id, job_ids in recommendations.items():
+                try:
+                    UserRecommendations.create(
+                        user_id=user_id,
+                        job_ids=job_ids,
+                        updated_at=datetime.now()
+                    )
+                    refreshed += 1
+                except Exception as e:
+                    logger.error(
+                        f"Error caching recommendations of {user_id}: {e}"
+                    )
+
+        logger.info(f"Refreshed recommendations for {refreshed} users")
@@ -0,0 +1,121 @@
+"""
+This module contains the stages of the scraping pipeline, run as a graph of
+stages by `etl.utils.stage_runner`:
+
+- `scrape:<site>`: scrapes a site in its own process, merging the
+  near-duplicates of jobs posted on other sites and writing the new jobs to
+  Cassandra as they are scraped. The sites are scraped at the same time.
+- `embed`: embeds the new jobs in Chroma and adds them to the lexical index,
+  once every site has finished, whether it succeeded or not.
+- `scrub`: deletes the jobs older than 30 days from Chroma, the lexical
+  index and Cassandra, in that order, since old vectors are found from the
+  jobs in Cassandra.
+- `index` and `recommendations`: rebuild the compressed vector index and
+  refresh the cached recommendations of active users, at the same time.
+
+The stages of each run are recorded in the database set in the `pipeline`
+section of the config file, so a run can be resumed with only its failed
+stages, and the stages after them, run again.
+"""
+
+import yaml
+from etl.extract.orchestrator import SITE_SCRAPERS, scrape_sites
+from etl.load.load_cassandra import CassandraIO
+from etl.load.load_chroma import ChromaIO
+from etl.load.load_recommendations import RecommendationIO
+from etl.utils.stage_runner import StageStore, run_stages
+
+
+def scrape_stage(site: str, SiteScraper):
+    """
+    Returns the function of the stage scraping one site.
+
+    Args:
+    - site (str): The site name.
+    - SiteScraper: The scraper class of the site.
+
+    Returns:
+    - Callable: The stage function, returning the site's summary.
+    """
+    def scrape() -> dict:
+        summary = scrape_sites({site: SiteScraper})[0]
+        if summary["status"] != "ok":
+            raise RuntimeError(f"{summary['status']}: {summary['error']}")
+        return summary
+    return scrape
+
+
+def embed():
+    ChromaIO().load_from_cassandra()
+
+
+def scrub():
+    ChromaIO().scrub_jobs()
+    CassandraIO().scrub_jobs()
+
+
+def build_index():
+    ChromaIO().build_compressed_index()
+
+
+def refresh_recommendations():
+    RecommendationIO().refresh_recommendations()
+
+
+def scraping_stages(sites: dict = None) -> list[dict]:
+    """
+    Returns the stages of the scraping pipeline.
+
+    Args:
+    - sites (dict | None): Scraper classes by site name. Default is None
+      (all sites in `SITE_SCRAPERS`).
+
+    Returns:
+    - list[dict]: The stages, see `etl.utils.stage_runner.run_stages`.
+    """
+    sites = sites or SITE_SCRAPERS
+    scrapes = [f"scrape:{site}" for site in sites]
+    return [
+        *[{"name": f"scrape:{site}", "run": scrape_stage(site, SiteScraper)}
+          for site, SiteScraper in sites.items()],
+        {"name": "embed", "run": embed, "after": scrapes},
+        {"name": "scrub", "run": scrub, "after": ["embed"]},
+        {"name": "index", "run": build_index, "after": ["scrub"]},
+        {"name": "recommendations", "run": refresh_recommendations,
+         "after": ["scrub"]},
+    ]
+
+
+def open_stage_store() -> tuple[StageStore, dict]:
+    """
+    Opens the stage store set in the config file.
+
+    Returns:
+    - tuple[StageStore, dict]: The store and the `pipeline` section of the
+      config file.
+    """
+    with open("./config/config.yaml", "r") as stream:
+        settings = yaml.safe_load(stream)["pipeline"]
+    return StageStore(settings["path"]), settings
+
+
+def run_scraping_pipeline(resume: bool = False) -> str:
+    """
+    Runs the scraping pipeline, or resumes its latest run.
+
+    Args:
+    - resume (bool): Whether to resume the latest run, running again only
+      its stages which did not succeed and the stages after them. Default
+      is False (a new run).
+
+    Returns:
+    - str: The run.
+
+    Example:
+        run_id = run_scraping_pipeline()
+        Scrapes every site, then embeds, scrubs and indexes the jobs and
+        refreshes the recommendations.
+    """
+    store, settings = open_stage_store()
+    run_id = store.latest_run() if resume else None
+    return run_stages(scraping_stages(), store, run_id, settings["workers"])
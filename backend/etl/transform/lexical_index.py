@@ -0,0 +1,329 @@
+"""
+This module contains the lexical (keyword) index over job listings.
+
+The index is an inverted index of the tokenized `job_title`,
+`company_name`, `location` and `job_desc` fields, with posting lists stored
+as delta + varint compressed byte strings. It is maintained incrementally by
+`ChromaIO` and scored with BM25, so that keyword-heavy queries can be fused
+with the dense vector results in the search route, or answered on their own
+when the embedding model is unavailable.
+"""
+
+import os
+import re
+import math
+import pickle
+from collections import Counter
+
+
+# fields of a job listing that are indexed
+INDEXED_FIELDS = ["job_title", "company_name", "location", "job_desc"]
+
+# common english words that carry no ranking signal
+STOPWORDS = frozenset([
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in",
+    "is", "it", "of", "on", "or", "our", "that", "the", "this", "to",
+    "we", "will", "with", "you", "your"
+])
+
+# keep characters used in skill names such as `c++`, `c#` or `node.js`
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Splits text into lowercase index terms.
+
+    Args:
+    - text (str): The text to be tokenized.
+
+    Returns:
+    - list[str]: The terms in the text, in order, with stopwords removed.
+    """
+    return [
+        token for token in TOKEN_PATTERN.findall(str(text).lower())
+        if token not in STOPWORDS
+    ]
+
+
+def encode_varint(value: int) -> bytes:
+    """
+    Encodes a non-negative integer as a variable length byte string.
+
+    Args:
+    - value (int): The integer to be encoded.
+
+    Returns:
+    - bytes: 7 bits of the value per byte, with the high bit set on
+      every byte except the last.
+    """
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def encode_postings(postings: list[tuple[int, int]], last_doc: int = -1) -> bytes:  # noqa E501
+    """
+    Compresses a posting list into a byte string.
+
+    Args:
+    - postings (list[tuple[int, int]]): `(doc_id, term_frequency)` pairs
+      sorted by ascending document ID.
+    - last_doc (int): The last document ID already encoded in the list
+      this chunk will be appended to. Default is -1 (new list).
+
+    Returns:
+    - bytes: Document ID gaps and term frequencies encoded as varints.
+    """
+    out = bytearray()
+    for doc_id, term_freq in postings:
+        out += encode_varint(doc_id - last_doc)
+        out += encode_varint(term_freq)
+        last_doc = doc_id
+    return bytes(out)
+
+
+def decode_postings(data: bytes) -> list[tuple[int, int]]:
+    """
+    Decompresses a posting list produced by `encode_postings`.
+
+    Args:
+    - data (bytes): The compressed posting list.
+
+    Returns:
+    - list[tuple[int, int]]: `(doc_id, term_frequency)` pairs.
+    """
+    postings = []
+    values = []
+    value = 0
+    shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        values.append(value)
+        value = 0
+        shift = 0
+
+    doc_id = -1
+    for gap, term_freq in zip(values[0::2], values[1::2]):
+        doc_id += gap
+        postings.append((doc_id, term_freq))
+    return postings
+
+
+def reciprocal_rank_fusion(rankings: list[list[str]],
+                           n_results: int = 10,
+                           k: int = 60) -> list[str]:
+    """
+    Fuses several ranked lists of job IDs into one ranking.
+
+    Args:
+    - rankings (list[list[str]]): Ranked lists of job IDs, best first.
+    - n_results (int): The number of fused results to return. Default is 10.
+    - k (int): The rank smoothing constant. Default is 60.
+
+    Returns:
+    - list[str]: Job IDs ordered by the sum of `1 / (k + rank)` over every
+      list they appear in.
+    """
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for rank, job_id in enumerate(ranking, start=1):
+            scores[job_id] = scores.get(job_id, 0.0) + 1.0 / (k + rank)
+    fused = sorted(scores, key=lambda job_id: scores[job_id], reverse=True)
+    return fused[:n_results]
+
+
+class InvertedIndex:
+    """
+    Inverted index over job listings with BM25 scoring.
+
+    Documents are given increasing internal IDs as they are added, so new
+    postings can be appended to the compressed lists without decoding them.
+    Removed documents are tombstoned and purged from the posting lists once
+    they make up more than `compact_ratio` of the index.
+
+    Attributes:
+    - k1 (float): BM25 term frequency saturation parameter.
+    - b (float): BM25 document length normalization parameter.
+    - compact_ratio (float): Fraction of removed documents that triggers
+      a compaction of the posting lists.
+    - postings (dict[str, bytes]): Compressed posting list for each term.
+    - doc_ids (dict[str, int]): Internal document ID for each job UUID.
+    - doc_uuids (dict[int, str]): Job UUID for each internal document ID.
+    - doc_lengths (dict[int, int]): Number of terms in each document.
+    """
+    def __init__(self, k1: float = 1.2, b: float = 0.75,
+                 compact_ratio: float = 0.2):
+        self.k1 = k1
+        self.b = b
+        self.compact_ratio = compact_ratio
+        self.postings: dict[str, bytes] = {}
+        self.last_doc: dict[str, int] = {}
+        self.doc_freq: dict[str, int] = {}
+        self.doc_ids: dict[str, int] = {}
+        self.doc_uuids: dict[int, str] = {}
+        self.doc_lengths: dict[int, int] = {}
+        self.deleted: set[int] = set()
+        self.next_doc = 0
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    def __contains__(self, uuid: object) -> bool:
+        return str(uuid) in self.doc_ids
+
+    def add_jobs(self, jobs: list[dict]):
+        """
+        Adds job listings to the index.
+
+        Args:
+        - jobs (list[dict]): Job listings with a `uuid` key and the
+          fields in `INDEXED_FIELDS`. Jobs already in the index are
+          re-indexed.
+        """
+        self.remove_jobs([job["uuid"] for job in jobs if job["uuid"] in self])
+
+        for job in jobs:
+            doc_id = self.next_doc
+            self.next_doc += 1
+
+            # count terms across all indexed fields
+            terms = Counter()
+            for field in INDEXED_FIELDS:
+                terms.update(tokenize(job.get(field) or ""))
+
+            # append the new document to each term's posting list
+            for term, term_freq in terms.items():
+                self.postings[term] = self.postings.get(term, b"") +\
+                    encode_postings(
+                        [(doc_id, term_freq)],
+                        self.last_doc.get(term, -1)
+                    )
+                self.last_doc[term] = doc_id
+                self.doc_freq[term] = self.doc_freq.get(term, 0) + 1
+
+            uuid = str(job["uuid"])
+            length = sum(terms.values())
+            self.doc_ids[uuid] = doc_id
+            self.doc_uuids[doc_id] = uuid
+            self.doc_lengths[doc_id] = length
+            self.total_length += length
+
+    def remove_jobs(self, uuids: list[str]):
+        """
+        Removes job listings from the index.
+
+        Args:
+        - uuids (list[str]): UUIDs of the jobs to remove. UUIDs which are
+          not in the index are ignored.
+        """
+        for uuid in uuids:
+            doc_id = self.doc_ids.pop(str(uuid), None)
+            if doc_id is None:
+                continue
+            del self.doc_uuids[doc_id]
+            self.total_length -= self.doc_lengths.pop(doc_id)
+            self.deleted.add(doc_id)
+
+        if len(self.deleted) > self.compact_ratio * max(len(self), 1):
+            self.compact()
+
+    def compact(self):
+        """
+        Rewrites the posting lists without tombstoned documents.
+        """
+        for term in list(self.postings):
+            postings = [
+                (doc_id, term_freq)
+                for doc_id, term_freq in decode_postings(self.postings[term])
+                if doc_id not in self.deleted
+            ]
+            if len(postings) == 0:
+                del self.postings[term]
+                del self.last_doc[term]
+                del self.doc_freq[term]
+            else:
+                self.postings[term] = encode_postings(postings)
+                self.last_doc[term] = postings[-1][0]
+                self.doc_freq[term] = len(postings)
+        self.deleted = set()
+
+    def search(self, query: str, n_results: int = 10) -> list[str]:
+        """
+        Ranks indexed jobs against a keyword query with BM25.
+
+        Args:
+        - query (str): The keyword query.
+        - n_results (int): The maximum number of job IDs to return.
+          Default is 10.
+
+        Returns:
+        - list[str]: UUIDs of the best matching jobs, best first.
+        """
+        num_docs = len(self)
+        if num_docs == 0:
+            return []
+        avg_length = self.total_length / num_docs
+
+        scores: dict[int, float] = {}
+        for term in set(tokenize(query)):
+            if term not in self.postings:
+                continue
+            # document frequency may include tombstones until compaction,
+            # which only slightly underestimates the term's idf
+            doc_freq = min(self.doc_freq[term], num_docs)
+            idf = math.log(1 + (num_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+            for doc_id, term_freq in decode_postings(self.postings[term]):
+                if doc_id in self.deleted:
+                    continue
+                norm = self.k1 * (
+                    1 - self.b + self.b * self.doc_lengths[doc_id] / avg_length
+                )
+                scores[doc_id] = scores.get(doc_id, 0.0) +\
+                    idf * term_freq * (self.k1 + 1) / (term_freq + norm)
+
+        ranked = sorted(
+            scores, key=lambda doc_id: scores[doc_id], reverse=True
+        )
+        return [self.doc_uuids[doc_id] for doc_id in ranked[:n_results]]
+
+    def save(self, path: str):
+        """
+        Saves the index to disk.
+
+        The index is written to a temporary file which then replaces `path`,
+        so readers in other processes never see a partially written index.
+
+        Args:
+        - path (str): The file path to save the index to.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump(self.__dict__, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "InvertedIndex":
+        """
+        Loads an index from disk.
+
+        Args:
+        - path (str): The file path to load the index from.
+
+        Returns:
+        - InvertedIndex: The loaded index, or an empty index if no index
+          has been saved at `path` yet.
+        """
+        index = cls()
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                index.__dict__.update(pickle.load(f))
+        return index
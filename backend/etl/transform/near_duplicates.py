@@ -0,0 +1,483 @@
+"""
+This module detects near-duplicate jobs, e.g. the same posting syndicated on
+Indeed, LinkedIn and Jobberman, which get a UUID per job link.
+
+Each job is reduced to the word shingles of its normalized title, company
+and description, and the shingles to a MinHash signature, whose agreement
+with another signature estimates the Jaccard similarity of their shingles.
+Signatures are split into bands, and jobs sharing the bucket of any band
+(locality-sensitive hashing) are compared, so finding the duplicates of a
+job does not compare it with every other job.
+
+The first job of a cluster of near-duplicates is its canonical job. The
+links of the later ones are added to its alternate links, and they are not
+written to the database, so they are neither embedded nor returned as
+separate results. The signatures and buckets of the canonical jobs are kept
+in a SQLite database shared by the scrapers of every site.
+
+A canonical job is indexed before it is written to the database, so the
+index records which canonical jobs were written. The links of copies of a
+canonical job another scraper is still writing are held in the index until
+it is written, and only canonical jobs missing after they were written are
+taken as scrubbed.
+"""
+
+import hashlib
+import os
+import re
+import numpy as np
+from etl.databases.cassandra.data_models import Job
+from etl.utils.sqlite_conn import connect
+
+# prime modulus of the MinHash permutations, and the largest hash
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalizes text for comparison: lowercase words without punctuation,
+    separated by single spaces.
+
+    Args:
+    - text (str): The text.
+
+    Returns:
+    - str: The normalized text.
+    """
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+def job_text(job: Job) -> str:
+    """
+    Returns the normalized text a job is compared on: its title, company
+    and description.
+
+    Args:
+    - job (Job): The job.
+
+    Returns:
+    - str: The normalized text.
+    """
+    return normalize_text(
+        f"{job.job_title} {job.company_name} {job.job_desc}"
+    )
+
+
+def shingles(text: str, size: int) -> set[str]:
+    """
+    Returns the word shingles of a normalized text.
+
+    Args:
+    - text (str): The normalized text.
+    - size (int): The number of words in a shingle.
+
+    Returns:
+    - set[str]: The shingles, or the whole text if it has fewer words.
+    """
+    words = text.split()
+    if len(words) <= size:
+        return {text}
+    return {
+        " ".join(words[i:i + size]) for i in range(len(words) - size + 1)
+    }
+
+
+class MinHasher:
+    """
+    Computes MinHash signatures of sets of shingles.
+
+    Attributes:
+    - num_perm (int): The number of hash permutations, i.e. the length of
+      the signatures.
+    """
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        """
+        Initializes a MinHasher with random permutations.
+
+        Args:
+        - num_perm (int): The number of permutations. Default is 128.
+        - seed (int): The seed of the permutations. Signatures are only
+          comparable when computed with the same seed. Default is 1.
+        """
+        self.num_perm = num_perm
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(
+            1, int(MERSENNE_PRIME), size=num_perm, dtype=np.uint64
+        )
+        self.b = rng.randint(
+            0, int(MERSENNE_PRIME), size=num_perm, dtype=np.uint64
+        )
+
+    def signature(self, items: set[str]) -> np.ndarray:
+        """
+        Computes the MinHash signature of a set of shingles.
+
+        Args:
+        - items (set[str]): The shingles.
+
+        Returns:
+        - np.ndarray: The signature, shape `(num_perm,)`.
+        """
+        hashes = np.array([
+            int.from_bytes(
+                hashlib.blake2b(item.encode(), digest_size=4).digest(),
+                "little"
+            )
+            for item in items
+        ], dtype=np.uint64)
+        # permute every hash, wrapping around like the reference
+        # implementation, and keep the minimum of each permutation
+        with np.errstate(over="ignore"):
+            permuted = (
+                hashes[:, None] * self.a + self.b
+            ) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=0)
+
+    @staticmethod
+    def similarity(first: np.ndarray, second: np.ndarray) -> float:
+        """
+        Estimates the Jaccard similarity of the shingles of two signatures.
+
+        Args:
+        - first (np.ndarray): A signature.
+        - second (np.ndarray): Another signature.
+
+        Returns:
+        - float: The share of matching permutations.
+        """
+        return float(np.mean(first == second))
+
+
+class NearDuplicateIndex:
+    """
+    The canonical jobs, indexed by the LSH buckets of their signatures in a
+    SQLite database.
+
+    Attributes:
+    - path (str): The file path of the SQLite database.
+    - hasher (MinHasher): The MinHash permutations.
+    - bands (int): The number of LSH bands the signatures are split into.
+    - threshold (float): The estimated Jaccard similarity from which jobs
+      are near-duplicates.
+    - shingle_size (int): The number of words in a shingle.
+    """
+    def __init__(self, path: str, num_perm: int = 128, bands: int = 16,
+                 threshold: float = 0.8, shingle_size: int = 3):
+        """
+        Initializes a NearDuplicateIndex, creating its database if needed.
+
+        Args:
+        - path (str): The file path of the SQLite database.
+        - num_perm (int): The length of the signatures. Default is 128.
+        - bands (int): The number of LSH bands, which must divide
+          `num_perm`. More bands find duplicates of lower similarity at
+          the cost of more comparisons. Default is 16.
+        - threshold (float): The similarity from which jobs are
+          near-duplicates. Default is 0.8.
+        - shingle_size (int): The number of words in a shingle. Default
+          is 3.
+
+        Example:
+            index = NearDuplicateIndex("./models/near_duplicates.db")
+            canonical, alt_links = index.dedup(jobs)
+            cassandra_io.write_jobs(canonical)
+            cassandra_io.add_alt_links(alt_links)
+            held = index.mark_written([job.uuid for job in canonical])
+            cassandra_io.add_alt_links(held)
+        """
+        if num_perm % bands != 0:
+            raise ValueError(
+                f"{bands} bands do not divide {num_perm} permutations"
+            )
+        self.path = path
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self.connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " uuid TEXT PRIMARY KEY,"
+                " canonical TEXT NOT NULL,"
+                " signature BLOB,"
+                " written INTEGER NOT NULL DEFAULT 0)"
+            )
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                " band INTEGER NOT NULL,"
+                " bucket INTEGER NOT NULL,"
+                " uuid TEXT NOT NULL)"
+            )
+            db.execute(
+                "CREATE INDEX IF NOT EXISTS buckets_band"
+                " ON buckets (band, bucket)"
+            )
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS held_links ("
+                " canonical TEXT NOT NULL,"
+                " link TEXT NOT NULL,"
+                " PRIMARY KEY (canonical, link))"
+            )
+
+    def connect(self):
+        """
+        Opens a connection to the index database, see
+        `etl.utils.sqlite_conn.connect`.
+        """
+        return connect(self.path)
+
+    def buckets(self, signature: np.ndarray) -> list[tuple[int, int]]:
+        """
+        Returns the LSH bucket of each band of a signature.
+
+        Args:
+        - signature (np.ndarray): The signature.
+
+        Returns:
+        - list[tuple[int, int]]: The band number and bucket of each band.
+        """
+        return [
+            (n, int.from_bytes(
+                hashlib.blake2b(band.tobytes(), digest_size=7).digest(),
+                "little"
+            ))
+            for n, band in enumerate(np.split(signature, self.bands))
+        ]
+
+    def find_canonical(self, db, signature: np.ndarray) -> str | None:
+        """
+        Finds the most similar canonical job sharing a bucket with a
+        signature.
+
+        Args:
+        - db (sqlite3.Connection): The connection.
+        - signature (np.ndarray): The signature.
+
+        Returns:
+        - str | None: The UUID of the canonical job, or None if no job is
+          similar enough.
+        """
+        best, best_similarity = None, self.threshold
+        candidates = set()
+        for band, bucket in self.buckets(signature):
+            candidates.update(uuid for (uuid,) in db.execute(
+                "SELECT uuid FROM buckets WHERE band = ? AND bucket = ?",
+                (band, bucket)
+            ))
+        for uuid in sorted(candidates):
+            (blob,) = db.execute(
+                "SELECT signature FROM jobs WHERE uuid = ?", (uuid,)
+            ).fetchone()
+            similarity = MinHasher.similarity(
+                signature, np.frombuffer(blob, dtype=np.uint64)
+            )
+            if similarity >= best_similarity:
+                best, best_similarity = uuid, similarity
+        return best
+
+    def add(self, db, job: Job) -> str:
+        """
+        Adds a job to the index, as a canonical job or as a near-duplicate
+        of one.
+
+        Args:
+        - db (sqlite3.Connection): The connection.
+        - job (Job): The job.
+
+        Returns:
+        - str: The UUID of the job's canonical job, its own UUID if the job
+          is canonical.
+        """
+        uuid = str(job.uuid)
+        row = db.execute(
+            "SELECT canonical FROM jobs WHERE uuid = ?", (uuid,)
+        ).fetchone()
+        if row is not None:
+            # the job was indexed by an earlier, unfinished run
+            return row[0]
+
+        signature = self.hasher.signature(
+            shingles(job_text(job), self.shingle_size)
+        )
+        canonical = self.find_canonical(db, signature)
+        if canonical is not None:
+            db.execute(
+                "INSERT INTO jobs (uuid, canonical) VALUES (?, ?)",
+                (uuid, canonical)
+            )
+            return canonical
+
+        db.execute(
+            "INSERT INTO jobs (uuid, canonical, signature) VALUES (?, ?, ?)",
+            (uuid, uuid, signature.tobytes())
+        )
+        db.executemany(
+            "INSERT INTO buckets (band, bucket, uuid) VALUES (?, ?, ?)",
+            [(band, bucket, uuid) for band, bucket in self.buckets(signature)]
+        )
+        return uuid
+
+    def dedup(self, jobs: list[Job]) -> tuple[list[Job], dict[str, set]]:
+        """
+        Clusters a batch of jobs with the indexed jobs.
+
+        Args:
+        - jobs (list[Job]): The jobs.
+
+        Returns:
+        - tuple: The canonical jobs of the batch, with the links of their
+          near-duplicates in the batch among their `alt_links`, and the
+          links of the near-duplicates of earlier canonical jobs, by the
+          UUID of the canonical job.
+        """
+        canonical_jobs = {}
+        alt_links = {}
+        # serialize the scrapers of the sites, so two copies of a job
+        # scraped at once are not both made canonical
+        with self.connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            for job in jobs:
+                canonical = self.add(db, job)
+                if canonical == str(job.uuid):
+                    canonical_jobs[canonical] = job
+                elif canonical in canonical_jobs:
+                    canonical_jobs[canonical].alt_links.add(job.job_link)
+                else:
+                    alt_links.setdefault(canonical, set()).add(job.job_link)
+        return list(canonical_jobs.values()), alt_links
+
+    def mark_written(self, uuids: list[str]) -> dict[str, set[str]]:
+        """
+        Records that canonical jobs were written to the database, and
+        releases the links of their copies held until then.
+
+        Args:
+        - uuids (list[str]): The UUIDs of the written canonical jobs.
+
+        Returns:
+        - dict[str, set[str]]: The held links, by the UUID of the canonical
+          job, to be added to its alternate links.
+        """
+        uuids = [str(uuid) for uuid in uuids]
+        held = {}
+        with self.connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            for start in range(0, len(uuids), 500):
+                chunk = uuids[start:start + 500]
+                marks = ", ".join("?" * len(chunk))
+                db.execute(
+                    f"UPDATE jobs SET written = 1 WHERE uuid IN ({marks})",
+                    chunk
+                )
+                for canonical, link in db.execute(
+                    "SELECT canonical, link FROM held_links"
+                    f" WHERE canonical IN ({marks})", chunk
+                ).fetchall():
+                    held.setdefault(canonical, set()).add(link)
+                db.execute(
+                    f"DELETE FROM held_links WHERE canonical IN ({marks})",
+                    chunk
+                )
+        return held
+
+    def hold_links(self, alt_links: dict[str, set[str]]) -> set[str]:
+        """
+        Holds the links of copies of canonical jobs missing from the
+        database until the canonical jobs are written, unless they were
+        already written.
+
+        Args:
+        - alt_links (dict[str, set[str]]): The links of the copies, by the
+          UUID of the canonical job.
+
+        Returns:
+        - set[str]: The UUIDs of the canonical jobs which were written, or
+          removed from the index, whose links were not held.
+        """
+        written = set()
+        with self.connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            for canonical, links in alt_links.items():
+                row = db.execute(
+                    "SELECT written FROM jobs WHERE uuid = ?", (canonical,)
+                ).fetchone()
+                if row is None or row[0]:
+                    written.add(canonical)
+                    continue
+                db.executemany(
+                    "INSERT OR IGNORE INTO held_links (canonical, link)"
+                    " VALUES (?, ?)",
+                    [(canonical, link) for link in links]
+                )
+        return written
+
+    def remove(self, uuids: list[str]) -> int:
+        """
+        Removes jobs from the index, e.g. after they were scrubbed from the
+        database, with the near-duplicates of the canonical ones, so later
+        copies of their postings are written as new canonical jobs.
+
+        Args:
+        - uuids (list[str]): The UUIDs of the jobs.
+
+        Returns:
+        - int: The number of jobs removed, near-duplicates included.
+        """
+        uuids = [str(uuid) for uuid in uuids]
+        removed = 0
+        with self.connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            # stay under SQLite's limit of bound parameters
+            for start in range(0, len(uuids), 500):
+                chunk = uuids[start:start + 500]
+                marks = ", ".join("?" * len(chunk))
+                removed += db.execute(
+                    f"DELETE FROM jobs WHERE uuid IN ({marks})"
+                    f" OR canonical IN ({marks})",
+                    chunk + chunk
+                ).rowcount
+                db.execute(
+                    f"DELETE FROM buckets WHERE uuid IN ({marks})", chunk
+                )
+                db.execute(
+                    f"DELETE FROM held_links WHERE canonical IN ({marks})",
+                    chunk
+                )
+        return removed
+
+    def duplicate_uuids(self) -> set[str]:
+        """
+        Returns the UUIDs of the indexed near-duplicates, whose jobs are
+        not in the database.
+
+        Returns:
+        - set[str]: The UUIDs.
+        """
+        with self.connect() as db:
+            return {uuid for (uuid,) in db.execute(
+                "SELECT uuid FROM jobs WHERE uuid != canonical"
+            )}
+
+
+def open_index(settings: dict) -> NearDuplicateIndex | None:
+    """
+    Opens the index set in the `scraping.near_duplicates` section of the
+    config file.
+
+    Args:
+    - settings (dict): The `scraping.near_duplicates` section.
+
+    Returns:
+    - NearDuplicateIndex | None: The index, or None if it is disabled.
+    """
+    if not settings["enabled"]:
+        return None
+    return NearDuplicateIndex(
+        settings["path"],
+        settings["num_perm"],
+        settings["bands"],
+        settings["threshold"],
+        settings["shingle_size"]
+    )
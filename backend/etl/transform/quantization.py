@@ -0,0 +1,381 @@
+"""
+This module contains compressed representations of the job embeddings.
+
+Three codecs are available:
+- float16: half precision storage (2x smaller).
+- sq8: per-dimension scalar quantization to one byte (4x smaller).
+- pq: product quantization to one byte per subspace (32x smaller for
+  768-dim embeddings split into 96 subspaces).
+
+Distances are asymmetric: the query stays in full precision and is compared
+against the compressed codes. A `CompressedIndex` can keep the full
+precision vectors in a memory-mapped file on disk, so the final shortlist is
+re-scored exactly while only the codes are held in memory.
+"""
+
+import glob
+import os
+import pickle
+import uuid
+import numpy as np
+
+
+# number of vectors decoded at a time when computing distances
+CHUNK_SIZE = 65536
+
+
+def squared_distances(query: np.ndarray, vectors: np.ndarray) -> np.ndarray:
+    """
+    Computes squared L2 distances between a query and a set of vectors.
+
+    Args:
+    - query (np.ndarray): The query vector, shape `(dim,)`.
+    - vectors (np.ndarray): The vectors, shape `(n, dim)`.
+
+    Returns:
+    - np.ndarray: The squared distance to each vector, shape `(n,)`.
+    """
+    diff = np.asarray(vectors, dtype=np.float32) - query
+    return np.einsum("ij,ij->i", diff, diff)
+
+
+class Float16Codec:
+    """
+    Stores vectors in half precision.
+    """
+    name = "float16"
+
+    def train(self, vectors: np.ndarray) -> "Float16Codec":
+        return self
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        return np.asarray(vectors, dtype=np.float16)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        return codes.astype(np.float32)
+
+    def distances(self, query: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """
+        Computes squared L2 distances between a full precision query and
+        encoded vectors.
+
+        Args:
+        - query (np.ndarray): The query vector, shape `(dim,)`.
+        - codes (np.ndarray): The encoded vectors.
+
+        Returns:
+        - np.ndarray: The squared distance to each vector.
+        """
+        return np.concatenate([
+            squared_distances(query, self.decode(codes[i:i + CHUNK_SIZE]))
+            for i in range(0, len(codes), CHUNK_SIZE)
+        ] or [np.empty(0, dtype=np.float32)])
+
+    def nbytes(self) -> int:
+        return 0
+
+
+class ScalarQuantizer(Float16Codec):
+    """
+    Quantizes each dimension to 256 levels between its minimum and maximum
+    over the training vectors.
+    """
+    name = "sq8"
+
+    def train(self, vectors: np.ndarray) -> "ScalarQuantizer":
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.low = vectors.min(axis=0)
+        self.scale = (vectors.max(axis=0) - self.low) / 255
+        # avoid division by zero on constant dimensions
+        self.scale[self.scale == 0] = 1.0
+        return self
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        levels = (np.asarray(vectors, dtype=np.float32) - self.low) /\
+            self.scale
+        return np.clip(np.rint(levels), 0, 255).astype(np.uint8)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        return codes.astype(np.float32) * self.scale + self.low
+
+    def nbytes(self) -> int:
+        return self.low.nbytes + self.scale.nbytes
+
+
+class ProductQuantizer:
+    """
+    Splits vectors into `num_subspaces` equal parts and replaces each part
+    with the index of its nearest k-means centroid.
+
+    Attributes:
+    - num_subspaces (int): The number of subspaces (bytes per vector).
+    - num_centroids (int): The number of centroids per subspace (at
+      most 256).
+    - iterations (int): The number of k-means iterations used in training.
+    - seed (int): Seed for the centroid initialization.
+    """
+    name = "pq"
+
+    def __init__(self, num_subspaces: int = 96, num_centroids: int = 256,
+                 iterations: int = 20, seed: int = 0):
+        self.num_subspaces = num_subspaces
+        self.num_centroids = num_centroids
+        self.iterations = iterations
+        self.seed = seed
+
+    def split(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Reshapes vectors of shape `(n, dim)` into `(n, m, dim / m)`.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        return vectors.reshape(len(vectors), self.num_subspaces, -1)
+
+    def assign(self, parts: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """
+        Finds the nearest centroid of each subvector in one subspace.
+
+        Uses `|c|^2 - 2 x.c` (the `|x|^2` term does not change the
+        nearest centroid), so only an `(n, k)` matrix is materialized.
+        """
+        centroid_norms = (centroids ** 2).sum(axis=1)
+        return np.concatenate([
+            np.argmin(
+                centroid_norms - 2 * parts[i:i + CHUNK_SIZE] @ centroids.T,
+                axis=1
+            )
+            for i in range(0, len(parts), CHUNK_SIZE)
+        ] or [np.empty(0, dtype=np.int64)])
+
+    def train(self, vectors: np.ndarray) -> "ProductQuantizer":
+        """
+        Learns the centroids of every subspace with k-means.
+
+        Args:
+        - vectors (np.ndarray): The training vectors, shape `(n, dim)`,
+          where `dim` is divisible by `num_subspaces`.
+
+        Returns:
+        - ProductQuantizer: The trained quantizer.
+        """
+        subvectors = self.split(vectors)
+        rng = np.random.default_rng(self.seed)
+        num_centroids = min(self.num_centroids, len(subvectors))
+
+        self.centroids = np.empty(
+            (self.num_subspaces, num_centroids, subvectors.shape[-1]),
+            dtype=np.float32
+        )
+        for j in range(self.num_subspaces):
+            parts = subvectors[:, j, :]
+            centroids = parts[
+                rng.choice(len(parts), num_centroids, replace=False)
+            ].copy()
+            for _ in range(self.iterations):
+                labels = self.assign(parts, centroids)
+                # move each centroid to the mean of its members
+                counts = np.bincount(labels, minlength=num_centroids)
+                sums = np.stack([
+                    np.bincount(
+                        labels, weights=parts[:, d], minlength=num_centroids
+                    )
+                    for d in range(parts.shape[1])
+                ], axis=1)
+                # keep empty clusters where they are
+                filled = counts > 0
+                centroids[filled] = sums[filled] / counts[filled, None]
+            self.centroids[j] = centroids
+        return self
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        subvectors = self.split(vectors)
+        codes = np.empty(
+            (len(subvectors), self.num_subspaces),
+            dtype=np.uint8
+        )
+        for j in range(self.num_subspaces):
+            codes[:, j] = self.assign(subvectors[:, j, :], self.centroids[j])
+        return codes
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        parts = self.centroids[np.arange(self.num_subspaces), codes]
+        return parts.reshape(len(codes), -1)
+
+    def distances(self, query: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """
+        Computes asymmetric squared L2 distances with a lookup table of the
+        distances between each query subvector and every centroid.
+
+        Args:
+        - query (np.ndarray): The query vector, shape `(dim,)`.
+        - codes (np.ndarray): The encoded vectors, shape `(n, m)`.
+
+        Returns:
+        - np.ndarray: The approximate squared distance to each vector.
+        """
+        query_parts = np.asarray(query, dtype=np.float32).reshape(
+            self.num_subspaces, 1, -1
+        )
+        table = ((self.centroids - query_parts) ** 2).sum(axis=-1)
+        return table[np.arange(self.num_subspaces), codes].sum(axis=1)
+
+    def nbytes(self) -> int:
+        return self.centroids.nbytes
+
+
+# available codecs by name
+CODECS = {
+    "float16": Float16Codec,
+    "sq8": ScalarQuantizer,
+    "pq": ProductQuantizer,
+}
+
+
+class CompressedIndex:
+    """
+    Nearest neighbour index over compressed job embeddings.
+
+    Attributes:
+    - codec: The codec used to compress the vectors.
+    - ids (list[str]): The job ID of each vector.
+    - codes (np.ndarray): The compressed vectors.
+    - vectors (np.ndarray | None): The full precision vectors used for
+      exact re-scoring, memory-mapped from disk when the index is loaded.
+    """
+    def __init__(self, codec):
+        self.codec = codec
+        self.ids: list[str] = []
+        self.codes = np.empty((0, 0), dtype=np.uint8)
+        self.vectors = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def build(self, ids: list[str], vectors: list,
+              keep_vectors: bool = True) -> "CompressedIndex":
+        """
+        Trains the codec on the vectors and compresses them.
+
+        Args:
+        - ids (list[str]): The job ID of each vector.
+        - vectors (list[Sequence[float]]): The job embeddings.
+        - keep_vectors (bool): Whether to keep the full precision vectors
+          for exact re-scoring. Default is True.
+
+        Returns:
+        - CompressedIndex: The built index.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.ids = [str(id) for id in ids]
+        if len(vectors) > 0:
+            self.codec.train(vectors)
+            self.codes = self.codec.encode(vectors)
+        self.vectors = vectors if keep_vectors else None
+        return self
+
+    def search(self, query, n_results: int = 10,
+               rescore: int = 0) -> list[str]:
+        """
+        Finds the jobs nearest to a query vector.
+
+        Args:
+        - query (Sequence[float]): The query vector.
+        - n_results (int): The number of job IDs to return. Default is 10.
+        - rescore (int): The number of approximate candidates re-scored
+          with the full precision vectors. Default is 0 (no re-scoring).
+
+        Returns:
+        - list[str]: The IDs of the nearest jobs, nearest first.
+        """
+        if len(self) == 0:
+            return []
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        distances = self.codec.distances(query, self.codes)
+
+        # shortlist the nearest candidates by approximate distance
+        shortlist_size = min(max(n_results, rescore), len(self))
+        shortlist = np.argpartition(distances, shortlist_size - 1)[
+            :shortlist_size
+        ]
+
+        if rescore > 0 and self.vectors is not None:
+            # exact distances for the shortlist only
+            shortlist = np.sort(shortlist)
+            distances = squared_distances(query, self.vectors[shortlist])
+        else:
+            distances = distances[shortlist]
+
+        nearest = shortlist[np.argsort(distances)[:n_results]]
+        return [self.ids[i] for i in nearest]
+
+    def memory_bytes(self) -> int:
+        """
+        Returns the in-memory size of the compressed vectors and codec.
+        """
+        return self.codes.nbytes + self.codec.nbytes()
+
+    def save(self, path: str):
+        """
+        Saves the index to disk.
+
+        The codes and codec are saved to `path` and the full precision
+        vectors, if kept, to `path` + `.<generation>.vectors.npy`, where the
+        generation is a new ID recorded with the codes, so a reader never
+        pairs the codes of one save with the vectors of another. Both are
+        written to temporary files first so readers never see a partial
+        index, and the vectors of earlier saves are deleted afterwards.
+
+        Args:
+        - path (str): The file path to save the index to.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        generation = uuid.uuid4().hex
+        vectors_path = f"{path}.{generation}.vectors.npy"
+        if self.vectors is not None:
+            with open(f"{vectors_path}.tmp", "wb") as f:
+                np.save(f, np.asarray(self.vectors, dtype=np.float32))
+            os.replace(f"{vectors_path}.tmp", vectors_path)
+        with open(f"{path}.tmp", "wb") as f:
+            pickle.dump(
+                {"codec": self.codec, "ids": self.ids, "codes": self.codes,
+                 "generation": generation,
+                 "has_vectors": self.vectors is not None},
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL
+            )
+        os.replace(f"{path}.tmp", path)
+        # readers which mapped older vectors keep them until they reload
+        for old in glob.glob(f"{glob.escape(path)}.*vectors.npy"):
+            if old != vectors_path:
+                os.remove(old)
+
+    @classmethod
+    def load(cls, path: str, attempts: int = 3) -> "CompressedIndex":
+        """
+        Loads an index from disk, memory-mapping the full precision vectors.
+
+        Args:
+        - path (str): The file path to load the index from.
+        - attempts (int): The number of times the index is read again if
+          its vectors were deleted by a newer save while it was read.
+          Default is 3.
+
+        Returns:
+        - CompressedIndex: The loaded index.
+        """
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        index = cls(state["codec"])
+        index.ids = state["ids"]
+        index.codes = state["codes"]
+        if state["has_vectors"]:
+            try:
+                index.vectors = np.load(
+                    f"{path}.{state['generation']}.vectors.npy",
+                    mmap_mode="r"
+                )
+            except FileNotFoundError:
+                # a newer save replaced the index, read it instead
+                if attempts <= 1:
+                    raise
+                return cls.load(path, attempts - 1)
+        return index
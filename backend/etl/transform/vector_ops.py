@@ -0,0 +1,95 @@
+"""
+This module contains helpers for combining embedding vectors.
+
+Embeddings produced by the embedding model are L2-normalized, so vectors
+blended here are normalized again before being used to query the
+job embeddings table.
+"""
+
+import numpy as np
+
+
+def normalize(vector) -> list[float]:
+    """
+    Scales a vector to unit length.
+
+    Args:
+    - vector (Sequence[float]): The vector to be normalized.
+
+    Returns:
+    - list[float]: The normalized vector, or the vector unchanged if its
+      length is zero.
+    """
+    array = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(array)
+    if norm == 0:
+        return array.tolist()
+    return (array / norm).tolist()
+
+
+def mean_vector(vectors: list,
+                weights: list[float] | None = None) -> list[float] | None:
+    """
+    Averages a list of vectors into a single normalized vector.
+
+    Args:
+    - vectors (list[Sequence[float]]): The vectors to be averaged.
+    - weights (list[float] | None): The weight of each vector. Default is
+      None (equal weights).
+
+    Returns:
+    - list[float] | None: The normalized (weighted) mean vector, or None if
+      there are no vectors or all weights are zero.
+    """
+    if len(vectors) == 0:
+        return None
+    if weights is not None and sum(weights) == 0:
+        return None
+    return normalize(np.average(
+        np.asarray(vectors, dtype=np.float32),
+        axis=0,
+        weights=weights
+    ))
+
+
+def decay_weights(n: int, decay: float) -> list[float]:
+    """
+    Builds recency weights for a list ordered from newest to oldest.
+
+    Args:
+    - n (int): The number of weights.
+    - decay (float): The weight of each item relative to the item
+      before it.
+
+    Returns:
+    - list[float]: The weights `1, decay, decay ** 2, ...`.
+    """
+    return [decay ** i for i in range(n)]
+
+
+def blend_vectors(vectors: list,
+                  weights: list[float] | None = None) -> list[float] | None:
+    """
+    Blends several vectors into a single normalized vector.
+
+    Args:
+    - vectors (list[Sequence[float] | None]): The vectors to be blended.
+      Missing (None or empty) vectors are skipped.
+    - weights (list[float] | None): The weight of each vector. Default is
+      None (equal weights).
+
+    Returns:
+    - list[float] | None: The normalized weighted mean of the normalized
+      vectors, or None if all vectors are missing.
+    """
+    if weights is None:
+        weights = [1.0] * len(vectors)
+    present = [
+        (normalize(vector), weight)
+        for vector, weight in zip(vectors, weights)
+        if vector is not None and len(vector) > 0
+    ]
+    return mean_vector(
+        [vector for vector, _ in present],
+        [weight for _, weight in present]
+    )
@@ -5,6 +5,7 @@ to the embedding model for ChromaDB
 
 from src.models.embedding_model import model
 from chromadb import Documents, EmbeddingFunction, Embeddings
+from etl.utils.tracing import span
 
 
 class Embed(EmbeddingFunction):
@@ -42,11 +43,13 @@ class Embed(EmbeddingFunction):
         Returns:
         - Embeddings: Embeddings generated for the input documents.
         """
-        return model.encode(  # type: ignore
-            list(input),
-            convert_to_numpy=True,
-            normalize_embeddings=True,
-        ).tolist()  # type: ignore
+        # tokenization runs inside `encode`, so its time is part of this span
+        with span("model.encode", {"documents": len(input)}):
+            return model.encode(  # type: ignore
+                list(input),
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+            ).tolist()  # type: ignore
 
 
 def vectorize(input: str | dict[str, str] | list[dict[str, str]]) -> Embeddings:  # noqa E501
@@ -0,0 +1,323 @@
+"""
+This module records how long each stage of the ETL pipeline takes and how
+many items it processes, per site, so regressions are visible run over run.
+
+Stages are instrumented with the `instrumented` decorator or the `timed`
+context manager, which record the duration, number of items and number of
+errors of every call. The scrapers run in several processes and nodes, so
+the metrics are kept in a SQLite database: running totals and the latest
+call of each stage and site, and the history of the last calls.
+
+The totals are served in the Prometheus text format by the `/metrics` route
+of the backend, see `MetricsStore.exposition`.
+
+The store is set in the `metrics` section of the config file.
+"""
+
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+import yaml
+from etl.utils.sqlite_conn import connect
+from src.utils.pipeline_log_config import pipeline as logger
+
+# metrics of each stage and site, with their Prometheus name, type and help
+METRICS = [
+    ("pipeline_stage_runs_total", "counter", "runs",
+     "Calls of each pipeline stage."),
+    ("pipeline_stage_errors_total", "counter", "errors",
+     "Errors raised or counted by each pipeline stage."),
+    ("pipeline_stage_items_total", "counter", "items",
+     "Items processed by each pipeline stage."),
+    ("pipeline_stage_seconds_total", "counter", "seconds",
+     "Seconds spent in each pipeline stage."),
+    ("pipeline_stage_last_duration_seconds", "gauge", "last_seconds",
+     "Duration of the latest call of each pipeline stage."),
+    ("pipeline_stage_last_items", "gauge", "last_items",
+     "Items processed by the latest call of each pipeline stage."),
+    ("pipeline_stage_last_items_per_second", "gauge", "last_rate",
+     "Throughput of the latest call of each pipeline stage."),
+]
+
+# store of this process, opened on first use
+metrics_store = None
+
+# marks the store of a process whose metrics are disabled, so the config
+# file is read once
+DISABLED = object()
+
+
+class MetricsStore:
+    """
+    The durations, item counts and error counts of the pipeline stages,
+    kept in a SQLite database.
+
+    Attributes:
+    - path (str): The file path of the SQLite database.
+    - history (int): The number of calls kept in the history of each stage
+      and site.
+    """
+    def __init__(self, path: str, history: int = 200):
+        """
+        Initializes a MetricsStore, creating its database if needed.
+
+        Args:
+        - path (str): The file path of the SQLite database.
+        - history (int): The number of calls kept in the history of each
+          stage and site. Default is 200.
+
+        Example:
+            store = MetricsStore("./models/metrics.db")
+            store.record("scrape", "indeed", 12.5, items=40, errors=0)
+            print(store.exposition())
+        """
+        self.path = path
+        self.history_size = history
+        with connect(self.path) as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS totals ("
+                "stage TEXT NOT NULL, site TEXT NOT NULL, "
+                "runs INTEGER NOT NULL, errors INTEGER NOT NULL, "
+                "items INTEGER NOT NULL, seconds REAL NOT NULL, "
+                "last_seconds REAL NOT NULL, last_items INTEGER NOT NULL, "
+                "last_at REAL NOT NULL, PRIMARY KEY (stage, site))"
+            )
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS calls ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "stage TEXT NOT NULL, site TEXT NOT NULL, "
+                "finished_at REAL NOT NULL, seconds REAL NOT NULL, "
+                "items INTEGER NOT NULL, errors INTEGER NOT NULL)"
+            )
+
+    def record(self, stage: str, site: str, seconds: float, items: int = 0,
+               errors: int = 0):
+        """
+        Records a call of a stage.
+
+        Args:
+        - stage (str): The name of the stage.
+        - site (str): The site, or `all` for stages of every site.
+        - seconds (float): The duration of the call.
+        - items (int): The number of items processed. Default is 0.
+        - errors (int): The number of errors. Default is 0.
+        """
+        now = time.time()
+        with connect(self.path) as db:
+            db.execute("BEGIN IMMEDIATE")
+            db.execute(
+                "INSERT INTO totals (stage, site, runs, errors, items, "
+                "seconds, last_seconds, last_items, last_at) "
+                "VALUES (?, ?, 1, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (stage, site) DO UPDATE SET "
+                "runs = runs + 1, errors = errors + excluded.errors, "
+                "items = items + excluded.items, "
+                "seconds = seconds + excluded.seconds, "
+                "last_seconds = excluded.last_seconds, "
+                "last_items = excluded.last_items, last_at = excluded.last_at",
+                (stage, site, errors, items, seconds, seconds, items, now)
+            )
+            db.execute(
+                "INSERT INTO calls (stage, site, finished_at, seconds, items, "
+                "errors) VALUES (?, ?, ?, ?, ?, ?)",
+                (stage, site, now, seconds, items, errors)
+            )
+            # keep the last calls of the stage and site
+            db.execute(
+                "DELETE FROM calls WHERE stage = ? AND site = ? AND id <= ("
+                "SELECT id FROM calls WHERE stage = ? AND site = ? "
+                "ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                (stage, site, stage, site, self.history_size)
+            )
+
+    def totals(self) -> list[dict]:
+        """
+        Returns the totals and latest call of each stage and site.
+
+        Returns:
+        - list[dict]: The `stage`, `site`, `runs`, `errors`, `items`,
+          `seconds`, `last_seconds`, `last_items` and `last_rate` (items
+          per second) of each stage and site.
+        """
+        with connect(self.path) as db:
+            rows = db.execute(
+                "SELECT stage, site, runs, errors, items, seconds, "
+                "last_seconds, last_items FROM totals ORDER BY stage, site"
+            ).fetchall()
+        columns = ["stage", "site", "runs", "errors", "items", "seconds",
+                   "last_seconds", "last_items"]
+        totals = [dict(zip(columns, row)) for row in rows]
+        for total in totals:
+            total["last_rate"] = total["last_items"] / total["last_seconds"]\
+                if total["last_seconds"] > 0 else 0.0
+        return totals
+
+    def history(self, stage: str, site: str = "all",
+                limit: int = 20) -> list[dict]:
+        """
+        Returns the last calls of a stage, latest first.
+
+        Args:
+        - stage (str): The name of the stage.
+        - site (str): The site. Default is `all`.
+        - limit (int): The number of calls. Default is 20.
+
+        Returns:
+        - list[dict]: The `finished_at` timestamp, `seconds`, `items` and
+          `errors` of each call.
+        """
+        with connect(self.path) as db:
+            rows = db.execute(
+                "SELECT finished_at, seconds, items, errors FROM calls "
+                "WHERE stage = ? AND site = ? ORDER BY id DESC LIMIT ?",
+                (stage, site, limit)
+            ).fetchall()
+        return [
+            dict(zip(["finished_at", "seconds", "items", "errors"], row))
+            for row in rows
+        ]
+
+    def exposition(self) -> str:
+        """
+        Returns the metrics of every stage and site in the Prometheus text
+        format.
+
+        Returns:
+        - str: The metrics.
+        """
+        totals = self.totals()
+        lines = []
+        for name, kind, column, description in METRICS:
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            for total in totals:
+                labels = format_labels(
+                    {"stage": total["stage"], "site": total["site"]}
+                )
+                lines.append(f"{name}{labels} {total[column]}")
+        return "\n".join(lines) + "\n"
+
+
+def format_labels(labels: dict) -> str:
+    """
+    Formats the labels of a metric sample in the Prometheus text format.
+
+    Args:
+    - labels (dict): The label values, by name.
+
+    Returns:
+    - str: The labels, e.g. `{stage="scrape",site="indeed"}`.
+    """
+    escaped = [
+        f'{name}="' + str(value).replace("\\", "\\\\").replace(
+            '"', '\\"'
+        ).replace("\n", "\\n") + '"'
+        for name, value in labels.items()
+    ]
+    return "{" + ",".join(escaped) + "}"
+
+
+def get_metrics_store() -> MetricsStore | None:
+    """
+    Returns the metrics store of this process, opening the store set in the
+    config file on first use.
+
+    Returns:
+    - MetricsStore | None: The store, or None if metrics are disabled.
+    """
+    global metrics_store
+    if metrics_store is None:
+        with open("./config/config.yaml", "r") as stream:
+            settings = yaml.safe_load(stream)["metrics"]
+        if settings["enabled"]:
+            metrics_store = MetricsStore(
+                settings["path"], settings["history"]
+            )
+        else:
+            metrics_store = DISABLED
+    return None if metrics_store is DISABLED else metrics_store
+
+
+def save(stage: str, site: str, seconds: float, record: dict):
+    """
+    Records a call of a stage in the metrics store, logging instead of
+    raising if it fails, so metrics never stop the pipeline.
+    """
+    try:
+        store = get_metrics_store()
+        if store is not None:
+            store.record(stage, site, seconds, record["items"],
+                         record["errors"])
+    except Exception as e:
+        logger.error(f"Error recording metrics of {stage}: {e}")
+
+
+@contextmanager
+def timed(stage: str, site: str = "all"):
+    """
+    Records the duration, item count and error count of a block of code.
+
+    Args:
+    - stage (str): The name of the stage.
+    - site (str): The site. Default is `all`.
+
+    Yields:
+    - dict: The counts of the call, whose `items` and `errors` the block
+      adds to. An exception raised by the block counts as an error.
+
+    Example:
+        with timed("write_jobs", "indeed") as record:
+            for job in jobs:
+                ...
+                record["items"] += 1
+    """
+    record = {"items": 0, "errors": 0}
+    start = time.monotonic()
+    try:
+        yield record
+    except Exception:
+        record["errors"] += 1
+        raise
+    finally:
+        save(stage, site, time.monotonic() - start, record)
+
+
+def instrumented(stage: str):
+    """
+    Decorates a method to record its duration, item count and error count,
+    under the site of its instance (`all` if it has no `site`).
+
+    The items of a generator are the values it yields, and its duration
+    runs until it is exhausted or closed. The items of other methods are
+    their result if it is a number.
+
+    Args:
+    - stage (str): The name of the stage.
+
+    Returns:
+    - Callable: The decorator.
+
+    Example:
+        @instrumented("scrape")
+        def scrape(self) -> Iterator[Job]:
+            ...
+    """
+    def decorator(method):
+        if inspect.isgeneratorfunction(method):
+            @functools.wraps(method)
+            def wrapper(self, *args, **kwargs):
+                with timed(stage, getattr(self, "site", "all")) as record:
+                    for item in method(self, *args, **kwargs):
+                        record["items"] += 1
+                        yield item
+        else:
+            @functools.wraps(method)
+            def wrapper(self, *args, **kwargs):
+                with timed(stage, getattr(self, "site", "all")) as record:
+                    result = method(self, *args, **kwargs)
+                    if isinstance(result, int):
+                        record["items"] = result
+                    return result
+        return wrapper
+    return decorator
@@ -0,0 +1,49 @@
+"""
+This module opens connections to the SQLite databases which hold the state
+shared by the processes of the pipeline and the backend: the task queue,
+site limits, near-duplicate index, page store, page freshness, stage runs
+and metrics.
+
+Connections are in autocommit mode with write-ahead logging, so readers do
+not block the writer, and stores take SQLite's database lock with
+`BEGIN IMMEDIATE` around writes spanning several statements.
+"""
+
+import sqlite3
+from contextlib import contextmanager
+
+
+@contextmanager
+def connect(path: str, row_factory=None):
+    """
+    Opens a connection to a SQLite database in autocommit mode, committing
+    an explicitly begun transaction on success, rolling it back on error,
+    and closing the connection.
+
+    Args:
+    - path (str): The file path of the SQLite database.
+    - row_factory (Callable | None): The row factory of the connection,
+      e.g. `sqlite3.Row`. Default is None (rows are tuples).
+
+    Yields:
+    - sqlite3.Connection: The connection.
+
+    Example:
+        with connect("./models/site_limits.db") as db:
+            db.execute("BEGIN IMMEDIATE")
+            ...
+    """
+    db = sqlite3.connect(path, timeout=30, isolation_level=None)
+    if row_factory is not None:
+        db.row_factory = row_factory
+    try:
+        db.execute("PRAGMA journal_mode=WAL")
+        yield db
+        if db.in_transaction:
+            db.commit()
+    except Exception:
+        if db.in_transaction:
+            db.rollback()
+        raise
+    finally:
+        db.close()
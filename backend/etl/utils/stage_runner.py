@@ -0,0 +1,234 @@
+"""
+This module runs a pipeline as a graph of stages, running the stages which
+do not depend on each other at the same time.
+
+A stage is a dict with its `name`, the function it `run`s, and the names of
+the stages it runs `after`. A stage starts once every stage it runs after
+has finished, whether it succeeded or failed, so one failed stage does not
+hold back the work of the others. Its dependents then work with whatever
+the stages before them wrote.
+
+The status, timings and outcome of every stage of every run are kept in a
+SQLite database, so an interrupted or partly failed run can be resumed:
+only the stages which did not succeed, and the stages after them, are run
+again.
+"""
+
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from etl.utils.sqlite_conn import connect
+from src.utils.pipeline_log_config import pipeline as logger
+
+
+class StageStore:
+    """
+    The status and timings of the stages of each pipeline run, kept in a
+    SQLite database.
+
+    Attributes:
+    - path (str): The file path of the SQLite database.
+    """
+    def __init__(self, path: str):
+        """
+        Initializes a StageStore, creating its database if needed.
+
+        Args:
+        - path (str): The file path of the SQLite database.
+
+        Example:
+            store = StageStore("./models/pipeline_runs.db")
+            run_stages(stages, store)
+            print(store.stages(store.latest_run()))
+        """
+        self.path = path
+        with connect(self.path) as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS stages ("
+                "run_id TEXT NOT NULL, stage TEXT NOT NULL, "
+                "status TEXT NOT NULL, started_at TEXT, finished_at TEXT, "
+                "duration REAL, error TEXT, result TEXT, "
+                "PRIMARY KEY (run_id, stage))"
+            )
+
+    def set(self, run_id: str, stage: str, status: str, **fields):
+        """
+        Records the status of a stage, with its other columns.
+
+        Args:
+        - run_id (str): The run.
+        - stage (str): The name of the stage.
+        - status (str): `pending`, `running`, `ok` or `failed`.
+        - fields: Values of the `started_at`, `finished_at`, `duration`,
+          `error` and `result` columns. Missing columns are cleared.
+        """
+        columns = ["started_at", "finished_at", "duration", "error", "result"]
+        with connect(self.path) as db:
+            db.execute(
+                "INSERT OR REPLACE INTO stages (run_id, stage, status, "
+                f"{', '.join(columns)}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, stage, status,
+                 *[fields.get(column) for column in columns])
+            )
+
+    def stages(self, run_id: str) -> dict[str, dict]:
+        """
+        Returns the stages of a run.
+
+        Args:
+        - run_id (str): The run.
+
+        Returns:
+        - dict[str, dict]: The `status`, `started_at`, `finished_at`,
+          `duration` in seconds, `error` and `result` of each stage, by
+          name.
+        """
+        with connect(self.path) as db:
+            rows = db.execute(
+                "SELECT stage, status, started_at, finished_at, duration, "
+                "error, result FROM stages WHERE run_id = ? "
+                "ORDER BY started_at",
+                (run_id,)
+            ).fetchall()
+        return {
+            row[0]: {
+                "status": row[1],
+                "started_at": row[2],
+                "finished_at": row[3],
+                "duration": row[4],
+                "error": row[5],
+                "result": json.loads(row[6]) if row[6] else None
+            }
+            for row in rows
+        }
+
+    def latest_run(self) -> str | None:
+        """
+        Returns the latest run, or None if no run was recorded.
+        """
+        with connect(self.path) as db:
+            row = db.execute("SELECT MAX(run_id) FROM stages").fetchone()
+        return row[0]
+
+
+def downstream(stages: list[dict], names: set[str]) -> set[str]:
+    """
+    Returns the stages which run after some stages, directly or not,
+    together with those stages.
+
+    Args:
+    - stages (list[dict]): The stages of the pipeline.
+    - names (set[str]): The names of the stages.
+
+    Returns:
+    - set[str]: The names of the stages and of the stages after them.
+    """
+    names = set(names)
+    changed = True
+    while changed:
+        changed = False
+        for stage in stages:
+            if stage["name"] not in names and \
+                    names.intersection(stage.get("after", [])):
+                names.add(stage["name"])
+                changed = True
+    return names
+
+
+def run_stage(stage: dict, store: StageStore, run_id: str) -> str:
+    """
+    Runs a stage, recording its status, timings and result.
+
+    Args:
+    - stage (dict): The stage.
+    - store (StageStore): The stage store.
+    - run_id (str): The run.
+
+    Returns:
+    - str: The status of the stage, `ok` or `failed`.
+    """
+    started_at = datetime.now().isoformat()
+    store.set(run_id, stage["name"], "running", started_at=started_at)
+    logger.info(f"Starting stage {stage['name']}")
+    start = time.monotonic()
+    try:
+        result, status, error = stage["run"](), "ok", None
+    except Exception as e:
+        result, status, error = None, "failed", str(e)
+        logger.error(f"Stage {stage['name']} failed: {e}")
+    duration = round(time.monotonic() - start, 3)
+    store.set(
+        run_id, stage["name"], status,
+        started_at=started_at,
+        finished_at=datetime.now().isoformat(),
+        duration=duration,
+        error=error,
+        result=json.dumps(result, default=str) if result is not None else None
+    )
+    logger.info(f"Finished stage {stage['name']}: {status} in {duration}s")
+    return status
+
+
+def run_stages(stages: list[dict], store: StageStore, run_id: str = None,
+               workers: int = 4) -> str:
+    """
+    Runs the stages of a pipeline, or resumes a run.
+
+    Args:
+    - stages (list[dict]): The stages, each with its `name`, the function
+      it `run`s, taking no arguments and returning a JSON-serializable
+      result or None, and the names of the stages it runs `after`.
+    - store (StageStore): The stage store.
+    - run_id (str | None): The run to resume, running again its stages
+      which did not succeed and the stages after them. Default is None (a
+      new run).
+    - workers (int): The number of stages run at the same time. Default
+      is 4.
+
+    Returns:
+    - str: The run.
+
+    Raises:
+    - ValueError: If a stage runs after an unknown stage, or the stages
+      depend on each other in a cycle.
+    """
+    names = {stage["name"] for stage in stages}
+    for stage in stages:
+        unknown = set(stage.get("after", [])).difference(names)
+        if unknown:
+            raise ValueError(f"Stage {stage['name']} runs after {unknown}")
+
+    done = set()
+    if run_id is None:
+        run_id = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    else:
+        recorded = store.stages(run_id)
+        failed = {name for name in names
+                  if recorded.get(name, {}).get("status") != "ok"}
+        done = names.difference(downstream(stages, failed))
+    pending = [stage for stage in stages if stage["name"] not in done]
+    for stage in pending:
+        store.set(run_id, stage["name"], "pending")
+    logger.info(
+        f"Running {len(pending)} of {len(stages)} stages of run {run_id}"
+    )
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        running = {}
+        while pending or running:
+            # start the stages whose earlier stages have all finished
+            for stage in [stage for stage in pending
+                          if done.issuperset(stage.get("after", []))]:
+                pending.remove(stage)
+                future = executor.submit(run_stage, stage, store, run_id)
+                running[future] = stage["name"]
+            if not running:
+                raise ValueError(
+                    f"Stages {[stage['name'] for stage in pending]} "
+                    "depend on each other"
+                )
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                done.add(running.pop(future))
+    return run_id
@@ -0,0 +1,535 @@
+"""
+This module traces where the time of a backend request goes, and records
+the latency of each route.
+
+Spans follow the OpenTelemetry tracing API (`start_as_current_span`,
+`set_attribute`, `record_exception`) and data model (trace and span IDs,
+parent span, start and end times in nanoseconds, attributes and status), so
+the tracer can be swapped for the OpenTelemetry SDK without touching the
+instrumented code. The current span is kept in a context variable, so spans
+nest across function calls within a request. The spans of a sampled trace
+are exported together when its root span ends, as JSON lines to a rotated
+file, written off the request path, or to the console.
+
+`LatencyMiddleware` starts the root span of each request, records the
+request's latency in a histogram per route, served by the `/metrics` route
+in the Prometheus text format, and keeps the spans of requests slower than
+a threshold as slow request samples.
+
+Tracing is set in the `tracing` section of the config file.
+"""
+
+import atexit
+import contextvars
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import yaml
+from starlette.routing import Match
+from etl.utils.metrics import format_labels
+from src.utils.backend_log_config import backend as logger
+
+# span of the current request, function call or block of code
+current_span = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """
+    A timed operation within a trace.
+
+    Attributes:
+    - name (str): The name of the operation.
+    - trace_id (str): The ID of the trace.
+    - span_id (str): The ID of the span.
+    - parent_id (str | None): The ID of the parent span, None for the root
+      span of a trace.
+    - attributes (dict): The attributes of the operation.
+    - spans (list[Span]): The finished spans of the trace, shared by every
+      span of the trace.
+    """
+    def __init__(self, name: str, parent: "Span" = None,
+                 attributes: dict = None):
+        self.name = name
+        self.parent_id = parent.span_id if parent is not None else None
+        self.trace_id = parent.trace_id if parent is not None else\
+            f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.spans = parent.spans if parent is not None else []
+        self.attributes = dict(attributes or {})
+        self.events = []
+        self.status = "OK"
+        self.start_time = time.time_ns()
+        self.end_time = None
+        self.start = time.perf_counter()
+        self.duration = None
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: dict):
+        self.attributes.update(attributes)
+
+    def record_exception(self, exception: Exception):
+        """
+        Records an exception raised during the operation, marking the span
+        as failed.
+        """
+        self.status = "ERROR"
+        self.events.append({
+            "name": "exception",
+            "time": time.time_ns(),
+            "attributes": {
+                "exception.type": type(exception).__name__,
+                "exception.message": str(exception)
+            }
+        })
+
+    def end(self):
+        self.end_time = time.time_ns()
+        self.duration = time.perf_counter() - self.start
+        self.spans.append(self)
+
+    def to_dict(self) -> dict:
+        """
+        Returns the span in the OpenTelemetry JSON span layout.
+        """
+        return {
+            "name": self.name,
+            "context": {"trace_id": self.trace_id, "span_id": self.span_id},
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration_ms": round(1000 * (self.duration or 0.0), 3),
+            "status": self.status,
+            "attributes": self.attributes,
+            "events": self.events
+        }
+
+
+class FileExporter:
+    """
+    Appends the spans of each trace to a file, one JSON span per line.
+
+    Spans are queued and written by a background thread, so requests do not
+    wait on file I/O, and the file is rotated once it reaches a size limit,
+    keeping a few older files. Spans are dropped while the queue is full.
+
+    Attributes:
+    - path (str): The file path of the traces.
+    - dropped (int): The number of spans dropped so far.
+    """
+    def __init__(self, path: str, max_bytes: int = 10_000_000,
+                 backup_count: int = 3, queue_size: int = 10_000):
+        """
+        Initializes a FileExporter, starting its writer thread.
+
+        Args:
+        - path (str): The file path of the traces.
+        - max_bytes (int): The size from which the file is rotated.
+          Default is 10 MB.
+        - backup_count (int): The number of rotated files kept. Default is
+          3.
+        - queue_size (int): The number of spans which can wait to be
+          written. Default is 10000.
+        """
+        self.path = path
+        self.dropped = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count
+        )
+        self.queue = queue.Queue(queue_size)
+        self.listener = logging.handlers.QueueListener(self.queue, handler)
+        self.listener.start()
+        self.closed = False
+        atexit.register(self.close)
+
+    def export(self, spans: list[dict]):
+        for span in spans:
+            try:
+                self.queue.put_nowait(logging.makeLogRecord(
+                    {"msg": json.dumps(span, default=str)}
+                ))
+            except queue.Full:
+                self.dropped += 1
+
+    def flush(self):
+        """
+        Waits until the queued spans are written.
+        """
+        self.queue.join()
+
+    def close(self):
+        """
+        Writes the queued spans and stops the writer thread.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+
+
+class ConsoleExporter:
+    """
+    Prints the spans of each trace to the standard output, one JSON span
+    per line.
+    """
+    def export(self, spans: list[dict]):
+        for span in spans:
+            print(json.dumps(span, default=str), file=sys.stdout)
+
+
+EXPORTERS = {
+    "file": lambda settings: FileExporter(
+        settings["path"], settings["max_bytes"], settings["backup_count"]
+    ),
+    "console": lambda settings: ConsoleExporter(),
+    "none": lambda settings: None,
+}
+
+
+class Tracer:
+    """
+    Starts spans and exports the spans of each trace when its root span
+    ends.
+
+    Attributes:
+    - exporter (FileExporter | ConsoleExporter | None): The exporter, or
+      None to not export spans.
+    - sample_rate (float): The fraction of traces exported.
+    """
+    def __init__(self, exporter=None, sample_rate: float = 1.0):
+        """
+        Initializes a Tracer.
+
+        Args:
+        - exporter (FileExporter | ConsoleExporter | None): The exporter.
+          Default is None (spans are timed but not exported).
+        - sample_rate (float): The fraction of traces exported. Default is
+          1.
+
+        Example:
+            tracer = Tracer(FileExporter("./logs/traces.jsonl"))
+            with tracer.start_as_current_span("query", {"n": 10}) as span:
+                ...
+        """
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    @contextmanager
+    def start_as_current_span(self, name: str, attributes: dict = None):
+        """
+        Times a block of code as a child of the current span, or as the
+        root span of a new trace.
+
+        Args:
+        - name (str): The name of the operation.
+        - attributes (dict | None): The attributes of the operation.
+          Default is None.
+
+        Yields:
+        - Span: The span, current until the block ends. An exception
+          raised by the block is recorded on the span.
+        """
+        span = Span(name, current_span.get(), attributes)
+        token = current_span.set(span)
+        try:
+            yield span
+        except Exception as e:
+            span.record_exception(e)
+            raise
+        finally:
+            current_span.reset(token)
+            span.end()
+            if span.parent_id is None:
+                self.export(span.spans)
+
+    def export(self, spans: list[Span]):
+        """
+        Exports the spans of a trace, if the trace is sampled, logging
+        instead of raising if it fails.
+        """
+        if self.exporter is None or random.random() >= self.sample_rate:
+            return
+        try:
+            self.exporter.export([span.to_dict() for span in spans])
+        except Exception as e:
+            logger.error("Error exporting trace: %s", e)
+
+
+def load_settings() -> dict:
+    """
+    Loads the `tracing` section of the config file.
+    """
+    with open("./config/config.yaml", "r") as stream:
+        return yaml.safe_load(stream)["tracing"]
+
+
+def create_tracer(settings: dict) -> Tracer:
+    """
+    Creates the tracer set in the `tracing` section of the config file.
+    """
+    if not settings["enabled"]:
+        return Tracer()
+    return Tracer(
+        EXPORTERS[settings["exporter"]](settings), settings["sample_rate"]
+    )
+
+
+# tracer of this process, created on first use
+tracer = None
+
+
+def get_tracer() -> Tracer:
+    """
+    Returns the tracer of this process, creating the tracer set in the
+    config file on first use.
+    """
+    global tracer
+    if tracer is None:
+        try:
+            tracer = create_tracer(load_settings())
+        except Exception as e:
+            logger.error("Error setting up tracing: %s", e)
+            tracer = Tracer()
+    return tracer
+
+
+@contextmanager
+def span(name: str, attributes: dict = None):
+    """
+    Times a block of code as a child of the current span. Outside a trace,
+    e.g. in the scraping pipeline, the block runs untraced, so only the
+    requests traced by `LatencyMiddleware` are exported.
+
+    Args:
+    - name (str): The name of the operation.
+    - attributes (dict | None): The attributes of the operation. Default is
+      None.
+
+    Yields:
+    - Span: The span, which is not recorded outside a trace.
+
+    Example:
+        with span("model.encode", {"documents": len(texts)}):
+            ...
+    """
+    if current_span.get() is None:
+        yield Span(name, attributes=attributes)
+        return
+    with get_tracer().start_as_current_span(name, attributes) as child:
+        yield child
+
+
+def set_attributes(attributes: dict):
+    """
+    Sets attributes of the current span, if any.
+    """
+    current = current_span.get()
+    if current is not None:
+        current.set_attributes(attributes)
+
+
+def traced(name: str = None):
+    """
+    Decorates a function to run in a span named after it, see `span`.
+
+    Args:
+    - name (str | None): The name of the span. Default is None (the
+      function's name).
+
+    Returns:
+    - Callable: The decorator.
+
+    Example:
+        @traced()
+        def get_user_data(user_id: UUID) -> str:
+            ...
+    """
+    def decorator(function):
+        span_name = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class LatencyHistogram:
+    """
+    Request latencies per method, route and status, in cumulative buckets.
+
+    Attributes:
+    - buckets (list[float]): The upper bounds of the buckets, in seconds.
+    """
+    def __init__(self, buckets: list[float]):
+        self.buckets = sorted(buckets)
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, labels: tuple, seconds: float):
+        """
+        Records a request.
+
+        Args:
+        - labels (tuple): The method, route and status of the request.
+        - seconds (float): The latency of the request.
+        """
+        with self.lock:
+            series = self.series.setdefault(labels, {
+                "counts": [0] * len(self.buckets), "count": 0, "sum": 0.0
+            })
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    series["counts"][i] += 1
+            series["count"] += 1
+            series["sum"] += seconds
+
+    def exposition(self) -> str:
+        """
+        Returns the histogram in the Prometheus text format.
+        """
+        name = "http_request_duration_seconds"
+        lines = [
+            f"# HELP {name} Latency of the backend requests of each route.",
+            f"# TYPE {name} histogram"
+        ]
+        with self.lock:
+            for (method, route, status), series in sorted(
+                    self.series.items()):
+                labels = {"method": method, "route": route, "status": status}
+                bounds = [*map(str, self.buckets), "+Inf"]
+                counts = [*series["counts"], series["count"]]
+                for bound, count in zip(bounds, counts):
+                    lines.append(
+                        f"{name}_bucket"
+                        f"{format_labels({**labels, 'le': bound})} {count}"
+                    )
+                lines.append(
+                    f"{name}_sum{format_labels(labels)} {series['sum']}"
+                )
+                lines.append(
+                    f"{name}_count{format_labels(labels)} {series['count']}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+class LatencyMiddleware:
+    """
+    ASGI middleware which traces each HTTP request, records its latency per
+    route and keeps the spans of slow requests.
+
+    Attributes:
+    - histogram (LatencyHistogram): The request latencies.
+    - slow_seconds (float): The latency above which a request is kept as a
+      slow request sample.
+    - slow_requests (deque): The latest slow request samples.
+    """
+    def __init__(self, app, settings: dict = None):
+        """
+        Initializes a LatencyMiddleware.
+
+        Args:
+        - app: The ASGI application.
+        - settings (dict | None): The `tracing` section of the config file.
+          Default is None (read from the config file).
+
+        Example:
+            app = FastAPI()
+            app.add_middleware(LatencyMiddleware)
+        """
+        self.app = app
+        settings = settings or load_settings()
+        self.histogram = LatencyHistogram(settings["latency_buckets"])
+        self.slow_seconds = settings["slow_request_ms"] / 1000
+        self.slow_requests = deque(maxlen=settings["slow_request_samples"])
+        # the latest middleware, whose metrics the `/metrics` route serves
+        LatencyMiddleware.instance = self
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response = {"status": 500, "sent": None}
+
+        async def send_status(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                root.set_attribute("http.status_code", message["status"])
+            elif message["type"] == "http.response.body" and\
+                    not message.get("more_body", False):
+                # background tasks run after the response is sent, so they
+                # are traced but not counted in the latency
+                response["sent"] = time.perf_counter()
+            await send(message)
+
+        route = route_template(scope)
+        attributes = {"http.method": scope["method"], "http.route": route}
+        try:
+            with get_tracer().start_as_current_span(
+                    f"{scope['method']} {route}", attributes) as root:
+                await self.app(scope, receive, send_status)
+        finally:
+            self.record(scope, route, root, response)
+
+    def record(self, scope: dict, route: str, root: Span, response: dict):
+        """
+        Records the latency of a request, and keeps its spans if it is
+        slow.
+
+        Args:
+        - scope (dict): The ASGI scope of the request.
+        - route (str): The path template of the matched route.
+        - root (Span): The root span of the request.
+        - response (dict): The `status` code of the response, and the time
+          it was `sent`, None if it was not sent.
+        """
+        status = response["status"]
+        seconds = root.duration if response["sent"] is None else\
+            response["sent"] - root.start
+        self.histogram.observe((scope["method"], route, str(status)), seconds)
+        if seconds >= self.slow_seconds:
+            self.slow_requests.append({
+                "route": route,
+                "path": scope["path"],
+                "status": status,
+                "duration_ms": round(1000 * seconds, 3),
+                "spans": [child.to_dict() for child in root.spans]
+            })
+            logger.warning(
+                "Slow request %s %s took %.0fms", scope["method"],
+                scope["path"], 1000 * seconds
+            )
+
+
+def route_template(scope: dict) -> str:
+    """
+    Returns the path template of the route matching a request, e.g.
+    `/index/search/{user_id}`, so requests to one route share their latency
+    series, or `unmatched` if no route matches.
+    """
+    for route in getattr(scope.get("app"), "routes", []):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+
+# middleware of the backend, set once it is added to the app
+LatencyMiddleware.instance = None
@@ -0,0 +1,258 @@
+"""
+This module maintains the cached embedding of each user's profile.
+
+A user's embedding is blended from three separately cached component
+vectors:
+- profile: the embedded skills, work history and preferences.
+- searches: the embedded recent search queries.
+- clicks: the recency-weighted mean of the stored embeddings of recently
+  clicked jobs, read from the job embeddings table by ID instead of
+  re-encoding job descriptions.
+
+Each component is recomputed on its own when the data behind it changes,
+so query-time work is reduced to encoding the search query and blending
+it with the cached user vector. The blend weights are set in the
+`user_vectors` section of the config file.
+"""
+
+from datetime import datetime
+from uuid import UUID
+from cassandra.cqlengine.query import LWTException
+from etl.databases.cassandra.cassandra_conn import sync_table
+from etl.databases.cassandra.table_models import UserVectors
+from etl.databases.chroma.chroma_conn import ChromaConn
+from etl.transform.vectorizer import vectorize
+from etl.transform.vector_ops import (
+    mean_vector, blend_vectors, decay_weights
+)
+from etl.utils.tracing import traced
+from etl.utils.utilities import (
+    get_user_data, get_recent_searches, get_recent_clicks
+)
+from src.utils.backend_log_config import backend as logger
+
+# component vectors blended into the user vector
+COMPONENTS = ["profile", "searches", "clicks"]
+
+# set up Chroma connection
+conn = ChromaConn()
+jobs_table = None
+
+# load blend settings
+settings = conn.config["user_vectors"]
+
+
+def get_jobs_table():
+    """
+    Returns the job embeddings table, loading it on first use.
+
+    Returns:
+    - Collection: The job embeddings table in Chroma.
+    """
+    global jobs_table
+    if jobs_table is None:
+        jobs_table = conn.session.get_collection(
+            name=conn.collection_name,
+            embedding_function=conn.embedding_function
+        )
+    return jobs_table
+
+
+@traced()
+def embed_text(text: str) -> list[float] | None:
+    """
+    Embeds a piece of text.
+
+    Args:
+    - text (str): The text to be embedded.
+
+    Returns:
+    - list[float] | None: The embedding, or None if the text is blank.
+    """
+    if text.strip() == "":
+        return None
+    return vectorize(text)[0]
+
+
+@traced()
+def get_job_vectors(job_ids: list[UUID]) -> list[list[float]]:
+    """
+    Reads the stored embeddings of jobs from the job embeddings table.
+
+    Args:
+    - job_ids (list[UUID]): IDs of the jobs.
+
+    Returns:
+    - list[list[float]]: The embeddings of the jobs which are still in the
+      table, in the order of `job_ids`.
+    """
+    if len(job_ids) == 0:
+        return []
+    results = get_jobs_table().get(
+        ids=[str(job_id) for job_id in job_ids],
+        include=["embeddings"]
+    )
+    # chroma does not return embeddings in the order of the requested IDs
+    vectors = dict(zip(results["ids"], results["embeddings"]))
+    return [
+        vectors[str(job_id)] for job_id in job_ids
+        if str(job_id) in vectors
+    ]
+
+
+@traced()
+def get_clicks_vector(user_id: UUID, limit: int) -> list[float] | None:
+    """
+    Combines the stored embeddings of the jobs a user clicked recently.
+
+    Args:
+    - user_id (UUID): The unique identifier of the user.
+    - limit (int): The maximum number of clicks to use.
+
+    Returns:
+    - list[float] | None: The weighted mean of the clicked jobs' embeddings,
+      with each click weighted `click_decay` times the next more recent
+      click, or None if the user has no clicked jobs left in the table.
+    """
+    vectors = get_job_vectors(get_recent_clicks(str(user_id), limit))
+    return mean_vector(
+        vectors,
+        decay_weights(len(vectors), settings["click_decay"])
+    )
+
+
+@traced()
+def compute_component(user_id: UUID, component: str) -> list[float] | None:
+    """
+    Computes one component vector of a user.
+
+    Args:
+    - user_id (UUID): The unique identifier of the user.
+    - component (str): One of `COMPONENTS`.
+
+    Returns:
+    - list[float] | None: The component vector, or None if the user has
+      no data for the component.
+
+    Raises:
+    - ValueError: If the component is not supported.
+    """
+    match component:
+        case "profile":
+            return embed_text(get_user_data(user_id))
+        case "searches":
+            return embed_text(
+                get_recent_searches(str(user_id), settings["limit"])
+            )
+        case "clicks":
+            return get_clicks_vector(user_id, settings["limit"])
+        case _:
+            raise ValueError(f"Unknown user vector component: {component}")
+
+
+@traced()
+def update_user_vector(user_id: UUID,
+                       components: list[str] = COMPONENTS) -> list[float] | None:  # noqa E501
+    """
+    Recomputes the given components of a user's vector and re-blends it.
+
+    Args:
+    - user_id (UUID): The unique identifier of the user.
+    - components (list[str]): The components to recompute. The other
+      components are read from the cache. Default is all components.
+
+    Returns:
+    - list[float] | None: The updated user vector, or None if the user
+      has no profile, searches or clicks yet.
+    """
+    # create the table on keyspaces created before it was added
+    sync_table(UserVectors)
+    if UserVectors.objects(user_id=user_id).first() is None:
+        components = COMPONENTS
+
+    # write only the recomputed components, so concurrent updates of other
+    # components are not overwritten
+    updated_at = datetime.now()
+    UserVectors.objects(user_id=user_id).update(
+        updated_at=updated_at,
+        **{
+            component: compute_component(user_id, component) or []
+            for component in components
+        }
+    )
+
+    # blend the components as they are now, including concurrent updates
+    cached = UserVectors.objects(user_id=user_id).first()
+    vector = blend_vectors(
+        [list(getattr(cached, component) or []) for component in COMPONENTS],
+        [settings["weights"][component] for component in COMPONENTS]
+    )
+    try:
+        # a later update of the components re-blends them itself
+        UserVectors.objects(user_id=user_id).iff(
+            updated_at=updated_at
+        ).update(vector=vector or [])
+    except LWTException:
+        logger.info(f"Vector of user {user_id} re-blended by a later update")
+    return vector
+
+
+def refresh_user_vector(user_id: UUID, components: list[str]):
+    """
+    Updates a user's vector after their data changed, logging any error.
+
+    Intended to be run as a background task by the routes that change
+    user data, so that failures never affect the route's response.
+
+    Args:
+    - user_id (UUID): The unique identifier of the user.
+    - components (list[str]): The components affected by the change.
+    """
+    try:
+        update_user_vector(user_id, components)
+        logger.info(f"Updated {components} vectors of user {user_id}")
+    except Exception as e:
+        logger.error(f"Error updating vectors of user {user_id}: {e}")
+
+
+@traced()
+def get_user_vector(user_id: UUID) -> list[float] | None:
+    """
+    Reads a user's cached vector, computing it if it is not cached yet.
+
+    Args:
+    - user_id (UUID): The unique identifier of the user.
+
+    Returns:
+    - list[float] | None: The user vector, or None if the user has no
+      profile, searches or clicks yet.
+
+    A cached row with an empty vector records that the user had no data
+    when it was computed, so it is not recomputed on every search. It is
+    updated by `refresh_user_vector` once the user's data changes.
+    """
+    sync_table(UserVectors)
+    cached = UserVectors.objects(user_id=user_id).first()
+    if cached is not None:
+        return list(cached.vector or []) or None
+    return update_user_vector(user_id)
+
+
+@traced()
+def get_search_vector(query: str, user_id: UUID) -> list[float] | None:
+    """
+    Builds the vector used to search the job embeddings table.
+
+    Args:
+    - query (str): The search query.
+    - user_id (UUID): The unique identifier of the user searching.
+
+    Returns:
+    - list[float] | None: The weighted mean of the embedded query and the
+      user's cached vector, or None if the query is blank and the user
+      has no vector yet.
+    """
+    return blend_vectors(
+        [embed_text(query), get_user_vector(user_id)],
+        [settings["weights"]["query"], settings["weights"]["user"]]
+    )
@@ -6,6 +6,7 @@ via API routes.
 from etl.databases.cassandra.cassandra_conn import CassandraConn
 from cassandra.query import ValueSequence
 from uuid import UUID
+from etl.utils.tracing import traced
 
 # set up Cassandra connection
 session = CassandraConn().session
@@ -60,6 +61,7 @@ def scrub_metadata(user_id: str, cuttoff: int = 10):
         session.execute(query, [ValueSequence(tuple(stale_clicks))])
 
 
+@traced()
 def get_user_metadata(user_id: UUID, limit: int = 5, trunc: int = -1) -> str:
     """
     Retrieves and formats metadata associated with a user.
@@ -100,6 +102,7 @@ def get_user_metadata(user_id: UUID, limit: int = 5, trunc: int = -1) -> str:
     return user_metadata
 
 
+@traced()
 def get_user_searches(user_id: str, limit: int) -> str:
     """
     Retrieves recent search queries associated with the given user ID.
@@ -131,6 +134,36 @@ def get_user_searches(user_id: str, limit: int) -> str:
     return flat_queries
 
 
+@traced()
+def get_recent_searches(user_id: str, limit: int) -> str:
+    """
+    Retrieves the search queries a user made most recently.
+
+    Args:
+    - user_id (str): The ID of the user for whom search queries are
+      retrieved.
+    - limit (int): The maximum number of search queries to retrieve.
+
+    Returns:
+    - str: The search queries separated by commas, most recent first.
+
+    Rows read through the `user_id` index come back in partition order,
+    so the searches are sorted by their timestamps before the most recent
+    `limit` are kept.
+    """
+    query = "SELECT search_query, search_timestamp\
+             FROM search_metadata WHERE user_id = %s"
+    search_query_set = session.execute(query, (user_id, ))
+    # sort results from newest to oldest
+    searches = sorted(
+        search_query_set,
+        key=lambda search: search['search_timestamp'],
+        reverse=True
+    )
+    return ", ".join(search['search_query'] for search in searches[:limit])
+
+
+@traced()
 def get_previous_clicks(user_id: str, limit: int) -> list[UUID]:
     # Job Clicks
     # load job ids of jobs the user has clicked
@@ -145,6 +178,35 @@ def get_previous_clicks(user_id: str, limit: int) -> list[UUID]:
     return job_ids
 
 
+@traced()
+def get_recent_clicks(user_id: str, limit: int) -> list[UUID]:
+    """
+    Retrieves the IDs of the jobs a user clicked most recently.
+
+    Args:
+    - user_id (str): The ID of the user for whom clicks are retrieved.
+    - limit (int): The maximum number of job IDs to retrieve.
+
+    Returns:
+    - list[UUID]: IDs of the clicked jobs, most recent click first.
+
+    Rows read through the `user_id` index come back in partition order,
+    so the clicks are sorted by their timestamps before the most recent
+    `limit` are kept.
+    """
+    query = "SELECT job_id, click_timestamp\
+             FROM clicks_metadata WHERE user_id = %s"
+    job_clicks_set = session.execute(query, (user_id, ))
+    # sort results from newest to oldest
+    job_clicks = sorted(
+        job_clicks_set,
+        key=lambda job: job['click_timestamp'],
+        reverse=True
+    )
+    return [UUID(job['job_id']) for job in job_clicks[:limit]]
+
+
+@traced()
 def get_previous_jobs(job_ids: list[UUID], trunc: int) -> str:
     """
     Retrieves truncated job descriptions associated with jobs the user clicked.
@@ -184,6 +246,7 @@ def get_previous_jobs(job_ids: list[UUID], trunc: int) -> str:
     return flat_job_descs
 
 
+@traced()
 def get_user_data(user_id: UUID) -> str:
     """
     Retrieves and formats user data from the `users` table.
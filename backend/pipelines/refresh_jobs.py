@@ -0,0 +1,34 @@
+"""
+This module contains the entry point for refreshing the jobs already in the
+database.
+
+It re-checks the job pages of a sample of live jobs with
+`etl.extract.refresh.JobRefresher`, rewriting the details of the jobs whose
+description changed, then re-embeds the changed jobs in Chroma.
+
+It is primarily to be called in a cron job, between scrape runs.
+
+Usage:
+    python -m pipelines.refresh_jobs [--sample-size N]
+"""
+
+import argparse
+from etl.extract.orchestrator import SITE_SCRAPERS
+from etl.extract.refresh import JobRefresher
+from etl.extract.scrape_tasks import load_config
+from etl.load.load_chroma import ChromaIO
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sample-size", type=int, default=None)
+    args = parser.parse_args()
+
+    # Re-check job pages and rewrite the changed jobs in Cassandra
+    refresher = JobRefresher(SITE_SCRAPERS, load_config())
+    changed = refresher.refresh(args.sample_size)
+
+    # Re-embed the changed jobs in Chroma
+    if len(changed) > 0:
+        chroma_io = ChromaIO()
+        chroma_io.reembed_jobs(changed)
+        chroma_io.build_compressed_index()
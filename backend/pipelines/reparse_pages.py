@@ -0,0 +1,45 @@
+"""
+This module contains the entry point for extracting job details again from
+the job pages kept in the page store, after a parser fix.
+
+Parsers whose version in `etl.extract.page_parsers.PAGE_PARSERS` was bumped
+are re-applied to the stored pages of their site with
+`etl.extract.page_store.PageStore.reextract`. The live jobs whose details
+changed are rewritten in Cassandra and re-embedded in Chroma, without
+visiting the sites again.
+
+Usage:
+    python -m pipelines.reparse_pages
+"""
+
+from etl.extract.page_parsers import PAGE_PARSERS
+from etl.extract.page_store import PageStore
+from etl.extract.scrape_tasks import load_config
+from etl.load.load_cassandra import CassandraIO
+from etl.load.load_chroma import ChromaIO
+from src.utils.pipeline_log_config import pipeline as logger
+
+if __name__ == "__main__":
+    settings = load_config()["scraping"]["page_store"]
+    store = PageStore(
+        settings["path"], settings["max_mb"] * 2 ** 20, settings["level"]
+    )
+    logger.info(f"Page store holds {store.stats()}")
+
+    # Re-parse the pages extracted by older parser versions
+    cassandra_io = CassandraIO()
+    cassandra_io.get_uuids()
+    live = set(cassandra_io.uuids)
+    changed = {}
+    for site, (version, parser) in PAGE_PARSERS.items():
+        for uuid, details in store.reextract(site, version, parser):
+            if uuid in live:
+                changed[uuid] = details
+    logger.info(f"Details of {len(changed)} live jobs changed")
+
+    # Rewrite the changed jobs in Cassandra and re-embed them in Chroma
+    cassandra_io.update_job_details(changed)
+    if len(changed) > 0:
+        chroma_io = ChromaIO()
+        chroma_io.reembed_jobs(list(changed))
+        chroma_io.build_compressed_index()
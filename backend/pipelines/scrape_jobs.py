@@ -2,29 +2,24 @@
 This module contains the main entry point for scraping job listings from
 Indeed, LinkedIn, and Jobberman.
 
-It calls the `scrape_with_retry` function in the `etl.extract.site_scraper`
-module to retry scraping if an error occurs.
+It runs the stages of the scraping pipeline in `etl.load.scraping_pipeline`:
+each site is scraped in its own process, retrying with `scrape_with_retry`
+if an error occurs, then the jobs are embedded, old jobs are scrubbed, and
+the vector index and cached recommendations are rebuilt.
 
 It is primarily to be called in a cron job.
+
+Usage:
+    python -m pipelines.scrape_jobs [--resume]
 """
 
-from etl.extract.site_scraper import (
-    IndeedScraper, LinkedinScraper, JobbermanScraper, scrape_with_retry
-)
-from etl.load.load_chroma import ChromaIO
-from etl.load.load_cassandra import CassandraIO
+import argparse
+from etl.load.scraping_pipeline import run_scraping_pipeline
 
 if __name__ == "__main__":
-    # Scrape Job and save to Cassandra
-    scrape_with_retry(IndeedScraper)
-    scrape_with_retry(JobbermanScraper)
-    scrape_with_retry(LinkedinScraper)
-
-    # Update Job embeddings in Chroma
-    chroma_io = ChromaIO()
-    chroma_io.load_from_cassandra()
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--resume", action="store_true",
+                        help="run again the failed stages of the latest run")
+    args = parser.parse_args()
 
-    # Scrub older jobs and embeddings
-    cassandra_io = CassandraIO()
-    cassandra_io.scrub_jobs()
-    chroma_io.scrub_jobs()
+    run_scraping_pipeline(resume=args.resume)
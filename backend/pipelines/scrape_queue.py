@@ -0,0 +1,29 @@
+"""
+This module contains the entry points of the distributed scraping
+subsystem in `etl.extract.scrape_tasks`.
+
+- `schedule` queues today's scrape run, e.g. from a cron job.
+- `work` runs a scrape worker, on any node which can reach the task queue
+  and Cassandra.
+
+Usage:
+    python -m pipelines.scrape_queue schedule
+    python -m pipelines.scrape_queue work [--idle-timeout SECONDS]
+    python -m pipelines.scrape_queue status
+"""
+
+import argparse
+from etl.extract.scrape_tasks import open_queue, run_worker, schedule_scrape
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("command", choices=["schedule", "work", "status"])
+    parser.add_argument("--idle-timeout", type=float, default=None)
+    args = parser.parse_args()
+
+    queue = open_queue()
+    if args.command == "schedule":
+        schedule_scrape(queue)
+    elif args.command == "work":
+        run_worker(queue, idle_timeout=args.idle_timeout)
+    print(queue.counts())
@@ -0,0 +1,115 @@
+import time
+from etl.extract.browser_manager import BrowserManager, ProfileStock
+
+
+class FakeDriver:
+    """
+    Webdriver which records the pages it loads and whether it was quit.
+    """
+    def __init__(self, profile_name):
+        self.profile_name = profile_name
+        self.loaded = []
+        self.memory = 100
+        self.quit_called = False
+
+    def get(self, url):
+        self.loaded.append(url)
+
+    def quit(self):
+        self.quit_called = True
+
+
+def make_manager(max_pages=3, max_memory_growth_mb=None):
+    created = iter(range(100))
+    stock = ProfileStock(lambda: f"Selenium{next(created)}", 0)
+    return BrowserManager(
+        FakeDriver, stock, max_pages, max_memory_growth_mb,
+        measure_memory=lambda driver: driver.memory
+    )
+
+
+def test_sessions_are_reused():
+    browsers = make_manager()
+    wd = browsers.acquire()
+    wd.get("https://ng.indeed.com/jobs")
+    assert wd.loaded == ["https://ng.indeed.com/jobs"]
+    browsers.release(wd)
+
+    # the warm session is handed out again
+    assert browsers.acquire() is wd
+    browsers.release(wd)
+    # a session with another profile is opened on request
+    other = browsers.acquire("Selenium")
+    assert other is not wd and other.profile_name == "Selenium"
+    browsers.release(other)
+
+    # new sessions open with the caller's webdriver factory
+    class LeanDriver(FakeDriver):
+        pass
+    lean = browsers.acquire("Lean", LeanDriver)
+    assert isinstance(lean.driver, LeanDriver)
+
+
+def test_sessions_are_recycled():
+    browsers = make_manager(max_pages=2, max_memory_growth_mb=50)
+    wd = browsers.acquire()
+    wd.get("page1")
+    wd.get("page2")
+    browsers.release(wd)
+    assert wd.driver.quit_called and browsers.idle == []
+
+    wd = browsers.acquire()
+    wd.driver.memory = 200
+    browsers.release(wd)
+    assert wd.driver.quit_called
+
+    wd = browsers.acquire()
+    browsers.release(wd)
+    browsers.recycle_idle(wd.profile_name)
+    assert wd.driver.quit_called and browsers.idle == []
+
+
+def test_profile_stock_fills_in_background():
+    created = []
+
+    def create_profile():
+        created.append(f"Selenium{len(created)}")
+        return created[-1]
+
+    deleted = []
+    stock = ProfileStock(create_profile, 2, deleted.append)
+    deadline = time.monotonic() + 5
+    while stock.profiles.qsize() < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert stock.take() == "Selenium0"
+    deadline = time.monotonic() + 5
+    while stock.profiles.qsize() < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # no profile is created ahead of room in the stock
+    time.sleep(0.1)
+    assert created == ["Selenium0", "Selenium1", "Selenium2"]
+    # the profiles left in stock are deleted
+    stock.stop()
+    assert deleted == ["Selenium1", "Selenium2"]
+    assert stock.take() == "Selenium3"
+
+
+def test_profiles_of_quit_sessions_are_deleted():
+    deleted = []
+    created = iter(range(100))
+    stock = ProfileStock(lambda: f"Selenium{next(created)}", 0,
+                         deleted.append)
+    browsers = BrowserManager(FakeDriver, stock, max_pages=1)
+    wd = browsers.acquire()
+    # a second session of the same profile keeps it
+    other = browsers.acquire(wd.profile_name)
+    wd.get("page1")
+    browsers.release(wd)
+    assert deleted == []
+    browsers.release(other)
+    default = browsers.acquire("Selenium")
+    browsers.release(default)
+    browsers.close()
+    # the default profile is not one of the stock's
+    assert default.driver.quit_called
+    assert deleted == ["Selenium0"]
@@ -0,0 +1,124 @@
+import threading
+import time
+from etl.extract.browser_pool import BrowserPool, HostLimiter
+
+
+limits = {"default": {"max_concurrency": 2, "delay": [0, 0]}}
+
+
+def test_results_in_link_order():
+    links = [f"https://example.com/job/{i}" for i in range(20)]
+
+    def fetch_page(session, link):
+        # finish pages out of order
+        time.sleep(0.001 * (20 - int(link.split("/")[-1])))
+        return link
+
+    pool = BrowserPool(4, HostLimiter(limits))
+    assert pool.map(fetch_page, links) == links
+
+
+def test_failed_pages_are_none():
+    def fetch_page(session, link):
+        if link.endswith("1"):
+            raise ValueError("page not found")
+        return link
+
+    pool = BrowserPool(2, HostLimiter(limits))
+    assert pool.map(fetch_page, ["a/0", "a/1", "a/2"]) ==\
+        ["a/0", None, "a/2"]
+
+
+def test_host_concurrency_cap():
+    lock = threading.Lock()
+    active = {"now": 0, "max": 0}
+
+    def fetch_page(session, link):
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        time.sleep(0.01)
+        with lock:
+            active["now"] -= 1
+
+    pool = BrowserPool(6, HostLimiter(limits))
+    pool.map(fetch_page, [f"https://example.com/{i}" for i in range(12)])
+    assert active["max"] == 2
+
+
+def test_politeness_delay():
+    limiter = HostLimiter({"default": {"max_concurrency": 4,
+                                       "delay": [0.05, 0.05]}})
+    start = time.monotonic()
+    BrowserPool(4, limiter).map(
+        lambda session, link: None,
+        [f"https://example.com/{i}" for i in range(4)]
+    )
+    # three gaps between the four request starts
+    assert time.monotonic() - start >= 0.15
+
+
+def test_sessions():
+    opened, closed = [], []
+
+    def open_session():
+        opened.append(object())
+        return opened[-1]
+
+    pool = BrowserPool(
+        3, HostLimiter(limits),
+        open_session=open_session,
+        close_session=closed.append
+    )
+    used = pool.map(
+        lambda session, link: session,
+        [f"https://example.com/{i}" for i in range(9)],
+        sessions=["main"]
+    )
+    # the given session is reused and left open
+    assert "main" in used
+    assert len(opened) == 2
+    assert sorted(map(id, closed)) == sorted(map(id, opened))
+
+
+def test_imap_streams_in_order():
+    links = [f"https://example.com/job/{i}" for i in range(4)]
+    released = threading.Event()
+
+    def fetch_page(session, link):
+        # the last page is held back until the first ones are consumed
+        if link.endswith("3"):
+            released.wait(5)
+        return link
+
+    results = BrowserPool(4, HostLimiter(limits)).imap(fetch_page, links)
+    assert [next(results) for _ in range(3)] == links[:3]
+    released.set()
+    assert list(results) == links[3:]
+
+
+def test_no_working_sessions():
+    def open_session():
+        raise RuntimeError("no browser")
+
+    pool = BrowserPool(2, HostLimiter(limits), open_session=open_session)
+    assert pool.map(lambda session, link: link, ["a/0", "a/1"]) ==\
+        [None, None]
+
+
+def test_closing_imap_stops_workers():
+    links = [f"https://example.com/job/{i}" for i in range(40)]
+    fetched = []
+
+    def fetch_page(session, link):
+        time.sleep(0.01)
+        fetched.append(link)
+        return link
+
+    results = BrowserPool(2, HostLimiter(limits)).imap(fetch_page, links)
+    next(results)
+    results.close()
+    # the workers finished their pages and fetch nothing afterwards
+    count = len(fetched)
+    time.sleep(0.1)
+    assert len(fetched) == count < 10
@@ -0,0 +1,71 @@
+from etl.extract.card_parsers import (
+    CardParser, INDEED_CARD_FIELDS, LINKEDIN_CARD_FIELDS, JOBBERMAN_CARD_FIELDS
+)
+
+indeed_card = """
+<li><div class="cardOutline tapItem"><div><div><div><div>
+<table><tbody><tr><td>
+  <div><h2><a href="https://ng.indeed.com/rc/clk?jk=1">
+    <span id="jobTitle-1">Data Analyst</span></a></h2></div>
+  <div><div><span>Acme Ltd</span><div>Lagos</div></div></div>
+</td></tr></tbody></table>
+<table><tbody><tr><td></td></tr><tr><td>
+  <div><span>Posted 2 days ago</span></div>
+</td></tr></tbody></table>
+</div></div></div></div></div></li>
+"""
+
+
+def test_parse_indeed_cards():
+    parser = CardParser("li", INDEED_CARD_FIELDS)
+    html = f'<div id="mosaic-provider-jobcards"><ul>{indeed_card}' \
+        '<li><div class="mosaic-zone"></div></li></ul></div>'
+    cards = parser.parse(html)
+    # cards without job details, such as ad slots, are not parsed
+    assert len(cards) == 2 and cards[1] is None
+    assert cards[0]["job_link"] == "https://ng.indeed.com/rc/clk?jk=1"
+    assert cards[0]["job_id"] == "jobTitle-1"
+    assert cards[0]["job_title"] == "Data Analyst"
+    assert cards[0]["company_name"] == "Acme Ltd"
+    assert cards[0]["date"] == "Posted 2 days ago"
+
+
+def test_parse_linkedin_cards():
+    parser = CardParser("li", LINKEDIN_CARD_FIELDS)
+    html = """
+    <ul class="jobs-search__results-list"><li><div>
+      <a href="https://ng.linkedin.com/jobs/view/1?refId=x"></a>
+      <div><h3>Engineer</h3><h4>Initech</h4>
+        <div><span class="job-search-card__location">Abuja</span>
+        <time datetime="2024-03-01">1 week ago</time></div></div>
+    </div></li></ul>
+    """
+    assert parser.parse(html) == [{
+        "job_link": "https://ng.linkedin.com/jobs/view/1?refId=x",
+        "job_id": "None",
+        "job_title": "Engineer",
+        "company_name": "Initech",
+        "location": "Abuja",
+        "date": "2024-03-01"
+    }]
+
+
+def test_parse_jobberman_cards():
+    parser = CardParser(".mx-5", JOBBERMAN_CARD_FIELDS)
+    # the first cards have a logo next to the job details
+    with_logo = """
+    <div class="mx-5"><div><div><img></div><div><div>
+      <div><a href="https://www.jobberman.com/listings/a"><p>Cook</p></a></div>
+      <p>Grill House</p><div><span>Lagos</span></div>
+    </div></div></div><div><p>New</p></div></div>
+    """
+    without_logo = """
+    <div class="mx-5"><div><div><div>
+      <div><a href="https://jobberman.com/listings/b"><p>Driver</p></a></div>
+      <p>Haulage Co</p><div><span>Kano</span></div>
+    </div></div></div><div><p>1 week ago</p></div></div>
+    """
+    cards = parser.parse(f"<div>{with_logo}{without_logo}</div>")
+    assert [card["job_title"] for card in cards] == ["Cook", "Driver"]
+    assert [card["location"] for card in cards] == ["Lagos", "Kano"]
+    assert [card["date"] for card in cards] == ["New", "1 week ago"]
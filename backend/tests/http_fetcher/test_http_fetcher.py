@@ -0,0 +1,151 @@
+import os
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import urllib3
+from etl.extract.http_fetcher import HttpFetcher
+from etl.extract.page_parsers import (
+    AuthWallError, PageParseError, is_auth_wall, parse_linkedin_page,
+    parse_jobberman_page
+)
+from etl.extract.site_limits import CircuitBreaker, RateLimiter
+from etl.extract.site_scraper import JobbermanScraper
+
+
+fixtures = os.path.join(os.path.dirname(__file__), "fixtures")
+config = {"timeout": 5, "retries": 0, "user_agent": "test"}
+
+
+def read_fixture(name):
+    with open(os.path.join(fixtures, name)) as f:
+        return f.read()
+
+
+class JobSiteHandler(SimpleHTTPRequestHandler):
+    """
+    Serves the fixtures, with LinkedIn-style redirects and blocks.
+    """
+    def do_GET(self):
+        if self.path == "/jobs/view/private":
+            self.send_response(302)
+            self.send_header("Location", "/authwall?trk=job")
+            self.end_headers()
+        elif self.path.startswith("/authwall"):
+            self.path = "/linkedin_authwall.html"
+            super().do_GET()
+        elif self.path == "/blocked":
+            self.send_response(999)
+            self.end_headers()
+        else:
+            super().do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server():
+    httpd = ThreadingHTTPServer(
+        ("127.0.0.1", 0),
+        partial(JobSiteHandler, directory=fixtures)
+    )
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+
+def test_parse_linkedin_page():
+    details = parse_linkedin_page(read_fixture("linkedin_job.html"))
+    assert details["seniority"] == "Entry level"
+    assert details["emp_type"] == "Full-time"
+    assert details["job_func"] == "Analyst"
+    assert details["ind"] == "Retail"
+    assert "build dashboards" in details["job_desc"]
+
+
+def test_parse_jobberman_page():
+    details = parse_jobberman_page(read_fixture("jobberman_job.html"))
+    assert details["seniority"] == "Mid level"
+    assert details["emp_type"] == "Full Time"
+    assert details["job_func"] == "Accounting, Auditing & Finance"
+    assert details["ind"] == "Banking, Finance & Insurance"
+    assert "financial statements" in details["job_desc"]
+
+
+def test_parse_errors():
+    with pytest.raises(PageParseError):
+        parse_linkedin_page(read_fixture("jobberman_job.html"))
+    with pytest.raises(PageParseError):
+        parse_jobberman_page(read_fixture("linkedin_job.html"))
+
+
+def test_is_auth_wall():
+    assert is_auth_wall("https://x.com/authwall", 200, "")
+    assert is_auth_wall("https://x.com/jobs/1", 999, "")
+    assert not is_auth_wall(
+        "https://x.com/jobs/1", 200, read_fixture("linkedin_job.html")
+    )
+    assert is_auth_wall(
+        "https://x.com/jobs/1", 200,
+        "<html><head><title>Just a moment...</title></head><body>"
+        "<form id='challenge-form' method='post'></form></body></html>"
+    )
+
+    # job pages loading bot check scripts or widgets are not auth walls
+    job_page = read_fixture("linkedin_job.html").replace(
+        "</head>",
+        "<script src='/cdn-cgi/challenge-platform/scripts/jsd/main.js'>"
+        "</script></head>"
+    ).replace("</main>", "<div class='g-recaptcha'></div></main>")
+    assert not is_auth_wall("https://x.com/jobs/1", 200, job_page)
+
+
+def test_fetch(server):
+    fetcher = HttpFetcher(config)
+    html = fetcher.get(f"{server}/linkedin_job.html")
+    assert parse_linkedin_page(html)["ind"] == "Retail"
+
+
+def test_fetch_auth_wall(server):
+    fetcher = HttpFetcher(config)
+    with pytest.raises(AuthWallError):
+        fetcher.get(f"{server}/jobs/view/private")
+    with pytest.raises(AuthWallError):
+        fetcher.get(f"{server}/blocked")
+    with pytest.raises(urllib3.exceptions.HTTPError):
+        fetcher.get(f"{server}/missing.html")
+
+
+class BrowserFallbackScraper(JobbermanScraper):
+    """
+    Jobberman scraper without a database or browser, recording the pages
+    loaded in the browser.
+    """
+    def __init__(self, limits_path):
+        self.http = HttpFetcher(config)
+        self.browser_pages = []
+        self.site = "jobberman"
+        self.rate_limiter = RateLimiter(
+            limits_path, {"default": {"rate": 100.0, "burst": 10}}
+        )
+        self.breaker = CircuitBreaker(limits_path)
+        self.archive = None
+        self.page_store = None
+
+    def get_job_page(self, wd, link):
+        self.browser_pages.append(link)
+        return {"job_desc": "from browser"}
+
+
+def test_browser_fallback(server, tmp_path):
+    scraper = BrowserFallbackScraper(str(tmp_path / "site_limits.db"))
+    details = scraper.fetch_job_page(None, f"{server}/jobberman_job.html")
+    assert details["emp_type"] == "Full Time"
+    assert scraper.browser_pages == []
+
+    link = f"{server}/jobs/view/private"
+    details = scraper.fetch_job_page(None, link)
+    assert details == {"job_desc": "from browser"}
+    assert scraper.browser_pages == [link]
@@ -0,0 +1,34 @@
+from urllib.parse import unquote
+from selenium.webdriver.firefox.options import Options
+from etl.extract.lean_browser import (
+    BLOCKING_PROXY, apply_lean_mode, blocklist_pac
+)
+from etl.extract.site_scraper import (
+    IndeedScraper, LinkedinScraper, JobbermanScraper
+)
+
+
+def test_apply_lean_mode():
+    options = apply_lean_mode(Options(), ["doubleclick.net"])
+    assert options.page_load_strategy == "eager"
+    assert options.preferences["permissions.default.image"] == 2
+    assert options.preferences["gfx.downloadable_fonts.enabled"] is False
+    # blocked hosts go through the proxy auto-config script
+    assert options.preferences["network.proxy.type"] == 2
+    script = unquote(options.preferences["network.proxy.autoconfig_url"])
+    assert '["doubleclick.net"]' in script and BLOCKING_PROXY in script
+
+    # without a blocklist, the proxy settings are left alone
+    assert "network.proxy.type" not in apply_lean_mode(Options(), [])\
+        .preferences
+
+
+def test_blocklist_pac():
+    pac = blocklist_pac(["hotjar.com", "clarity.ms"])
+    assert pac.startswith("data:application/x-javascript-config,")
+    assert "FindProxyForURL" in unquote(pac)
+
+
+def test_scrapers_opt_in():
+    assert not IndeedScraper.lean_browser
+    assert LinkedinScraper.lean_browser and JobbermanScraper.lean_browser
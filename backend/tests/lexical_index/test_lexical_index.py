@@ -0,0 +1,94 @@
+from etl.transform.lexical_index import (
+    tokenize, encode_postings, decode_postings, reciprocal_rank_fusion,
+    InvertedIndex
+)
+
+
+jobs = [
+    {
+        'uuid': 'job1',
+        'job_title': 'Python Django Developer',
+        'company_name': 'Acme',
+        'location': 'Lagos',
+        'job_desc': 'Build web services with python and django.'
+    },
+    {
+        'uuid': 'job2',
+        'job_title': 'Accountant',
+        'company_name': 'Ledger Ltd',
+        'location': 'Abuja',
+        'job_desc': 'Prepare financial statements.'
+    },
+    {
+        'uuid': 'job3',
+        'job_title': 'Backend Engineer',
+        'company_name': 'Acme',
+        'location': 'Lagos',
+        'job_desc': 'Node.js and C++ services.'
+    },
+]
+
+
+def test_tokenize():
+    assert tokenize("Python, Django & the C++ / Node.js stack") ==\
+        ['python', 'django', 'c++', 'node.js', 'stack']
+
+
+def test_postings_round_trip():
+    postings = [(0, 1), (3, 2), (200, 1), (70000, 5)]
+    assert decode_postings(encode_postings(postings)) == postings
+
+
+def test_postings_append():
+    data = encode_postings([(0, 1), (3, 2)])
+    data += encode_postings([(10, 4)], last_doc=3)
+    assert decode_postings(data) == [(0, 1), (3, 2), (10, 4)]
+
+
+def test_reciprocal_rank_fusion():
+    fused = reciprocal_rank_fusion(
+        [['a', 'b', 'c'], ['c', 'a', 'd']],
+        n_results=3
+    )
+    assert fused == ['a', 'c', 'b']
+
+
+def test_search():
+    index = InvertedIndex()
+    index.add_jobs(jobs)
+    assert len(index) == 3
+    assert index.search("python django lagos")[0] == 'job1'
+    assert index.search("accountant") == ['job2']
+    assert index.search("unknown") == []
+
+
+def test_remove_jobs():
+    index = InvertedIndex(compact_ratio=1.0)
+    index.add_jobs(jobs)
+    index.remove_jobs(['job1'])
+    assert 'job1' not in index
+    assert index.search("lagos") == ['job3']
+
+    # compaction keeps results the same
+    index.compact()
+    assert index.search("lagos") == ['job3']
+    assert 'python' not in index.postings
+
+
+def test_reindex_job():
+    index = InvertedIndex()
+    index.add_jobs(jobs)
+    index.add_jobs([dict(jobs[1], job_title='Python Accountant')])
+    assert len(index) == 3
+    assert 'job2' in index.search("python")
+
+
+def test_save_load(tmp_path):
+    path = str(tmp_path / "index.pkl")
+    index = InvertedIndex()
+    index.add_jobs(jobs)
+    index.save(path)
+
+    loaded = InvertedIndex.load(path)
+    assert loaded.search("acme") == index.search("acme")
+    assert len(InvertedIndex.load(str(tmp_path / "missing.pkl"))) == 0
@@ -0,0 +1,72 @@
+import pytest
+from etl.utils import metrics
+from etl.utils.metrics import MetricsStore, instrumented, timed
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = MetricsStore(str(tmp_path / "metrics.db"), history=2)
+    monkeypatch.setattr(metrics, "metrics_store", store)
+    return store
+
+
+def test_record(store):
+    store.record("scrape", "indeed", 2.0, items=10)
+    store.record("scrape", "indeed", 4.0, items=10, errors=1)
+    store.record("scrape", "indeed", 1.0, items=5)
+    total = store.totals()[0]
+    assert (total["runs"], total["errors"], total["items"]) == (3, 1, 25)
+    assert total["seconds"] == 7.0
+    assert total["last_rate"] == 5.0
+    # only the last calls are kept in the history
+    assert [call["seconds"] for call in store.history("scrape", "indeed")] ==\
+        [1.0, 4.0]
+
+
+def test_exposition(store):
+    store.record("write_jobs", 'a"b', 0.5, items=3)
+    text = store.exposition()
+    assert "# TYPE pipeline_stage_items_total counter" in text
+    assert 'pipeline_stage_items_total{stage="write_jobs",site="a\\"b"} 3'\
+        in text
+    assert 'pipeline_stage_last_items_per_second{stage="write_jobs",' \
+        'site="a\\"b"} 6.0' in text
+
+
+class Stage:
+    site = "jobberman"
+
+    @instrumented("job_details")
+    def details(self, n):
+        for i in range(n):
+            yield i
+
+    @instrumented("scrub_jobs")
+    def scrub(self, fail=False):
+        if fail:
+            raise RuntimeError("down")
+        return 4
+
+
+def test_instrumented(store):
+    stage = Stage()
+    assert list(stage.details(3)) == [0, 1, 2]
+    assert stage.scrub() == 4
+    with pytest.raises(RuntimeError):
+        stage.scrub(fail=True)
+    with timed("write_jobs") as record:
+        record["items"] += 2
+
+    totals = {(t["stage"], t["site"]): t for t in store.totals()}
+    assert totals[("job_details", "jobberman")]["items"] == 3
+    assert totals[("scrub_jobs", "jobberman")]["runs"] == 2
+    assert totals[("scrub_jobs", "jobberman")]["errors"] == 1
+    assert totals[("scrub_jobs", "jobberman")]["items"] == 4
+    assert totals[("write_jobs", "all")]["items"] == 2
+
+
+def test_disabled_metrics(monkeypatch):
+    monkeypatch.setattr(metrics, "metrics_store", metrics.DISABLED)
+    # the config file is not read again
+    monkeypatch.setattr(metrics.yaml, "safe_load", None)
+    assert metrics.get_metrics_store() is None
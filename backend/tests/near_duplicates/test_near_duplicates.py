@@ -0,0 +1,150 @@
+from datetime import datetime
+from uuid import uuid5, NAMESPACE_URL
+from etl.databases.cassandra.data_models import Job
+from etl.load.load_cassandra import JobWriter
+from etl.transform.near_duplicates import (
+    MinHasher, NearDuplicateIndex, job_text, shingles
+)
+
+DESCRIPTION = (
+    "We are looking for an experienced accountant to prepare monthly "
+    "financial statements, reconcile bank accounts, manage payables and "
+    "receivables, and support the annual audit. Candidates need a degree "
+    "in accounting, ICAN certification and five years of experience in a "
+    "fast paced finance team. Strong Excel skills are required."
+)
+
+
+def make_job(link, source, title="Senior Accountant",
+             company="Ledger Ltd", desc=DESCRIPTION):
+    return Job(
+        uuid=uuid5(NAMESPACE_URL, link),
+        skipped=False,
+        scraped_at=datetime.now(),
+        source=source,
+        job_id="1",
+        job_title=title,
+        company_name=company,
+        location="Lagos",
+        date="1 day ago",
+        job_link=link,
+        job_desc=desc,
+        seniority="Senior",
+        emp_type="Full-time",
+        job_func="Finance",
+        ind="Accounting"
+    )
+
+
+def test_similarity_estimate():
+    hasher = MinHasher(256)
+    first = shingles(job_text(make_job("a", "Indeed")), 3)
+    second = shingles(job_text(make_job(
+        "b", "LinkedIn", desc=DESCRIPTION.replace("Strong", "Good")
+    )), 3)
+    jaccard = len(first & second) / len(first | second)
+    estimate = MinHasher.similarity(
+        hasher.signature(first), hasher.signature(second)
+    )
+    assert abs(estimate - jaccard) < 0.1
+
+
+def test_dedup_clusters_syndicated_jobs(tmp_path):
+    index = NearDuplicateIndex(str(tmp_path / "near_duplicates.db"))
+    indeed = make_job("https://indeed/1", "Indeed")
+    # the same posting, reformatted on another site
+    linkedin = make_job(
+        "https://linkedin/1", "LinkedIn", title="SENIOR ACCOUNTANT!",
+        company="Ledger Ltd.", desc=DESCRIPTION + " Apply now."
+    )
+    other = make_job(
+        "https://indeed/2", "Indeed", title="Backend Engineer",
+        desc="Build and operate Python services on Kubernetes for payments."
+    )
+
+    canonical, alt_links = index.dedup([indeed, linkedin, other])
+    assert canonical == [indeed, other]
+    assert indeed.alt_links == {"https://linkedin/1"}
+    assert alt_links == {}
+
+    # a copy scraped by a later batch is linked to the written job
+    jobberman = make_job("https://jobberman/1", "Jobberman")
+    canonical, alt_links = index.dedup([jobberman])
+    assert canonical == []
+    assert alt_links == {str(indeed.uuid): {"https://jobberman/1"}}
+    assert index.duplicate_uuids() == {
+        str(linkedin.uuid), str(jobberman.uuid)
+    }
+
+    # a batch indexed by an unfinished run is written again
+    canonical, _ = index.dedup([indeed])
+    assert canonical == [indeed]
+
+
+class RecordingIO:
+    def __init__(self, missing=()):
+        self.written = []
+        self.alt_links = []
+        self.missing = set(missing)
+
+    def write_jobs(self, jobs):
+        self.written.append([job.job_link for job in jobs])
+
+    def add_alt_links(self, alt_links):
+        self.alt_links.append(alt_links)
+        return self.missing & set(alt_links)
+
+
+def test_job_writer_dedup(tmp_path):
+    io = RecordingIO()
+    index = NearDuplicateIndex(str(tmp_path / "near_duplicates.db"))
+    with JobWriter(io, batch_size=2, deduplicator=index) as writer:
+        writer.add(make_job("https://indeed/1", "Indeed"))
+        writer.add(make_job("https://linkedin/1", "LinkedIn"))
+        writer.add(make_job("https://jobberman/1", "Jobberman"))
+    assert io.written == [["https://indeed/1"], []]
+    assert writer.written == 1
+    assert writer.duplicates == 2
+
+
+def test_scrubbed_canonical_jobs(tmp_path):
+    index = NearDuplicateIndex(str(tmp_path / "near_duplicates.db"))
+    indeed = make_job("https://indeed/1", "Indeed")
+    linkedin = make_job("https://linkedin/1", "LinkedIn")
+    index.dedup([indeed])
+    index.dedup([linkedin])
+
+    # scrubbing a canonical job removes its near-duplicates too
+    assert index.remove([str(indeed.uuid)]) == 2
+    assert index.duplicate_uuids() == set()
+    canonical, alt_links = index.dedup([make_job("https://jobberman/1",
+                                                 "Jobberman")])
+    assert len(canonical) == 1 and alt_links == {}
+
+    # a copy of a canonical job scrubbed from the database is written
+    index.mark_written([canonical[0].uuid])
+    io = RecordingIO(missing={str(canonical[0].uuid)})
+    with JobWriter(io, batch_size=2, deduplicator=index) as writer:
+        writer.add(make_job("https://indeed/2", "Indeed"))
+        writer.add(make_job("https://linkedin/2", "LinkedIn"))
+    assert io.written == [["https://indeed/2"]]
+    assert writer.duplicates == 1
+
+
+def test_copies_of_jobs_being_written(tmp_path):
+    index = NearDuplicateIndex(str(tmp_path / "near_duplicates.db"))
+    indeed = make_job("https://indeed/1", "Indeed")
+    # another scraper indexed the job but has not written it yet
+    index.dedup([indeed])
+
+    io = RecordingIO(missing={str(indeed.uuid)})
+    with JobWriter(io, batch_size=2, deduplicator=index) as writer:
+        writer.add(make_job("https://linkedin/1", "LinkedIn"))
+    assert io.written == [[]]
+    assert writer.duplicates == 1
+
+    # the link is added once the job is written
+    assert index.mark_written([indeed.uuid]) == {
+        str(indeed.uuid): {"https://linkedin/1"}
+    }
+    assert index.mark_written([indeed.uuid]) == {}
@@ -0,0 +1,43 @@
+import os
+import time
+from etl.extract.orchestrator import scrape_sites
+
+
+settings = {
+    "timeouts": {"default": 30, "slow": 8},
+    "limits": {"cpu_seconds": 60, "memory_mb": None, "open_files": 256}
+}
+
+
+def fake_scrape(seconds):
+    """
+    Stands in for `scrape_with_retry`, with the scraper class replaced by
+    the number of seconds the scrape takes.
+    """
+    if seconds < 0:
+        raise Exception("Ran into AuthWall")
+    if seconds == 0:
+        os._exit(3)
+    time.sleep(seconds)
+    return int(seconds * 10)
+
+
+def test_scrape_sites():
+    start = time.monotonic()
+    summary = scrape_sites(
+        {"slow": 30, "fast": 0.5, "walled": -1, "crashing": 0},
+        scrape=fake_scrape,
+        settings=settings
+    )
+    # the slow site is killed without delaying the others
+    assert time.monotonic() - start < 20
+
+    by_site = {site["site"]: site for site in summary}
+    assert by_site["fast"]["status"] == "ok"
+    assert by_site["fast"]["jobs"] == 5
+    assert by_site["walled"]["status"] == "failed"
+    assert by_site["walled"]["error"] == "Ran into AuthWall"
+    assert by_site["crashing"]["status"] == "crashed"
+    assert by_site["slow"]["status"] == "timeout"
+    assert 8 <= by_site["slow"]["duration"] < 15
+    assert summary[-1]["site"] == "slow"
@@ -0,0 +1,102 @@
+import random
+import string
+import pytest
+from etl.extract.page_parsers import PageParseError, parse_indeed_page
+from etl.extract.page_store import PageStore, compress, decompress
+from etl.extract.site_limits import CircuitBreaker, RateLimiter
+from etl.extract.site_scraper import IndeedScraper
+from etl.utils.sqlite_conn import connect
+
+INDEED_PAGE = """
+<html><body>
+  <div class="css-tvvxwd">Full-time</div>
+  <div class="jobsearch-jobDescriptionText"><p>Prepare reports.</p></div>
+</body></html>"""
+
+
+def test_compress():
+    codec, data = compress("<p>job</p>" * 100, 10)
+    assert len(data) < 1000
+    assert decompress(codec, data) == "<p>job</p>" * 100
+
+
+def test_parse_indeed_page():
+    details = parse_indeed_page(INDEED_PAGE)
+    assert details["job_desc"] == "Prepare reports."
+    assert details["emp_type"] == "Full-time"
+    with pytest.raises(PageParseError):
+        parse_indeed_page("<html></html>")
+
+
+def test_eviction(tmp_path):
+    store = PageStore(str(tmp_path / "page_store.db"), max_bytes=300)
+    for n in range(3):
+        # random pages, which compress to more than 100 bytes
+        html = "".join(random.Random(n).choices(string.ascii_letters, k=200))
+        store.add(str(n), "indeed", f"https://x/{n}", html)
+    # the page stored first is evicted once the store is over its size
+    assert store.get("0") is None
+    assert store.get("2") is not None
+    assert store.stats()["bytes"] <= 300
+
+    # the running total matches the stored pages, also after a replace
+    store.add("2", "indeed", "https://x/2", "<p>job</p>")
+    with connect(store.path) as db:
+        (size,) = db.execute("SELECT SUM(size) FROM pages").fetchone()
+    assert store.stats()["bytes"] == size
+
+
+def test_reextract(tmp_path):
+    store = PageStore(str(tmp_path / "page_store.db"), max_bytes=2 ** 20)
+    store.add("1", "indeed", "https://x/1", INDEED_PAGE)
+    store.add("2", "indeed", "https://x/2", INDEED_PAGE.replace(
+        "css-tvvxwd", "css-new"
+    ))
+    for uuid in ("1", "2"):
+        store.mark_parsed(uuid, 1, parse_indeed_page(store.get(uuid)))
+
+    def fixed_parser(html):
+        # parser fix picking up a new employment type selector
+        return parse_indeed_page(html.replace("css-new", "css-tvvxwd"))
+
+    # pages extracted by the current version are not re-parsed
+    assert list(store.reextract("indeed", 1, fixed_parser)) == []
+    changed = list(store.reextract("indeed", 2, fixed_parser, batch_size=1))
+    assert [(uuid, details["emp_type"]) for uuid, details in changed] ==\
+        [("2", "Full-time")]
+    assert list(store.reextract("indeed", 2, fixed_parser)) == []
+
+
+class PageDriver:
+    def get(self, url):
+        self.current_url = url
+        self.page_source = INDEED_PAGE
+
+
+class StoringScraper(IndeedScraper):
+    """
+    Indeed scraper with only the site limits and page store set up.
+    """
+    def __init__(self, tmp_path):
+        self.site = "indeed"
+        path = str(tmp_path / "site_limits.db")
+        self.rate_limiter = RateLimiter(
+            path, {"default": {"rate": 100.0, "burst": 10}}
+        )
+        self.breaker = CircuitBreaker(path)
+        self.archive = None
+        self.page_store = PageStore(str(tmp_path / "page_store.db"), 2 ** 20)
+
+
+def test_scraper_stores_pages(tmp_path):
+    scraper = StoringScraper(tmp_path)
+    link = "https://ng.indeed.com/viewjob?jk=1"
+    details = scraper.fetch_job_page(PageDriver(), link)
+    assert details["emp_type"] == "Full-time"
+
+    uuid = str(scraper.generate_uuid(link))
+    assert scraper.page_store.get(uuid) == INDEED_PAGE
+    # the page was extracted by the current parser version
+    assert list(scraper.page_store.reextract(
+        "indeed", 1, parse_indeed_page
+    )) == []
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from etl.transform.quantization import (
+    Float16Codec, ScalarQuantizer, ProductQuantizer, CompressedIndex,
+    squared_distances
+)
+
+
+rng = np.random.default_rng(0)
+vectors = rng.normal(size=(500, 32)).astype(np.float32)
+vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+ids = [f"job{i}" for i in range(len(vectors))]
+
+
+def exact_nearest(query, n_results=10):
+    nearest = np.argsort(squared_distances(query, vectors))[:n_results]
+    return [ids[i] for i in nearest]
+
+
+@pytest.mark.parametrize("codec", [
+    Float16Codec(),
+    ScalarQuantizer(),
+    ProductQuantizer(num_subspaces=8, num_centroids=64, iterations=5)
+])
+def test_codec_distances(codec):
+    codec.train(vectors)
+    codes = codec.encode(vectors)
+    assert len(codes) == len(vectors)
+    # asymmetric distances match the distances to the decoded vectors
+    np.testing.assert_allclose(
+        codec.distances(vectors[0], codes),
+        squared_distances(vectors[0], codec.decode(codes)),
+        rtol=1e-4, atol=1e-4
+    )
+
+
+def test_compression_ratio():
+    sq8 = CompressedIndex(ScalarQuantizer()).build(ids, vectors)
+    pq = CompressedIndex(
+        ProductQuantizer(num_subspaces=8, num_centroids=64, iterations=5)
+    ).build(ids, vectors)
+    assert sq8.codes.nbytes == vectors.nbytes // 4
+    assert pq.codes.nbytes == vectors.nbytes // 16
+
+
+def test_search_rescore():
+    index = CompressedIndex(
+        ProductQuantizer(num_subspaces=8, num_centroids=64, iterations=5)
+    ).build(ids, vectors)
+    query = vectors[7]
+    assert index.search(query, n_results=1)[0] == 'job7'
+    # re-scoring the whole index is exact
+    assert index.search(query, n_results=10, rescore=len(ids)) ==\
+        exact_nearest(query)
+
+
+def test_save_load(tmp_path):
+    path = str(tmp_path / "index.pkl")
+    index = CompressedIndex(ScalarQuantizer()).build(ids, vectors)
+    index.save(path)
+
+    loaded = CompressedIndex.load(path)
+    assert isinstance(loaded.vectors, np.memmap)
+    assert loaded.search(vectors[3], rescore=50) ==\
+        index.search(vectors[3], rescore=50)
+
+    # a rebuild with as many jobs replaces the vectors of the loaded index
+    rebuilt = CompressedIndex(ScalarQuantizer()).build(ids, vectors[::-1])
+    rebuilt.save(path)
+    assert len(list(tmp_path.glob("index.pkl.*vectors.npy"))) == 1
+    reloaded = CompressedIndex.load(path)
+    assert np.array_equal(reloaded.vectors, vectors[::-1])
+    assert loaded.search(vectors[3], rescore=50) ==\
+        index.search(vectors[3], rescore=50)
+
+
+def test_empty_index():
+    index = CompressedIndex(Float16Codec()).build([], [])
+    assert index.search(vectors[0]) == []
@@ -0,0 +1,135 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from etl.extract.http_fetcher import HttpFetcher
+from etl.extract.refresh import (
+    FreshnessStore, JobRefresher, description_hash
+)
+from etl.extract.site_limits import CircuitBreaker, RateLimiter
+from etl.extract.site_scraper import JobbermanScraper
+
+fixtures = os.path.join(
+    os.path.dirname(__file__), "..", "http_fetcher", "fixtures"
+)
+config = {"timeout": 5, "retries": 0, "user_agent": "test"}
+
+
+class EditableSite:
+    """
+    A job site serving one page per path, with an ETag of its version.
+    """
+    def __init__(self):
+        with open(os.path.join(fixtures, "jobberman_job.html")) as f:
+            html = f.read()
+        self.pages = {"/job/1": html, "/job/2": html}
+        self.versions = {"/job/1": 1, "/job/2": 1}
+        self.statuses = []
+
+    def edit(self, path, old, new):
+        self.pages[path] = self.pages[path].replace(old, new)
+        self.versions[path] += 1
+
+
+@pytest.fixture
+def site():
+    site = EditableSite()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            etag = f'"v{site.versions[self.path]}"'
+            if self.headers.get("If-None-Match") == etag:
+                site.statuses.append(304)
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = site.pages[self.path].encode()
+            site.statuses.append(200)
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    site.base_url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield site
+    httpd.shutdown()
+
+
+def test_get_conditional(site):
+    fetcher = HttpFetcher(config)
+    html, validators = fetcher.get_conditional(f"{site.base_url}/job/1")
+    assert validators["etag"] == '"v1"'
+    assert fetcher.get_conditional(
+        f"{site.base_url}/job/1", validators["etag"]
+    ) == (None, validators)
+    assert site.statuses == [200, 304]
+
+
+def test_description_hash():
+    assert description_hash("Build  dashboards.") ==\
+        description_hash("build dashboards")
+    assert description_hash("build dashboards") !=\
+        description_hash("build reports")
+
+
+def test_sample(tmp_path):
+    store = FreshnessStore(str(tmp_path / "refresh.db"))
+    store.update("a", {}, "hash")
+    store.update("b", {}, "hash")
+    # jobs never checked come first, then the ones checked longest ago
+    assert store.sample(["b", "a", "c"], 2) == ["c", "a"]
+    assert store.sample(["a", "b", "c"], 3, min_age=3600) == ["c"]
+    store.prune(["b"])
+    assert store.get("a") is None
+
+
+class OfflineRefresher(JobRefresher):
+    """
+    Job refresher with the jobs of the database kept in memory.
+    """
+    def __init__(self, path, jobs):
+        self.sites = {"Jobberman": JobbermanScraper}
+        self.settings = {"sample_size": 10, "min_age_hours": 0}
+        self.store = FreshnessStore(path)
+        self.http = HttpFetcher(config)
+        self.rate_limiter = RateLimiter(
+            path, {"default": {"rate": 100.0, "burst": 10}}
+        )
+        self.breaker = CircuitBreaker(path)
+        self.jobs = jobs
+        self.updates = {}
+
+    def get_job_pages(self, sources):
+        return [job for job in self.jobs if job["source"] in sources]
+
+    def update_job_details(self, details):
+        self.updates.update(details)
+
+
+def test_refresh(site, tmp_path):
+    description = JobbermanScraper.page_parser(site.pages["/job/1"])
+    jobs = [
+        {"uuid": str(n), "source": "Jobberman",
+         "job_link": f"{site.base_url}/job/{n}",
+         "job_desc": description["job_desc"]}
+        for n in (1, 2)
+    ]
+    refresher = OfflineRefresher(str(tmp_path / "refresh.db"), jobs)
+    # unchanged pages are downloaded once, then answered with a 304
+    assert refresher.refresh() == []
+    site.edit("/job/1", "financial statements", "tax returns")
+    assert refresher.refresh() == ["1"]
+    assert site.statuses == [200, 200, 200, 304]
+    assert "tax returns" in refresher.updates["1"]["job_desc"]
+    # a new version with the same description is not rewritten
+    site.edit("/job/2", "/apply", "/apply?ref=1")
+    refresher.updates = {}
+    assert refresher.refresh() == []
+    assert site.statuses[4:] == [304, 200]
+    assert refresher.updates == {}
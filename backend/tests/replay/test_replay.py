@@ -0,0 +1,60 @@
+import time
+from benchmarks.bench_scrapers import (
+    bench_site, build_synthetic_archive, parse_list_page
+)
+from etl.extract.http_fetcher import HttpFetcher
+from etl.extract.replay import PageArchive, ReplayServer
+from etl.extract.site_scraper import IndeedScraper, JobbermanScraper
+
+config = {"timeout": 5, "retries": 0, "user_agent": "test"}
+
+
+def test_archive(tmp_path):
+    archive = PageArchive(str(tmp_path / "archive"))
+    archive.add("jobs", "list", "https://jobs.example/search", "<ul></ul>")
+    archive.add("jobs", "detail", "https://jobs.example/1", "old")
+    # a page recorded again replaces the earlier recording
+    archive.add("jobs", "detail", "https://jobs.example/1", "<p>1</p>")
+    assert archive.sites() == ["jobs"]
+    assert [page["html"] for page in archive.pages("jobs", "detail")] ==\
+        ["<p>1</p>"]
+    assert len(list(archive.pages())) == 2
+
+
+def test_replay_server(tmp_path):
+    archive = PageArchive(str(tmp_path / "archive"))
+    archive.add(
+        "jobs", "list", "https://jobs.example/search?q=cook",
+        '<a href="https://jobs.example/view/1"></a><a href="/view/2"></a>'
+    )
+    archive.add("jobs", "detail", "https://jobs.example/view/1", "one")
+    archive.add("jobs", "detail", "https://jobs.example/view/2", "two")
+    fetcher = HttpFetcher(config)
+
+    with ReplayServer(archive, latency=0.1) as server:
+        start = time.perf_counter()
+        html = fetcher.get(server.url("https://jobs.example/search?q=cook"))
+        assert time.perf_counter() - start >= 0.1
+        # absolute links point to the server, relative links resolve
+        # against its root
+        assert f'href="{server.base_url}/jobs.example/view/1"' in html
+        assert fetcher.get(f"{server.base_url}/jobs.example/view/1") == "one"
+        assert fetcher.get(f"{server.base_url}/view/2") == "two"
+        assert server.requests == 3
+
+
+def test_synthetic_archive(tmp_path):
+    sites = {"indeed": IndeedScraper, "jobberman": JobbermanScraper}
+    archive = build_synthetic_archive(
+        str(tmp_path / "archive"), pages=2, cards=3, sites=sites
+    )
+    page = next(archive.pages("jobberman", "list"))
+    cards, _ = parse_list_page(JobbermanScraper, page["html"])
+    assert [card["job_title"] for card in cards] ==\
+        ["Driver 0", "Driver 1", "Driver 2"]
+
+    with ReplayServer(archive) as server:
+        result = bench_site(server, "jobberman", JobbermanScraper, 2)
+    assert result["list_pages"] == 2
+    assert result["cards"] == 6
+    assert result["details"] == 6
@@ -0,0 +1,99 @@
+from etl.extract.checkpoint import ScrapeCheckpoint
+from etl.extract.scrape_plans import load_plans, plan_url
+from etl.extract.site_scraper import IndeedScraper
+
+
+class PlannedScraper(IndeedScraper):
+    """
+    Indeed scraper without a database or browser, whose searches list the
+    job UUIDs of a dict.
+    """
+    def __init__(self, plans, listings, checkpoint_path):
+        self.config = {
+            "selenium": {"num_jobs": 30},
+            "scraping": {"pager": {
+                "watermarks": f"{checkpoint_path}.watermarks",
+                "patience": 1
+            }},
+            "scrape_plans": {"planned": plans}
+        }
+        self.plans = load_plans(self.__class__, self.config)
+        self.listings = listings
+        self.checkpoint = ScrapeCheckpoint(checkpoint_path, 48)
+        self.uuids = []
+        self.known_uuids = None
+        self.deduplicator = None
+        self.page_seen = []
+        self.cards = []
+        self.url = self.plans[0]["url"]
+        self.pagers = []
+        self.pager = self.create_pager()
+        self.visited = []
+
+    def visit_pages(self, pages):
+        for page in pages:
+            self.visited.append((self.url, page))
+            cards = [
+                {"uuid": uuid, "job_link": uuid}
+                for uuid in self.listings[self.url][page]
+                if not self.is_known(uuid)
+            ]
+            self.cards.extend(cards)
+            if self.record_page(cards):
+                break
+
+    def get_uuids(self):
+        pass
+
+
+def test_plan_url():
+    assert plan_url(IndeedScraper, {}) == IndeedScraper.search_url
+    assert plan_url(IndeedScraper, {"url": "https://x"}) == "https://x"
+    assert plan_url(
+        IndeedScraper, {"query": "data analyst", "location": "Port Harcourt"}
+    ) == "https://ng.indeed.com/jobs?q=data+analyst&l=Port+Harcourt"
+
+
+def test_load_plans():
+    config = {
+        "selenium": {"num_jobs": 30},
+        "scrape_plans": {"indeed": [
+            {"query": "nurse", "quota": 10},
+            {"location": "Kano", "priority": 2},
+        ]}
+    }
+    plans = load_plans(IndeedScraper, config)
+    # highest priority first, with the global quota as default
+    assert [(p["name"], p["quota"], p["priority"]) for p in plans] == [
+        ("all in Kano", 30, 2), ("nurse in default location", 10, 0)
+    ]
+    # a site without plans scrapes its default search
+    assert load_plans(IndeedScraper, {"selenium": {"num_jobs": 30}}) == [{
+        "name": "all in default location",
+        "url": IndeedScraper.search_url,
+        "quota": 30,
+        "priority": 0
+    }]
+
+
+def test_visit_plans_dedups_across_searches(tmp_path):
+    plans = [
+        {"url": "lagos", "quota": 30, "priority": 1},
+        {"url": "abuja", "quota": 15, "priority": 0},
+    ]
+    listings = {
+        "lagos": [["a", "b"], ["c"]],
+        "abuja": [["b", "d"]],
+    }
+    path = str(tmp_path / "planned.json")
+    scraper = PlannedScraper(plans, listings, path)
+    scraper.visit_plans()
+    # the job listed by both searches is collected once
+    assert [card["uuid"] for card in scraper.cards] == ["a", "b", "c", "d"]
+    assert scraper.checkpoint.pages_visited == {"lagos": 2, "abuja": 1}
+    assert len(scraper.pagers) == 2
+
+    # a resumed run skips the searches already visited
+    resumed = PlannedScraper(plans, listings, path)
+    resumed.visit_plans()
+    assert resumed.visited == []
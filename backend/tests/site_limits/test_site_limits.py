@@ -0,0 +1,78 @@
+import time
+import pytest
+from etl.extract.page_parsers import AuthWallError
+from etl.extract.site_limits import (
+    CircuitBreaker, RateLimiter, SiteBlockedError
+)
+from etl.extract.site_scraper import LinkedinScraper
+
+RATES = {"default": {"rate": 10.0, "burst": 2}}
+
+
+def test_rate_limiter_shared_bucket(tmp_path):
+    path = str(tmp_path / "site_limits.db")
+    first = RateLimiter(path, RATES)
+    second = RateLimiter(path, RATES)
+    # the burst is shared by both limiters, then requests are spaced out
+    assert first.reserve("jobs.example") == 0
+    assert second.reserve("jobs.example") == 0
+    assert first.reserve("jobs.example") == pytest.approx(0.1, abs=0.02)
+    assert second.reserve("jobs.example") == pytest.approx(0.2, abs=0.02)
+    # other hosts have their own bucket
+    assert first.reserve("other.example") == 0
+
+    start = time.monotonic()
+    first.acquire("https://jobs.example/1")
+    assert time.monotonic() - start >= 0.2
+
+
+def test_circuit_breaker(tmp_path):
+    breaker = CircuitBreaker(str(tmp_path / "site_limits.db"), threshold=2)
+    assert not breaker.record_block("linkedin", "authwall")
+    # a page which is not blocked resets the count
+    breaker.record_success("linkedin")
+    assert not breaker.record_block("linkedin", "authwall")
+    assert breaker.record_block("linkedin", "captcha")
+    assert breaker.open_sites() == {"linkedin": "captcha"}
+    breaker.check("indeed")
+    with pytest.raises(SiteBlockedError):
+        breaker.check("linkedin")
+
+    breaker.cooldown = 0
+    assert breaker.record_block("indeed", "a") is False
+    assert breaker.record_block("indeed", "b")
+    assert "indeed" not in breaker.open_sites()
+
+
+class PageDriver:
+    """
+    Webdriver which loads an auth wall for URLs containing `authwall`.
+    """
+    def get(self, url):
+        self.current_url = url
+        self.page_source = "<html><body>Job</body></html>"
+
+
+class GuardedScraper(LinkedinScraper):
+    """
+    LinkedIn scraper with only the site limits set up.
+    """
+    def __init__(self, path):
+        self.site = "linkedin"
+        self.rate_limiter = RateLimiter(path, RATES)
+        self.breaker = CircuitBreaker(path, threshold=2)
+        self.archive = None
+        self.page_store = None
+
+
+def test_open_page_trips_breaker(tmp_path):
+    scraper = GuardedScraper(str(tmp_path / "site_limits.db"))
+    wd = PageDriver()
+    scraper.open_page(wd, "https://www.linkedin.com/jobs/view/1")
+    for _ in range(2):
+        with pytest.raises(AuthWallError):
+            scraper.open_page(wd, "https://www.linkedin.com/authwall?x=1")
+    # the site's workers stop without loading more pages
+    with pytest.raises(SiteBlockedError):
+        scraper.open_page(wd, "https://www.linkedin.com/jobs/view/2")
+    assert wd.current_url == "https://www.linkedin.com/authwall?x=1"
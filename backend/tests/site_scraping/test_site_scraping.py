@@ -1,6 +1,12 @@
+import json
+import time
+from datetime import datetime, timedelta
 from unittest.mock import patch
+from etl.extract.checkpoint import ScrapeCheckpoint
+from etl.extract.pager import FreshnessPager
 from etl.extract.site_scraper import (
-    generate_profile
+    generate_profile, retry_delay, scrape_with_retry, JobbermanScraper,
+    LinkedinScraper
 )
 
 
@@ -18,3 +24,240 @@ def test_generate_profile():
         ):
             assert len(generate_profile()) == 18
             assert generate_profile() == "Seleniumxxxxxxxxxx"
+
+
+class OfflineScraper(JobbermanScraper):
+    """
+    Jobberman scraper without a database or browser, recording the batches
+    of jobs written.
+    """
+    def __init__(self, batch_size, checkpoint_path, patience=1):
+        self.batch_size = batch_size
+        self.batches = []
+        self.checkpoint = ScrapeCheckpoint(checkpoint_path, 48)
+        self.pager = FreshnessPager(
+            f"{checkpoint_path}.watermarks", "Offline:jobs", patience
+        )
+        self.uuids = ["known1", "known2"]
+        self.known_uuids = None
+        self.deduplicator = None
+        self.page_seen = []
+        self.cards = []
+        self.card_parsing = True
+        self.url = "jobs"
+
+    def get_uuids(self):
+        pass
+
+    def write_jobs(self, jobs):
+        self.batches.append([job.job_link for job in jobs])
+
+
+card = {
+    "uuid": JobbermanScraper.generate_uuid("https://jobberman.com/1"),
+    "job_id": "Not available on Jobberman",
+    "job_title": "Accountant",
+    "company_name": "Ledger Ltd",
+    "location": "Lagos",
+    "date": "1 day ago",
+    "job_link": "https://jobberman.com/1",
+}
+details = {
+    "job_desc": "Prepare statements.",
+    "seniority": "Mid level",
+    "emp_type": "Full Time",
+    "job_func": "Accounting",
+    "ind": "Banking"
+}
+
+
+def test_create_job(tmp_path):
+    scraper = OfflineScraper(2, str(tmp_path / "jobberman.json"))
+    job = scraper.create_job(card, details)
+    # the source is the class name without "Scraper"
+    assert job.source == "Offline"
+    assert job.job_title == "Accountant"
+    assert job.emp_type == "Full Time"
+    # jobs without a title are skipped
+    assert scraper.create_job(dict(card, job_title=""), details) is None
+
+
+def test_update_database_batches(tmp_path):
+    scraper = OfflineScraper(2, str(tmp_path / "jobberman.json"))
+    jobs = (
+        scraper.create_job(dict(card, job_link=f"link{i}"), details)
+        for i in range(5)
+    )
+    assert scraper.update_database(jobs) == 5
+    assert scraper.batches ==\
+        [["link0", "link1"], ["link2", "link3"], ["link4"]]
+    # written jobs are checkpointed
+    assert scraper.checkpoint.written == {f"link{i}" for i in range(5)}
+
+
+def test_checkpoint_resume(tmp_path):
+    path = str(tmp_path / "jobberman.json")
+    checkpoint = ScrapeCheckpoint(path, 48)
+    assert not checkpoint.resumed
+    second = dict(
+        card,
+        job_link="link2",
+        uuid=str(JobbermanScraper.generate_uuid("link2"))
+    )
+    checkpoint.add_page([card, second], "jobs")
+    checkpoint.mark_written(
+        [OfflineScraper(2, path).create_job(card, details)]
+    )
+
+    # a new run resumes after the first page, with one job left
+    resumed = ScrapeCheckpoint(path, 48)
+    assert resumed.resumed
+    assert resumed.pages_visited == {"jobs": 1}
+    assert [c["job_link"] for c in resumed.pending_cards()] == ["link2"]
+    assert str(card["uuid"]) in resumed.known_uuids()
+
+    # the pending card still makes a valid job
+    scraper = OfflineScraper(2, path)
+    assert scraper.create_job(resumed.pending_cards()[0], details) is not None
+
+    resumed.clear()
+    assert not ScrapeCheckpoint(path, 48).resumed
+
+
+def test_checkpoint_expiry(tmp_path):
+    path = str(tmp_path / "jobberman.json")
+    ScrapeCheckpoint(path, 48).add_page([card], "jobs")
+    with open(path) as f:
+        state = json.load(f)
+    state["started_at"] = (datetime.now() - timedelta(days=3)).isoformat()
+    with open(path, "w") as f:
+        json.dump(state, f)
+    assert not ScrapeCheckpoint(path, 48).resumed
+
+
+def test_known_jobs_stop_pagination(tmp_path):
+    scraper = OfflineScraper(2, str(tmp_path / "jobberman.json"), patience=2)
+    assert not scraper.is_known("new1")
+    assert scraper.is_known("known1")
+    assert not scraper.record_page([])
+    # a job seen earlier in the run counts as known
+    assert scraper.is_known("new1")
+    assert not scraper.record_page([])
+    # second page in a row without new jobs
+    assert scraper.is_known("known2")
+    assert scraper.record_page([])
+
+
+def test_pager_watermark(tmp_path):
+    path = str(tmp_path / "watermarks.json")
+    pager = FreshnessPager(path, "Indeed:jobs", patience=3)
+    assert pager.add_page([("a", False), ("b", False)])
+    assert pager.add_page([("c", True)])
+    pager.save()
+
+    # the next run stops at the newest postings of the last run
+    pager = FreshnessPager(path, "Indeed:jobs", patience=3)
+    assert pager.watermark == ["a", "b"]
+    assert pager.add_page([("z", False), ("a", True), ("y", False)])
+    assert not pager.add_page([("b", True), ("c", True)])
+    # other queries keep their own watermark
+    assert FreshnessPager(path, "Indeed:other", 3).watermark == []
+
+
+class FakeContainer:
+    """
+    Webdriver element holding job cards, which only serves its HTML.
+    """
+    def __init__(self, html):
+        self.html = html
+
+    def get_attribute(self, name):
+        return self.html
+
+
+def test_get_jobs_card_fallback(tmp_path):
+    scraper = OfflineScraper(2, str(tmp_path / "jobberman.json"))
+    read = []
+
+    def read_card(job, n):
+        read.append(n)
+        return scraper.new_card(f"https://www.jobberman.com/listings/{n}")
+
+    scraper.read_card = read_card
+    card_html = (
+        '<div class="mx-5"><div><div><div><div>'
+        '<a href="https://www.jobberman.com/listings/{0}"><p>Cook</p></a>'
+        '</div><p>Grill House</p><div><span>Lagos</span></div>'
+        '</div></div></div><div><p>New</p></div></div>'
+    )
+    html = "<div>" + card_html.format(1) + '<div class="mx-5"></div>' + \
+        card_html.format(3) + "</div>"
+    scraper.get_jobs(["card1", "card2", "card3"], FakeContainer(html))
+
+    # only the card which could not be parsed is read with the webdriver
+    assert read == [2]
+    assert [card["job_link"][-1] for card in scraper.cards] == ["1", "2", "3"]
+    assert scraper.cards[0]["job_id"] == "Not available on Jobberman"
+    assert scraper.cards[0]["company_name"] == "Grill House"
+
+    # every card is read with the webdriver if the cards do not match
+    scraper.get_jobs(["card4"], FakeContainer(html))
+    assert read == [2, 1]
+
+
+def test_retry_delay():
+    settings = {"base_delay": 5, "max_delay": 60}
+    with patch("etl.extract.site_scraper.random.uniform",
+               side_effect=lambda low, high: high):
+        assert [retry_delay(n, settings) for n in range(5)] ==\
+            [5, 10, 20, 40, 60]
+    assert 0 <= retry_delay(3, settings) <= 40
+
+
+def test_scrape_with_retry():
+    attempts = []
+
+    class FlakyScraper:
+        def __init__(self, profile_name):
+            attempts.append(profile_name)
+
+        def scrape(self):
+            return []
+
+        def update_database(self, jobs):
+            # the first attempt runs into an auth wall
+            return 0 if len(attempts) == 1 else 3
+
+    with patch("etl.extract.site_scraper.time.sleep") as sleep, \
+            patch("etl.extract.site_scraper.generate_profile",
+                  return_value="SeleniumNew"):
+        assert scrape_with_retry(FlakyScraper) == 3
+    assert attempts == ["Selenium", "SeleniumNew"]
+    assert sleep.call_count == 1
+
+
+class CountingDriver:
+    """
+    Webdriver whose search results grow by 25 jobs on every poll, up to
+    `total` jobs.
+    """
+    def __init__(self, total):
+        self.total = total
+        self.listed = 25
+
+    def execute_script(self, script):
+        listed = self.listed
+        self.listed = min(self.listed + 25, self.total)
+        return listed
+
+
+def test_wait_for_jobs():
+    scraper = LinkedinScraper.__new__(LinkedinScraper)
+    scraper.load_timeout = 1
+    scraper.driver = CountingDriver(total=50)
+    assert scraper.wait_for_jobs(25) == 50
+
+    # no more jobs load at the end of the results
+    start = time.monotonic()
+    assert scraper.wait_for_jobs(50) == 50
+    assert time.monotonic() - start < 2
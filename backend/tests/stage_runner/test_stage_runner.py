@@ -0,0 +1,79 @@
+import threading
+import time
+import pytest
+from etl.utils.stage_runner import StageStore, downstream, run_stages
+
+
+class Pipeline:
+    """
+    Stages recording their calls, with a scrape stage per site and stages
+    which fail until they are fixed.
+    """
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def stage(self, name, seconds=0.0):
+        def run():
+            with self.lock:
+                self.calls.append(name)
+            time.sleep(seconds)
+            if name in self.failing:
+                raise RuntimeError(f"{name} blocked")
+            return {"stage": name}
+        return run
+
+    def stages(self):
+        return [
+            {"name": "scrape:a", "run": self.stage("scrape:a", 0.3)},
+            {"name": "scrape:b", "run": self.stage("scrape:b", 0.3)},
+            {"name": "embed", "run": self.stage("embed"),
+             "after": ["scrape:a", "scrape:b"]},
+            {"name": "scrub", "run": self.stage("scrub"), "after": ["embed"]},
+            {"name": "other", "run": self.stage("other")},
+        ]
+
+
+def test_run_stages(tmp_path):
+    store = StageStore(str(tmp_path / "pipeline_runs.db"))
+    pipeline = Pipeline(failing={"scrape:b"})
+    start = time.monotonic()
+    run_id = run_stages(pipeline.stages(), store)
+    # independent stages run at the same time
+    assert time.monotonic() - start < 0.5
+
+    stages = store.stages(run_id)
+    assert stages["scrape:a"]["status"] == "ok"
+    assert stages["scrape:a"]["duration"] >= 0.3
+    assert stages["scrape:a"]["result"] == {"stage": "scrape:a"}
+    assert stages["scrape:b"]["status"] == "failed"
+    assert stages["scrape:b"]["error"] == "scrape:b blocked"
+    # a failed site does not hold back the stages after it
+    assert stages["embed"]["status"] == "ok"
+    assert pipeline.calls.index("embed") > pipeline.calls.index("scrape:b")
+    assert store.latest_run() == run_id
+
+
+def test_resume(tmp_path):
+    store = StageStore(str(tmp_path / "pipeline_runs.db"))
+    run_id = run_stages(Pipeline(failing={"scrape:b"}).stages(), store)
+
+    # only the failed stage and the stages after it run again
+    pipeline = Pipeline()
+    assert run_stages(pipeline.stages(), store, run_id) == run_id
+    assert sorted(pipeline.calls) == ["embed", "scrape:b", "scrub"]
+    assert {stage["status"] for stage in store.stages(run_id).values()} ==\
+        {"ok"}
+
+
+def test_downstream_and_cycles(tmp_path):
+    stages = Pipeline().stages()
+    assert downstream(stages, {"scrape:a"}) == {"scrape:a", "embed", "scrub"}
+
+    store = StageStore(str(tmp_path / "pipeline_runs.db"))
+    stages[0]["after"] = ["scrub"]
+    with pytest.raises(ValueError):
+        run_stages(stages, store)
+    with pytest.raises(ValueError):
+        run_stages([{"name": "x", "run": None, "after": ["y"]}], store)
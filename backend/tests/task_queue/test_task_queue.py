@@ -0,0 +1,213 @@
+import threading
+import time
+from etl.extract.scrape_tasks import list_pages, run_worker, schedule_scrape
+from etl.extract.site_limits import CircuitBreaker
+from etl.extract.task_queue import TaskQueue
+
+
+def test_lease_complete_and_retry(tmp_path):
+    queue = TaskQueue(str(tmp_path / "queue.db"), max_attempts=2)
+    assert queue.enqueue("list_pages", {"site": "indeed"}, key="a")
+    # the same unit of work is only queued once
+    assert not queue.enqueue("list_pages", {"site": "indeed"}, key="a")
+    queue.enqueue("job_details", {"cards": []}, priority=1)
+
+    # higher priority tasks are leased first
+    task = queue.lease("w1")
+    assert task["kind"] == "job_details" and task["attempts"] == 1
+    assert queue.complete(task, "w1")
+
+    task = queue.lease("w1")
+    assert task["payload"] == {"site": "indeed"}
+    assert queue.lease("w2") is None
+    # a failed task is retried until it reaches max_attempts
+    queue.fail(task, "w1", "auth wall")
+    task = queue.lease("w2")
+    assert task["attempts"] == 2
+    queue.fail(task, "w2", "auth wall")
+    assert queue.lease("w1") is None
+    assert queue.counts() == {"done": 1, "failed": 1}
+    assert queue.is_drained()
+
+
+def test_expired_lease(tmp_path):
+    queue = TaskQueue(str(tmp_path / "queue.db"), lease_seconds=0.1)
+    queue.enqueue("list_pages", {})
+    task = queue.lease("w1")
+    time.sleep(0.2)
+    # the task of a dead worker is taken over
+    assert queue.lease("w2")["id"] == task["id"]
+    assert not queue.complete(task, "w1")
+    assert queue.complete(task, "w2")
+
+
+def test_concurrent_leases(tmp_path):
+    queue = TaskQueue(str(tmp_path / "queue.db"))
+    for n in range(40):
+        queue.enqueue("job_details", {"n": n})
+    leased = []
+
+    def work(worker):
+        while (task := queue.lease(worker)) is not None:
+            leased.append(task["payload"]["n"])
+            queue.complete(task, worker)
+
+    threads = [threading.Thread(target=work, args=(f"w{n}",))
+               for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # every task is leased exactly once
+    assert sorted(leased) == list(range(40))
+
+
+class FakeScraper:
+    """
+    Scraper class which lists two new job cards per page and finds no new
+    jobs from page 2 on.
+    """
+    search_url = "https://jobs.example/search"
+    scrolling_results = False
+
+    def __init__(self, profile_name=None, url=None, checkpointing=True):
+        self.cards = []
+        self.pager = self
+
+    @classmethod
+    def count_pages(cls, num_jobs):
+        return 5
+
+    def visit_pages(self, pages):
+        for page in pages:
+            if page >= 2:
+                self.stopped = True
+                return
+            self.cards += [{"uuid": f"{page}-{n}"} for n in range(2)]
+        self.stopped = False
+
+    def close(self):
+        pass
+
+
+config = {
+    "selenium": {"num_jobs": 100},
+    "scraping": {"batch_size": 3},
+    "task_queue": {"pages_per_task": 2, "idle_timeout": 0,
+                   "poll_interval": 0}
+}
+
+
+def test_schedule_and_list_pages(tmp_path):
+    queue = TaskQueue(str(tmp_path / "queue.db"))
+    sites = {"fake": FakeScraper}
+    assert schedule_scrape(queue, sites, config, run_id="day1") == 3
+    # scheduling the run again does not duplicate its tasks
+    assert schedule_scrape(queue, sites, config, run_id="day1") == 0
+
+    task = queue.lease("w1")
+    assert task["payload"]["start_page"] == 0
+    list_pages(queue, task, sites, config)
+    queue.complete(task, "w1")
+
+    task = queue.lease("w1")
+    # the four cards of the first two pages are queued in two batches
+    assert task["kind"] == "job_details"
+    assert [c["uuid"] for c in task["payload"]["cards"]] ==\
+        ["0-0", "0-1", "1-0"]
+    queue.complete(task, "w1")
+    queue.complete(queue.lease("w1"), "w1")
+
+    # once a page has no new jobs, the rest of the search is cancelled
+    task = queue.lease("w1")
+    list_pages(queue, task, sites, config)
+    queue.complete(task, "w1")
+    assert queue.counts() == {"done": 4, "cancelled": 1}
+
+
+def limits_config(tmp_path):
+    return dict(config, site_limits={
+        "path": str(tmp_path / "site_limits.db"),
+        "breaker_threshold": 1,
+        "breaker_cooldown": 60
+    })
+
+
+def test_run_worker(tmp_path):
+    queue = TaskQueue(str(tmp_path / "queue.db"), max_attempts=1)
+    queue.enqueue("job_details", {"ok": True})
+    queue.enqueue("job_details", {"ok": False})
+
+    def handle(queue, task, sites, config):
+        assert task["payload"]["ok"]
+
+    processed = run_worker(
+        queue, {}, limits_config(tmp_path), worker="w1",
+        handlers={"job_details": handle}
+    )
+    assert processed == {"done": 1, "failed": 1}
+
+
+def test_run_worker_skips_blocked_sites(tmp_path):
+    queue = TaskQueue(str(tmp_path / "queue.db"))
+    queue.enqueue("job_details", {"site": "blocked"}, priority=1)
+    queue.enqueue("job_details", {"site": "open"})
+    worker_config = limits_config(tmp_path)
+
+    def handle(queue, task, sites, config):
+        # every task trips the breaker of its site
+        breaker = CircuitBreaker(config["site_limits"]["path"], 1)
+        breaker.record_block(task["payload"]["site"], "captcha")
+        breaker.check(task["payload"]["site"])
+
+    processed = run_worker(
+        queue, {}, worker_config, worker="w1",
+        handlers={"job_details": handle}
+    )
+    # the task of a blocked site is given back untried, and is skipped
+    # while its site's breaker is open
+    assert processed == {"done": 0, "failed": 0}
+    assert queue.counts() == {"pending": 2}
+    assert queue.lease("w2")["attempts"] == 1
+
+
+def test_claim(tmp_path):
+    queue = TaskQueue(str(tmp_path / "queue.db"))
+    assert queue.claim(["a", "b"], "task1") == {"a", "b"}
+    assert queue.claim(["b", "c"], "task2") == {"c"}
+    # a retried task holds its keys again
+    assert queue.claim(["a", "b", "d"], "task1") == {"a", "b", "d"}
+
+
+class OverlappingScraper(FakeScraper):
+    """
+    Scraper class whose searches all list the same two job cards.
+    """
+    def visit_pages(self, pages):
+        self.cards = [{"uuid": "shared-0"}, {"uuid": "shared-1"}]
+        self.stopped = True
+
+
+def test_schedule_plans(tmp_path):
+    queue = TaskQueue(str(tmp_path / "queue.db"))
+    sites = {"overlapping": OverlappingScraper}
+    plans_config = dict(config, scrape_plans={"overlapping": [
+        {"url": "low", "quota": 10, "priority": 0},
+        {"url": "high", "quota": 10, "priority": 3},
+    ]})
+    assert schedule_scrape(queue, sites, plans_config, run_id="day1") == 6
+
+    # the first pages of the higher priority search are leased first, then
+    # the first pages of the other search
+    tasks = [queue.lease("w1") for _ in range(2)]
+    assert [(t["payload"]["url"], t["payload"]["start_page"])
+            for t in tasks] == [("high", 0), ("high", 2)]
+    for task in tasks:
+        queue.complete(task, "w1")
+
+    # the cards listed by both searches are only queued once
+    for _ in range(2):
+        task = queue.lease("w1", ["list_pages"])
+        list_pages(queue, task, sites, plans_config)
+        queue.complete(task, "w1")
+    assert queue.counts()["pending"] == 1
@@ -0,0 +1,123 @@
+import asyncio
+import json
+import time
+import pytest
+from fastapi import FastAPI
+from etl.utils import tracing
+from etl.utils.tracing import (
+    FileExporter, LatencyMiddleware, Tracer, span, traced
+)
+
+SETTINGS = {
+    "latency_buckets": [0.05, 1],
+    "slow_request_ms": 100,
+    "slow_request_samples": 2,
+}
+
+
+@pytest.fixture
+def exported(tmp_path, monkeypatch):
+    path = tmp_path / "traces.jsonl"
+    exporter = FileExporter(str(path))
+    monkeypatch.setattr(tracing, "tracer", Tracer(exporter))
+
+    def read():
+        exporter.flush()
+        return [json.loads(line) for line in path.read_text().splitlines()]
+    yield read
+    exporter.close()
+
+
+@traced()
+def get_user_data(user_id):
+    with span("model.encode", {"documents": 1}):
+        return user_id
+
+
+def test_spans(exported):
+    # outside a trace functions run untraced
+    assert get_user_data(1) == 1
+    with tracing.get_tracer().start_as_current_span("search") as root:
+        get_user_data(2)
+        with pytest.raises(ValueError):
+            with span("query_jobs_table"):
+                raise ValueError("down")
+
+    spans = {s["name"]: s for s in exported()}
+    assert list(spans) == [
+        "model.encode", "get_user_data", "query_jobs_table", "search"
+    ]
+    assert {s["context"]["trace_id"] for s in spans.values()} ==\
+        {root.trace_id}
+    assert spans["model.encode"]["parent_id"] ==\
+        spans["get_user_data"]["context"]["span_id"]
+    assert spans["get_user_data"]["parent_id"] == root.span_id
+    assert spans["model.encode"]["attributes"] == {"documents": 1}
+    assert spans["query_jobs_table"]["status"] == "ERROR"
+    assert spans["query_jobs_table"]["events"][0]["attributes"][
+        "exception.message"] == "down"
+
+
+def request(app, path):
+    scope = {"type": "http", "method": "GET", "path": path,
+             "query_string": b"", "headers": [], "root_path": ""}
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return messages[0]["status"]
+
+
+def test_middleware(exported):
+    app = FastAPI()
+
+    @app.get("/index/search/{user_id}")
+    async def search(user_id: str):
+        get_user_data(user_id)
+        if user_id == "slow":
+            time.sleep(0.15)
+        return [user_id]
+
+    app.add_middleware(LatencyMiddleware, settings=SETTINGS)
+    assert request(app, "/index/search/fast") == 200
+    assert request(app, "/index/search/slow") == 200
+    assert request(app, "/missing") == 404
+
+    middleware = LatencyMiddleware.instance
+    text = middleware.histogram.exposition()
+    labels = 'method="GET",route="/index/search/{user_id}",status="200"'
+    assert f'http_request_duration_seconds_bucket{{{labels},le="0.05"}} 1'\
+        in text
+    assert f'http_request_duration_seconds_count{{{labels}}} 2' in text
+    assert 'route="unmatched",status="404"' in text
+
+    # only the slow request is kept, with the spans of the request
+    [sample] = middleware.slow_requests
+    assert sample["path"] == "/index/search/slow"
+    assert sample["duration_ms"] >= 150
+    assert [s["name"] for s in sample["spans"]] == [
+        "model.encode", "get_user_data", "GET /index/search/{user_id}"
+    ]
+    root = exported()[-1]
+    assert root["attributes"]["http.status_code"] == 404
+
+
+def test_file_rotation(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    exporter = FileExporter(str(path), max_bytes=1000, backup_count=2)
+    for n in range(50):
+        exporter.export([{"name": "search", "n": n, "padding": "x" * 50}])
+    exporter.close()
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert files == [
+        "traces.jsonl", "traces.jsonl.1", "traces.jsonl.2"
+    ]
+    assert all((tmp_path / name).stat().st_size <= 1000 for name in files)
+    # the newest spans are in the current file
+    last = json.loads(path.read_text().splitlines()[-1])
+    assert last["n"] == 49
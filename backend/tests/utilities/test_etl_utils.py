@@ -1,8 +1,9 @@
 from unittest.mock import patch
 from etl.utils.utilities import (
     get_previous_jobs, get_user_data, get_user_searches,
-    get_previous_clicks
+    get_previous_clicks, get_recent_clicks, get_recent_searches
 )
+from datetime import datetime
 from uuid import UUID
 
 
@@ -39,6 +40,23 @@ def test_get_user_searches_empty():
         assert get_user_searches('test', 2) == ''
 
 
+def test_get_recent_searches():
+    response = [
+        {'search_query': 'test1',
+         'search_timestamp': datetime(2023, 12, 1)},
+        {'search_query': 'test3',
+         'search_timestamp': datetime(2023, 12, 3)},
+        {'search_query': 'test2',
+         'search_timestamp': datetime(2023, 12, 2)},
+    ]
+    # Mocking the Cassandra Cluster and Session objects
+    with patch(
+        'etl.utils.utilities.session',
+        MockSession(response)
+       ):
+        assert get_recent_searches('test', 2) == 'test3, test2'
+
+
 def test_get_previous_clicks():
     response = [
         {'job_id': '4703b861-4ddc-421c-a0eb-b8204ee6c78e'},
@@ -69,6 +87,26 @@ def test_get_previous_clicks_empty():
         ]
 
 
+def test_get_recent_clicks():
+    response = [
+        {'job_id': '00000000-0000-0000-0000-000000000001',
+         'click_timestamp': datetime(2023, 12, 1)},
+        {'job_id': '00000000-0000-0000-0000-000000000003',
+         'click_timestamp': datetime(2023, 12, 3)},
+        {'job_id': '00000000-0000-0000-0000-000000000002',
+         'click_timestamp': datetime(2023, 12, 2)},
+    ]
+    # Mocking the Cassandra Cluster and Session objects
+    with patch(
+        'etl.utils.utilities.session',
+        MockSession(response)
+       ):
+        assert get_recent_clicks('test', 2) == [
+            UUID('00000000-0000-0000-0000-000000000003'),
+            UUID('00000000-0000-0000-0000-000000000002'),
+        ]
+
+
 def test_get_previous_jobs():
     input = [
         UUID('4703b861-4ddc-421c-a0eb-b8204ee6c78e'),
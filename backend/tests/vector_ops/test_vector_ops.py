@@ -0,0 +1,39 @@
+from pytest import approx
+from etl.transform.vector_ops import (
+    normalize, mean_vector, blend_vectors, decay_weights
+)
+
+
+def test_normalize():
+    assert normalize([3.0, 4.0]) == approx([0.6, 0.8])
+    assert normalize([0.0, 0.0]) == [0.0, 0.0]
+
+
+def test_mean_vector():
+    assert mean_vector([[1.0, 0.0], [0.0, 1.0]]) ==\
+        approx([0.7071068, 0.7071068])
+    assert mean_vector([]) is None
+
+
+def test_blend_vectors():
+    # vectors are normalized before blending
+    assert blend_vectors([[10.0, 0.0], [0.0, 1.0]]) ==\
+        approx([0.7071068, 0.7071068])
+
+
+def test_blend_vectors_missing():
+    assert blend_vectors([None, [], [2.0, 0.0]]) == approx([1.0, 0.0])
+    assert blend_vectors([None, []]) is None
+
+
+def test_blend_vectors_weighted():
+    assert blend_vectors([[1.0, 0.0], [0.0, 1.0]], [3.0, 0.0]) ==\
+        approx([1.0, 0.0])
+    # weights of missing vectors are dropped with them
+    assert blend_vectors([None, [0.0, 1.0]], [5.0, 1.0]) ==\
+        approx([0.0, 1.0])
+
+
+def test_decay_weights():
+    assert decay_weights(3, 0.5) == [1.0, 0.5, 0.25]
+    assert decay_weights(0, 0.5) == []